@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: application cold start
+
+Times a fresh interpreter importing ``app`` (which creates the Flask app)
+under each ``SCHEMA_ON_STARTUP`` mode:
+
+* ``migrate`` - the legacy behaviour: create_all, column probes, ALTER/UPDATE
+  statements and the lineage backfill on every import
+* ``auto``    - the fast stamped-version check, migrating only a stale schema
+* ``skip``    - no schema work at import (production; the release step migrates)
+
+Each mode runs in its own subprocess so module import cost is included.  The
+database is the one the app is configured for; run the release step
+(``python run_migration_on_startup.py``) first so ``auto`` sees a current
+schema.
+
+Usage: python benchmarks/bench_cold_start.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ('migrate', 'auto', 'skip')
+
+# Measured inside the child so interpreter start-up itself is excluded
+_CHILD = (
+    "import time; started = time.perf_counter(); import app; "
+    "print(f'@@{time.perf_counter() - started}')"
+)
+
+
+def cold_start(mode):
+    env = dict(os.environ, SCHEMA_ON_STARTUP=mode)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', _CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    total = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"import app failed in mode {mode}:\n{result.stderr}")
+    marker = [line for line in result.stdout.splitlines() if line.startswith('@@')]
+    return float(marker[-1][2:]), total
+
+
+def run(runs=5):
+    # Warm the OS file cache and make sure the schema is stamped
+    cold_start('auto')
+    print(f"{'mode':>8} {'import ms (median)':>19} {'process ms (median)':>20} {'min import ms':>14}")
+    for mode in MODES:
+        samples = [cold_start(mode) for _ in range(runs)]
+        imports = [sample[0] * 1000 for sample in samples]
+        totals = [sample[1] * 1000 for sample in samples]
+        print(f"{mode:>8} {statistics.median(imports):>19.1f} {statistics.median(totals):>20.1f} "
+              f"{min(imports):>14.1f}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import-time profile of the app module
+
+Runs ``python -X importtime -c "import app"`` in a fresh interpreter (with
+``SCHEMA_ON_STARTUP=skip`` so no database work is timed), then reports the
+total import time and the slowest top-level packages.
+
+Optional subsystems (QR codes, images, mail, the scheduler and the raw
+database drivers) are loaded on first use behind the facades in
+``services/``; ``--check`` fails when any of them is imported eagerly again
+or when the total exceeds ``--budget-ms``.
+
+Usage: python benchmarks/bench_import_time.py [--top N] [--check] [--budget-ms MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that must not be imported by "import app"
+LAZY_PACKAGES = ('qrcode', 'PIL', 'requests', 'flask_mail', 'sqlite3', 'psycopg2', 'apscheduler')
+
+
+def lazy_packages():
+    # Locally the app runs on SQLite, so SQLAlchemy loads sqlite3 as its driver
+    if not os.getenv('RENDER'):
+        return tuple(name for name in LAZY_PACKAGES if name != 'sqlite3')
+    return LAZY_PACKAGES
+
+
+def profile_import(module='app'):
+    """{module name: (self us, cumulative us)} from -X importtime"""
+    env = dict(os.environ, SCHEMA_ON_STARTUP='skip')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def top_level_totals(modules):
+    """Self time summed per top-level package"""
+    totals = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        totals[name.split('.')[0]] += self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--check', action='store_true', help='exit 1 when a lazy package is imported eagerly')
+    parser.add_argument('--budget-ms', type=float, default=None, help='with --check, fail above this total')
+    args = parser.parse_args()
+
+    modules = profile_import()
+    total_ms = modules.get('app', (0, 0))[1] / 1000
+    totals = top_level_totals(modules)
+
+    print(f"import app: {total_ms:.1f} ms cumulative, {len(modules)} modules")
+    print(f"{'package':<28} {'self ms':>9}")
+    for name, self_us in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<28} {self_us / 1000:>9.1f}")
+
+    expected_lazy = lazy_packages()
+    eager = [name for name in expected_lazy if name in totals]
+    if eager:
+        print(f"❌ Eagerly imported: {', '.join(eager)}")
+    else:
+        print(f"✅ Not imported at startup: {', '.join(expected_lazy)}")
+
+    if args.check:
+        if eager:
+            sys.exit(1)
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            print(f"❌ Import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
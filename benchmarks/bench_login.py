@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: login cost versus number of plants
+
+Measures the database work done by the login bookkeeping for users owning
+an increasing number of trees.  The legacy path touched ``updated_at`` on
+every tree (one UPDATE per tree plus loading the whole collection); the
+current ``User.update_last_login`` writes only the user row, so statement
+count and time should stay flat as the plant count grows.
+
+Usage: python benchmarks/bench_login.py [plant counts...]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+
+from models import db, User, Farm, Dome, Tree
+
+
+def legacy_update_last_login(user):
+    """The login bookkeeping used before the per-user reference time"""
+    user.previous_login = user.last_login
+    user.last_login = datetime.utcnow()
+    user.login_count = (user.login_count or 0) + 1
+    for tree in user.trees:
+        tree.updated_at = datetime.utcnow()
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed_user(username, plant_count):
+    user = User(username=username, email=f'{username}@example.com', last_login=datetime.utcnow())
+    user.set_password('secret123')
+    db.session.add(user)
+    db.session.flush()
+    farm = Farm(name='Farm', grid_row=0, grid_col=0, user_id=user.id)
+    db.session.add(farm)
+    db.session.flush()
+    side = max(1, int(plant_count ** 0.5) + 1)
+    dome = Dome(name='Dome', grid_row=0, grid_col=0, internal_rows=side, internal_cols=side,
+                user_id=user.id, farm_id=farm.id)
+    db.session.add(dome)
+    db.session.flush()
+    db.session.bulk_insert_mappings(Tree, [
+        {'name': f'Tree {i}', 'internal_row': i // side, 'internal_col': i % side,
+         'dome_id': dome.id, 'user_id': user.id, 'plant_type': 'mother'}
+        for i in range(plant_count)
+    ])
+    db.session.commit()
+    return user.id
+
+
+def measure(user_id, login_fn):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        db.session.expire_all()
+        start = time.perf_counter()
+        user = db.session.get(User, user_id)
+        login_fn(user)
+        db.session.commit()
+        seconds = time.perf_counter() - start
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    return seconds, len(statements)
+
+
+def run(plant_counts=(10, 100, 1000, 5000)):
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        print(f"{'plants':>8} {'legacy ms':>10} {'legacy sql':>11} {'current ms':>11} {'current sql':>12}")
+        for index, plant_count in enumerate(plant_counts):
+            user_id = seed_user(f'grower{index}', plant_count)
+            legacy_seconds, legacy_sql = measure(user_id, legacy_update_last_login)
+            current_seconds, current_sql = measure(user_id, User.update_last_login)
+            print(f"{plant_count:>8} {legacy_seconds * 1000:>10.2f} {legacy_sql:>11} "
+                  f"{current_seconds * 1000:>11.2f} {current_sql:>12}")
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    counts = tuple(int(arg) for arg in sys.argv[1:]) or (10, 100, 1000, 5000)
+    run(counts)
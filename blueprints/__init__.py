@@ -0,0 +1,53 @@
+"""Route blueprints, imported and registered by ``register_blueprints``.
+
+Nothing is imported from here at module load: each blueprint module is only
+imported when it is registered, so the debug/repair routes in ``admin`` are
+never loaded when ENABLE_DEBUG_ROUTES is off, and a subset of blueprints
+(``BLUEPRINTS=auth,farms``) can be loaded to profile one subsystem.
+"""
+import importlib
+import os
+import time
+
+# (module, blueprint attribute); registration order follows the old app.py layout
+BLUEPRINTS = (
+    ('auth', 'auth_bp'),
+    ('farms', 'farms_bp'),
+    ('domes', 'domes_bp'),
+    ('trees', 'trees_bp'),
+    ('lineage', 'lineage_bp'),
+    ('areas', 'areas_bp'),
+    ('clipboard', 'clipboard_bp'),
+    ('images', 'images_bp'),
+    ('assets', 'assets_bp'),
+    ('search', 'search_bp'),
+)
+DEBUG_BLUEPRINTS = (
+    ('admin', 'admin_bp'),
+)
+
+
+def enabled_blueprints(enable_debug_routes, only=None):
+    """The (module, attribute) pairs to register"""
+    blueprints = BLUEPRINTS + (DEBUG_BLUEPRINTS if enable_debug_routes else ())
+    if only:
+        wanted = {name.strip() for name in only.split(',') if name.strip()}
+        blueprints = tuple(entry for entry in blueprints if entry[0] in wanted)
+    return blueprints
+
+
+def register_blueprints(app, enable_debug_routes=False, only=None):
+    """Import and register the enabled blueprints.
+
+    Returns {module name: seconds spent importing and registering it}.
+    """
+    only = only if only is not None else os.getenv('BLUEPRINTS')
+    timings = {}
+    for module_name, attribute in enabled_blueprints(enable_debug_routes, only):
+        started = time.perf_counter()
+        module = importlib.import_module(f'{__name__}.{module_name}')
+        app.register_blueprint(getattr(module, attribute))
+        timings[module_name] = time.perf_counter() - started
+    print("🧩 Registered blueprints: " +
+          ', '.join(f"{name} ({seconds * 1000:.1f}ms)" for name, seconds in timings.items()))
+    return timings
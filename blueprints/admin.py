@@ -0,0 +1,1924 @@
+"""Debug, test, migration and repair routes.
+
+Only registered when ENABLE_DEBUG_ROUTES is on (the default locally, off on
+Render); see blueprints/__init__.py."""
+
+import base64
+import json
+import os
+import traceback
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, session, current_app
+from flask_login import login_required, current_user
+from sqlalchemy import text
+
+from config import is_postgresql
+from models import db, User, Farm, Dome, Tree, GridSettings, DragArea, DragAreaTree, RegularArea, RegularAreaCell, PlantRelationship, TreeBreed
+from services.grid_settings import get_grid_settings
+from services.occupancy import DomeOccupancy
+from services.qr import cached_qr_png
+
+
+admin_bp = Blueprint('admin', __name__)
+
+
+@admin_bp.route('/debug/drag_areas/<int:dome_id>')
+@login_required
+def debug_drag_areas_detailed(dome_id):
+    """Comprehensive debug route for drag area issues"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'error': 'Dome not found'}), 404
+        
+        debug_data = {
+            'dome_info': {
+                'id': dome.id,
+                'name': dome.name,
+                'size': f"{dome.internal_rows}x{dome.internal_cols}",
+                'user_id': dome.user_id,
+                'farm_id': dome.farm_id
+            },
+            'database_checks': {},
+            'relationship_checks': {},
+            'data_integrity': {},
+            'recommendations': []
+        }
+        
+        # Check DragArea table
+        try:
+            total_drag_areas = DragArea.query.filter_by(dome_id=dome_id).count()
+            debug_data['database_checks']['drag_areas_count'] = total_drag_areas
+            debug_data['database_checks']['drag_areas_table_exists'] = True
+        except Exception as e:
+            debug_data['database_checks']['drag_areas_table_exists'] = False
+            debug_data['database_checks']['drag_areas_error'] = str(e)
+            debug_data['recommendations'].append("DragArea table may not exist or have schema issues")
+        
+        # Check DragAreaTree table
+        try:
+            total_drag_area_trees = DragAreaTree.query.join(DragArea).filter(DragArea.dome_id == dome_id).count()
+            debug_data['database_checks']['drag_area_trees_count'] = total_drag_area_trees
+            debug_data['database_checks']['drag_area_trees_table_exists'] = True
+        except Exception as e:
+            debug_data['database_checks']['drag_area_trees_table_exists'] = False
+            debug_data['database_checks']['drag_area_trees_error'] = str(e)
+            debug_data['recommendations'].append("DragAreaTree table may not exist or have schema issues")
+        
+        # Test relationship loading
+        try:
+            from sqlalchemy.orm import joinedload
+            areas_with_relationships = DragArea.query.options(
+                joinedload(DragArea.drag_area_trees).joinedload(DragAreaTree.tree)
+            ).filter_by(dome_id=dome_id).all()
+            
+            debug_data['relationship_checks']['joinedload_success'] = True
+            debug_data['relationship_checks']['areas_loaded'] = len(areas_with_relationships)
+            
+            # Check each area's relationships
+            for area in areas_with_relationships:
+                area_debug = {
+                    'id': area.id,
+                    'name': area.name,
+                    'has_drag_area_trees_attr': hasattr(area, 'drag_area_trees'),
+                    'drag_area_trees_count': len(area.drag_area_trees) if hasattr(area, 'drag_area_trees') else 0,
+                    'trees_with_data': 0
+                }
+                
+                if hasattr(area, 'drag_area_trees'):
+                    for dat in area.drag_area_trees:
+                        if hasattr(dat, 'tree') and dat.tree:
+                            area_debug['trees_with_data'] += 1
+                
+                debug_data['relationship_checks'][f'area_{area.id}'] = area_debug
+                
+        except Exception as e:
+            debug_data['relationship_checks']['joinedload_success'] = False
+            debug_data['relationship_checks']['joinedload_error'] = str(e)
+            debug_data['recommendations'].append("Relationship loading failed - may need manual queries")
+        
+        # Data integrity checks
+        try:
+            areas = DragArea.query.filter_by(dome_id=dome_id).all()
+            integrity_issues = []
+            
+            for area in areas:
+                issues = []
+                
+                if not area.name or area.name.strip() == '':
+                    issues.append("Missing or empty name")
+                
+                if area.min_row is None or area.max_row is None or area.min_col is None or area.max_col is None:
+                    issues.append("Missing boundary coordinates")
+                
+                if area.min_row > area.max_row or area.min_col > area.max_col:
+                    issues.append("Invalid boundary coordinates")
+                
+                if hasattr(area, 'width') and hasattr(area, 'height'):
+                    if area.width <= 0 or area.height <= 0:
+                        issues.append("Invalid dimensions")
+                
+                if issues:
+                    integrity_issues.append({
+                        'area_id': area.id,
+                        'area_name': area.name,
+                        'issues': issues
+                    })
+            
+            debug_data['data_integrity']['total_areas_checked'] = len(areas)
+            debug_data['data_integrity']['areas_with_issues'] = len(integrity_issues)
+            debug_data['data_integrity']['issues'] = integrity_issues
+            
+            if integrity_issues:
+                debug_data['recommendations'].append(f"Fix data integrity issues in {len(integrity_issues)} areas")
+            
+        except Exception as e:
+            debug_data['data_integrity']['check_failed'] = True
+            debug_data['data_integrity']['error'] = str(e)
+        
+        # Generate recommendations
+        if not debug_data['recommendations']:
+            debug_data['recommendations'].append("No issues detected - drag areas should load properly")
+        
+        return jsonify(debug_data)
+        
+    except Exception as e:
+        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+
+
+@admin_bp.route('/debug/grid/<int:dome_id>/drag_areas')
+@login_required
+def debug_grid_drag_areas(dome_id):
+    """Debug endpoint specifically for grid drag areas"""
+    try:
+        # Get dome
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'error': 'Dome not found'}), 404
+        
+        # Get drag areas exactly as the grid route does
+        drag_areas_db = DragArea.query.filter_by(dome_id=dome_id).all()
+        
+        debug_data = {
+            'dome': {
+                'id': dome.id,
+                'name': dome.name,
+                'size': f"{dome.internal_rows}x{dome.internal_cols}",
+                'farm_id': dome.farm_id
+            },
+            'database_query': {
+                'total_drag_areas_found': len(drag_areas_db),
+                'query_used': f"DragArea.query.filter_by(dome_id={dome_id}).all()"
+            },
+            'drag_areas_raw': [
+                {
+                    'id': area.id,
+                    'name': area.name,
+                    'bounds': f"({area.min_row},{area.min_col}) to ({area.max_row},{area.max_col})",
+                    'size': f"{area.width}x{area.height}",
+                    'visible': area.visible,
+                    'color': area.color,
+                    'tree_associations': len(area.drag_area_trees) if hasattr(area, 'drag_area_trees') else 'N/A'
+                }
+                for area in drag_areas_db
+            ],
+            'template_format': [],
+            'potential_issues': []
+        }
+        
+        # Convert to template format
+        for area in drag_areas_db:
+            try:
+                template_area = {
+                    'id': area.id,
+                    'name': area.name,
+                    'color': area.color,
+                    'minRow': area.min_row,
+                    'maxRow': area.max_row,
+                    'minCol': area.min_col,
+                    'maxCol': area.max_col,
+                    'width': area.width,
+                    'height': area.height,
+                    'visible': area.visible,
+                    'tree_count': len(area.drag_area_trees) if hasattr(area, 'drag_area_trees') else 0
+                }
+                debug_data['template_format'].append(template_area)
+            except Exception as convert_error:
+                debug_data['potential_issues'].append(f"Error converting area {area.id}: {str(convert_error)}")
+        
+        # Check for potential issues
+        if len(drag_areas_db) == 0:
+            debug_data['potential_issues'].append("No drag areas found in database for this dome")
+        
+        visible_areas = [area for area in drag_areas_db if area.visible]
+        if len(visible_areas) != len(drag_areas_db):
+            debug_data['potential_issues'].append(f"Only {len(visible_areas)}/{len(drag_areas_db)} drag areas are visible")
+        
+        return jsonify(debug_data)
+        
+    except Exception as e:
+        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+
+
+@admin_bp.route('/test/grid/<int:dome_id>')
+@login_required
+def test_grid(dome_id):
+    """Test route to verify grid access"""
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        trees = Tree.query.filter_by(dome_id=dome_id).all()
+        
+        return f"""
+        <h2>Grid Test for Dome {dome_id}</h2>
+        <p><strong>Dome found:</strong> {dome is not None}</p>
+        <p><strong>Dome name:</strong> {dome.name if dome else 'Not found'}</p>
+        <p><strong>Trees count:</strong> {len(trees)}</p>
+        <p><strong>User ID:</strong> {current_user.id}</p>
+        <p><strong>Grid template exists:</strong> {os.path.exists('templates/grid.html')}</p>
+        <hr>
+        <a href="/grid/{dome_id}">Try Normal Grid Route</a><br>
+        <a href="/tree_info/{trees[0].id if trees else 1}">Back to Tree Info</a>
+        """
+        
+    except Exception as e:
+        return f"<h2>Error:</h2><pre>{str(e)}</pre>"
+
+
+@admin_bp.route('/debug/grid/<int:dome_id>')
+@login_required
+def debug_grid_route(dome_id):
+    """Enhanced debug route"""
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        trees = Tree.query.filter_by(dome_id=dome_id).all()
+        
+        # Check for route conflicts
+        grid_routes = []
+        for rule in current_app.url_map.iter_rules():
+            if 'grid' in str(rule):
+                grid_routes.append({
+                    'rule': str(rule),
+                    'endpoint': rule.endpoint,
+                    'methods': list(rule.methods)
+                })
+        
+        debug_info = {
+            'dome_id': dome_id,
+            'user_id': current_user.id,
+            'dome_found': dome is not None,
+            'dome_name': dome.name if dome else 'Not found',
+            'dome_farm_id': dome.farm_id if dome else None,
+            'trees_count': len(trees),
+            'trees_data': [
+                {
+                    'id': t.id, 
+                    'name': t.name, 
+                    'row': getattr(t, 'row', None),
+                    'col': getattr(t, 'col', None),
+                    'internal_row': getattr(t, 'internal_row', None),
+                    'internal_col': getattr(t, 'internal_col', None)
+                } for t in trees
+            ],
+            'grid_template_exists': os.path.exists('templates/grid.html'),
+            'grid_routes': grid_routes,
+            'route_working': True
+        }
+        
+        return f"<pre>{json.dumps(debug_info, indent=2)}</pre>"
+        
+    except Exception as e:
+        import traceback
+        return f"<pre>Error: {str(e)}\n\nTraceback:\n{traceback.format_exc()}</pre>"
+
+
+@admin_bp.route('/fix_tree_columns')
+def fix_tree_columns():
+    try:
+        # Update trees to use internal_row/internal_col
+        trees = Tree.query.all()
+        for tree in trees:
+            if hasattr(tree, 'row') and hasattr(tree, 'col'):
+                tree.internal_row = tree.row
+                tree.internal_col = tree.col
+        
+        db.session.commit()
+        return f"Fixed {len(trees)} trees"
+        
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@admin_bp.route('/debug/routes')
+def debug_routes():
+    """Debug route to see all registered routes"""
+    routes = []
+    for rule in current_app.url_map.iter_rules():
+        routes.append({
+            'endpoint': rule.endpoint,
+            'methods': list(rule.methods),
+            'rule': str(rule)
+        })
+    
+    # Filter grid routes
+    grid_routes = [r for r in routes if 'grid' in r['rule']]
+    
+    return f"<h3>Grid Routes:</h3><pre>{json.dumps(grid_routes, indent=2)}</pre>"
+
+
+@admin_bp.route('/cleanup/remove_regular_areas/<int:dome_id>')
+@login_required
+def cleanup_regular_areas(dome_id):
+    """Remove all regular areas for a dome to eliminate conflicts"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return "❌ Dome not found or access denied", 404
+        
+        # Get regular areas
+        regular_areas = RegularArea.query.filter_by(dome_id=dome_id).all()
+        regular_cells = RegularAreaCell.query.join(RegularArea).filter(RegularArea.dome_id == dome_id).all()
+        
+        # Delete regular area cells first
+        for cell in regular_cells:
+            db.session.delete(cell)
+        
+        # Delete regular areas
+        for area in regular_areas:
+            db.session.delete(area)
+        
+        db.session.commit()
+        
+        return f"✅ Cleaned up {len(regular_areas)} regular areas and {len(regular_cells)} cells for dome {dome_id}", 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return f"❌ Error cleaning up regular areas: {str(e)}", 500
+
+
+@admin_bp.route('/debug/all_grid_settings')
+@login_required
+def debug_all_grid_settings():
+    """Debug route to check all grid settings"""
+    try:
+        all_settings = GridSettings.query.filter_by(user_id=current_user.id).all()
+        
+        debug_info = {
+            'user_id': current_user.id,
+            'total_settings': len(all_settings),
+            'settings': []
+        }
+        
+        for setting in all_settings:
+            debug_info['settings'].append({
+                'id': setting.id,
+                'type': setting.grid_type,
+                'rows': setting.rows,
+                'cols': setting.cols,
+                'user_id': setting.user_id
+            })
+        
+        # Also get current settings for both types
+        farm_settings = get_grid_settings('farm', current_user.id)
+        dome_settings = get_grid_settings('dome', current_user.id)
+        
+        debug_info['current_farm'] = f"{farm_settings.rows}x{farm_settings.cols}"
+        debug_info['current_dome'] = f"{dome_settings.rows}x{dome_settings.cols}"
+        
+        return f"<pre>{json.dumps(debug_info, indent=2)}</pre>"
+        
+    except Exception as e:
+        return f"<pre>Error: {str(e)}</pre>"
+
+
+@admin_bp.route('/run_quick_fix')
+def run_quick_fix():
+    try:
+        with db.engine.connect() as conn:
+            # Add missing columns
+            conn.execute(text("ALTER TABLE dome ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+            conn.execute(text("ALTER TABLE dome ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+            conn.commit()
+            return "✅ Database fixed! <a href='/farms'>Go to Farms</a>"
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@admin_bp.route('/migrate_orphan_domes')
+@login_required
+def migrate_orphan_domes():
+    """One-time migration to assign orphan domes to farms or delete them"""
+    try:
+        # Find domes without farm_id
+        orphan_domes = Dome.query.filter_by(farm_id=None, user_id=current_user.id).all()
+        
+        if not orphan_domes:
+            return jsonify({
+                'success': True,
+                'message': 'No orphan domes found - all domes belong to farms'
+            })
+        
+        # Get user's first farm or create one
+        first_farm = Farm.query.filter_by(user_id=current_user.id).first()
+        
+        if not first_farm:
+            # Create a default farm
+            first_farm = Farm(
+                name="Default Farm",
+                grid_row=0,
+                grid_col=0,
+                user_id=current_user.id
+            )
+            db.session.add(first_farm)
+            db.session.commit()
+            print(f"✅ Created default farm for user {current_user.id}")
+        
+        # Assign orphan domes to the first farm
+        migrated_count = 0
+        for dome in orphan_domes:
+            dome.farm_id = first_farm.id
+            migrated_count += 1
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Migrated {migrated_count} orphan domes to farm "{first_farm.name}"'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error migrating orphan domes: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@admin_bp.route('/debug/session')
+def debug_session():
+    try:
+        debug_info = {
+            'session_data': dict(session),
+            'session_keys': list(session.keys()),
+            'cookies': dict(request.cookies),
+            'headers': dict(request.headers),
+            'user_id_in_session': 'user_id' in session,
+            'id_in_session': 'id' in session,
+            'session_permanent': session.permanent if hasattr(session, 'permanent') else 'N/A'
+        }
+        
+        return jsonify(debug_info)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/debug/database')
+@login_required
+def debug_database():
+    """Debug database tables and structure"""
+    try:
+        debug_info = {
+            'database_url': current_app.config.get('SQLALCHEMY_DATABASE_URI', 'Not set'),
+            'tables': {},
+            'errors': []
+        }
+        
+        # Check each table
+        tables_to_check = [
+            ('User', User),
+            ('Farm', Farm),
+            ('Dome', Dome),
+            ('Tree', Tree),
+            ('TreeBreed', TreeBreed),
+            ('PlantRelationship', PlantRelationship),
+            ('DragArea', DragArea),
+            ('DragAreaTree', DragAreaTree)
+        ]
+        
+        for table_name, model_class in tables_to_check:
+            try:
+                # Try to query the table
+                count = model_class.query.count()
+                debug_info['tables'][table_name] = {
+                    'exists': True,
+                    'count': count,
+                    'error': None
+                }
+                print(f"✅ {table_name} table: {count} records")
+                
+            except Exception as table_error:
+                debug_info['tables'][table_name] = {
+                    'exists': False,
+                    'count': 0,
+                    'error': str(table_error)
+                }
+                debug_info['errors'].append(f"{table_name}: {str(table_error)}")
+                print(f"❌ {table_name} table error: {table_error}")
+        
+        # Check Tree model fields
+        try:
+            tree_fields = []
+            for column in Tree.__table__.columns:
+                tree_fields.append({
+                    'name': column.name,
+                    'type': str(column.type),
+                    'nullable': column.nullable,
+                    'default': str(column.default) if column.default else None
+                })
+            debug_info['tree_fields'] = tree_fields
+            
+        except Exception as field_error:
+            debug_info['tree_fields_error'] = str(field_error)
+        
+        # Check TreeBreed model fields
+        try:
+            breed_fields = []
+            for column in TreeBreed.__table__.columns:
+                breed_fields.append({
+                    'name': column.name,
+                    'type': str(column.type),
+                    'nullable': column.nullable,
+                    'default': str(column.default) if column.default else None
+                })
+            debug_info['breed_fields'] = breed_fields
+            
+        except Exception as breed_field_error:
+            debug_info['breed_fields_error'] = str(breed_field_error)
+        
+        return jsonify(debug_info)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'message': 'Database debug failed'
+        }), 500
+
+
+@admin_bp.route('/debug/create_tables')
+@login_required
+def debug_create_tables():
+    """Create missing database tables"""
+    try:
+        print("🔧 Creating database tables...")
+        
+        # Create all tables
+        db.create_all()
+        
+        # Check what was created
+        created_info = {}
+        tables_to_check = [
+            ('User', User),
+            ('Farm', Farm),
+            ('Dome', Dome),
+            ('Tree', Tree),
+            ('TreeBreed', TreeBreed),
+            ('PlantRelationship', PlantRelationship),
+            ('DragArea', DragArea),
+            ('DragAreaTree', DragAreaTree)
+        ]
+        
+        for table_name, model_class in tables_to_check:
+            try:
+                count = model_class.query.count()
+                created_info[table_name] = {
+                    'exists': True,
+                    'count': count
+                }
+                print(f"✅ {table_name}: {count} records")
+                
+            except Exception as table_error:
+                created_info[table_name] = {
+                    'exists': False,
+                    'error': str(table_error)
+                }
+                print(f"❌ {table_name}: {table_error}")
+        
+        return jsonify({
+            'success': True,
+            'message': 'Database tables creation attempted',
+            'tables': created_info
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/recreate_tables')
+def recreate_tables():
+    try:
+        db.create_all()
+        return "✅ Tables recreated successfully"
+    except Exception as e:
+        return f"❌ Error: {str(e)}"
+
+
+@admin_bp.route('/setup_farm_domes')
+@login_required
+def setup_farm_domes():
+    """One-time setup to ensure all domes belong to farms with proper defaults"""
+    try:
+        print(f"🔧 Setting up farm domes for user {current_user.id}")
+        
+        # Step 1: Find orphan domes (domes without farm_id)
+        orphan_domes = Dome.query.filter_by(farm_id=None, user_id=current_user.id).all()
+        
+        # Step 2: Get or create a default farm
+        default_farm = Farm.query.filter_by(user_id=current_user.id).first()
+        
+        if not default_farm:
+            default_farm = Farm(
+                name="My Farm",
+                grid_row=0,
+                grid_col=0,
+                user_id=current_user.id
+            )
+            db.session.add(default_farm)
+            db.session.commit()
+            print(f"✅ Created default farm: {default_farm.name}")
+        
+        # Step 3: Assign orphan domes to default farm
+        migrated_domes = 0
+        for dome in orphan_domes:
+            dome.farm_id = default_farm.id
+            # Ensure dome has proper internal grid size (5x5 default)
+            if not dome.internal_rows or dome.internal_rows == 0:
+                dome.internal_rows = 5
+            if not dome.internal_cols or dome.internal_cols == 0:
+                dome.internal_cols = 5
+            migrated_domes += 1
+        
+        # Step 4: Update all user's domes to have proper internal grid sizes
+        all_user_domes = Dome.query.filter_by(user_id=current_user.id).all()
+        updated_domes = 0
+        
+        for dome in all_user_domes:
+            updated = False
+            if not dome.internal_rows or dome.internal_rows == 0:
+                dome.internal_rows = 5
+                updated = True
+            if not dome.internal_cols or dome.internal_cols == 0:
+                dome.internal_cols = 5
+                updated = True
+            if updated:
+                updated_domes += 1
+        
+        # Step 5: Set up proper grid settings for each farm
+        user_farms = Farm.query.filter_by(user_id=current_user.id).all()
+        grid_settings_created = 0
+        
+        for farm in user_farms:
+            # Check if farm-specific dome grid settings exist
+            farm_dome_settings = GridSettings.query.filter_by(
+                grid_type=f'farm_{farm.id}_dome',
+                user_id=current_user.id
+            ).first()
+            
+            if not farm_dome_settings:
+                farm_dome_settings = GridSettings(
+                    rows=5,  # Default 5x5 dome grid for farms
+                    cols=5,
+                    grid_type=f'farm_{farm.id}_dome',
+                    user_id=current_user.id
+                )
+                db.session.add(farm_dome_settings)
+                grid_settings_created += 1
+        
+        db.session.commit()
+        
+        # Step 6: Generate summary
+        total_farms = len(user_farms)
+        total_domes = len(all_user_domes)
+        
+        return f"""
+        <div style="font-family: Arial; padding: 20px; max-width: 600px; margin: 0 auto;">
+            <h2>🎉 Farm Dome Setup Complete!</h2>
+            
+            <div style="background: #e8f5e8; padding: 15px; border-radius: 8px; margin: 15px 0;">
+                <h3>✅ Setup Summary:</h3>
+                <ul>
+                    <li><strong>Farms:</strong> {total_farms} farm(s)</li>
+                    <li><strong>Domes:</strong> {total_domes} dome(s)</li>
+                    <li><strong>Migrated orphan domes:</strong> {migrated_domes}</li>
+                    <li><strong>Updated dome grid sizes:</strong> {updated_domes}</li>
+                    <li><strong>Grid settings created:</strong> {grid_settings_created}</li>
+                </ul>
+            </div>
+            
+            <div style="background: #f0f8ff; padding: 15px; border-radius: 8px; margin: 15px 0;">
+                <h3>📏 Default Settings:</h3>
+                <ul>
+                    <li><strong>Farm grid:</strong> 10x10 (for placing domes)</li>
+                    <li><strong>Dome grid:</strong> 5x5 (for placing trees)</li>
+                    <li><strong>All grids are editable</strong> in their respective views</li>
+                </ul>
+            </div>
+            
+            <div style="text-align: center; margin: 20px 0;">
+                <a href="/farms" style="background: #4CAF50; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; font-weight: bold;">
+                    🚜 Go to Farms
+                </a>
+            </div>
+            
+            <div style="background: #fff3cd; padding: 10px; border-radius: 6px; margin: 15px 0; font-size: 14px;">
+                <strong>Note:</strong> You can remove this setup route after confirming everything works properly.
+            </div>
+        </div>
+        """
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error setting up farm domes: {str(e)}")
+        return f"""
+        <div style="font-family: Arial; padding: 20px; text-align: center;">
+            <h2>❌ Setup Failed</h2>
+            <p><strong>Error:</strong> {str(e)}</p>
+            <p><a href="/farms">Try Farms Page</a></p>
+        </div>
+        """
+
+
+@admin_bp.route('/validate_dome_setup')
+@login_required
+def validate_dome_setup():
+    """Validate that dome setup is correct"""
+    try:
+        # Check for orphan domes
+        orphan_domes = Dome.query.filter_by(farm_id=None, user_id=current_user.id).all()
+        
+        # Check dome internal grid sizes
+        domes_without_grid = Dome.query.filter(
+            Dome.user_id == current_user.id,
+            (Dome.internal_rows.is_(None)) | (Dome.internal_rows == 0) |
+            (Dome.internal_cols.is_(None)) | (Dome.internal_cols == 0)
+        ).all()
+        
+        # Check grid settings
+        user_farms = Farm.query.filter_by(user_id=current_user.id).all()
+        farms_without_dome_settings = []
+        
+        for farm in user_farms:
+            settings = GridSettings.query.filter_by(
+                grid_type=f'farm_{farm.id}_dome',
+                user_id=current_user.id
+            ).first()
+            if not settings:
+                farms_without_dome_settings.append(farm.name)
+        
+        # Check for trees with invalid positions
+        invalid_trees = []
+        all_domes = Dome.query.filter_by(user_id=current_user.id).all()
+        
+        for dome in all_domes:
+            trees = Tree.query.filter_by(dome_id=dome.id).all()
+            for tree in trees:
+                if (tree.internal_row >= dome.internal_rows or 
+                    tree.internal_col >= dome.internal_cols or
+                    tree.internal_row < 0 or tree.internal_col < 0):
+                    invalid_trees.append({
+                        'tree_name': tree.name,
+                        'dome_name': dome.name,
+                        'position': f"({tree.internal_row}, {tree.internal_col})",
+                        'dome_size': f"{dome.internal_rows}x{dome.internal_cols}"
+                    })
+        
+        # Generate validation report
+        issues = []
+        fixes_applied = []
+        
+        if orphan_domes:
+            issues.append(f"Found {len(orphan_domes)} orphan domes without farm assignment")
+            
+            # Auto-fix: Assign to first farm or create default farm
+            first_farm = Farm.query.filter_by(user_id=current_user.id).first()
+            if not first_farm:
+                first_farm = Farm(
+                    name="Default Farm",
+                    grid_row=0,
+                    grid_col=0,
+                    user_id=current_user.id
+                )
+                db.session.add(first_farm)
+                db.session.commit()
+                fixes_applied.append("Created default farm")
+            
+            for dome in orphan_domes:
+                dome.farm_id = first_farm.id
+            db.session.commit()
+            fixes_applied.append(f"Assigned {len(orphan_domes)} orphan domes to {first_farm.name}")
+        
+        if domes_without_grid:
+            issues.append(f"Found {len(domes_without_grid)} domes without proper grid sizes")
+            
+            # Auto-fix: Set default 5x5 grid
+            for dome in domes_without_grid:
+                if not dome.internal_rows or dome.internal_rows == 0:
+                    dome.internal_rows = 5
+                if not dome.internal_cols or dome.internal_cols == 0:
+                    dome.internal_cols = 5
+            db.session.commit()
+            fixes_applied.append(f"Set default 5x5 grid for {len(domes_without_grid)} domes")
+        
+        if farms_without_dome_settings:
+            issues.append(f"Found {len(farms_without_dome_settings)} farms without dome grid settings")
+            
+            # Auto-fix: Create default dome grid settings
+            for farm in user_farms:
+                settings = GridSettings.query.filter_by(
+                    grid_type=f'farm_{farm.id}_dome',
+                    user_id=current_user.id
+                ).first()
+                
+                if not settings:
+                    settings = GridSettings(
+                        rows=5,
+                        cols=5,
+                        grid_type=f'farm_{farm.id}_dome',
+                        user_id=current_user.id
+                    )
+                    db.session.add(settings)
+            
+            db.session.commit()
+            fixes_applied.append(f"Created dome grid settings for {len(farms_without_dome_settings)} farms")
+        
+        if invalid_trees:
+            issues.append(f"Found {len(invalid_trees)} trees with invalid positions")
+            
+            # Auto-fix: Move invalid trees to valid positions (one occupancy map per dome)
+            occupancy_by_dome = {}
+            for tree_info in invalid_trees:
+                tree = Tree.query.filter_by(name=tree_info['tree_name']).first()
+                dome = Dome.query.filter_by(name=tree_info['dome_name']).first()
+                
+                if tree and dome:
+                    if dome.id not in occupancy_by_dome:
+                        occupancy_by_dome[dome.id] = DomeOccupancy.for_dome(dome)
+                    occupancy = occupancy_by_dome[dome.id]
+                    free_cell = occupancy.first_free()
+                    if free_cell:
+                        occupancy.move(tree.id, *free_cell)
+                        tree.internal_row, tree.internal_col = free_cell
+            
+            db.session.commit()
+            fixes_applied.append(f"Repositioned {len(invalid_trees)} trees to valid positions")
+        
+        # Generate summary statistics
+        total_farms = Farm.query.filter_by(user_id=current_user.id).count()
+        total_domes = Dome.query.filter_by(user_id=current_user.id).count()
+        total_trees = Tree.query.filter_by(user_id=current_user.id).count()
+        
+        # Check for duplicate positions
+        duplicate_positions = []
+        for dome in all_domes:
+            trees = Tree.query.filter_by(dome_id=dome.id).all()
+            positions = {}
+            for tree in trees:
+                pos_key = f"{tree.internal_row},{tree.internal_col}"
+                if pos_key in positions:
+                    duplicate_positions.append({
+                        'dome_name': dome.name,
+                        'position': f"({tree.internal_row}, {tree.internal_col})",
+                        'trees': [positions[pos_key], tree.name]
+                    })
+                else:
+                    positions[pos_key] = tree.name
+        
+        if duplicate_positions:
+            issues.append(f"Found {len(duplicate_positions)} duplicate tree positions")
+        
+        # Generate HTML report
+        status = "✅ All Good" if not issues else "⚠️ Issues Found"
+        status_color = "#4CAF50" if not issues else "#FF9800"
+        
+        html_report = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Dome Setup Validation</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }}
+                .status {{ background: {status_color}; color: white; padding: 15px; border-radius: 8px; text-align: center; margin-bottom: 20px; }}
+                .section {{ background: #f5f5f5; padding: 15px; border-radius: 8px; margin: 15px 0; }}
+                .issue {{ background: #fff3cd; padding: 10px; border-left: 4px solid #ffc107; margin: 10px 0; }}
+                .fix {{ background: #d4edda; padding: 10px; border-left: 4px solid #28a745; margin: 10px 0; }}
+                .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px; }}
+                .stat-card {{ background: white; padding: 15px; border-radius: 8px; text-align: center; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+                .stat-number {{ font-size: 2em; font-weight: bold; color: #007bff; }}
+                .actions {{ text-align: center; margin: 20px 0; }}
+                .btn {{ background: #007bff; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 0 10px; }}
+                .btn:hover {{ background: #0056b3; }}
+                ul {{ list-style-type: none; padding: 0; }}
+                li {{ margin: 5px 0; }}
+            </style>
+        </head>
+        <body>
+            <div class="status">
+                <h1>{status}</h1>
+                <p>Dome Setup Validation Report for {current_user.username}</p>
+            </div>
+            
+            <div class="section">
+                <h2>📊 Summary Statistics</h2>
+                <div class="stats">
+                    <div class="stat-card">
+                        <div class="stat-number">{total_farms}</div>
+                        <div>Farms</div>
+                    </div>
+                    <div class="stat-card">
+                        <div class="stat-number">{total_domes}</div>
+                        <div>Domes</div>
+                    </div>
+                    <div class="stat-card">
+                        <div class="stat-number">{total_trees}</div>
+                        <div>Trees</div>
+                    </div>
+                    <div class="stat-card">
+                        <div class="stat-number">{len(issues)}</div>
+                        <div>Issues Found</div>
+                    </div>
+                </div>
+            </div>
+        """
+        
+        if issues:
+            html_report += """
+            <div class="section">
+                <h2>⚠️ Issues Detected</h2>
+                <ul>
+            """
+            for issue in issues:
+                html_report += f'<li class="issue">• {issue}</li>'
+            html_report += "</ul></div>"
+        
+        if fixes_applied:
+            html_report += """
+            <div class="section">
+                <h2>🔧 Fixes Applied</h2>
+                <ul>
+            """
+            for fix in fixes_applied:
+                html_report += f'<li class="fix">✅ {fix}</li>'
+            html_report += "</ul></div>"
+        
+        if duplicate_positions:
+            html_report += """
+            <div class="section">
+                <h2>🔍 Duplicate Positions Found</h2>
+                <ul>
+            """
+            for dup in duplicate_positions:
+                html_report += f"""
+                <li class="issue">
+                    Dome: {dup['dome_name']} - Position {dup['position']}<br>
+                    Trees: {', '.join(dup['trees'])}
+                </li>
+                """
+            html_report += "</ul></div>"
+        
+        if invalid_trees:
+            html_report += """
+            <div class="section">
+                <h2>📍 Invalid Tree Positions (Fixed)</h2>
+                <ul>
+            """
+            for tree_info in invalid_trees:
+                html_report += f"""
+                <li class="fix">
+                    Tree: {tree_info['tree_name']} in {tree_info['dome_name']}<br>
+                    Was at {tree_info['position']} (dome size: {tree_info['dome_size']})
+                </li>
+                """
+            html_report += "</ul></div>"
+        
+        html_report += f"""
+            <div class="actions">
+                <a href="/farms" class="btn">🚜 Go to Farms</a>
+                <a href="/profile" class="btn">👤 View Profile</a>
+                <a href="/validate_dome_setup" class="btn">🔄 Re-run Validation</a>
+            </div>
+            
+            <div class="section">
+                <h3>🛠️ Validation Details</h3>
+                <p><strong>Validation completed at:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC</p>
+                <p><strong>Database type:</strong> {'PostgreSQL' if is_postgresql() else 'SQLite'}</p>
+                <p><strong>Total issues found:</strong> {len(issues)}</p>
+                <p><strong>Total fixes applied:</strong> {len(fixes_applied)}</p>
+            </div>
+        </body>
+        </html>
+        """
+        
+        return html_report
+        
+    except Exception as e:
+        print(f"❌ Validation error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        
+        return f"""
+        <div style="font-family: Arial; padding: 20px; text-align: center;">
+            <h2>❌ Validation Failed</h2>
+            <p><strong>Error:</strong> {str(e)}</p>
+            <p><a href="/farms">Back to Farms</a></p>
+            <details>
+                <summary>Technical Details</summary>
+                <pre>{traceback.format_exc()}</pre>
+            </details>
+        </div>
+        """
+
+
+# ✅ NEW: Debug route for farm-specific grid settings
+@admin_bp.route('/debug/farm_grid_settings/<int:farm_id>')
+@login_required
+def debug_farm_grid_settings(farm_id):
+    """Debug route to check farm-specific grid settings"""
+    try:
+        farm = Farm.query.filter_by(id=farm_id, user_id=current_user.id).first()
+        if not farm:
+            return f"<pre>Farm {farm_id} not found</pre>"
+            
+        # Get all grid settings for this user
+        all_settings = GridSettings.query.filter_by(user_id=current_user.id).all()
+        
+        debug_info = {
+            'farm_id': farm_id,
+            'farm_name': farm.name,
+            'user_id': current_user.id,
+            'total_settings': len(all_settings),
+            'settings': []
+        }
+        
+        for setting in all_settings:
+            debug_info['settings'].append({
+                'id': setting.id,
+                'type': setting.grid_type,
+                'rows': setting.rows,
+                'cols': setting.cols,
+                'user_id': setting.user_id
+            })
+        
+        # Get current settings for different types
+        farm_settings = get_grid_settings('farm', current_user.id)
+        global_dome_settings = get_grid_settings('dome', current_user.id)
+        farm_dome_settings = get_grid_settings('dome', current_user.id, farm_id)
+        
+        debug_info['current_farm'] = f"{farm_settings.rows}x{farm_settings.cols}"
+        debug_info['current_global_dome'] = f"{global_dome_settings.rows}x{global_dome_settings.cols}"
+        debug_info['current_farm_dome'] = f"{farm_dome_settings.rows}x{farm_dome_settings.cols}"
+        
+        return f"<pre>{json.dumps(debug_info, indent=2)}</pre>"
+        
+    except Exception as e:
+        return f"<pre>Error: {str(e)}</pre>"
+
+
+# ============= VIEW ROUTES =============
+@admin_bp.route('/debug/grid_settings')
+@login_required
+def debug_grid_settings():
+    """Debug route to check current grid settings"""
+    try:
+        grid_settings = GridSettings.query.first()
+        all_settings = GridSettings.query.all()
+        
+        debug_info = {
+            'grid_settings_found': grid_settings is not None,
+            'current_rows': grid_settings.rows if grid_settings else 'No settings',
+            'current_cols': grid_settings.cols if grid_settings else 'No settings',
+            'total_grid_settings_records': len(all_settings),
+            'all_settings': [{'id': s.id, 'rows': s.rows, 'cols': s.cols} for s in all_settings],
+            'user_id': current_user.id
+        }
+        
+        return f"<pre>{json.dumps(debug_info, indent=2)}</pre>"
+        
+    except Exception as e:
+        return f"<pre>Error: {str(e)}</pre>"
+
+
+@admin_bp.route('/migrate_tree_breed_complete')
+@login_required
+def migrate_tree_breed_complete():
+    """Complete migration for tree_breed table - adds all missing columns"""
+    try:
+        migration_log = []
+        migration_log.append("🔧 Starting complete TreeBreed table migration...")
+        
+        with db.engine.connect() as conn:
+            # Check if tree_breed table exists
+            result = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name='tree_breed'"))
+            table_exists = result.fetchone() is not None
+            
+            if not table_exists:
+                migration_log.append("📋 tree_breed table doesn't exist, creating it...")
+                # Create the complete table
+                conn.execute(text("""
+                    CREATE TABLE tree_breed (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name VARCHAR(100) UNIQUE NOT NULL,
+                        description TEXT,
+                        user_id INTEGER NOT NULL,
+                        farm_id INTEGER,
+                        is_active BOOLEAN DEFAULT 1,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (user_id) REFERENCES user (id) ON DELETE CASCADE,
+                        FOREIGN KEY (farm_id) REFERENCES farm (id) ON DELETE CASCADE
+                    )
+                """))
+                migration_log.append("✅ tree_breed table created with all columns")
+                
+                # Insert default breeds
+                default_breeds = [
+                    ('Apple', 'Sweet and crispy fruit tree'),
+                    ('Orange', 'Citrus fruit tree with vitamin C'),
+                    ('Mango', 'Tropical fruit tree with sweet flesh'),
+                    ('Banana', 'Tropical fruit tree with potassium-rich fruit'),
+                    ('Coconut', 'Palm tree with versatile coconut fruit'),
+                    ('Avocado', 'Nutrient-rich fruit tree'),
+                    ('Cherry', 'Small stone fruit tree'),
+                    ('Peach', 'Soft stone fruit tree'),
+                    ('Lemon', 'Sour citrus fruit tree'),
+                    ('Lime', 'Small green citrus fruit tree'),
+                    ('Papaya', 'Tropical fruit tree with enzyme-rich fruit'),
+                    ('Guava', 'Tropical fruit tree with vitamin C')
+                ]
+                
+                for breed_name, description in default_breeds:
+                    conn.execute(text("""
+                        INSERT INTO tree_breed (name, description, user_id, farm_id, is_active)
+                        VALUES (:name, :description, :user_id, :farm_id, 1)
+                    """), {
+                        'name': breed_name,
+                        'description': description,
+                        'user_id': current_user.id,
+                        'farm_id': 1  # Default to farm 1
+                    })
+                
+                migration_log.append(f"✅ Inserted {len(default_breeds)} default breeds")
+                
+            else:
+                # Check existing columns
+                result = conn.execute(text("PRAGMA table_info(tree_breed)"))
+                existing_columns = [row[1] for row in result.fetchall()]
+                migration_log.append(f"📋 Existing columns: {', '.join(existing_columns)}")
+                
+                # Define required columns
+                required_columns = {
+                    'description': 'TEXT',
+                    'farm_id': 'INTEGER',
+                    'is_active': 'BOOLEAN DEFAULT 1',
+                    'created_at': 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
+                    'updated_at': 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'
+                }
+                
+                # Add missing columns
+                for column_name, column_type in required_columns.items():
+                    if column_name not in existing_columns:
+                        migration_log.append(f"➕ Adding {column_name} column...")
+                        conn.execute(text(f"ALTER TABLE tree_breed ADD COLUMN {column_name} {column_type}"))
+                        migration_log.append(f"✅ {column_name} column added")
+                    else:
+                        migration_log.append(f"ℹ️ {column_name} column already exists")
+                
+                # Update existing records with default values
+                if 'farm_id' not in existing_columns:
+                    conn.execute(text("UPDATE tree_breed SET farm_id = 1 WHERE farm_id IS NULL"))
+                    migration_log.append("✅ Updated existing records with default farm_id")
+                
+                if 'is_active' not in existing_columns:
+                    conn.execute(text("UPDATE tree_breed SET is_active = 1 WHERE is_active IS NULL"))
+                    migration_log.append("✅ Updated existing records with default is_active")
+            
+            # Commit changes
+            conn.commit()
+            migration_log.append("💾 Changes committed to database")
+            
+            # Verify final table structure
+            result = conn.execute(text("PRAGMA table_info(tree_breed)"))
+            final_columns = [row[1] for row in result.fetchall()]
+            migration_log.append(f"🎯 Final table structure: {', '.join(final_columns)}")
+            
+            # Count records
+            result = conn.execute(text("SELECT COUNT(*) FROM tree_breed"))
+            record_count = result.fetchone()[0]
+            migration_log.append(f"📊 Total breeds in database: {record_count}")
+        
+        migration_log.append("🎉 TreeBreed migration completed successfully!")
+        
+        # Create HTML response
+        html_response = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>TreeBreed Migration Complete</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
+                .container {{ background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
+                .success {{ color: #4CAF50; }}
+                .log {{ background: #f9f9f9; padding: 15px; border-left: 4px solid #4CAF50; margin: 20px 0; }}
+                .log pre {{ margin: 0; font-family: monospace; }}
+                .button {{ background: #4CAF50; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 10px 5px; }}
+                .warning {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; margin: 20px 0; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <h1 class="success">✅ TreeBreed Migration Complete!</h1>
+                
+                <div class="log">
+                    <h3>Migration Log:</h3>
+                    <pre>{'<br>'.join(migration_log)}</pre>
+                </div>
+                
+                <h3>What was fixed:</h3>
+                <ul>
+                    <li>✅ Added missing <code>description</code> column</li>
+                    <li>✅ Added missing <code>farm_id</code> column</li>
+                    <li>✅ Added missing <code>is_active</code> column</li>
+                    <li>✅ Added missing <code>created_at</code> column</li>
+                    <li>✅ Added missing <code>updated_at</code> column</li>
+                    <li>✅ Inserted default breed data if table was empty</li>
+                </ul>
+                
+                <div class="warning">
+                    <h4>⚠️ Important: Restart Your Application</h4>
+                    <p>After this migration, please restart your Flask application to ensure all changes take effect:</p>
+                    <ol>
+                        <li>Stop your current Flask app (Ctrl+C in terminal)</li>
+                        <li>Restart with: <code>python app.py</code></li>
+                        <li>Try creating a tree again</li>
+                    </ol>
+                </div>
+                
+                <div style="margin-top: 30px;">
+                    <a href="/farms" class="button">🚜 Go to Farms</a>
+                    <a href="/grid/1" class="button">🌱 Test Grid</a>
+                    <a href="/api/farm/1/breeds" class="button">🧬 Test Breeds API</a>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+        
+        return html_response
+        
+    except Exception as e:
+        error_msg = str(e)
+        migration_log.append(f"❌ Migration failed: {error_msg}")
+        
+        return f"""
+        <!DOCTYPE html>
+        <html>
+        <head><title>Migration Failed</title></head>
+        <body style="font-family: Arial; margin: 40px;">
+            <h1 style="color: #f44336;">❌ Migration Failed</h1>
+            <p><strong>Error:</strong> {error_msg}</p>
+            <p>Please check your database permissions and try again.</p>
+            <a href="/farms" style="background: #2196F3; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px;">🚜 Back to Farms</a>
+        </body>
+        </html>
+        """, 500
+
+
+@admin_bp.route('/api/dome/<int:dome_id>/debug_relationships')
+@login_required
+def debug_dome_relationships(dome_id):
+    """Debug endpoint to check all tree relationships in a dome"""
+    try:
+        print(f"🔍 === DEBUGGING RELATIONSHIPS IN DOME {dome_id} ===")
+        
+        # Get all trees in the dome
+        trees = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+        print(f"🔍 Found {len(trees)} trees in dome {dome_id}")
+        
+        relationships_data = {
+            'dome_id': dome_id,
+            'total_trees': len(trees),
+            'mothers': [],
+            'cuttings': [],
+            'independent': [],
+            'broken_relationships': []
+        }
+        
+        for tree in trees:
+            tree_data = {
+                'id': tree.id,
+                'name': tree.name,
+                'plant_type': tree.plant_type,
+                'mother_plant_id': getattr(tree, 'mother_plant_id', None),
+                'position': f"({tree.internal_row}, {tree.internal_col})"
+            }
+            
+            if tree.plant_type == 'mother':
+                # Count cuttings for this mother
+                cuttings = Tree.query.filter_by(mother_plant_id=tree.id, user_id=current_user.id).all()
+                tree_data['cutting_count'] = len(cuttings)
+                tree_data['cutting_ids'] = [c.id for c in cuttings]
+                relationships_data['mothers'].append(tree_data)
+                
+            elif tree.plant_type == 'cutting':
+                mother_id = getattr(tree, 'mother_plant_id', None)
+                if mother_id:
+                    mother = Tree.query.filter_by(id=mother_id, user_id=current_user.id).first()
+                    tree_data['mother_exists'] = mother is not None
+                    tree_data['mother_name'] = mother.name if mother else 'NOT_FOUND'
+                    
+                    if not mother:
+                        relationships_data['broken_relationships'].append(tree_data)
+                    else:
+                        relationships_data['cuttings'].append(tree_data)
+                else:
+                    tree_data['mother_exists'] = False
+                    tree_data['mother_name'] = 'NO_MOTHER_ID'
+                    relationships_data['broken_relationships'].append(tree_data)
+                    
+            else:
+                relationships_data['independent'].append(tree_data)
+        
+        print(f"🔍 Relationship summary:")
+        print(f"   - Mothers: {len(relationships_data['mothers'])}")
+        print(f"   - Cuttings: {len(relationships_data['cuttings'])}")
+        print(f"   - Independent: {len(relationships_data['independent'])}")
+        print(f"   - Broken: {len(relationships_data['broken_relationships'])}")
+        
+        return jsonify({
+            'success': True,
+            'relationships_data': relationships_data
+        })
+        
+    except Exception as e:
+        print(f"❌ Error debugging dome relationships: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@admin_bp.route('/migrate_images_to_database')
+@login_required
+def migrate_images_to_database():
+    """One-time migration to convert file URLs to data URLs"""
+    try:
+        migrated = 0
+        
+        # Check farms with file-based image URLs
+        farms = Farm.query.filter(Farm.image_url.like('/uploads/%')).all()
+        for farm in farms:
+            # Convert to placeholder or remove
+            farm.image_url = None
+            migrated += 1
+        
+        # Check domes with file-based image URLs
+        domes = Dome.query.filter(Dome.image_url.like('/uploads/%')).all()
+        for dome in domes:
+            # Convert to placeholder or remove
+            dome.image_url = None
+            migrated += 1
+        
+        # Check trees with file-based image URLs
+        trees = Tree.query.filter(Tree.image_url.like('/uploads/%')).all()
+        for tree in trees:
+            # Convert to placeholder or remove
+            tree.image_url = None
+            migrated += 1
+        
+        db.session.commit()
+        
+        return f"""
+        <h2>✅ Image Migration Complete</h2>
+        <p>Cleaned up {migrated} old file references.</p>
+        <p>All future uploads will be stored in the database.</p>
+        <p><a href="/farms">Back to Farms</a></p>
+        """
+        
+    except Exception as e:
+        return f"❌ Migration error: {e}"
+
+
+@admin_bp.route('/test_qr/<int:tree_id>')
+@login_required
+def test_qr(tree_id):
+    """Test route to debug QR code generation"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return f"Tree {tree_id} not found", 404
+        
+        qr_data = f"{request.url_root}tree_info/{tree_id}"
+        
+        # Test QR code generation
+        png, _ = cached_qr_png(qr_data, box_size=10, border=5)
+        img_base64 = base64.b64encode(png).decode()
+        
+        html = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>QR Code Test</title>
+        </head>
+        <body>
+            <h1>QR Code Test for Tree: {tree.name}</h1>
+            <p>URL: {qr_data}</p>
+            <img src="data:image/png;base64,{img_base64}" alt="QR Code" style="border: 1px solid #ccc;">
+            <br><br>
+            <a href="/tree_info/{tree_id}">Go to Tree Info</a>
+        </body>
+        </html>
+        """
+        return html
+        
+    except Exception as e:
+        return f"Error: {str(e)}", 500
+
+
+@admin_bp.route('/fix_image_columns')
+def fix_image_columns():
+    """Fix image_url columns to handle base64 data"""
+    try:
+        with db.engine.connect() as conn:
+            print("🔧 Fixing image_url column sizes...")
+            
+            is_postgresql = 'postgresql' in str(db.engine.url)
+            fixes_applied = []
+            
+            if is_postgresql:
+                # PostgreSQL version - change VARCHAR(255) to TEXT
+                try:
+                    # Fix farm table
+                    conn.execute(text("ALTER TABLE farm ALTER COLUMN image_url TYPE TEXT"))
+                    fixes_applied.append("✅ Fixed farm.image_url column")
+                except Exception as e:
+                    if "does not exist" in str(e):
+                        fixes_applied.append("ℹ️ farm.image_url column doesn't exist")
+                    else:
+                        fixes_applied.append(f"⚠️ farm.image_url: {str(e)[:100]}")
+                
+                try:
+                    # Fix dome table
+                    conn.execute(text("ALTER TABLE dome ALTER COLUMN image_url TYPE TEXT"))
+                    fixes_applied.append("✅ Fixed dome.image_url column")
+                except Exception as e:
+                    if "does not exist" in str(e):
+                        fixes_applied.append("ℹ️ dome.image_url column doesn't exist")
+                    else:
+                        fixes_applied.append(f"⚠️ dome.image_url: {str(e)[:100]}")
+                
+                try:
+                    # Fix tree table
+                    conn.execute(text("ALTER TABLE tree ALTER COLUMN image_url TYPE TEXT"))
+                    fixes_applied.append("✅ Fixed tree.image_url column")
+                except Exception as e:
+                    if "does not exist" in str(e):
+                        fixes_applied.append("ℹ️ tree.image_url column doesn't exist")
+                    else:
+                        fixes_applied.append(f"⚠️ tree.image_url: {str(e)[:100]}")
+                        
+            else:
+                # SQLite doesn't support ALTER COLUMN TYPE directly
+                fixes_applied.append("ℹ️ SQLite detected - column types are flexible")
+            
+            conn.commit()
+            
+            # Clear SQLAlchemy cache
+            db.metadata.clear()
+            db.metadata.reflect(bind=db.engine)
+            
+            return f"""
+            <h2>✅ Image Column Fix Complete!</h2>
+            <ul>
+                {''.join([f'<li>{fix}</li>' for fix in fixes_applied])}
+            </ul>
+            
+            <p><a href="/clean_old_images" style="background: #ff9800; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">🧹 Next: Clean Old Images</a></p>
+            
+            <hr>
+            <p><small>Step 1 of 2 complete</small></p>
+            """
+            
+    except Exception as e:
+        return f"""
+        <h2>❌ Image Column Fix Failed</h2>
+        <p><strong>Error:</strong> {str(e)}</p>
+        <p><a href="/farms">Back to Farms</a></p>
+        """
+
+
+@admin_bp.route('/clean_old_images')
+def clean_old_images():
+    """Clean up old file-based image URLs"""
+    try:
+        cleaned = 0
+        
+        # Clean farm images
+        farms_with_old_images = Farm.query.filter(
+            Farm.image_url.like('/static/uploads/%')
+        ).all()
+        
+        for farm in farms_with_old_images:
+            farm.image_url = None
+            cleaned += 1
+        
+        # Clean dome images
+        domes_with_old_images = Dome.query.filter(
+            Dome.image_url.like('/static/uploads/%')
+        ).all()
+        
+        for dome in domes_with_old_images:
+            dome.image_url = None
+            cleaned += 1
+        
+        # Clean tree images
+        trees_with_old_images = Tree.query.filter(
+            Tree.image_url.like('/static/uploads/%')
+        ).all()
+        
+        for tree in trees_with_old_images:
+            tree.image_url = None
+            cleaned += 1
+        
+        db.session.commit()
+        
+        return f"""
+        <h2>✅ Old Images Cleaned!</h2>
+        <p>Removed {cleaned} old file references.</p>
+        <p>All future uploads will be stored as base64 in the database.</p>
+        
+        <h3>🎉 Image Upload System Ready!</h3>
+        <p><a href="/farms" style="background: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">🚜 Test Image Upload</a></p>
+        
+        <hr>
+        <p><small>Setup complete - images will now persist through deployments!</small></p>
+        """
+        
+    except Exception as e:
+        return f"""
+        <h2>❌ Image Cleanup Failed</h2>
+        <p><strong>Error:</strong> {str(e)}</p>
+        <p><a href="/farms">Back to Farms</a></p>
+        """
+
+
+@admin_bp.route('/migrate_database')
+def migrate_database():
+    """Manually trigger database migration - REMOVE AFTER USE"""
+    try:
+        print("🔄 Starting database migration...")
+        
+        # Check current table structure
+        with db.engine.connect() as conn:
+            if is_postgresql():
+                # ✅ FIXED: PostgreSQL version
+                result = conn.execute(text("""
+                    SELECT column_name 
+                    FROM information_schema.columns 
+                    WHERE table_name = 'tree'
+                    ORDER BY ordinal_position
+                """))
+                columns = [row[0] for row in result.fetchall()]
+            else:
+                # SQLite version
+                result = conn.execute(text("PRAGMA table_info(tree)"))
+                columns = [row[1] for row in result.fetchall()]
+                
+            print(f"Current tree table columns: {columns}")
+            
+            if 'internal_row' not in columns and 'row' in columns:
+                print("✅ Migration needed - adding new columns...")
+                
+                # Add new columns
+                conn.execute(text('ALTER TABLE tree ADD COLUMN internal_row INTEGER DEFAULT 0'))
+                conn.execute(text('ALTER TABLE tree ADD COLUMN internal_col INTEGER DEFAULT 0'))
+                
+                # Copy data from old columns to new columns
+                conn.execute(text('UPDATE tree SET internal_row = row, internal_col = col'))
+                
+                # Commit the changes
+                conn.commit()
+                
+                print("✅ Migration completed successfully!")
+                return "Migration completed successfully! You can now use the app normally. <a href='/farms'>Go to Farms</a>"
+                
+            elif 'internal_row' in columns:
+                print("✅ Migration already completed")
+                return "Migration already completed - new columns exist. <a href='/farms'>Go to Farms</a>"
+                
+            else:
+                print("❌ Unexpected table structure")
+                return f"Unexpected table structure. Columns: {columns}"
+                
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return f"Migration failed: {str(e)}"
+
+
+# ============= ERROR HANDLERS =============
+@admin_bp.route('/fix_database_for_render')
+def fix_database_for_render():
+    """Comprehensive database fix for Render deployment - REMOVE AFTER USE"""
+    try:
+        print("🔧 Starting comprehensive database fix for Render...")
+        
+        with db.engine.connect() as conn:
+            fixes_applied = []
+            
+            # 1. Check and fix dome table
+            if is_postgresql():
+                result = conn.execute(text("""
+                    SELECT column_name 
+                    FROM information_schema.columns 
+                    WHERE table_name = 'dome'
+                """))
+                dome_columns = [row[0] for row in result.fetchall()]
+            else:
+                result = conn.execute(text("PRAGMA table_info(dome)"))
+                dome_columns = [row[1] for row in result.fetchall()]
+            
+            if 'farm_id' not in dome_columns:
+                conn.execute(text('ALTER TABLE dome ADD COLUMN farm_id INTEGER'))
+                if is_postgresql():
+                    try:
+                        conn.execute(text('ALTER TABLE dome ADD CONSTRAINT fk_dome_farm FOREIGN KEY (farm_id) REFERENCES farm(id)'))
+                    except:
+                        pass  # Constraint might already exist
+                fixes_applied.append("Added farm_id column to dome table")
+            
+            # 2. Check and fix tree table
+            if is_postgresql():
+                result = conn.execute(text("""
+                    SELECT column_name 
+                    FROM information_schema.columns 
+                    WHERE table_name = 'tree'
+                """))
+                tree_columns = [row[0] for row in result.fetchall()]
+            else:
+                result = conn.execute(text("PRAGMA table_info(tree)"))
+                tree_columns = [row[1] for row in result.fetchall()]
+            
+            if 'internal_row' not in tree_columns:
+                conn.execute(text('ALTER TABLE tree ADD COLUMN internal_row INTEGER DEFAULT 0'))
+                conn.execute(text('ALTER TABLE tree ADD COLUMN internal_col INTEGER DEFAULT 0'))
+                
+                # Copy data if old columns exist
+                if 'row' in tree_columns:
+                    conn.execute(text('UPDATE tree SET internal_row = row, internal_col = col'))
+                
+                fixes_applied.append("Added internal_row/internal_col columns to tree table")
+            
+            # 3. Check and fix grid_settings table
+            if is_postgresql():
+                result = conn.execute(text("""
+                    SELECT column_name 
+                    FROM information_schema.columns 
+                    WHERE table_name = 'grid_settings'
+                """))
+                grid_columns = [row[0] for row in result.fetchall()]
+            else:
+                result = conn.execute(text("PRAGMA table_info(grid_settings)"))
+                grid_columns = [row[1] for row in result.fetchall()]
+            
+            missing_grid_columns = []
+            if 'grid_type' not in grid_columns:
+                conn.execute(text("ALTER TABLE grid_settings ADD COLUMN grid_type VARCHAR(20) DEFAULT 'dome'"))
+                missing_grid_columns.append("grid_type")
+            
+            if 'user_id' not in grid_columns:
+                conn.execute(text("ALTER TABLE grid_settings ADD COLUMN user_id INTEGER"))
+                missing_grid_columns.append("user_id")
+            
+            if 'created_at' not in grid_columns:
+                if is_postgresql():
+                    conn.execute(text("ALTER TABLE grid_settings ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                else:
+                    conn.execute(text("ALTER TABLE grid_settings ADD COLUMN created_at TIMESTAMP"))
+                missing_grid_columns.append("created_at")
+            
+            if 'updated_at' not in grid_columns:
+                if is_postgresql():
+                    conn.execute(text("ALTER TABLE grid_settings ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                else:
+                    conn.execute(text("ALTER TABLE grid_settings ADD COLUMN updated_at TIMESTAMP"))
+                missing_grid_columns.append("updated_at")
+            
+            if missing_grid_columns:
+                fixes_applied.append(f"Added columns to grid_settings: {', '.join(missing_grid_columns)}")
+            
+            # Commit all changes
+            conn.commit()
+            
+            # 4. Test queries
+            test_results = []
+            try:
+                result = conn.execute(text("SELECT COUNT(*) FROM dome WHERE farm_id IS NULL OR farm_id IS NOT NULL"))
+                count = result.fetchone()[0]
+                test_results.append(f"✅ Dome farm_id query works: {count} domes")
+            except Exception as e:
+                test_results.append(f"❌ Dome farm_id query failed: {e}")
+            
+            try:
+                result = conn.execute(text("SELECT COUNT(*) FROM tree WHERE internal_row IS NOT NULL"))
+                count = result.fetchone()[0]
+                test_results.append(f"✅ Tree internal_row query works: {count} trees")
+            except Exception as e:
+                test_results.append(f"❌ Tree internal_row query failed: {e}")
+            
+            # Clear SQLAlchemy cache
+            db.metadata.clear()
+            db.metadata.reflect(bind=db.engine)
+            
+            return f"""
+            <h2>🔧 Database Fix Results</h2>
+            <h3>Fixes Applied:</h3>
+            <ul>
+                {''.join([f'<li>✅ {fix}</li>' for fix in fixes_applied]) if fixes_applied else '<li>No fixes needed</li>'}
+            </ul>
+            
+            <h3>Test Results:</h3>
+            <ul>
+                {''.join([f'<li>{result}</li>' for result in test_results])}
+            </ul>
+            
+            <hr>
+            <p><strong>Database Type:</strong> {'PostgreSQL' if is_postgresql() else 'SQLite'}</p>
+            <p><a href="/farms">🚜 Test Farms Page</a></p>
+            <p><a href="/">🏠 Go Home</a></p>
+            <hr>
+            <p><strong>Note:</strong> Remove this route after the fix works.</p>
+            """
+                
+    except Exception as e:
+        print(f"❌ Database fix failed: {e}")
+        import traceback
+        return f"""
+        <h2>❌ Database Fix Failed</h2>
+        <p>Error: {str(e)}</p>
+        <pre>{traceback.format_exc()}</pre>
+        <p><a href="/farms">Try Farms Anyway</a></p>
+        """
+
+
+# ============= MAIN APPLICATION ENTRY POINT =============
+@admin_bp.route('/fix_dome_columns')
+def fix_dome_columns():
+    """Fix missing created_at and updated_at columns in dome table"""
+    try:
+        with db.engine.connect() as conn:
+            print("🔧 Fixing dome table columns...")
+            
+            # Check if we're on PostgreSQL (Render) or SQLite (local)
+            is_postgresql = 'postgresql' in str(db.engine.url)
+            
+            if is_postgresql:
+                # PostgreSQL version (for Render)
+                try:
+                    # Add created_at column
+                    conn.execute(text("ALTER TABLE dome ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                    print("✅ Added created_at column")
+                except Exception as e:
+                    if "already exists" in str(e):
+                        print("ℹ️ created_at column already exists")
+                    else:
+                        print(f"⚠️ Error adding created_at: {e}")
+                
+                try:
+                    # Add updated_at column
+                    conn.execute(text("ALTER TABLE dome ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                    print("✅ Added updated_at column")
+                except Exception as e:
+                    if "already exists" in str(e):
+                        print("ℹ️ updated_at column already exists")
+                    else:
+                        print(f"⚠️ Error adding updated_at: {e}")
+            else:
+                # SQLite version (for local development)
+                try:
+                    conn.execute(text("ALTER TABLE dome ADD COLUMN created_at TIMESTAMP"))
+                    conn.execute(text("ALTER TABLE dome ADD COLUMN updated_at TIMESTAMP"))
+                    print("✅ Added timestamp columns (SQLite)")
+                except Exception as e:
+                    print(f"ℹ️ Columns might already exist: {e}")
+            
+            # Commit the changes
+            conn.commit()
+            
+            # Update existing records with current timestamp
+            from datetime import datetime
+            current_time = datetime.utcnow()
+            try:
+                conn.execute(text("UPDATE dome SET created_at = :time WHERE created_at IS NULL"), {"time": current_time})
+                conn.execute(text("UPDATE dome SET updated_at = :time WHERE updated_at IS NULL"), {"time": current_time})
+                conn.commit()
+                print("✅ Updated existing records with timestamps")
+            except Exception as e:
+                print(f"⚠️ Error updating existing records: {e}")
+            
+            # Clear SQLAlchemy metadata cache to recognize new columns
+            db.metadata.clear()
+            db.metadata.reflect(bind=db.engine)
+            print("✅ Cleared SQLAlchemy metadata cache")
+            
+            # Test the fix by trying a simple query
+            try:
+                result = conn.execute(text("SELECT COUNT(*) FROM dome WHERE created_at IS NOT NULL"))
+                count = result.fetchone()[0]
+                print(f"✅ Test query successful: {count} domes have timestamps")
+                
+                return f"""
+                <h2>✅ Database Fix Completed!</h2>
+                <p><strong>Successfully added missing columns to dome table:</strong></p>
+                <ul>
+                    <li>✅ created_at column added</li>
+                    <li>✅ updated_at column added</li>
+                    <li>✅ {count} existing records updated</li>
+                    <li>✅ SQLAlchemy cache cleared</li>
+                </ul>
+                
+                <h3>🎉 Your farm system should now work!</h3>
+                <p><a href="/farms" style="background: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">🚜 Test Farms Page</a></p>
+                
+                <hr>
+                <p><small>Database: {'PostgreSQL (Render)' if is_postgresql else 'SQLite (Local)'}</small></p>
+                <p><small>You can remove this route after confirming everything works.</small></p>
+                """
+                
+            except Exception as test_error:
+                return f"""
+                <h2>⚠️ Partial Fix Applied</h2>
+                <p>Columns were added but test query failed: {test_error}</p>
+                <p><a href="/farms">Try Farms Page Anyway</a></p>
+                """
+                
+    except Exception as e:
+        print(f"❌ Database fix failed: {e}")
+        return f"""
+        <h2>❌ Database Fix Failed</h2>
+        <p><strong>Error:</strong> {str(e)}</p>
+        <p>This might be a permissions issue or the columns might already exist.</p>
+        <p><a href="/farms">Try Farms Page</a></p>
+        """
+
+
+@admin_bp.route('/fix_all_tables')
+def fix_all_tables():
+    """Fix missing columns in all tables"""
+    try:
+        with db.engine.connect() as conn:
+            print("🔧 Fixing all database tables...")
+            
+            is_postgresql = 'postgresql' in str(db.engine.url)
+            fixes_applied = []
+            
+            # Fix user table
+            try:
+                if is_postgresql:
+                    conn.execute(text('ALTER TABLE "user" ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP'))
+                    conn.execute(text('ALTER TABLE "user" ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP'))
+                else:
+                    conn.execute(text("ALTER TABLE user ADD COLUMN created_at TIMESTAMP"))
+                    conn.execute(text("ALTER TABLE user ADD COLUMN updated_at TIMESTAMP"))
+                fixes_applied.append("✅ Fixed user table")
+            except:
+                fixes_applied.append("ℹ️ User table already fixed")
+            
+            # Fix farm table
+            try:
+                if is_postgresql:
+                    conn.execute(text("ALTER TABLE farm ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                    conn.execute(text("ALTER TABLE farm ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                else:
+                    conn.execute(text("ALTER TABLE farm ADD COLUMN created_at TIMESTAMP"))
+                    conn.execute(text("ALTER TABLE farm ADD COLUMN updated_at TIMESTAMP"))
+                fixes_applied.append("✅ Fixed farm table")
+            except:
+                fixes_applied.append("ℹ️ Farm table already fixed")
+            
+            # Fix tree table
+            try:
+                if is_postgresql:
+                    conn.execute(text("ALTER TABLE tree ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                    conn.execute(text("ALTER TABLE tree ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"))
+                else:
+                    conn.execute(text("ALTER TABLE tree ADD COLUMN created_at TIMESTAMP"))
+                    conn.execute(text("ALTER TABLE tree ADD COLUMN updated_at TIMESTAMP"))
+                fixes_applied.append("✅ Fixed tree table")
+            except:
+                fixes_applied.append("ℹ️ Tree table already fixed")
+            
+            conn.commit()
+            
+            # Clear cache
+            db.metadata.clear()
+            db.metadata.reflect(bind=db.engine)
+            
+            return f"""
+            <h2>✅ All Tables Fixed!</h2>
+            <ul>
+                {''.join([f'<li>{fix}</li>' for fix in fixes_applied])}
+            </ul>
+            <p><a href="/register">🔐 Test Register</a></p>
+            <p><a href="/farms">🚜 Test Farms</a></p>
+            """
+            
+    except Exception as e:
+        return f"❌ Error: {e}"
@@ -0,0 +1,1730 @@
+"""Drag area and regular area routes"""
+
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+
+from models import db, Dome, Tree, DragArea, DragAreaTree, RegularArea, RegularAreaCell
+from services.tree_listing import ListingError, TreeListing, tree_field
+from blueprints.common import dome_etag
+
+
+areas_bp = Blueprint('areas', __name__)
+
+
+@areas_bp.route('/update_drag_area_trees/<int:dome_id>/<int:area_id>', methods=['POST'])
+@login_required
+def update_drag_area_trees(dome_id, area_id):
+    """Update trees in a drag area when trees are moved"""
+    try:
+        data = request.get_json()
+        new_tree_ids = data.get('tree_ids', [])
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get current areas
+        try:
+            areas_data = json.loads(dome.info or '{"drag_areas": []}')
+            areas = areas_data.get('drag_areas', [])
+        except:
+            return jsonify({'success': False, 'error': 'No areas found'}), 404
+        
+        # Find and update the area
+        area_found = False
+        for area in areas:
+            if area.get('id') == area_id:
+                # Verify all trees belong to the user and dome
+                if new_tree_ids:
+                    trees = Tree.query.filter(
+                        Tree.id.in_(new_tree_ids),
+                        Tree.user_id == current_user.id,
+                        Tree.dome_id == dome_id
+                    ).all()
+                    
+                    if len(trees) != len(new_tree_ids):
+                        return jsonify({'success': False, 'error': 'Some trees not found or access denied'}), 403
+                
+                area['tree_ids'] = new_tree_ids
+                area['updated_at'] = datetime.utcnow().isoformat()
+                area_found = True
+                break
+        
+        if not area_found:
+            return jsonify({'success': False, 'error': 'Area not found'}), 404
+        
+        dome.info = json.dumps(areas_data)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Area updated with {len(new_tree_ids)} trees'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error updating drag area trees: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/regular_areas/<int:dome_id>')
+@login_required
+def get_regular_areas(dome_id):
+    """Disabled regular areas endpoint - returns empty array"""
+    print(f"ℹ️ Regular areas API called for dome {dome_id} - returning empty (DISABLED)")
+    return jsonify({
+        'success': True,
+        'regular_areas': [],
+        'count': 0,
+        'message': 'Regular areas system disabled - using drag areas only'
+    })
+
+
+@areas_bp.route('/api/regular_areas/<int:dome_id>', methods=['POST'])
+@login_required
+def create_regular_area(dome_id):
+    """Disabled regular area creation"""
+    return jsonify({
+        'success': False,
+        'error': 'Regular areas system disabled - use drag areas instead'
+    }), 400
+
+
+@areas_bp.route('/api/dome/<int:dome_id>/areas', methods=['GET'])
+@login_required
+@dome_etag('areas')
+def get_dome_areas(dome_id):
+    """Get all areas (drag and regular) for a dome"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({
+                'success': False,
+                'error': 'Dome not found or access denied'
+            }), 404
+        
+        areas_data = {
+            'drag_areas': [],
+            'regular_areas': [],
+            'total_areas': 0,
+            'total_trees': 0
+        }
+        
+        # ✅ Get Drag Areas
+        try:
+            drag_areas = DragArea.query.filter_by(dome_id=dome_id).all()
+            for area in drag_areas:
+                area_data = {
+                    'id': area.id,
+                    'name': area.name,
+                    'type': 'dragArea',
+                    'color': area.color,
+                    'width': area.width,
+                    'height': area.height,
+                    'min_row': area.min_row,
+                    'max_row': area.max_row,
+                    'min_col': area.min_col,
+                    'max_col': area.max_col,
+                    'visible': area.visible,
+                    'tree_count': 0,
+                    'trees': []
+                }
+                
+                # Get trees in this drag area
+                if hasattr(area, 'drag_area_trees'):
+                    for dat in area.drag_area_trees:
+                        if dat.tree:
+                            area_data['trees'].append({
+                                'id': dat.tree.id,
+                                'name': dat.tree.name,
+                                'relative_row': dat.relative_row,
+                                'relative_col': dat.relative_col
+                            })
+                    area_data['tree_count'] = len(area_data['trees'])
+                
+                areas_data['drag_areas'].append(area_data)
+                
+        except Exception as drag_error:
+            print(f"⚠️ Error loading drag areas: {str(drag_error)}")
+            # DragArea model might not exist, continue with empty list
+        
+        # ✅ Get Regular Areas
+        try:
+            regular_areas = RegularArea.query.filter_by(dome_id=dome_id).all()
+            for area in regular_areas:
+                area_data = {
+                    'id': area.id,
+                    'name': area.name,
+                    'type': 'regularArea',
+                    'color': area.color,
+                    'width': area.max_col - area.min_col + 1,
+                    'height': area.max_row - area.min_row + 1,
+                    'min_row': area.min_row,
+                    'max_row': area.max_row,
+                    'min_col': area.min_col,
+                    'max_col': area.max_col,
+                    'visible': area.visible,
+                    'cell_count': len(area.cells) if area.cells else 0,
+                    'tree_count': len(area.trees) if area.trees else 0,
+                    'cells': [],
+                    'trees': []
+                }
+                
+                # Get cells
+                if area.cells:
+                    for cell in area.cells:
+                        area_data['cells'].append({
+                            'row': cell.row,
+                            'col': cell.col
+                        })
+                
+                # Get trees
+                if area.trees:
+                    for tree in area.trees:
+                        area_data['trees'].append({
+                            'id': tree.id,
+                            'name': tree.name,
+                            'internal_row': tree.internal_row,
+                            'internal_col': tree.internal_col
+                        })
+                
+                areas_data['regular_areas'].append(area_data)
+                
+        except Exception as regular_error:
+            print(f"⚠️ Error loading regular areas: {str(regular_error)}")
+            # Continue with empty list
+        
+        # Calculate totals
+        areas_data['total_areas'] = len(areas_data['drag_areas']) + len(areas_data['regular_areas'])
+        areas_data['total_trees'] = sum(area.get('tree_count', 0) for area in areas_data['drag_areas']) + \
+                                   sum(area.get('tree_count', 0) for area in areas_data['regular_areas'])
+        
+        print(f"✅ Loaded {len(areas_data['drag_areas'])} drag areas and {len(areas_data['regular_areas'])} regular areas for dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'areas': areas_data
+        })
+        
+    except Exception as e:
+        print(f"❌ Error loading areas for dome {dome_id}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Failed to load areas: {str(e)}'
+        }), 500
+
+
+@areas_bp.route('/api/delete_regular_area/<int:dome_id>/<int:area_id>', methods=['DELETE'])
+@login_required
+def delete_regular_area(dome_id, area_id):
+    """Delete a regular area"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        regular_area = RegularArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        
+        if not regular_area:
+            return jsonify({
+                'success': False,
+                'error': 'Regular area not found'
+            }), 404
+        
+        area_name = regular_area.name
+        db.session.delete(regular_area)
+        db.session.commit()
+        
+        print(f"✅ Regular area '{area_name}' deleted for dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Regular area "{area_name}" deleted successfully'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error deleting regular area: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@areas_bp.route('/api/update_regular_area/<int:dome_id>/<int:area_id>', methods=['POST'])
+@login_required
+def update_regular_area(dome_id, area_id):
+    """Update a regular area"""
+    try:
+        data = request.get_json()
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        regular_area = RegularArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        
+        if not regular_area:
+            return jsonify({
+                'success': False,
+                'error': 'Regular area not found'
+            }), 404
+        
+        # Update fields
+        if 'name' in data:
+            # Check if new name already exists (excluding current area)
+            existing_area = RegularArea.query.filter_by(
+                dome_id=dome_id,
+                name=data['name']
+            ).filter(RegularArea.id != area_id).first()
+            
+            if existing_area:
+                return jsonify({
+                    'success': False,
+                    'error': 'Area name already exists for this dome'
+                }), 400
+            
+            regular_area.name = data['name']
+        
+        if 'color' in data:
+            regular_area.color = data['color']
+        
+        if 'visible' in data:
+            regular_area.visible = data['visible']
+        
+        db.session.commit()
+        
+        print(f"✅ Regular area '{regular_area.name}' updated for dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Regular area updated successfully'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error updating regular area: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@areas_bp.route('/api/copy_regular_area/<int:dome_id>/<int:area_id>', methods=['GET'])
+@login_required
+def copy_regular_area(dome_id, area_id):
+    """Copy a regular area to clipboard with enhanced error handling"""
+    try:
+        # ✅ ENHANCED: Input validation
+        if dome_id <= 0 or area_id <= 0:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid dome_id or area_id'
+            }), 400
+        
+        # ✅ ENHANCED: Verify dome ownership with better error messages
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            # Check if dome exists but belongs to different user
+            dome_exists = Dome.query.filter_by(id=dome_id).first()
+            if dome_exists:
+                return jsonify({
+                    'success': False,
+                    'error': f'Access denied: Dome {dome_id} belongs to another user'
+                }), 403
+            else:
+                return jsonify({
+                    'success': False,
+                    'error': f'Dome {dome_id} not found'
+                }), 404
+        
+        # ✅ ENHANCED: Get regular area with better error handling
+        try:
+            regular_area = RegularArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        except Exception as db_error:
+            print(f"❌ Database error querying RegularArea: {str(db_error)}")
+            return jsonify({
+                'success': False,
+                'error': 'Database error occurred while fetching regular area'
+            }), 500
+        
+        if not regular_area:
+            # ✅ ENHANCED: Check if area exists in different dome
+            area_exists = RegularArea.query.filter_by(id=area_id).first()
+            if area_exists:
+                return jsonify({
+                    'success': False,
+                    'error': f'Regular area {area_id} exists but not in dome {dome_id}'
+                }), 404
+            else:
+                return jsonify({
+                    'success': False,
+                    'error': f'Regular area {area_id} not found'
+                }), 404
+        
+        # ✅ ENHANCED: Validate area belongs to user's dome
+        if regular_area.dome_id != dome_id:
+            return jsonify({
+                'success': False,
+                'error': 'Regular area does not belong to the specified dome'
+            }), 400
+        
+        # ✅ ENHANCED: Get trees with better error handling and validation
+        area_trees = []
+        processed_cells = 0
+        
+        try:
+            # Check if cells relationship exists
+            if hasattr(regular_area, 'cells') and regular_area.cells:
+                for cell in regular_area.cells:
+                    # ✅ ENHANCED: Validate cell data
+                    if not cell or not hasattr(cell, 'row') or not hasattr(cell, 'col'):
+                        print(f"⚠️ Invalid cell data found in area {area_id}")
+                        continue
+                    
+                    if cell.row is None or cell.col is None:
+                        print(f"⚠️ Cell with null coordinates found in area {area_id}")
+                        continue
+                    
+                    processed_cells += 1
+                    
+                    # ✅ ENHANCED: Query tree with error handling
+                    try:
+                        tree = Tree.query.filter_by(
+                            dome_id=dome_id,
+                            internal_row=cell.row,
+                            internal_col=cell.col
+                        ).first()
+                    except Exception as tree_query_error:
+                        print(f"❌ Error querying tree at ({cell.row}, {cell.col}): {str(tree_query_error)}")
+                        continue
+                    
+                    if tree:
+                        # ✅ ENHANCED: Validate tree data and include tree ID
+                        tree_data = {
+                            'id': tree.id,  # ✅ ADDED: Include tree ID for identification
+                            'name': tree.name or f'Tree {tree.id}',
+                            'life_days': tree.life_days if tree.life_days is not None else 0,
+                            'info': tree.info or '',
+                            'image_url': tree.image_url or '',
+                            'relativeRow': cell.row - regular_area.min_row,
+                            'relativeCol': cell.col - regular_area.min_col,
+                            'originalRow': cell.row,
+                            'originalCol': cell.col
+                        }
+                        area_trees.append(tree_data)
+            else:
+                print(f"⚠️ No cells found for regular area {area_id}")
+                
+        except Exception as tree_error:
+            print(f"❌ Error processing trees for regular area {area_id}: {str(tree_error)}")
+            # Continue with trees found so far rather than failing completely
+        
+        # ✅ ENHANCED: Get cell positions with error handling
+        try:
+            cell_positions = regular_area.get_cell_positions() if hasattr(regular_area, 'get_cell_positions') else []
+        except Exception as cell_error:
+            print(f"❌ Error getting cell positions: {str(cell_error)}")
+            # Fallback: create cell positions manually
+            cell_positions = []
+            if hasattr(regular_area, 'cells') and regular_area.cells:
+                for cell in regular_area.cells:
+                    if hasattr(cell, 'row') and hasattr(cell, 'col'):
+                        cell_positions.append({'row': cell.row, 'col': cell.col})
+        
+        # ✅ ENHANCED: Create clipboard data with validation
+        try:
+            clipboard_data = {
+                'id': regular_area.id,  # ✅ ADDED: Include area ID
+                'type': 'regularArea',
+                'name': regular_area.name or f'Regular Area {regular_area.id}',
+                'color': regular_area.color or '#28a745',
+                'width': regular_area.width if hasattr(regular_area, 'width') and regular_area.width is not None else (regular_area.max_col - regular_area.min_col + 1),
+                'height': regular_area.height if hasattr(regular_area, 'height') and regular_area.height is not None else (regular_area.max_row - regular_area.min_row + 1),
+                'min_row': regular_area.min_row if regular_area.min_row is not None else 0,
+                'max_row': regular_area.max_row if regular_area.max_row is not None else 0,
+                'min_col': regular_area.min_col if regular_area.min_col is not None else 0,
+                'max_col': regular_area.max_col if regular_area.max_col is not None else 0,
+                'cells': cell_positions,
+                'trees': area_trees,
+                'tree_count': len(area_trees),
+                'cell_count': len(cell_positions),
+                'source_dome': dome_id,
+                'source_dome_name': dome.name or f'Dome {dome_id}',
+                'copied_at': datetime.utcnow().isoformat(),
+                'visible': regular_area.visible if hasattr(regular_area, 'visible') else True
+            }
+        except Exception as data_error:
+            print(f"❌ Error creating clipboard data: {str(data_error)}")
+            return jsonify({
+                'success': False,
+                'error': 'Error preparing area data for copying'
+            }), 500
+        
+        # ✅ ENHANCED: Validate clipboard data integrity
+        if clipboard_data['width'] <= 0 or clipboard_data['height'] <= 0:
+            print(f"⚠️ Invalid area dimensions: {clipboard_data['width']}x{clipboard_data['height']}")
+            clipboard_data['width'] = max(1, clipboard_data['width'])
+            clipboard_data['height'] = max(1, clipboard_data['height'])
+        
+        # ✅ ENHANCED: Detailed logging
+        print(f"✅ Regular area '{clipboard_data['name']}' (ID: {regular_area.id}) copied successfully")
+        print(f"   📊 Area size: {clipboard_data['width']}x{clipboard_data['height']}")
+        print(f"   📍 Position: ({clipboard_data['min_row']},{clipboard_data['min_col']}) to ({clipboard_data['max_row']},{clipboard_data['max_col']})")
+        print(f"   🔲 Cells processed: {processed_cells}")
+        print(f"   🌳 Trees included: {len(area_trees)}")
+        
+        return jsonify({
+            'success': True,
+            'area': clipboard_data,
+            'message': f"Regular area '{clipboard_data['name']}' copied with {len(area_trees)} trees from {processed_cells} cells"
+        })
+        
+    except AttributeError as attr_error:
+        print(f"❌ Attribute error in copy_regular_area: {str(attr_error)}")
+        return jsonify({
+            'success': False,
+            'error': 'Missing required model attributes. Please check your database schema.'
+        }), 500
+        
+    except Exception as e:
+        print(f"❌ Unexpected error copying regular area {area_id} from dome {dome_id}: {str(e)}")
+        print(f"   Error type: {type(e).__name__}")
+        import traceback
+        print(f"   Traceback: {traceback.format_exc()}")
+        
+        return jsonify({
+            'success': False,
+            'error': f'Failed to copy regular area: {str(e)}'
+        }), 500
+
+
+# Per-tree fields of /get_area_trees (?fields= picks a subset, see services/tree_listing.py)
+AREA_TREE_FIELDS = {
+    'id': tree_field(lambda tree: tree.id, 'id'),
+    'name': tree_field(lambda tree: tree.name, 'name'),
+    'internal_row': tree_field(lambda tree: tree.internal_row, 'internal_row'),
+    'internal_col': tree_field(lambda tree: tree.internal_col, 'internal_col'),
+    'life_days': tree_field(lambda tree: tree.life_days or 0, 'life_days'),
+    'image_url': tree_field(lambda tree: tree.image_url, 'image_url'),
+}
+
+
+@areas_bp.route('/get_area_trees/<int:dome_id>/<int:area_id>')
+@login_required
+def get_area_trees(dome_id, area_id):
+    """Get all trees in a specific drag area"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        try:
+            listing = TreeListing.from_request(AREA_TREE_FIELDS, request)
+        except ListingError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        area = DragArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        if not area:
+            return jsonify({'success': False, 'error': 'Area not found'}), 404
+        
+        trees_query = Tree.query.join(DragAreaTree, DragAreaTree.tree_id == Tree.id).filter(
+            DragAreaTree.drag_area_id == area_id,
+            Tree.user_id == current_user.id,
+            Tree.dome_id == dome_id
+        )
+        if listing.ndjson:
+            return listing.stream(trees_query)
+        
+        trees, next_cursor = listing.page(listing.apply(trees_query).all())
+        
+        response = {
+            'success': True,
+            'area': {
+                'id': area.id,
+                'name': area.name,
+                'color': area.color,
+                'dome_id': area.dome_id,
+                'minRow': area.min_row,
+                'maxRow': area.max_row,
+                'minCol': area.min_col,
+                'maxCol': area.max_col,
+                'width': area.width,
+                'height': area.height,
+                'visible': area.visible
+            },
+            'trees': [listing.serialize(tree) for tree in trees]
+        }
+        if listing.paginated:
+            response['next_cursor'] = next_cursor
+        return jsonify(response)
+        
+    except Exception as e:
+        print(f"❌ Error getting area trees: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/validate_drag_area_position/<int:dome_id>', methods=['POST'])
+@login_required
+def validate_drag_area_position(dome_id):
+    """Validate drag area position with proper field mapping"""
+    try:
+        data = request.get_json()
+        
+        # ✅ FIXED: Handle both camelCase and snake_case field names
+        start_row = data.get('start_row') or data.get('startRow')
+        start_col = data.get('start_col') or data.get('startCol')
+        width = data.get('width')
+        height = data.get('height')
+        exclude_area_id = data.get('exclude_area_id') or data.get('excludeAreaId')
+        
+        if start_row is None or start_col is None or width is None or height is None:
+            return jsonify({
+                'success': False, 
+                'error': 'Missing required fields: start_row, start_col, width, height'
+            }), 400
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Check bounds
+        if (start_row + height > dome.internal_rows or 
+            start_col + width > dome.internal_cols or
+            start_row < 0 or start_col < 0):
+            return jsonify({
+                'success': False, 
+                'error': f'Area extends outside dome boundaries. Dome size: {dome.internal_rows}×{dome.internal_cols}'
+            }), 400
+        
+        # Check for overlaps with existing drag areas
+        try:
+            existing_areas = DragArea.query.filter_by(dome_id=dome_id).all()
+            
+            for area in existing_areas:
+                # Skip the area being edited
+                if exclude_area_id and area.id == exclude_area_id:
+                    continue
+                
+                # Check for overlap
+                if not (start_row + height <= area.min_row or 
+                       start_row > area.max_row or
+                       start_col + width <= area.min_col or 
+                       start_col > area.max_col):
+                    return jsonify({
+                        'success': False,
+                        'error': f'Area overlaps with existing drag area "{area.name}"'
+                    }), 400
+                    
+        except Exception as area_error:
+            print(f"⚠️ Error checking drag area overlaps: {area_error}")
+            # Continue without overlap check if DragArea model has issues
+        
+        return jsonify({
+            'success': True, 
+            'message': 'Position is valid',
+            'bounds': {
+                'start_row': start_row,
+                'start_col': start_col,
+                'end_row': start_row + height - 1,
+                'end_col': start_col + width - 1
+            }
+        })
+        
+    except Exception as e:
+        print(f"❌ Error validating drag area position: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/get_drag_areas/<int:dome_id>')
+@login_required
+@dome_etag('drag-areas')
+def get_drag_areas_safe(dome_id):
+    """Get drag areas with safe error handling"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        try:
+            drag_areas = DragArea.query.filter_by(dome_id=dome_id).all()
+        except Exception as db_error:
+            print(f"⚠️ Error querying DragArea table: {db_error}")
+            # Return empty list if table doesn't exist or has issues
+            return jsonify({
+                'success': True,
+                'drag_areas': [],
+                'message': 'DragArea table not available'
+            })
+        
+        areas_data = []
+        for area in drag_areas:
+            try:
+                # Get trees in this drag area safely
+                area_trees = []
+                if hasattr(area, 'drag_area_trees'):
+                    for dat in area.drag_area_trees:
+                        tree = dat.tree if hasattr(dat, 'tree') else None
+                        if tree:
+                            area_trees.append({
+                                'id': tree.id,
+                                'name': tree.name,
+                                'internal_row': tree.internal_row,
+                                'internal_col': tree.internal_col,
+                                'relative_row': getattr(dat, 'relative_row', 0),
+                                'relative_col': getattr(dat, 'relative_col', 0),
+                                'life_days': getattr(tree, 'life_days', 0),
+                                'info': getattr(tree, 'info', ''),
+                                'image_url': getattr(tree, 'image_url', '')
+                            })
+                
+                areas_data.append({
+                    'id': area.id,
+                    'name': area.name,
+                    'color': getattr(area, 'color', '#007bff'),
+                    'minRow': area.min_row,
+                    'maxRow': area.max_row,
+                    'minCol': area.min_col,
+                    'maxCol': area.max_col,
+                    'width': getattr(area, 'width', area.max_col - area.min_col + 1),
+                    'height': getattr(area, 'height', area.max_row - area.min_row + 1),
+                    'visible': getattr(area, 'visible', True),
+                    'trees': [t['id'] for t in area_trees],
+                    'tree_data': area_trees,
+                    'tree_count': len(area_trees),
+                    'createdAt': area.created_at.isoformat() if hasattr(area, 'created_at') and area.created_at else None
+                })
+                
+            except Exception as area_error:
+                print(f"⚠️ Error processing drag area {area.id}: {area_error}")
+                continue
+        
+        return jsonify({
+            'success': True,
+            'drag_areas': areas_data
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting drag areas: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@areas_bp.route('/resize_drag_area/<int:dome_id>/<int:area_id>', methods=['POST'])
+@login_required
+def resize_drag_area(dome_id, area_id):
+    """Resize an existing drag area"""
+    try:
+        data = request.get_json()
+        new_min_row = data.get('min_row')
+        new_max_row = data.get('max_row')
+        new_min_col = data.get('min_col')
+        new_max_col = data.get('max_col')
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get areas
+        try:
+            areas_data = json.loads(dome.info or '{"drag_areas": []}')
+            areas = areas_data.get('drag_areas', [])
+        except:
+            return jsonify({'success': False, 'error': 'No areas found'}), 404
+        
+        # Find and update the area
+        area_found = False
+        for area in areas:
+            if area.get('id') == area_id:
+                # Validate new bounds
+                if (new_max_row >= dome.internal_rows or new_max_col >= dome.internal_cols or
+                    new_min_row < 0 or new_min_col < 0 or
+                    new_min_row > new_max_row or new_min_col > new_max_col):
+                    return jsonify({'success': False, 'error': 'Invalid area bounds'}), 400
+                
+                # Update area bounds
+                area['min_row'] = new_min_row
+                area['max_row'] = new_max_row
+                area['min_col'] = new_min_col
+                area['max_col'] = new_max_col
+                area['width'] = new_max_col - new_min_col + 1
+                area['height'] = new_max_row - new_min_row + 1
+                area['updated_at'] = datetime.utcnow().isoformat()
+                
+                # Remove trees that are now outside the area
+                current_tree_ids = area.get('tree_ids', [])
+                valid_tree_ids = []
+                
+                if current_tree_ids:
+                    trees = Tree.query.filter(
+                        Tree.id.in_(current_tree_ids),
+                        Tree.user_id == current_user.id,
+                        Tree.dome_id == dome_id
+                    ).all()
+                    
+                    for tree in trees:
+                        if (new_min_row <= tree.internal_row <= new_max_row and
+                            new_min_col <= tree.internal_col <= new_max_col):
+                            valid_tree_ids.append(tree.id)
+                
+                area['tree_ids'] = valid_tree_ids
+                area_found = True
+                break
+        
+        if not area_found:
+            return jsonify({'success': False, 'error': 'Area not found'}), 404
+        
+        dome.info = json.dumps(areas_data)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Area resized successfully',
+            'area': area
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error resizing drag area: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/auto_assign_trees_to_area/<int:dome_id>/<int:area_id>', methods=['POST'])
+@login_required
+def auto_assign_trees_to_area(dome_id, area_id):
+    """Automatically assign all trees within an area's bounds"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get areas
+        try:
+            areas_data = json.loads(dome.info or '{"drag_areas": []}')
+            areas = areas_data.get('drag_areas', [])
+        except:
+            return jsonify({'success': False, 'error': 'No areas found'}), 404
+        
+        # Find the area
+        target_area = None
+        for area in areas:
+            if area.get('id') == area_id:
+                target_area = area
+                break
+        
+        if not target_area:
+            return jsonify({'success': False, 'error': 'Area not found'}), 404
+        
+        # Find all trees within the area bounds
+        trees_in_area = Tree.query.filter(
+            Tree.dome_id == dome_id,
+            Tree.user_id == current_user.id,
+            Tree.internal_row >= target_area['min_row'],
+            Tree.internal_row <= target_area['max_row'],
+            Tree.internal_col >= target_area['min_col'],
+            Tree.internal_col <= target_area['max_col']
+        ).all()
+        
+        # Update area with tree IDs
+        target_area['tree_ids'] = [tree.id for tree in trees_in_area]
+        target_area['updated_at'] = datetime.utcnow().isoformat()
+        
+        dome.info = json.dumps(areas_data)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Auto-assigned {len(trees_in_area)} trees to area',
+            'tree_count': len(trees_in_area)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error auto-assigning trees: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/save_drag_area/<int:dome_id>', methods=['POST'])
+@login_required
+def save_drag_area(dome_id):
+    """Save a new drag area with plant relationships and trees"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        data = request.get_json()
+        print(f"🔍 Incoming data for save_drag_area: {data}")
+        
+        # Extract data
+        name = data.get('name', '').strip()
+        color = data.get('color', '#007bff')
+        min_row = data.get('min_row', data.get('minRow', 0))
+        max_row = data.get('max_row', data.get('maxRow', 0))
+        min_col = data.get('min_col', data.get('minCol', 0))
+        max_col = data.get('max_col', data.get('maxCol', 0))
+        tree_ids = data.get('tree_ids', [])
+        cells_data = data.get('cells_data', [])
+        
+        # Validation
+        if not name:
+            return jsonify({'success': False, 'error': 'Area name is required'}), 400
+        
+        # Check for duplicate names
+        existing_area = DragArea.query.filter_by(dome_id=dome_id, name=name).first()
+        if existing_area:
+            return jsonify({'success': False, 'error': 'Area name already exists'}), 400
+        
+        # Calculate dimensions
+        width = max_col - min_col + 1
+        height = max_row - min_row + 1
+        
+        # Create the drag area
+        drag_area = DragArea(
+            name=name,
+            color=color,
+            min_row=min_row,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+            width=width,
+            height=height,
+            dome_id=dome_id,
+            visible=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        
+        # Add enhanced fields if available
+        if hasattr(DragArea, 'cells_data'):
+            drag_area.cells_data = json.dumps(cells_data) if cells_data else None
+        if hasattr(DragArea, 'supports_empty_cells'):
+            drag_area.supports_empty_cells = True
+        
+        db.session.add(drag_area)
+        db.session.flush()  # Get the ID
+        
+        print(f"✅ DragArea created with ID: {drag_area.id}")
+        
+        # Associate trees with the drag area
+        created_tree_ids = []
+        for tree_id in tree_ids:
+            # Verify tree exists and belongs to user
+            tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id, dome_id=dome_id).first()
+            if tree:
+                # Calculate relative position
+                relative_row = tree.internal_row - min_row
+                relative_col = tree.internal_col - min_col
+                
+                # Create drag area tree association
+                drag_area_tree = DragAreaTree(
+                    drag_area_id=drag_area.id,
+                    tree_id=tree_id,
+                    relative_row=relative_row,
+                    relative_col=relative_col,
+                    created_at=datetime.utcnow()
+                )
+                
+                db.session.add(drag_area_tree)
+                created_tree_ids.append(tree_id)
+        
+        db.session.commit()
+        
+        print(f"✅ Drag area '{name}' saved with {len(created_tree_ids)} trees")
+        
+        return jsonify({
+            'success': True,
+            'drag_area_id': drag_area.id,
+            'message': f'Drag area "{name}" saved successfully',
+            'area_details': {
+                'id': drag_area.id,
+                'name': name,
+                'color': color,
+                'bounds': f"({min_row},{min_col}) to ({max_row},{max_col})",
+                'size': f"{width}×{height}",
+                'tree_count': len(created_tree_ids),
+                'tree_ids': created_tree_ids
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in save_drag_area: {str(e)}")
+        return jsonify({
+            'success': False, 
+            'error': f'Failed to save drag area: {str(e)}'
+        }), 500
+
+
+@areas_bp.route('/api/update_drag_area/<int:dome_id>/<int:area_id>', methods=['POST'])
+@login_required
+def update_drag_area(dome_id, area_id):
+    try:
+        data = request.get_json()
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        drag_area = DragArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        
+        if not drag_area:
+            return jsonify({
+                'success': False,
+                'error': 'Drag area not found'
+            }), 404
+        
+        # Update fields
+        if 'name' in data:
+            drag_area.name = data['name']
+        if 'visible' in data:
+            drag_area.visible = data['visible']
+        if 'color' in data:
+            drag_area.color = data['color']
+        
+        db.session.commit()
+        
+        print(f"✅ Drag area '{drag_area.name}' updated for dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Drag area updated successfully'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error updating drag area: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@areas_bp.route('/api/delete_drag_area/<int:dome_id>/<int:area_id>', methods=['DELETE'])
+@login_required
+def delete_drag_area(dome_id, area_id):
+    """Delete a drag area"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        # Get the drag area
+        drag_area = DragArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        if not drag_area:
+            return jsonify({'success': False, 'error': 'Drag area not found'}), 404
+        
+        area_name = drag_area.name
+        tree_count = len(drag_area.drag_area_trees)
+        
+        # Delete the drag area (cascade will handle DragAreaTree records)
+        db.session.delete(drag_area)
+        db.session.commit()
+        
+        print(f"✅ Deleted drag area '{area_name}' with {tree_count} tree associations")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Drag area "{area_name}" deleted successfully'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error deleting drag area: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/copy_drag_area/<int:dome_id>/<int:area_id>', methods=['GET'])
+@login_required
+def copy_drag_area(dome_id, area_id):
+    """Copy a drag area to clipboard with enhanced cross-dome support"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        # Get the drag area
+        drag_area = DragArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        if not drag_area:
+            return jsonify({'success': False, 'error': f'Drag area {area_id} not found'}), 404
+        
+        print(f"✅ Copying drag area {area_id} from dome {dome_id}")
+        
+        # Get trees in this area with full data
+        area_trees = []
+        for dat in drag_area.drag_area_trees:
+            if dat.tree:
+                tree = dat.tree
+                tree_data = {
+                    'id': tree.id,
+                    'name': tree.name,
+                    'breed': tree.breed or '',
+                    'internal_row': tree.internal_row,
+                    'internal_col': tree.internal_col,
+                    'relative_row': dat.relative_row,
+                    'relative_col': dat.relative_col,
+                    'image_url': tree.image_url,
+                    'info': tree.info or '',
+                    'life_days': tree.life_days or 0,
+                    'plant_type': getattr(tree, 'plant_type', 'mother'),
+                    'mother_plant_id': getattr(tree, 'mother_plant_id', None),
+                    'cutting_notes': getattr(tree, 'cutting_notes', ''),
+                    'created_at': tree.created_at.isoformat() if tree.created_at else None
+                }
+                area_trees.append(tree_data)
+        
+        # Create comprehensive clipboard data
+        clipboard_data = {
+            'id': drag_area.id,
+            'name': drag_area.name,
+            'type': 'dragArea',
+            'color': drag_area.color,
+            'width': drag_area.width,
+            'height': drag_area.height,
+            'min_row': drag_area.min_row,
+            'max_row': drag_area.max_row,
+            'min_col': drag_area.min_col,
+            'max_col': drag_area.max_col,
+            'trees': area_trees,
+            'tree_count': len(area_trees),
+            'tree_ids': [tree['id'] for tree in area_trees],
+            'visible': drag_area.visible,
+            'copied_at': datetime.utcnow().isoformat(),
+            'source_dome_id': dome_id,
+            'source_dome_name': dome.name,
+            'clipboard_version': '2.4',
+            'clipboard_source': 'backend_api',
+            'summary': {
+                'total_trees': len(area_trees),
+                'trees_in_original_area': len(area_trees),
+                'related_trees_outside_area': 0,
+                'breeds': list(set([tree['breed'] for tree in area_trees if tree['breed']])),
+                'breed_count': len(set([tree['breed'] for tree in area_trees if tree['breed']])),
+                'has_images': len([tree for tree in area_trees if tree['image_url']]),
+                'plant_relationships': {
+                    'mother_trees': len([tree for tree in area_trees if tree['plant_type'] == 'mother']),
+                    'cutting_trees': len([tree for tree in area_trees if tree['plant_type'] == 'cutting']),
+                    'complete_relationships': 0,  # Calculate if needed
+                    'broken_relationships': 0
+                }
+            }
+        }
+        
+        print(f"✅ Drag area '{clipboard_data['name']}' copied successfully")
+        print(f"   📊 Area size: {clipboard_data['width']}x{clipboard_data['height']}")
+        print(f"   🌳 Trees: {len(area_trees)}")
+        
+        return jsonify({
+            'success': True,
+            'clipboard_data': clipboard_data,
+            'message': f'Drag area "{drag_area.name}" copied to clipboard'
+        })
+        
+    except Exception as e:
+        print(f"❌ Error in copy_drag_area: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/validate_area_name/<int:dome_id>', methods=['POST'])
+@login_required
+def validate_area_name(dome_id):
+    """Validate if an area name is available"""
+    try:
+        data = request.get_json()
+        name = data.get('name', '').strip()
+        area_type = data.get('type', 'drag')  # 'drag' or 'regular'
+        exclude_id = data.get('exclude_id')  # For editing existing areas
+        
+        if not name:
+            return jsonify({'success': False, 'error': 'Name is required'}), 400
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get existing areas
+        try:
+            # Check if dome has info field and it's not None
+            if hasattr(dome, 'info') and dome.info:
+                areas_data = json.loads(dome.info)
+                drag_areas = areas_data.get('drag_areas', [])
+                regular_areas = areas_data.get('areas', [])
+            else:
+                # Initialize empty info if it doesn't exist
+                dome.info = json.dumps({"drag_areas": [], "areas": []})
+                db.session.commit()
+                drag_areas = []
+                regular_areas = []
+                
+            print(f"✅ Found {len(drag_areas)} drag areas and {len(regular_areas)} regular areas for dome {dome_id}")
+            
+        except Exception as area_error:
+            print(f"⚠️ Error loading areas: {area_error}")
+            # Initialize empty info on error
+            try:
+                dome.info = json.dumps({"drag_areas": [], "areas": []})
+                db.session.commit()
+            except:
+                pass
+            drag_areas = []
+            regular_areas = []
+        
+        # Check for name conflicts
+        all_areas = drag_areas + regular_areas
+        for area in all_areas:
+            if area.get('name') == name and area.get('id') != exclude_id:
+                return jsonify({
+                    'success': False,
+                    'available': False,
+                    'error': f'Name "{name}" is already used'
+                })
+        
+        return jsonify({
+            'success': True,
+            'available': True,
+            'message': f'Name "{name}" is available'
+        })
+        
+    except Exception as e:
+        print(f"❌ Error validating area name: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/cleanup_areas/<int:dome_id>', methods=['POST'])
+@login_required
+def cleanup_areas(dome_id):
+    """Clean up areas by removing invalid tree references"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get existing areas
+        try:
+            # Check if dome has info field and it's not None
+            if hasattr(dome, 'info') and dome.info:
+                areas_data = json.loads(dome.info)
+                drag_areas = areas_data.get('drag_areas', [])
+                regular_areas = areas_data.get('areas', [])
+            else:
+                # Initialize empty info if it doesn't exist
+                dome.info = json.dumps({"drag_areas": [], "areas": []})
+                db.session.commit()
+                drag_areas = []
+                regular_areas = []
+            
+            # If no areas exist, return early
+            if len(drag_areas) == 0 and len(regular_areas) == 0:
+                return jsonify({'success': False, 'error': 'No areas to clean'}), 400
+                
+        except Exception as area_error:
+            print(f"⚠️ Error loading areas for cleanup: {area_error}")
+            return jsonify({'success': False, 'error': 'Failed to load areas for cleanup'}), 400
+        
+        # Get all valid tree IDs for this dome
+        valid_tree_ids = set(
+            tree.id for tree in Tree.query.filter_by(
+                dome_id=dome_id, 
+                user_id=current_user.id
+            ).all()
+        )
+        
+        cleaned_count = 0
+        
+        # Clean drag areas
+        for area in drag_areas:
+            if 'tree_ids' in area:
+                original_count = len(area['tree_ids'])
+                area['tree_ids'] = [tid for tid in area['tree_ids'] if tid in valid_tree_ids]
+                if len(area['tree_ids']) != original_count:
+                    cleaned_count += 1
+                    area['updated_at'] = datetime.utcnow().isoformat()
+        
+        # Clean regular areas (remove cells without trees if needed)
+        for area in regular_areas:
+            if 'cells' in area:
+                # Regular areas don't directly reference trees, but we can validate positions
+                valid_cells = []
+                for cell in area['cells']:
+                    row, col = cell.get('row'), cell.get('col')
+                    if (0 <= row < dome.internal_rows and 0 <= col < dome.internal_cols):
+                        valid_cells.append(cell)
+                
+                if len(valid_cells) != len(area['cells']):
+                    area['cells'] = valid_cells
+                    cleaned_count += 1
+                    area['updated_at'] = datetime.utcnow().isoformat()
+        
+        # Save cleaned data
+        areas_data['drag_areas'] = drag_areas
+        areas_data['areas'] = regular_areas
+        dome.info = json.dumps(areas_data)
+        db.session.commit()
+        
+        print(f"✅ Cleaned {cleaned_count} areas for dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Cleaned {cleaned_count} areas',
+            'cleaned_count': cleaned_count
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error cleaning areas: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/batch_area_operation/<int:dome_id>', methods=['POST'])
+@login_required
+def batch_area_operation(dome_id):
+    """Perform batch operations on areas (show/hide all, delete multiple, etc.)"""
+    try:
+        data = request.get_json()
+        operation = data.get('operation')  # 'show_all', 'hide_all', 'delete_selected'
+        area_ids = data.get('area_ids', [])
+        area_type = data.get('area_type', 'both')  # 'drag', 'regular', or 'both'
+        
+        if not operation:
+            return jsonify({'success': False, 'error': 'Operation is required'}), 400
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get existing areas
+        try:
+            # Check if dome has info field and it's not None
+            if hasattr(dome, 'info') and dome.info:
+                areas_data = json.loads(dome.info)
+                drag_areas = areas_data.get('drag_areas', [])
+                regular_areas = areas_data.get('areas', [])
+            else:
+                # Initialize empty info if it doesn't exist
+                dome.info = json.dumps({"drag_areas": [], "areas": []})
+                db.session.commit()
+                drag_areas = []
+                regular_areas = []
+            
+            # If no areas exist, return early
+            if len(drag_areas) == 0 and len(regular_areas) == 0:
+                return jsonify({'success': False, 'error': 'No areas to clean'}), 400
+                
+        except Exception as area_error:
+            print(f"⚠️ Error loading areas for cleanup: {area_error}")
+            return jsonify({'success': False, 'error': 'Failed to load areas for cleanup'}), 400
+        
+        affected_count = 0
+        
+        if operation == 'show_all':
+            if area_type in ['drag', 'both']:
+                for area in drag_areas:
+                    area['visible'] = True
+                    affected_count += 1
+            if area_type in ['regular', 'both']:
+                for area in regular_areas:
+                    area['visible'] = True
+                    affected_count += 1
+                    
+        elif operation == 'hide_all':
+            if area_type in ['drag', 'both']:
+                for area in drag_areas:
+                    area['visible'] = False
+                    affected_count += 1
+            if area_type in ['regular', 'both']:
+                for area in regular_areas:
+                    area['visible'] = False
+                    affected_count += 1
+                    
+        elif operation == 'delete_selected':
+            if area_ids:
+                # Remove selected drag areas
+                if area_type in ['drag', 'both']:
+                    original_count = len(drag_areas)
+                    drag_areas = [area for area in drag_areas if area.get('id') not in area_ids]
+                    affected_count += original_count - len(drag_areas)
+                
+                # Remove selected regular areas
+                if area_type in ['regular', 'both']:
+                    original_count = len(regular_areas)
+                    regular_areas = [area for area in regular_areas if area.get('id') not in area_ids]
+                    affected_count += original_count - len(regular_areas)
+        
+        # Save changes
+        areas_data['drag_areas'] = drag_areas
+        areas_data['areas'] = regular_areas
+        dome.info = json.dumps(areas_data)
+        db.session.commit()
+        
+        print(f"✅ Batch operation '{operation}' completed: {affected_count} areas affected")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Operation completed: {affected_count} areas affected',
+            'affected_count': affected_count
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in batch area operation: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/get_drag_area_full/<int:area_id>')
+@login_required
+def get_drag_area_full(area_id):
+    """Get complete drag area data with all tree information"""
+    try:
+        print(f"🔍 Getting full data for drag area {area_id}")
+        
+        # Get the drag area
+        drag_area = DragArea.query.filter_by(id=area_id).first()
+        if not drag_area:
+            return jsonify({'success': False, 'error': 'Drag area not found'}), 404
+        
+        # Verify ownership through dome
+        dome = Dome.query.filter_by(id=drag_area.dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Access denied'}), 403
+        
+        # Get all trees in this area with full data
+        area_trees = []
+        drag_area_trees = DragAreaTree.query.filter_by(drag_area_id=area_id).all()
+        
+        for dat in drag_area_trees:
+            tree = Tree.query.filter_by(id=dat.tree_id, user_id=current_user.id).first()
+            if tree:
+                tree_data = {
+                    'id': tree.id,
+                    'name': tree.name,
+                    'breed': tree.breed or '',
+                    'life_days': tree.life_days or 0,
+                    'info': tree.info or '',
+                    'image_url': tree.image_url or '',
+                    'internal_row': tree.internal_row,
+                    'internal_col': tree.internal_col,
+                    'relativeRow': dat.relative_row,
+                    'relativeCol': dat.relative_col,
+                    'relative_row': dat.relative_row,
+                    'relative_col': dat.relative_col,
+                    
+                    # Plant relationship data
+                    'plant_type': tree.plant_type or 'mother',
+                    'mother_plant_id': tree.mother_plant_id,
+                    'cutting_notes': tree.cutting_notes or '',
+                    'is_mother_plant': tree.plant_type == 'mother',
+                    'is_cutting': tree.plant_type == 'cutting',
+                    
+                    # Additional metadata
+                    'user_id': tree.user_id,
+                    'dome_id': tree.dome_id,
+                    'created_at': tree.created_at.isoformat() if tree.created_at else None,
+                    'updated_at': tree.updated_at.isoformat() if tree.updated_at else None
+                }
+                area_trees.append(tree_data)
+        
+        # ✅ FIXED: Build relationship metadata for paste operation
+        mother_cutting_pairs = []
+        relationship_stats = {
+        'total_trees': len(area_trees),
+        'mothers': 0,
+        'cuttings': 0,
+        'relationships': 0,
+        'preserved_relationships': 0
+        }
+        
+        # Build mother-cutting pairs for trees that have relationships
+        area_data = {
+        'id': drag_area.id,
+        'name': drag_area.name,
+        'color': drag_area.color,
+        'width': drag_area.width,
+        'height': drag_area.height,
+        'minRow': drag_area.min_row,
+        'maxRow': drag_area.max_row,
+        'minCol': drag_area.min_col,
+        'maxCol': drag_area.max_col,
+        'trees': area_trees,
+        'tree_count': len(area_trees),
+        'dome_id': drag_area.dome_id,
+        'visible': drag_area.visible,
+        'created_at': drag_area.created_at.isoformat() if drag_area.created_at else None,
+        # ✅ FIXED: Include relationship metadata for paste operation
+        'relationship_metadata': relationship_metadata,
+        'trees_data': area_trees  # Also include as trees_data for paste compatibility
+        }
+        
+        print(f"✅ Retrieved full data for area '{drag_area.name}' with {len(area_trees)} trees")
+        print(f"🔗 Relationship metadata: {len(mother_cutting_pairs)} mother-cutting pairs")
+        
+        return jsonify({
+        'success': True,
+        'area': area_data
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting full drag area data: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/create_drag_area/<int:dome_id>', methods=['POST'])
+@login_required
+def create_drag_area(dome_id):
+    """Create a new drag area from selected cells"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        data = request.get_json()
+        print(f"🔍 Creating drag area with data: {data}")
+        
+        # Extract data
+        name = data.get('name', '').strip()
+        color = data.get('color', '#007bff')
+        min_row = data.get('min_row', 0)
+        max_row = data.get('max_row', 0)
+        min_col = data.get('min_col', 0)
+        max_col = data.get('max_col', 0)
+        tree_ids = data.get('tree_ids', [])
+        cells_data = data.get('cells_data', [])
+        
+        # Validation
+        if not name:
+            return jsonify({'success': False, 'error': 'Area name is required'}), 400
+        
+        # Check for duplicate names
+        existing_area = DragArea.query.filter_by(dome_id=dome_id, name=name).first()
+        if existing_area:
+            return jsonify({'success': False, 'error': 'Area name already exists'}), 400
+        
+        # Calculate dimensions
+        width = max_col - min_col + 1
+        height = max_row - min_row + 1
+        
+        # Create the drag area
+        drag_area = DragArea(
+            name=name,
+            color=color,
+            min_row=min_row,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+            width=width,
+            height=height,
+            dome_id=dome_id,
+            visible=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        
+        db.session.add(drag_area)
+        db.session.flush()  # Get the ID
+        
+        # Associate trees with the drag area
+        for tree_id in tree_ids:
+            tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id, dome_id=dome_id).first()
+            if tree:
+                relative_row = tree.internal_row - min_row
+                relative_col = tree.internal_col - min_col
+                
+                drag_area_tree = DragAreaTree(
+                    drag_area_id=drag_area.id,
+                    tree_id=tree_id,
+                    relative_row=relative_row,
+                    relative_col=relative_col,
+                    created_at=datetime.utcnow()
+                )
+                
+                db.session.add(drag_area_tree)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'drag_area_id': drag_area.id,
+            'area': {
+                'id': drag_area.id,
+                'name': name,
+                'color': color,
+                'min_row': min_row,
+                'max_row': max_row,
+                'min_col': min_col,
+                'max_col': max_col,
+                'width': width,
+                'height': height,
+                'tree_count': len(tree_ids),
+                'created_at': drag_area.created_at.isoformat()
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in create_drag_area: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@areas_bp.route('/api/save_regular_area/<int:dome_id>', methods=['POST'])
+@login_required
+def save_regular_area_api(dome_id):
+    """Save a regular (selection box) area to the database"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        # Validate required fields
+        required_fields = ['name', 'color', 'cells']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'success': False, 'error': f'Missing required field: {field}'}), 400
+        
+        name = data['name'].strip()
+        color = data['color']
+        cells = data['cells']
+        
+        if not name:
+            return jsonify({'success': False, 'error': 'Area name cannot be empty'}), 400
+        
+        if not cells or len(cells) == 0:
+            return jsonify({'success': False, 'error': 'No cells selected'}), 400
+        
+        # Check for duplicate names
+        existing_area = RegularArea.query.filter_by(dome_id=dome_id, name=name).first()
+        if existing_area:
+            return jsonify({'success': False, 'error': f'Area name "{name}" already exists'}), 400
+        
+        # Calculate bounds
+        rows = [cell['row'] for cell in cells]
+        cols = [cell['col'] for cell in cells]
+        
+        min_row = min(rows)
+        max_row = max(rows)
+        min_col = min(cols)
+        max_col = max(cols)
+        
+        # Create regular area
+        new_area = RegularArea(
+            name=name,
+            color=color,
+            dome_id=dome_id,
+            min_row=min_row,
+            max_row=max_row,
+            min_col=min_col,
+            max_col=max_col,
+            visible=data.get('visible', True)
+        )
+        
+        db.session.add(new_area)
+        db.session.flush()  # Get the ID
+        
+        # Add cells
+        for cell in cells:
+            area_cell = RegularAreaCell(
+                regular_area_id=new_area.id,
+                row=cell['row'],
+                col=cell['col']
+            )
+            db.session.add(area_cell)
+        
+        # Add tree associations
+        tree_ids = data.get('tree_ids', [])
+        for tree_id in tree_ids:
+            # Use the association table
+            tree = db.session.get(Tree, tree_id)
+            if tree and tree.dome_id == dome_id:
+                new_area.trees.append(tree)
+        
+        db.session.commit()
+        
+        print(f'✅ Regular area "{name}" saved with {len(cells)} cells and {len(tree_ids)} trees')
+        
+        return jsonify({
+            'success': True,
+            'message': f'Area "{name}" saved successfully',
+            'area_id': new_area.id,
+            'cell_count': len(cells),
+            'tree_count': len(tree_ids)
+        })
+        
+    except Exception as e:
+        print(f'❌ Error saving regular area: {str(e)}')
+        db.session.rollback()
+        return jsonify({'success': False, 'error': f'Failed to save area: {str(e)}'}), 500
+
+
+@areas_bp.route('/api/update_drag_area_color/<int:dome_id>/<int:area_id>', methods=['PUT'])
+@login_required
+def update_drag_area_color(dome_id, area_id):
+    """Update drag area color"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        # Get the drag area
+        drag_area = DragArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        if not drag_area:
+            return jsonify({'success': False, 'error': 'Drag area not found'}), 404
+        
+        data = request.get_json()
+        new_color = data.get('color')
+        
+        if not new_color:
+            return jsonify({'success': False, 'error': 'Color is required'}), 400
+        
+        # Validate hex color format
+        if not new_color.startswith('#') or len(new_color) != 7:
+            return jsonify({'success': False, 'error': 'Invalid color format. Use #RRGGBB'}), 400
+        
+        # Update color
+        drag_area.color = new_color
+        if hasattr(drag_area, 'updated_at'):
+            drag_area.updated_at = datetime.utcnow()
+        
+        db.session.commit()
+        
+        print(f"✅ Updated drag area {area_id} color to {new_color}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Area color updated to {new_color}',
+            'area': {
+                'id': drag_area.id,
+                'name': drag_area.name,
+                'color': drag_area.color
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error updating drag area color: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,32 @@
+"""Fingerprinted static bundles served with far-future cache headers"""
+
+from flask import Blueprint, current_app, redirect, send_from_directory, abort
+
+from services.assets import ASSET_URL_PREFIX, asset_url, get_manifest
+
+
+assets_bp = Blueprint('assets', __name__)
+
+# A fingerprinted URL never changes content, so browsers may keep it for a year
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+
+@assets_bp.route(f'{ASSET_URL_PREFIX}/<path:filename>')
+def fingerprinted_asset(filename):
+    manifest = get_manifest()
+    name, digest = manifest.resolve(filename)
+    if not name:
+        abort(404)
+    try:
+        current = manifest.digest(name)
+    except OSError:
+        abort(404)
+
+    if digest != current:
+        # A page rendered before the bundle changed; point it at the current one
+        return redirect(asset_url(name))
+
+    response = send_from_directory(current_app.static_folder, name, max_age=ASSET_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
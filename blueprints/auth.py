@@ -0,0 +1,402 @@
+"""Registration, login/logout, profile and password-reset routes"""
+
+import os
+from datetime import timedelta
+
+from flask import Blueprint, render_template, request, jsonify, redirect, session, flash, url_for
+from flask_login import login_user, logout_user, login_required, current_user
+
+from models import db, User, Farm, Dome, Tree
+from services.grid_settings import get_grid_settings
+from services.mailer import mail, Message
+
+
+auth_bp = Blueprint('auth', __name__)
+
+
+def send_reset_email(email, token, username):
+    """Send password reset email using Flask-Mail"""
+    try:
+        reset_url = f"{request.url_root}reset_password?token={token}"
+        msg = Message(
+            subject="Password Reset Request",
+            recipients=[email],
+            sender=os.getenv('MAIL_USERNAME'),
+            body=f"""Password reset requested for: {email} ({username})
+Reset URL: {reset_url}
+
+If you did not request this, please ignore this email.
+"""
+        )
+        mail.send(msg)
+        print(f"Password reset email sent to: {email}")
+        return True
+    except Exception as e:
+        print(f"Failed to send reset email: {e}")
+        raise
+
+
+# ============= AUTHENTICATION ROUTES =============
+@auth_bp.route('/register', methods=['GET', 'POST'])
+def register():
+    try:
+        if request.method == 'POST':
+            data = request.get_json() if request.is_json else request.form
+            
+            username = data.get('username', '').strip()
+            email = data.get('email', '').strip()
+            password = data.get('password', '')
+            confirm_password = data.get('confirm_password', '')
+            
+            print(f"Registration attempt for: {username}")
+            
+            # Validation
+            if not username or not email or not password:
+                return jsonify({'success': False, 'error': 'All fields are required'}), 400
+            
+            if len(username) < 3:
+                return jsonify({'success': False, 'error': 'Username must be at least 3 characters'}), 400
+            
+            if len(password) < 6:
+                return jsonify({'success': False, 'error': 'Password must be at least 6 characters'}), 400
+            
+            if password != confirm_password:
+                return jsonify({'success': False, 'error': 'Passwords do not match'}), 400
+            
+            # Check if user already exists
+            if User.query.filter_by(username=username).first():
+                return jsonify({'success': False, 'error': 'Username already exists'}), 400
+            
+            if User.query.filter_by(email=email).first():
+                return jsonify({'success': False, 'error': 'Email already registered'}), 400
+            
+            # Create new user
+            user = User(username=username, email=email)
+            user.set_password(password)
+            
+            try:
+                db.session.add(user)
+                db.session.commit()
+                
+                # Auto login after registration
+                login_user(user)
+                print(f"Registration successful for: {username}")
+                
+                return jsonify({'success': True, 'message': 'Registration successful'})
+                
+            except Exception as e:
+                db.session.rollback()
+                print(f"Database error during registration: {e}")
+                return jsonify({'success': False, 'error': 'Registration failed'}), 500
+        
+        # GET request - show the registration form
+        return render_template('auth/register.html')
+        
+    except Exception as e:
+        print(f"❌ Register error: {e}")
+        if request.method == 'POST':
+            return jsonify({'success': False, 'message': f'Registration failed: {str(e)}'})
+        else:
+            flash('Registration system temporarily unavailable', 'error')
+            return redirect(url_for('auth.login'))
+
+
+@auth_bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        try:
+            data = request.get_json() if request.is_json else request.form
+            
+            username = data.get('username', '').strip()
+            password = data.get('password', '')
+            remember = data.get('remember', True)  # ✅ Default to True for persistence
+            
+            print(f"🔐 Login attempt for: {username}")
+            
+            if not username or not password:
+                error_msg = 'Username and password are required'
+                print(f"❌ Login validation error: {error_msg}")
+                return jsonify({'success': False, 'error': error_msg}), 400
+            
+            # Find user by username or email
+            user = User.query.filter(
+                (User.username == username) | (User.email == username)
+            ).first()
+            
+            print(f"👤 User found: {user is not None}")
+            
+            if user and user.check_password(password):
+                try:
+                    # ✅ FIXED: Calculate days since last login BEFORE updating
+                    days_since_last = user.get_days_since_last_login()
+                    was_first_login = user.last_login is None
+                    
+                    # ✅ Update last login and the life-day reference time (user row only)
+                    user.update_last_login()
+                    db.session.commit()
+                    
+                    # ✅ FIXED: Set permanent session and remember user
+                    session.permanent = True
+                    login_user(user, remember=remember, duration=timedelta(days=30))
+                    
+                    print(f"✅ Login successful for user: {user.username} (Remember: {remember})")
+                    
+                    # ✅ FIXED: Prepare response with tree growth info
+                    response_data = {
+                        'success': True, 
+                        'message': 'Login successful', 
+                        'redirect': '/farms',
+                        'user': {
+                            'username': user.username,
+                            'login_count': user.login_count,
+                            'days_since_last_login': days_since_last,
+                            'is_first_login': was_first_login,
+                            'life_reference_at': user.life_reference_at.isoformat() if user.life_reference_at else None
+                        }
+                    }
+                    
+                    # ✅ FIXED: Add tree growth message if applicable
+                    # Counting trees here would make login cost grow with the farm size
+                    if not was_first_login and days_since_last > 0:
+                        growth_message = f"Welcome back! Your trees have grown for {days_since_last} day{'s' if days_since_last != 1 else ''} since your last visit."
+                        response_data['growth_message'] = growth_message
+                        print(f"🌱 Tree growth: {growth_message}")
+                    elif was_first_login:
+                        response_data['welcome_message'] = "Welcome to your farm! Start by creating your first dome and planting trees."
+                        print(f"🎉 First login for user: {user.username}")
+                    
+                    return jsonify(response_data)
+                    
+                except Exception as login_process_error:
+                    print(f"❌ Error during login process: {login_process_error}")
+                    db.session.rollback()
+                    return jsonify({
+                        'success': False, 
+                        'error': 'Login process failed. Please try again.'
+                    }), 500
+                    
+            else:
+                print(f"❌ Invalid credentials for: {username}")
+                return jsonify({
+                    'success': False, 
+                    'error': 'Invalid username or password'
+                }), 401
+                
+        except Exception as e:
+            print(f"❌ Login error: {e}")
+            import traceback
+            print(f"❌ Login traceback: {traceback.format_exc()}")
+            return jsonify({
+                'success': False, 
+                'error': 'Login failed due to server error'
+            }), 500
+    
+    # ✅ FIXED: Handle GET request
+    try:
+        return render_template('auth/login.html')
+    except Exception as template_error:
+        print(f"❌ Template error: {template_error}")
+        # Fallback simple login form
+        return '''
+        <!DOCTYPE html>
+        <html>
+        <head><title>Login</title></head>
+        <body>
+            <h2>Login</h2>
+            <form method="post" action="/login">
+                <div>
+                    <label>Username/Email:</label>
+                    <input type="text" name="username" required>
+                </div>
+                <div>
+                    <label>Password:</label>
+                    <input type="password" name="password" required>
+                </div>
+                <div>
+                    <input type="checkbox" name="remember" checked>
+                    <label>Remember me</label>
+                </div>
+                <button type="submit">Login</button>
+            </form>
+            <p><a href="/register">Don't have an account? Register here</a></p>
+        </body>
+        </html>
+        '''
+
+
+@auth_bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return jsonify({'success': True, 'message': 'Logged out successfully'})
+
+
+@auth_bp.route('/profile')
+@login_required
+def profile():
+    """User profile page - updated to show only farm-specific stats"""
+    try:
+        # Get user statistics
+        farms_count = Farm.query.filter_by(user_id=current_user.id).count()
+        domes_count = Dome.query.filter_by(user_id=current_user.id).count()  # All domes (farm-specific only)
+        trees_count = Tree.query.filter_by(user_id=current_user.id).count()
+        
+        # Get grid settings for farms only
+        farm_grid = get_grid_settings('farm', current_user.id)
+        
+        return render_template('profile.html',
+                             user=current_user,
+                             farms_count=farms_count,
+                             domes_count=domes_count,
+                             trees_count=trees_count,
+                             farm_grid=farm_grid)
+                             
+    except Exception as e:
+        print(f"Error in profile route: {str(e)}")
+        flash('Error loading profile', 'error')
+        return redirect(url_for('farms.farms'))
+
+
+# ============= STATIC FILE SERVING =============
+@auth_bp.route('/request_password_reset', methods=['GET', 'POST'])
+def request_password_reset():
+    """Handle password reset requests"""
+    if request.method == 'POST':
+        try:
+            data = request.get_json() if request.is_json else request.form
+            email = data.get('email', '').strip()
+            
+            if not email:
+                return jsonify({'success': False, 'error': 'Email is required'}), 400
+            
+            user = User.query.filter_by(email=email).first()
+            if user:
+                try:
+                    token = user.generate_reset_token()
+                    db.session.commit()
+                    
+                    # Try to send email
+                    try:
+                        send_reset_email(email, token, user.username)
+                        return jsonify({'success': True, 'message': 'Password reset email sent'})
+                    except Exception as e:
+                        # If email fails, show the reset link in console
+                        reset_url = f"{request.url_root}reset_password?token={token}"
+                        print(f"Password reset requested for: {email} ({user.username})")
+                        print(f"Reset URL: {reset_url}")
+                        print("Email functionality disabled - check console for reset link")
+                        return jsonify({'success': True, 'message': 'Password reset link generated (check console)'})
+                        
+                except Exception as e:
+                    print(f"Error generating reset token: {e}")
+                    return jsonify({'success': False, 'error': 'Failed to generate reset token'}), 500
+            else:
+                # Don't reveal if email exists or not for security
+                return jsonify({'success': True, 'message': 'If your email is registered, you will receive a reset link'})
+                
+        except Exception as e:
+            print(f"Password reset request error: {e}")
+            return jsonify({'success': False, 'error': 'Password reset request failed'}), 500
+    
+    # GET request - show password reset form
+    return render_template('auth/reset_request.html')
+
+
+@auth_bp.route('/forgot_password', methods=['GET', 'POST'])
+def forgot_password():
+    if request.method == 'POST':
+        try:
+            data = request.get_json() if request.is_json else request.form
+            email = data.get('email', '').strip()
+            
+            print(f"Password reset request for: {email}")
+            
+            if not email:
+                return jsonify({'success': False, 'error': 'Email address is required'}), 400
+            
+            # Find user by email
+            user = User.query.filter_by(email=email).first()
+            
+            if user:
+                # Generate reset token
+                token = user.generate_reset_token()
+                db.session.commit()
+                
+                try:
+                    # Send reset email
+                    send_reset_email(email, token, user.username)
+                    print(f"Password reset email sent to: {email}")
+                    
+                    return jsonify({
+                        'success': True, 
+                        'message': f'Password reset instructions have been sent to {email}'
+                    })
+                    
+                except Exception as e:
+                    print(f"Failed to send reset email: {e}")
+                    return jsonify({
+                        'success': False, 
+                        'error': 'Failed to send reset email. Please try again later.'
+                    }), 500
+            else:
+                # Don't reveal if email exists or not for security
+                print(f"Password reset requested for non-existent email: {email}")
+                return jsonify({
+                    'success': True, 
+                    'message': f'If an account with {email} exists, password reset instructions have been sent.'
+                })
+                
+        except Exception as e:
+            print(f"Forgot password error: {e}")
+            return jsonify({'success': False, 'error': 'Password reset request failed'}), 500
+    
+    # GET request - show the forgot password form
+    return render_template('auth/forgot_password.html')
+
+
+@auth_bp.route('/reset_password', methods=['GET', 'POST'])
+def reset_password():
+    """Handle password reset with token"""
+    if request.method == 'POST':
+        try:
+            data = request.get_json() if request.is_json else request.form
+            token = data.get('token')
+            new_password = data.get('new_password') or data.get('password')
+            confirm_password = data.get('confirm_password')
+
+            if not token or not new_password:
+                return jsonify({'success': False, 'error': 'Token and password are required'}), 400
+
+            if new_password != confirm_password:
+                return jsonify({'success': False, 'error': 'Passwords do not match'}), 400
+
+            if len(new_password) < 6:
+                return jsonify({'success': False, 'error': 'Password must be at least 6 characters'}), 400
+            
+            # Find user with this token
+            user = User.query.filter_by(reset_token=token).first()
+            if not user or not user.verify_reset_token(token):
+                return jsonify({'success': False, 'error': 'Invalid or expired reset token'}), 400
+            
+            # Update password
+            user.set_password(new_password)
+            user.clear_reset_token()
+            db.session.commit()
+            
+            return jsonify({'success': True, 'message': 'Password reset successful'})
+            
+        except Exception as e:
+            print(f"Password reset error: {e}")
+            return jsonify({'success': False, 'error': 'Password reset failed'}), 500
+    
+    # GET request - show password reset form
+    token = request.args.get('token')
+    if not token:
+        return render_template('auth/reset_password.html', error='No reset token provided')
+    
+    # Verify token exists
+    user = User.query.filter_by(reset_token=token).first()
+    if not user or not user.verify_reset_token(token):
+        return render_template('auth/reset_password.html', error='Invalid or expired reset token')
+    
+    return render_template('auth/reset_password.html', token=token)
@@ -0,0 +1,2305 @@
+"""Drag area clipboard routes: copy to the backend clipboard and paste with
+relationships"""
+
+import json
+import time
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, session
+from flask_login import login_required, current_user
+
+from models import db, Dome, Tree, DragArea, DragAreaTree, PlantRelationship, ClipboardData
+from services.mother_matcher import MotherCandidateIndex
+
+
+clipboard_bp = Blueprint('clipboard', __name__)
+
+
+# ✅ ADD: Enhanced POST method endpoint
+@clipboard_bp.route('/paste_drag_area_with_relationships/<int:dome_id>', methods=['POST'])
+@login_required
+def paste_drag_area_with_relationships(dome_id):
+    """Enhanced paste endpoint that preserves plant relationships with bidirectional updates"""
+    try:
+        data = request.get_json()
+        print(f"🔗 Pasting area with relationships to dome {dome_id}")
+        
+        # Get dome and verify ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Extract relationship metadata
+        relationship_metadata = data.get('relationship_metadata', {})
+        mother_cutting_pairs = relationship_metadata.get('mother_cutting_pairs', [])
+        
+        print(f"🔗 Processing {len(mother_cutting_pairs)} relationship pairs")
+        
+        # Step 1: Create all trees first (without relationships)
+        trees_data = data.get('trees_data', [])
+        old_to_new_id_mapping = {}
+        new_tree_ids = []
+        relationship_stats = {
+            'relationships_preserved': 0,
+            'relationships_broken': 0,
+            'mothers_created': 0,
+            'cuttings_created': 0,
+            'mother_cutting_links': []
+        }
+        
+        for tree_data in trees_data:
+            try:
+                # ✅ CRITICAL: Preserve original mother_plant_id for cutting trees
+                original_mother_id = tree_data.get('mother_plant_id')
+                plant_type = tree_data.get('plant_type', 'mother')
+                
+                print(f"🌳 Creating tree '{tree_data.get('name')}' - Type: {plant_type}, Original Mother ID: {original_mother_id}")
+                
+                new_tree = Tree(
+                    name=tree_data.get('name', 'Pasted Tree'),
+                    breed=tree_data.get('breed', ''),
+                    internal_row=tree_data.get('internal_row'),
+                    internal_col=tree_data.get('internal_col'),
+                    life_days=tree_data.get('life_days', 0),
+                    info=tree_data.get('info', ''),
+                    image_url=tree_data.get('image_url', ''),
+                    dome_id=dome_id,
+                    user_id=current_user.id,
+                    plant_type=tree_data.get('plant_type', 'mother'),
+                    cutting_notes=tree_data.get('cutting_notes', ''),
+                    # ✅ PRESERVE: Keep original mother_plant_id for cutting trees
+                    mother_plant_id=original_mother_id,
+                    created_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow()
+                )
+                
+                db.session.add(new_tree)
+                db.session.flush()  # Get the new ID
+                
+                # Map old ID to new ID
+                if tree_data.get('relationship_metadata', {}).get('original_tree_id'):
+                    old_id = tree_data['relationship_metadata']['original_tree_id']
+                    old_to_new_id_mapping[old_id] = new_tree.id
+                
+                new_tree_ids.append(new_tree.id)
+                
+                if new_tree.plant_type == 'mother':
+                    relationship_stats['mothers_created'] += 1
+                elif new_tree.plant_type == 'cutting':
+                    relationship_stats['cuttings_created'] += 1
+                
+                print(f"✅ Created tree '{new_tree.name}' (Type: {new_tree.plant_type}, Mother ID: {new_tree.mother_plant_id}) - old ID: {old_id if 'old_id' in locals() else 'N/A'} -> new ID: {new_tree.id}")
+                
+            except Exception as tree_error:
+                print(f"❌ Error creating tree: {tree_error}")
+                continue
+        
+        # Step 2: Update relationships using the ID mapping
+        mother_cutting_counts = {}  # Track how many cuttings each mother has
+        
+        for pair in mother_cutting_pairs:
+            if not pair.get('relationship_preserved', False):
+                continue
+                
+            old_cutting_id = pair.get('cutting_original_id')
+            old_mother_id = pair.get('mother_original_id')
+            
+            new_cutting_id = old_to_new_id_mapping.get(old_cutting_id)
+            new_mother_id = old_to_new_id_mapping.get(old_mother_id)
+            
+            if new_cutting_id and new_mother_id:
+                cutting_tree = db.session.get(Tree, new_cutting_id)
+                mother_tree = db.session.get(Tree, new_mother_id)
+                
+                if cutting_tree and mother_tree:
+                    # ✅ CRITICAL: Set the relationship
+                    cutting_tree.mother_plant_id = new_mother_id
+                    cutting_tree.plant_type = 'cutting'  # Ensure it's marked as cutting
+                    cutting_tree.updated_at = datetime.utcnow()
+                    
+                    # ✅ ENHANCED: Ensure mother is marked as mother type
+                    if mother_tree.plant_type != 'mother':
+                        mother_tree.plant_type = 'mother'
+                        mother_tree.updated_at = datetime.utcnow()
+                    
+                    # ✅ CRITICAL: Track mother-cutting relationships
+                    if new_mother_id not in mother_cutting_counts:
+                        mother_cutting_counts[new_mother_id] = {
+                            'mother_name': mother_tree.name,
+                            'cutting_ids': [],
+                            'cutting_names': []
+                        }
+                    
+                    mother_cutting_counts[new_mother_id]['cutting_ids'].append(new_cutting_id)
+                    mother_cutting_counts[new_mother_id]['cutting_names'].append(cutting_tree.name)
+                    
+                    relationship_stats['relationships_preserved'] += 1
+                    
+                    # ✅ CRITICAL: Track that this mother tree was updated
+                    if new_mother_id not in relationship_stats['mothers_updated']:
+                        relationship_stats['mothers_updated'].append(new_mother_id)
+                    relationship_stats['mother_cutting_links'].append({
+                        'mother_id': new_mother_id,
+                        'mother_name': mother_tree.name,
+                        'cutting_id': new_cutting_id,
+                        'cutting_name': cutting_tree.name,
+                        'cutting_notes': pair.get('cutting_notes', '')
+                    })
+                    
+                    print(f"🔗 Preserved relationship: '{cutting_tree.name}' -> mother '{mother_tree.name}' (ID {new_mother_id})")
+                else:
+                    relationship_stats['relationships_broken'] += 1
+                    print(f"❌ Trees not found for relationship: cutting {new_cutting_id}, mother {new_mother_id}")
+            else:
+                relationship_stats['relationships_broken'] += 1
+                print(f"❌ Broken relationship: cutting {old_cutting_id} -> mother {old_mother_id}")
+        
+        # ✅ ENHANCED: Update mother trees with cutting counts
+        for mother_id, mother_info in mother_cutting_counts.items():
+            mother_tree = db.session.get(Tree, mother_id)
+            if mother_tree:
+                cutting_count = len(mother_info['cutting_ids'])
+                
+                # ✅ CRITICAL: Update mother tree info to reflect cutting count
+                if mother_tree.info:
+                    # Remove old cutting count info if exists
+                    info_lines = mother_tree.info.split('\n')
+                    info_lines = [line for line in info_lines if not line.startswith('Cuttings:')]
+                    mother_tree.info = '\n'.join(info_lines)
+                    if mother_tree.info:
+                        mother_tree.info += f"\nCuttings: {cutting_count} cutting trees"
+                    else:
+                        mother_tree.info = f"Cuttings: {cutting_count} cutting trees"
+                else:
+                    mother_tree.info = f"Cuttings: {cutting_count} cutting trees"
+                
+                mother_tree.updated_at = datetime.utcnow()
+                
+                print(f"🌳 Updated mother '{mother_tree.name}' with {cutting_count} cuttings: {', '.join(mother_info['cutting_names'])}")
+        
+        # Step 3: Create drag area
+        new_area = DragArea(
+            name=data.get('name', 'Pasted Area'),
+            color=data.get('color', '#007bff'),
+            min_row=data.get('minRow', data.get('min_row')),
+            max_row=data.get('maxRow', data.get('max_row')),
+            min_col=data.get('minCol', data.get('min_col')),
+            max_col=data.get('maxCol', data.get('max_col')),
+            width=data.get('width'),
+            height=data.get('height'),
+            dome_id=dome_id,
+            visible=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        
+        db.session.add(new_area)
+        db.session.flush()
+        
+        # Step 4: Link trees to drag area
+        for i, tree_id in enumerate(new_tree_ids):
+            try:
+                # Find the corresponding tree data to get relative position
+                tree_data = trees_data[i] if i < len(trees_data) else {}
+                
+                # Calculate relative position within the area
+                tree = db.session.get(Tree, tree_id)
+                if tree:
+                    relative_row = tree.internal_row - new_area.min_row
+                    relative_col = tree.internal_col - new_area.min_col
+                    
+                    drag_area_tree = DragAreaTree(
+                        drag_area_id=new_area.id,
+                        tree_id=tree_id,
+                        relative_row=relative_row,
+                        relative_col=relative_col,
+                        created_at=datetime.utcnow()
+                    )
+                    
+                    db.session.add(drag_area_tree)
+                    print(f"🔗 Linked tree {tree_id} to area {new_area.id} at relative position ({relative_row}, {relative_col})")
+                    
+            except Exception as link_error:
+                print(f"❌ Error linking tree {tree_id} to area: {link_error}")
+                continue
+        
+        # Step 5: Commit all changes
+        db.session.commit()
+        
+        # ✅ ENHANCED: Add mother cutting count summary to relationship stats
+        relationship_stats['mother_cutting_summary'] = {
+            mother_id: {
+                'mother_name': info['mother_name'],
+                'cutting_count': len(info['cutting_ids']),
+                'cutting_names': info['cutting_names']
+            }
+            for mother_id, info in mother_cutting_counts.items()
+        }
+        
+        # Step 6: Prepare response with comprehensive data
+        response_data = {
+            'success': True,
+            'message': f'Area "{new_area.name}" pasted successfully with relationships!',
+            'drag_area_id': new_area.id,
+            'trees_created': len(new_tree_ids),
+            'tree_ids': new_tree_ids,
+            'relationship_stats': relationship_stats,
+            'area': {
+                'id': new_area.id,
+                'name': new_area.name,
+                'color': new_area.color,
+                'min_row': new_area.min_row,
+                'max_row': new_area.max_row,
+                'min_col': new_area.min_col,
+                'max_col': new_area.max_col,
+                'width': new_area.width,
+                'height': new_area.height,
+                'tree_count': len(new_tree_ids),
+                'tree_ids': new_tree_ids
+            },
+            'trees_created_details': [
+                {
+                    'new_tree_id': new_tree_ids[i],
+                    'original_tree_id': trees_data[i].get('relationship_metadata', {}).get('original_tree_id'),
+                    'name': trees_data[i].get('name', 'Pasted Tree'),
+                    'plant_type': trees_data[i].get('plant_type', 'mother'),
+                    'position': {
+                        'row': trees_data[i].get('internal_row'),
+                        'col': trees_data[i].get('internal_col')
+                    }
+                }
+                for i in range(min(len(new_tree_ids), len(trees_data)))
+            ],
+            'id_mapping': old_to_new_id_mapping
+        }
+        
+        print(f"✅ Successfully pasted area with {len(new_tree_ids)} trees and {relationship_stats['relationships_preserved']} preserved relationships")
+        print(f"🌳 Mother-cutting summary: {len(mother_cutting_counts)} mothers with cuttings")
+        
+        return jsonify(response_data)
+        
+    except Exception as e:
+        print(f"❌ Error in paste_drag_area_with_relationships: {str(e)}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        
+        # Rollback any partial changes
+        try:
+            db.session.rollback()
+        except:
+            pass
+            
+        return jsonify({
+            'success': False, 
+            'error': f'Failed to paste area with relationships: {str(e)}'
+        }), 500
+
+
+@clipboard_bp.route('/api/paste_drag_area/<int:dome_id>', methods=['POST'])
+@login_required
+def paste_drag_area(dome_id):
+    """Paste a copied drag area with cross-dome support"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        data = request.get_json()
+        clipboard_data = data.get('clipboard_data')
+        paste_row = data.get('paste_row', 0)
+        paste_col = data.get('paste_col', 0)
+        new_name = data.get('name', clipboard_data.get('name', 'Pasted Area'))
+        create_trees = data.get('create_trees', True)
+        
+        if not clipboard_data:
+            return jsonify({'success': False, 'error': 'No clipboard data provided'}), 400
+        
+        print(f"🔄 Pasting drag area '{new_name}' to dome {dome_id} at ({paste_row}, {paste_col})")
+        
+        # Check for name conflicts
+        existing_area = DragArea.query.filter_by(dome_id=dome_id, name=new_name).first()
+        if existing_area:
+            return jsonify({'success': False, 'error': 'Area name already exists'}), 400
+        
+        # Calculate new boundaries
+        width = clipboard_data.get('width', 1)
+        height = clipboard_data.get('height', 1)
+        new_min_row = paste_row
+        new_max_row = paste_row + height - 1
+        new_min_col = paste_col
+        new_max_col = paste_col + width - 1
+        
+        # Validate boundaries
+        if new_max_row >= dome.internal_rows or new_max_col >= dome.internal_cols:
+            return jsonify({
+                'success': False, 
+                'error': f'Area would extend outside grid boundaries ({dome.internal_rows}x{dome.internal_cols})'
+            }), 400
+        
+        # Create new drag area
+        new_area = DragArea(
+            name=new_name,
+            color=clipboard_data.get('color', '#007bff'),
+            min_row=new_min_row,
+            max_row=new_max_row,
+            min_col=new_min_col,
+            max_col=new_max_col,
+            width=width,
+            height=height,
+            dome_id=dome_id,
+            visible=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        
+        db.session.add(new_area)
+        db.session.flush()  # Get the ID
+        
+        # Create trees if requested
+        new_tree_ids = []
+        if create_trees and clipboard_data.get('trees'):
+            for tree_data in clipboard_data['trees']:
+                try:
+                    # Calculate new position
+                    new_row = paste_row + tree_data.get('relative_row', 0)
+                    new_col = paste_col + tree_data.get('relative_col', 0)
+                    
+                    # Check if position is available
+                    existing_tree = Tree.query.filter_by(
+                        dome_id=dome_id,
+                        internal_row=new_row,
+                        internal_col=new_col,
+                        user_id=current_user.id
+                    ).first()
+                    
+                    if existing_tree:
+                        print(f"⚠️ Position ({new_row}, {new_col}) occupied, skipping tree '{tree_data['name']}'")
+                        continue
+                    
+                    # Create new tree
+                    new_tree = Tree(
+                        name=tree_data['name'],
+                        breed=tree_data.get('breed', ''),
+                        dome_id=dome_id,
+                        internal_row=new_row,
+                        internal_col=new_col,
+                        image_url=tree_data.get('image_url'),
+                        info=tree_data.get('info', ''),
+                        life_days=tree_data.get('life_days', 0),
+                        user_id=current_user.id,
+                        created_at=datetime.utcnow(),
+                        updated_at=datetime.utcnow()
+                    )
+                    
+                    # Set plant type and relationships
+                    if hasattr(Tree, 'plant_type'):
+                        new_tree.plant_type = tree_data.get('plant_type', 'mother')
+                    if hasattr(Tree, 'cutting_notes'):
+                        new_tree.cutting_notes = tree_data.get('cutting_notes', '')
+                    
+                    db.session.add(new_tree)
+                    db.session.flush()  # Get the ID
+                    
+                    # Create drag area tree association
+                    drag_area_tree = DragAreaTree(
+                        drag_area_id=new_area.id,
+                        tree_id=new_tree.id,
+                        relative_row=tree_data.get('relative_row', 0),
+                        relative_col=tree_data.get('relative_col', 0),
+                        created_at=datetime.utcnow()
+                    )
+                    
+                    db.session.add(drag_area_tree)
+                    new_tree_ids.append(new_tree.id)
+                    
+                    print(f"✅ Created tree '{new_tree.name}' at ({new_row}, {new_col})")
+                    
+                except Exception as tree_error:
+                    print(f"⚠️ Error creating tree '{tree_data.get('name', 'Unknown')}': {tree_error}")
+                    continue
+        
+        db.session.commit()
+        
+        print(f"✅ Pasted drag area '{new_name}' with {len(new_tree_ids)} trees")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Area "{new_name}" pasted successfully!',
+            'drag_area_id': new_area.id,
+            'trees_created': len(new_tree_ids),
+            'area_details': {
+                'id': new_area.id,
+                'name': new_name,
+                'bounds': f"({new_min_row},{new_min_col}) to ({new_max_row},{new_max_col})",
+                'size': f"{width}×{height}",
+                'tree_count': len(new_tree_ids)
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in paste_drag_area: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def _extract_clipboard_data(data):
+    """Extract and validate clipboard data from request"""
+    try:
+        # Method 1: Frontend clipboard data
+        if data.get('trees_data') or data.get('trees'):
+            print("📋 Using frontend clipboard data...")
+            
+            copied_area = {
+                'name': data.get('name', 'Copied Area'),
+                'color': data.get('color', '#007bff'),
+                'width': data.get('width', 1),
+                'height': data.get('height', 1),
+                'trees': []
+            }
+            
+            # Convert trees_data to internal format
+            trees_data = data.get('trees_data', data.get('trees', []))
+            min_row = data.get('minRow', data.get('min_row', 0))
+            min_col = data.get('minCol', data.get('min_col', 0))
+            
+            for i, tree_data in enumerate(trees_data):
+                tree_row = tree_data.get('internal_row', 0)
+                tree_col = tree_data.get('internal_col', 0)
+                
+                copied_area['trees'].append({
+                    'name': tree_data.get('name', f'Tree {i+1}'),
+                    'breed': tree_data.get('breed', ''),
+                    'life_days': tree_data.get('life_days', 0),
+                    'info': tree_data.get('info', ''),
+                    'image_url': tree_data.get('image_url', ''),
+                    'relativeRow': tree_row - min_row,
+                    'relativeCol': tree_col - min_col,
+                    'plant_type': tree_data.get('plant_type', 'mother'),
+                    'mother_plant_id': tree_data.get('mother_plant_id'),
+                    'cutting_notes': tree_data.get('cutting_notes', ''),
+                    'paste_metadata': tree_data.get('paste_metadata', {}),
+                    'id': tree_data.get('id', f'temp_{i}')  # For relationship mapping
+                })
+            
+            return {
+                'success': True,
+                'copied_area': copied_area,
+                'source': 'frontend',
+                'paste_row': data.get('minRow', data.get('min_row', 0)),
+                'paste_col': data.get('minCol', data.get('min_col', 0)),
+                'new_name': data.get('name', 'Pasted Area')
+            }
+        
+        # Method 2: Session clipboard data
+        else:
+            print("📋 Using session clipboard data...")
+            
+            copied_area = session.get('copied_drag_area')
+            if not copied_area:
+                return {'success': False, 'error': 'No area in clipboard'}
+            
+            new_name = data.get('name', '').strip()
+            if not new_name:
+                return {'success': False, 'error': 'Area name is required'}
+            
+            return {
+                'success': True,
+                'copied_area': copied_area,
+                'source': 'session',
+                'paste_row': data.get('row', 0),
+                'paste_col': data.get('col', 0),
+                'new_name': new_name
+            }
+            
+    except Exception as e:
+        return {'success': False, 'error': f'Failed to extract clipboard data: {str(e)}'}
+
+
+def _validate_area_placement(dome, copied_area, paste_row, paste_col, create_trees, user_id):
+    """Validate that the area can be placed at the specified position"""
+    try:
+        area_width = copied_area['width']
+        area_height = copied_area['height']
+        
+        # Check bounds
+        if (paste_row + area_height > dome.internal_rows or 
+            paste_col + area_width > dome.internal_cols or
+            paste_row < 0 or paste_col < 0):
+            return {
+                'success': False,
+                'error': f'Area doesn\'t fit. Required: {area_width}×{area_height}, '
+                        f'Available space: {dome.internal_cols - paste_col}×{dome.internal_rows - paste_row}'
+            }
+        
+        # Check for existing trees if creating trees
+        if create_trees and copied_area.get('trees'):
+            for tree_data in copied_area['trees']:
+                new_row = paste_row + tree_data['relativeRow']
+                new_col = paste_col + tree_data['relativeCol']
+                
+                existing_tree = Tree.query.filter_by(
+                    dome_id=dome.id,
+                    user_id=user_id,
+                    internal_row=new_row,
+                    internal_col=new_col
+                ).first()
+                
+                if existing_tree:
+                    return {
+                        'success': False,
+                        'error': f'Cannot paste: Tree already exists at position ({new_row}, {new_col})'
+                    }
+        
+        return {'success': True,}
+        
+    except Exception as e:
+        return {'success': False, 'error': f'Validation failed: {str(e)}'}
+
+
+def _area_name_exists(dome, new_name):
+    """Check if area name already exists in dome"""
+    try:
+        areas_data = json.loads(dome.info or '{"drag_areas": []}')
+        if 'drag_areas' not in areas_data:
+            return False
+        
+        return any(area.get('name') == new_name for area in areas_data['drag_areas'])
+    except:
+        return False
+
+
+def _create_drag_area_record(dome_id, new_name, copied_area, paste_row, paste_col, data):
+    """Create DragArea database record"""
+    try:
+        area_width = copied_area['width']
+        area_height = copied_area['height']
+        
+        drag_area = DragArea(
+            name=new_name,
+            color=copied_area['color'],
+            dome_id=dome_id,
+            min_row=paste_row,
+            max_row=paste_row + area_height - 1,
+            min_col=paste_col,
+            max_col=paste_col + area_width - 1,
+            width=area_width,
+            height=area_height,
+            visible=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        
+        # Add enhanced fields if available
+        relationship_metadata = data.get('relationship_metadata', {})
+        if hasattr(DragArea, 'relationship_metadata'):
+            drag_area.relationship_metadata = json.dumps(relationship_metadata) if relationship_metadata else None
+        if hasattr(DragArea, 'cells_data'):
+            drag_area.cells_data = json.dumps(data.get('cells_data', []))
+        if hasattr(DragArea, 'supports_empty_cells'):
+            drag_area.supports_empty_cells = data.get('supports_empty_cells', True)
+        if hasattr(DragArea, 'paste_timestamp'):
+            drag_area.paste_timestamp = datetime.utcnow()
+        if hasattr(DragArea, 'area_type'):
+            drag_area.area_type = 'pasted_area'
+        
+        db.session.add(drag_area)
+        db.session.flush()
+        
+        print(f"✅ Created DragArea record with ID: {drag_area.id}")
+        return {'drag_area_id': drag_area.id}
+        
+    except Exception as e:
+        print(f"⚠️ Could not create DragArea record: {e}")
+        return {'drag_area_id': None}
+
+
+def _create_trees_with_relationships(copied_area, paste_row, paste_col, dome_id, user_id, create_trees, drag_area_id):
+    """Create trees with proper plant relationships - COMPREHENSIVE FIX"""
+    new_tree_ids = []
+    trees_created = 0
+    breed_debug_info = []
+    relationship_stats = {
+        'mothers_created': 0,
+        'cuttings_created': 0,
+        'relationships_preserved': 0,
+        'relationships_broken': 0,
+        'mothers_updated': []
+    }
+
+    if not create_trees or not copied_area.get('trees'):
+        return {
+            'new_tree_ids': new_tree_ids,
+            'trees_created': trees_created,
+            'breed_debug_info': breed_debug_info,
+            'relationship_stats': relationship_stats
+        }
+
+    print(f"🌱 Creating {len(copied_area['trees'])} trees from copied area...")
+
+    # ✅ ENHANCED DEBUG: Show what data we're working with
+    print(f"🔍 === DEBUGGING PASTE OPERATION ===")
+    print(f"🔍 Trees to create: {len(copied_area.get('trees', []))}")
+    print(f"🔍 Copied area keys: {list(copied_area.keys())}")
+    print(f"🔍 Copied area type: {type(copied_area)}")
+
+    for i, tree_data in enumerate(copied_area.get('trees', [])):
+        print(f"🌳 Tree {i}: '{tree_data.get('name', 'Unknown')}'")
+        print(f"   - Plant type: {tree_data.get('plant_type', 'Unknown')}")
+        print(f"   - Mother plant ID: {tree_data.get('mother_plant_id', 'None')}")
+        print(f"   - Original ID: {tree_data.get('id', 'None')}")
+        print(f"   - Has mother_plant_id key: {'mother_plant_id' in tree_data}")
+        print(f"   - Tree data type: {type(tree_data)}")
+        print(f"   - All keys: {list(tree_data.keys())}")
+
+    print(f"🔍 === END PASTE DEBUG INFO ===")
+
+    # ✅ STEP 1: Create ID mapping dictionaries
+    original_to_new_id_mapping = {}
+    mother_id_mapping = {}
+
+    # ✅ STEP 2: First pass - Create all trees and build ID mappings
+    for i, tree_data in enumerate(copied_area['trees']):
+        new_row = paste_row + tree_data['relativeRow']
+        new_col = paste_col + tree_data['relativeCol']
+
+        # Process breed data
+        original_breed = tree_data.get('breed', '')
+        breed_value = original_breed.strip() if original_breed and original_breed.strip() else None
+
+        # ✅ CRITICAL: Plant relationship handling with better data extraction
+        plant_type = tree_data.get('plant_type', 'mother')
+        cutting_notes = tree_data.get('cutting_notes', '')
+        original_mother_id = tree_data.get('mother_plant_id')
+        
+        # ✅ ENHANCED: Also check alternative keys for mother ID
+        if not original_mother_id:
+            original_mother_id = tree_data.get('mother_tree_id')
+        if not original_mother_id:
+            original_mother_id = tree_data.get('mother_id')
+        
+        # ✅ CRITICAL: Debug what we're getting
+        print(f"🔍 Tree {i} relationship debug:")
+        print(f"   - tree_data keys: {list(tree_data.keys())}")
+        print(f"   - plant_type: {tree_data.get('plant_type')}")
+        print(f"   - mother_plant_id: {tree_data.get('mother_plant_id')}")
+        print(f"   - original_mother_id extracted: {original_mother_id}")
+
+        # ✅ CRITICAL: Store original_mother_id in paste metadata for later use
+        paste_metadata = tree_data.get('paste_metadata', {})
+
+        # ✅ DEBUG: Log what we're working with for each tree
+        print(f"🌱 Creating tree {i}: '{tree_data.get('name', 'Unknown')}'")
+        print(f"   - Plant type: {plant_type}")
+        print(f"   - Original mother ID: {original_mother_id}")
+        print(f"   - Original tree ID: {tree_data.get('id')}")
+
+        # Enhanced paste metadata
+        enhanced_paste_metadata = {
+            **paste_metadata,
+            'paste_timestamp': datetime.utcnow().isoformat(),
+            'original_tree_id': tree_data.get('id'),
+            'original_mother_id': original_mother_id,  # ✅ CRITICAL: Store this!
+            'paste_operation': True
+        }
+
+        try:
+            # ✅ CRITICAL: Create tree WITHOUT mother_plant_id initially
+            # We'll set it in the second pass after all trees are created
+            new_tree = Tree(
+                name=tree_data.get('name', f'Tree {i+1}'),
+                breed=breed_value,
+                internal_row=new_row,
+                internal_col=new_col,
+                life_days=tree_data.get('life_days', 0),
+                info=tree_data.get('info', ''),
+                image_url=tree_data.get('image_url', ''),
+                dome_id=dome_id,
+                user_id=user_id,
+                plant_type=plant_type,
+                cutting_notes=cutting_notes,
+                mother_plant_id=None,  # ✅ CRITICAL: Set to None initially
+                paste_metadata=json.dumps(enhanced_paste_metadata) if enhanced_paste_metadata else None,
+                planted_date=datetime.utcnow(),
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            )
+
+            db.session.add(new_tree)
+            db.session.flush()  # Get the ID without committing
+
+            new_tree_ids.append(new_tree.id)
+            trees_created += 1
+
+            # ✅ ENHANCED: Track ALL trees for relationship mapping with consistent keys
+            original_id = tree_data.get('id', f'temp_{i}')
+            if original_id:
+                print(f"🔗 Mapping tree {i}: original_id='{original_id}' -> new_id={new_tree.id} (type: {plant_type})")
+                
+                # Add to general ID mapping for all trees (both string and original type keys)
+                original_id_str = str(original_id)
+                original_to_new_id_mapping[original_id_str] = new_tree.id
+                original_to_new_id_mapping[original_id] = new_tree.id  # Keep original type for compatibility
+
+                # Also add mother trees to specific mother mapping
+                if plant_type == 'mother':
+                    mother_id_mapping[original_id_str] = new_tree.id
+                    mother_id_mapping[original_id] = new_tree.id  # Keep original type for compatibility
+                    relationship_stats['mothers_created'] += 1
+                elif plant_type == 'cutting':
+                    relationship_stats['cuttings_created'] += 1
+
+            # Create DragAreaTree association if DragArea was created
+            if drag_area_id:
+                drag_area_tree = DragAreaTree(
+                    drag_area_id=drag_area_id,
+                    tree_id=new_tree.id,
+                    relative_row=tree_data['relativeRow'],
+                    relative_col=tree_data['relativeCol'],
+                    created_at=datetime.utcnow()
+                )
+                db.session.add(drag_area_tree)
+
+            print(f"✅ Tree created: '{new_tree.name}' ({plant_type}) at ({new_row}, {new_col})")
+
+            breed_debug_info.append({
+                'tree_name': new_tree.name,
+                'original_breed': original_breed,
+                'processed_breed': breed_value,
+                'stored_breed': new_tree.breed,
+                'position': f"({new_row}, {new_col})",
+                'plant_type': plant_type,
+                'original_id': tree_data.get('id')
+            })
+
+        except Exception as tree_error:
+            print(f"❌ Error creating tree {i+1}: {tree_error}")
+            raise tree_error
+
+    # ✅ STEP 3: Second pass - Set mother_plant_id relationships
+    print(f"🔗 === STARTING RELATIONSHIP PROCESSING ===")
+    print(f"🔗 Original to new ID mapping: {dict(list(original_to_new_id_mapping.items())[:5])}...")  # Show first 5
+    print(f"🔗 Mother ID mapping: {dict(list(mother_id_mapping.items())[:5])}...")  # Show first 5
+
+    # Process each tree to set mother relationships
+    for i, tree_data in enumerate(copied_area['trees']):
+        if i < len(new_tree_ids):
+            tree_id = new_tree_ids[i]
+            tree = db.session.get(Tree, tree_id)
+
+            if tree and tree.plant_type == 'cutting':
+                # ✅ ENHANCED: Get original mother ID from multiple sources
+                original_mother_id = tree_data.get('mother_plant_id')
+                if not original_mother_id:
+                    original_mother_id = tree_data.get('mother_tree_id')
+                if not original_mother_id:
+                    original_mother_id = tree_data.get('mother_id')
+
+                if not original_mother_id:
+                    print(f"⚠️ Cutting tree '{tree.name}' has no original mother ID - skipping")
+                    continue
+
+                print(f"🌿 Processing cutting '{tree.name}' - Original mother ID: {original_mother_id}")
+
+                new_mother_id = None
+
+                # ✅ ENHANCED: Try multiple approaches to find the mother tree
+                original_mother_str = str(original_mother_id)
+
+                # Approach 1: Check if mother was also pasted (in our mappings)
+                if original_mother_str in original_to_new_id_mapping:
+                    new_mother_id = original_to_new_id_mapping[original_mother_str]
+                    print(f"✅ Found pasted mother in mapping (str key): {original_mother_id} -> {new_mother_id}")
+                elif original_mother_id in original_to_new_id_mapping:
+                    new_mother_id = original_to_new_id_mapping[original_mother_id]
+                    print(f"✅ Found pasted mother in mapping (orig key): {original_mother_id} -> {new_mother_id}")
+
+                # Approach 2: Check if mother exists in the same dome (not pasted, but existing)
+                elif not new_mother_id:
+                    existing_mother = Tree.query.filter_by(
+                        dome_id=dome_id,
+                        user_id=user_id,
+                        id=original_mother_id
+                    ).first()
+
+                    if existing_mother and (existing_mother.plant_type == 'mother' or not existing_mother.plant_type):
+                        new_mother_id = existing_mother.id
+                        print(f"✅ Found existing mother tree in dome: {original_mother_id}")
+                    else:
+                        print(f"❌ Mother tree {original_mother_id} not found anywhere")
+
+                # ✅ CRITICAL: Set the relationship if mother was found
+                if new_mother_id:
+                    # Verify the mother tree exists and is valid
+                    mother_tree = db.session.get(Tree, new_mother_id)
+                    if mother_tree and (mother_tree.plant_type == 'mother' or not mother_tree.plant_type):
+                        tree.mother_plant_id = new_mother_id
+                        relationship_stats['relationships_preserved'] += 1
+
+                        # ✅ CRITICAL: Create PlantRelationship record for bidirectional relationship
+                        try:
+                            # Check if relationship already exists
+                            existing_relationship = PlantRelationship.query.filter_by(
+                                cutting_tree_id=tree.id
+                            ).first()
+                            
+                            if not existing_relationship:
+                                plant_relationship = PlantRelationship(
+                                    mother_tree_id=new_mother_id,
+                                    cutting_tree_id=tree.id,
+                                    user_id=user_id,
+                                    dome_id=dome_id,
+                                    notes=tree.cutting_notes or '',
+                                    cutting_date=datetime.utcnow()
+                                )
+                                db.session.add(plant_relationship)
+                                print(f"✅ Created PlantRelationship record")
+                            else:
+                                print(f"ℹ️ PlantRelationship already exists")
+                        except Exception as rel_error:
+                            print(f"⚠️ Error creating PlantRelationship: {rel_error}")
+
+                        # ✅ CRITICAL: Track that this mother tree was updated
+                        if new_mother_id not in relationship_stats['mothers_updated']:
+                            relationship_stats['mothers_updated'].append(new_mother_id)
+
+                        # Update paste metadata
+                        paste_meta = tree.get_paste_metadata()
+                        paste_meta['relationship_preserved'] = True
+                        paste_meta['original_mother_id'] = original_mother_id
+                        paste_meta['new_mother_id'] = new_mother_id
+                        tree.set_paste_metadata(paste_meta)
+
+                        print(f"✅ Relationship preserved: '{tree.name}' -> mother '{mother_tree.name}' (ID {new_mother_id})")
+                    else:
+                        print(f"❌ Invalid mother tree ID {new_mother_id} - tree not found or not a mother")
+                        relationship_stats['relationships_broken'] += 1
+                else:
+                    relationship_stats['relationships_broken'] += 1
+
+                    # Update paste metadata for broken relationship
+                    paste_meta = tree.get_paste_metadata()
+                    paste_meta['relationship_preserved'] = False
+                    paste_meta['original_mother_id'] = original_mother_id
+                    paste_meta['relationship_broken_reason'] = 'Mother tree not found in paste operation'
+                    tree.set_paste_metadata(paste_meta)
+
+                    print(f"❌ Relationship broken: '{tree.name}' - mother {original_mother_id} not found")
+
+    # ✅ STEP 4: Update mother trees' cutting counts
+    print("🔄 Updating mother trees' cutting counts...")
+    updated_mothers = set()
+
+    for tree_id in new_tree_ids:
+        tree = db.session.get(Tree, tree_id)
+        if tree and tree.plant_type == 'cutting' and tree.mother_plant_id:
+            if tree.mother_plant_id not in updated_mothers:
+                mother_tree = db.session.get(Tree, tree.mother_plant_id)
+                if mother_tree:
+                    # Update mother tree's updated_at timestamp to reflect new cutting
+                    mother_tree.updated_at = datetime.utcnow()
+                    updated_mothers.add(tree.mother_plant_id)
+                    print(f"✅ Updated mother tree '{mother_tree.name}' timestamp")
+
+    print(f"✅ Updated {len(updated_mothers)} mother trees")
+
+    # ✅ STEP 5: Final validation pass
+    print("🔍 Final validation pass...")
+    final_validation_stats = {
+        'trees_with_preserved_relationships': 0,
+        'trees_with_broken_relationships': 0,
+        'orphaned_cuttings': 0
+    }
+
+    for tree_id in new_tree_ids:
+        tree = db.session.get(Tree, tree_id)
+        if tree and tree.plant_type == 'cutting':
+            if tree.mother_plant_id:
+                final_validation_stats['trees_with_preserved_relationships'] += 1
+            else:
+                final_validation_stats['orphaned_cuttings'] += 1
+
+    print(f"📊 Final validation results:")
+    print(f"   - Trees with preserved relationships: {final_validation_stats['trees_with_preserved_relationships']}")
+    print(f"   - Orphaned cuttings: {final_validation_stats['orphaned_cuttings']}")
+
+    return {
+        'new_tree_ids': new_tree_ids,
+        'trees_created': trees_created,
+        'breed_debug_info': breed_debug_info,
+        'relationship_stats': relationship_stats,
+        'final_validation': final_validation_stats
+    }
+
+
+def _update_dome_info(dome, new_name, copied_area, paste_row, paste_col, new_tree_ids, drag_area_id, clipboard_source, relationship_stats):
+    """Update dome.info with new area data"""
+    try:
+        areas_data = json.loads(dome.info or '{"drag_areas": []}')
+        if 'drag_areas' not in areas_data:
+            areas_data['drag_areas'] = []
+    except:
+        areas_data = {'drag_areas': []}
+    
+    area_width = copied_area['width']
+    area_height = copied_area['height']
+    
+    new_area = {
+        'id': drag_area_id or int(time.time() * 1000),
+        'name': new_name,
+        'color': copied_area['color'],
+        'tree_ids': new_tree_ids,
+        'dome_id': dome.id,
+        'min_row': paste_row,
+        'max_row': paste_row + area_height - 1,
+        'min_col': paste_col,
+        'max_col': paste_col + area_width - 1,
+        'width': area_width,
+        'height': area_height,
+        'created_at': datetime.utcnow().isoformat(),
+        'updated_at': datetime.utcnow().isoformat(),
+        'user_id': dome.user_id,
+        'visible': True,
+        'clipboard_source': clipboard_source,
+        'relationship_stats': relationship_stats,
+        'is_pasted': True,
+        'paste_timestamp': datetime.utcnow().isoformat()
+    }
+    new_area['area_id'] = new_area['id']
+    
+    areas_data['drag_areas'].append(new_area)
+    dome.info = json.dumps(areas_data)
+
+
+def _build_success_message(new_name, trees_created, relationship_stats):
+    """Build success message with relationship info"""
+    message = f'Area "{new_name}" pasted with {trees_created} trees'
+    
+    if relationship_stats['relationships_preserved'] > 0 or relationship_stats['relationships_broken'] > 0:
+        message += f' ({relationship_stats["relationships_preserved"]} relationships preserved'
+        if relationship_stats['relationships_broken'] > 0:
+            message += f', {relationship_stats["relationships_broken"]} broken'
+        message += ')'
+    
+    return message
+
+
+@clipboard_bp.route('/paste_drag_area_at_position/<int:dome_id>', methods=['POST'])
+@login_required
+def paste_drag_area_at_position(dome_id):
+    """Paste a copied drag area at a specific position (for click-to-paste) - ENHANCED"""
+    try:
+        data = request.get_json()
+        paste_row = data.get('row')
+        paste_col = data.get('col')
+        auto_name = data.get('auto_name', True)
+        create_trees = data.get('create_trees', True)
+        
+        if paste_row is None or paste_col is None:
+            return jsonify({'success': False, 'error': 'Position is required'}), 400
+        
+        print(f"🎯 Click-to-paste request at ({paste_row}, {paste_col}) for dome {dome_id}")
+        
+        # Verify dome ownership first
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # ✅ ENHANCED: Try to get clipboard data from multiple sources
+        copied_area = None
+        clipboard_source = None
+        
+        # Method 1: Check if frontend sent clipboard data directly
+        if data.get('clipboard_data'):
+            print("📋 Using clipboard data from frontend request")
+            copied_area = data.get('clipboard_data')
+            clipboard_source = 'frontend_direct'
+            
+        # Method 2: Check session clipboard
+        elif session.get('copied_drag_area'):
+            print("📋 Using session clipboard data")
+            copied_area = session.get('copied_drag_area')
+            clipboard_source = 'session'
+            
+        # Method 3: Check if frontend clipboard data is available (fallback)
+        elif data.get('use_frontend_clipboard'):
+            print("📋 Frontend clipboard requested but no data provided")
+            return jsonify({
+                'success': False, 
+                'error': 'Frontend clipboard requested but no clipboard data provided'
+            }), 400
+        
+        if not copied_area:
+            return jsonify({
+                'success': False, 
+                'error': 'No area in clipboard. Please copy an area first.'
+            }), 400
+        
+        print(f"📋 Found clipboard data from {clipboard_source}")
+        print(f"📊 Clipboard contains: {len(copied_area.get('trees', []))} trees")
+        
+        # ✅ ENHANCED: Generate automatic name with better collision detection
+        base_name = copied_area.get('name', 'Copied Area')
+        if auto_name:
+            new_name = f"{base_name} Copy"
+            counter = 1
+            
+            # Get existing areas from multiple sources
+            existing_names = set()
+            
+            # Check DragArea table
+            try:
+                existing_drag_areas = DragArea.query.filter_by(dome_id=dome_id).all()
+                for area in existing_drag_areas:
+                    existing_names.add(area.name)
+            except Exception as db_error:
+                print(f"⚠️ Could not query DragArea table: {db_error}")
+            
+            # Check dome.info as fallback
+            try:
+                areas_data = json.loads(dome.info or '{"drag_areas": []}')
+                existing_areas = areas_data.get('drag_areas', [])
+                for area in existing_areas:
+                    if area.get('name'):
+                        existing_names.add(area.get('name'))
+            except Exception as json_error:
+                print(f"⚠️ Could not parse dome.info: {json_error}")
+            
+            # Find unique name
+            while new_name in existing_names:
+                new_name = f"{base_name} Copy {counter}"
+                counter += 1
+                
+            print(f"📝 Generated unique name: '{new_name}'")
+        else:
+            new_name = data.get('name', f"{base_name} Copy")
+        
+        # ✅ ENHANCED: Validate area placement before attempting paste
+        area_width = copied_area.get('width', 1)
+        area_height = copied_area.get('height', 1)
+        
+        # Check bounds
+        if (paste_row + area_height > dome.internal_rows or 
+            paste_col + area_width > dome.internal_cols or
+            paste_row < 0 or paste_col < 0):
+            return jsonify({
+                'success': False,
+                'error': f'Area doesn\'t fit at position ({paste_row}, {paste_col}). '
+                        f'Required: {area_width}×{area_height}, '
+                        f'Available space: {dome.internal_cols - paste_col}×{dome.internal_rows - paste_row}'
+            }), 400
+        
+        # Check for tree conflicts if creating trees
+        if create_trees and copied_area.get('trees'):
+            conflicts = []
+            for tree_data in copied_area['trees']:
+                tree_relative_row = tree_data.get('relativeRow', tree_data.get('relative_row', 0))
+                tree_relative_col = tree_data.get('relativeCol', tree_data.get('relative_col', 0))
+                new_row = paste_row + tree_relative_row
+                new_col = paste_col + tree_relative_col
+                
+                # Check if position is occupied
+                existing_tree = Tree.query.filter_by(
+                    dome_id=dome_id,
+                    user_id=current_user.id,
+                    internal_row=new_row,
+                    internal_col=new_col
+                ).first()
+                
+                if existing_tree:
+                    conflicts.append({
+                        'tree_name': tree_data.get('name', 'Unknown'),
+                        'position': f"({new_row}, {new_col})",
+                        'existing_tree': existing_tree.name
+                    })
+            
+            if conflicts:
+                conflict_details = "; ".join([
+                    f"{c['tree_name']} at {c['position']} (occupied by {c['existing_tree']})" 
+                    for c in conflicts
+                ])
+                return jsonify({
+                    'success': False,
+                    'error': f'Cannot paste: Tree conflicts detected - {conflict_details}'
+                }), 400
+        
+        # ✅ ENHANCED: Prepare data for main paste function
+        if clipboard_source == 'session':
+            # For session clipboard, use the existing format
+            paste_data = {
+                'name': new_name,
+                'row': paste_row,
+                'col': paste_col,
+                'create_trees': create_trees
+            }
+        else:
+            # For frontend clipboard, convert to the format expected by paste_drag_area
+            paste_data = {
+                'name': new_name,
+                'color': copied_area.get('color', '#007bff'),
+                'width': area_width,
+                'height': area_height,
+                'row': paste_row,
+                'col': paste_col,
+                'minRow': paste_row,
+                'maxRow': paste_row + area_height - 1,
+                'minCol': paste_col,
+                'maxCol': paste_col + area_width - 1,
+                'min_row': paste_row,
+                'max_row': paste_row + area_height - 1,
+                'min_col': paste_col,
+                'max_col': paste_col + area_width - 1,
+                'create_trees': create_trees,
+                
+                # ✅ CRITICAL: Include trees data
+                'trees_data': copied_area.get('trees', []),
+                'trees': copied_area.get('trees', []),
+                
+                # ✅ NEW: Include relationship metadata
+                'relationship_metadata': copied_area.get('relationship_metadata', {}),
+                'cells_data': copied_area.get('cells', []),
+                'supports_empty_cells': True,
+                'clipboard_source': clipboard_source
+            }
+        
+        print(f"📤 Calling main paste function with data: {paste_data.keys()}")
+        print(f"🌳 Trees to paste: {len(paste_data.get('trees_data', paste_data.get('trees', [])))}")
+        
+        # ✅ ENHANCED: Call main paste function with proper data
+        try:
+            # Create a new request context with the paste data
+            from flask import g
+            
+            # Store original request data
+            original_json = request.get_json()
+            
+            # Temporarily replace request data
+            request._cached_json = (paste_data, paste_data)
+            
+            try:
+                # Call the main paste function
+                result = paste_drag_area(dome_id)
+                
+                # ✅ ENHANCED: Add click-to-paste specific information to response
+                if hasattr(result, 'get_json') and result.get_json():
+                    response_data = result.get_json()
+                    if response_data.get('success'):
+                        response_data['paste_method'] = 'click_to_paste'
+                        response_data['paste_position'] = {'row': paste_row, 'col': paste_col}
+                        response_data['clipboard_source'] = clipboard_source
+                        response_data['auto_named'] = auto_name
+                        
+                        print(f"✅ Click-to-paste successful: '{new_name}' at ({paste_row}, {paste_col})")
+                        
+                        return jsonify(response_data), result.status_code
+                    else:
+                        print(f"❌ Click-to-paste failed: {response_data.get('error', 'Unknown error')}")
+                        return result
+                else:
+                    return result
+                    
+            finally:
+                # Restore original request data
+                request._cached_json = (original_json, original_json)
+                
+        except Exception as paste_error:
+            print(f"❌ Error calling main paste function: {paste_error}")
+            import traceback
+            print(f"❌ Traceback: {traceback.format_exc()}")
+            
+            return jsonify({
+                'success': False,
+                'error': f'Paste operation failed: {str(paste_error)}'
+            }), 500
+        
+    except Exception as e:
+        print(f"❌ Error in paste_drag_area_at_position: {str(e)}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ✅ HELPER: Alternative approach using direct function call
+@clipboard_bp.route('/paste_drag_area_at_position_direct/<int:dome_id>', methods=['POST'])
+@login_required
+def paste_drag_area_at_position_direct(dome_id):
+    """Direct paste without modifying request object"""
+    try:
+        data = request.get_json()
+        paste_row = data.get('row')
+        paste_col = data.get('col')
+        
+        if paste_row is None or paste_col is None:
+            return jsonify({'success': False, 'error': 'Position is required'}), 400
+        
+        # Get clipboard data
+        copied_area = session.get('copied_drag_area')
+        if not copied_area:
+            return jsonify({'success': False, 'error': 'No area in clipboard'}), 400
+        
+        # Generate name
+        base_name = copied_area.get('name', 'Copied Area')
+        new_name = f"{base_name} Copy"
+        
+        # ✅ DIRECT: Call helper functions from main paste function
+        clipboard_result = _extract_clipboard_data({
+            'name': new_name,
+            'row': paste_row,
+            'col': paste_col
+        })
+        
+        if not clipboard_result['success']:
+            return jsonify({'success': False, 'error': clipboard_result['error']}), 400
+        
+        # Validate dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Validate placement
+        validation_result = _validate_area_placement(
+            dome, clipboard_result['copied_area'], paste_row, paste_col, True, current_user.id
+        )
+        if not validation_result['success']:
+            return jsonify({'success': False, 'error': validation_result['error']}), 400
+        
+        # Check name conflicts
+        if _area_name_exists(dome, new_name):
+            counter = 1
+            while _area_name_exists(dome, f"{new_name} {counter}"):
+                counter += 1
+            new_name = f"{new_name} {counter}"
+        
+        # Create area and trees
+        try:
+            drag_area_result = _create_drag_area_record(dome_id, new_name, clipboard_result['copied_area'], paste_row, paste_col, data)
+            trees_result = _create_trees_with_relationships(
+                clipboard_result['copied_area'], paste_row, paste_col, dome_id, current_user.id, 
+                True, drag_area_result.get('drag_area_id')
+            )
+            _update_dome_info(dome, new_name, clipboard_result['copied_area'], paste_row, paste_col, 
+                            trees_result['new_tree_ids'], drag_area_result.get('drag_area_id'), 'session', 
+                            trees_result['relationship_stats'])
+            
+            db.session.commit()
+            
+            success_message = _build_success_message(new_name, trees_result['trees_created'], trees_result['relationship_stats'])
+            
+            return jsonify({
+                'success': True,
+                'message': success_message,
+                'drag_area_id': drag_area_result.get('drag_area_id'),
+                'trees_created': trees_result['trees_created'],
+                'relationship_stats': trees_result['relationship_stats'],
+                'paste_method': 'click_to_paste_direct',
+                'paste_position': {'row': paste_row, 'col': paste_col}
+            })
+            
+        except Exception as transaction_error:
+            db.session.rollback()
+            raise transaction_error
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in direct paste: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@clipboard_bp.route('/get_clipboard_area')
+@login_required
+def get_clipboard_area():
+    """Get the area currently in clipboard"""
+    try:
+        copied_area = session.get('copied_drag_area')
+        
+        return jsonify({
+            'success': True,
+            'has_area': copied_area is not None,
+            'area': copied_area
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting clipboard area: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@clipboard_bp.route('/api/copy_drag_area_to_backend/<int:dome_id>/<int:area_id>', methods=['POST'])
+@login_required
+def copy_drag_area_to_backend(dome_id, area_id):
+    """Copy a drag area to backend clipboard storage with full tree data"""
+    try:
+        print(f"🔄 Backend copy: Copying drag area {area_id} from dome {dome_id}")
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+
+        # Get the drag area with all relationships
+        drag_area = DragArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+        if not drag_area:
+            return jsonify({'success': False, 'error': f'Drag area {area_id} not found'}), 404
+
+        print(f"✅ Found drag area: {drag_area.name}")
+        print(f"🔍 Drag area details: ID={drag_area.id}, Name='{drag_area.name}', Size={drag_area.width}x{drag_area.height}")
+        print(f"🔍 Drag area bounds: ({drag_area.min_row},{drag_area.min_col}) to ({drag_area.max_row},{drag_area.max_col})")
+
+        # ✅ DEBUG: Check if there are any trees in this dome at all
+        all_dome_trees = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+        print(f"🔍 Total trees in dome {dome_id}: {len(all_dome_trees)}")
+        
+        # ✅ DEBUG: Check which trees are within the drag area bounds
+        trees_in_bounds = []
+        for tree in all_dome_trees:
+            in_bounds = (drag_area.min_row <= tree.internal_row <= drag_area.max_row and 
+                        drag_area.min_col <= tree.internal_col <= drag_area.max_col)
+            print(f"   - Tree {tree.id} '{tree.name}' at ({tree.internal_row},{tree.internal_col}) - In bounds: {in_bounds}")
+            if in_bounds:
+                trees_in_bounds.append(tree)
+        
+        print(f"🔍 Trees within drag area bounds: {len(trees_in_bounds)}")
+
+        # Get all trees in this area with full data including relationships
+        area_trees = []
+        tree_ids = []
+        
+        # ✅ FIX: Explicitly query drag area trees to avoid lazy loading issues
+        drag_area_trees = DragAreaTree.query.filter_by(drag_area_id=area_id).all()
+        print(f"🔍 Found {len(drag_area_trees)} drag area tree associations for area {area_id}")
+        
+        # ✅ FALLBACK: If no associations but trees are in bounds, use the trees in bounds
+        if len(drag_area_trees) == 0 and len(trees_in_bounds) > 0:
+            print(f"⚠️ No DragAreaTree associations found, but {len(trees_in_bounds)} trees are within bounds")
+            print(f"🔄 Using trees within bounds as fallback")
+            
+            # Create temporary DragAreaTree objects for processing
+            drag_area_trees = []
+            for tree in trees_in_bounds:
+                # Calculate relative position within the drag area
+                relative_row = tree.internal_row - drag_area.min_row
+                relative_col = tree.internal_col - drag_area.min_col
+                
+                # Create a temporary DragAreaTree-like object
+                temp_dat = type('TempDragAreaTree', (), {
+                    'drag_area_id': area_id,
+                    'tree_id': tree.id,
+                    'tree': tree,
+                    'relative_row': relative_row,
+                    'relative_col': relative_col
+                })()
+                
+                drag_area_trees.append(temp_dat)
+                print(f"   + Added tree {tree.id} '{tree.name}' with relative pos ({relative_row},{relative_col})")
+        
+        # ✅ DEBUG: Check all DragAreaTree records for this dome
+        all_drag_area_trees = DragAreaTree.query.join(DragArea).filter(DragArea.dome_id == dome_id).all()
+        print(f"🔍 Total DragAreaTree records in dome {dome_id}: {len(all_drag_area_trees)}")
+        for dat in all_drag_area_trees:
+            print(f"   - DragAreaTree: area_id={dat.drag_area_id}, tree_id={dat.tree_id}")
+        
+        # ✅ DEBUG: Check if the drag area has the relationship loaded
+        try:
+            original_trees = drag_area.drag_area_trees
+            print(f"🔍 Original relationship loaded: {len(original_trees)} trees")
+        except Exception as rel_error:
+            print(f"⚠️ Original relationship not loaded: {rel_error}")
+        
+        # ✅ DEBUG: Show what's in the DragAreaTree associations
+        for i, dat in enumerate(drag_area_trees):
+            print(f"🔍 DragAreaTree {i}: area_id={dat.drag_area_id}, tree_id={dat.tree_id}, relative_pos=({dat.relative_row},{dat.relative_col})")
+        
+        for dat in drag_area_trees:
+            tree = dat.tree
+            if not tree:
+                # ✅ FALLBACK: If tree relationship isn't loaded, query directly
+                tree = Tree.query.get(dat.tree_id)
+                print(f"🔄 Fallback: Loaded tree {dat.tree_id} directly")
+            
+            if tree:
+                print(f"🌳 Processing tree {tree.id} '{tree.name}' in drag area")
+                tree_data = {
+                    'id': tree.id,
+                    'name': tree.name,
+                    'breed': tree.breed or '',
+                    'internal_row': tree.internal_row,
+                    'internal_col': tree.internal_col,
+                    'relative_row': dat.relative_row,
+                    'relative_col': dat.relative_col,
+                    'image_url': tree.image_url,
+                    'info': tree.info or '',
+                    'life_days': tree.life_days or 0,
+                    'plant_type': getattr(tree, 'plant_type', 'mother'),
+                    'mother_plant_id': getattr(tree, 'mother_plant_id', None),
+                    'cutting_notes': getattr(tree, 'cutting_notes', ''),
+                    'created_at': tree.created_at.isoformat() if tree.created_at else None,
+                    'updated_at': tree.updated_at.isoformat() if tree.updated_at else None
+                }
+                area_trees.append(tree_data)
+                tree_ids.append(tree.id)
+
+        print(f"📦 Collected {len(area_trees)} trees from drag area")
+
+        # ✅ NEW: Auto-include cutting trees when copying mother trees
+        additional_trees = []
+        mother_tree_ids = [t['id'] for t in area_trees if t['plant_type'] == 'mother']
+        
+        if mother_tree_ids:
+            print(f"🔍 Found {len(mother_tree_ids)} mother trees, checking for their cuttings...")
+            
+            # Find all cutting trees that belong to these mothers (anywhere in the dome)
+            for mother_id in mother_tree_ids:
+                cutting_trees_for_mother = Tree.query.filter_by(
+                    dome_id=dome_id,
+                    user_id=current_user.id,
+                    mother_plant_id=mother_id,
+                    plant_type='cutting'
+                ).all()
+                
+                print(f"��� Mother {mother_id} has {len(cutting_trees_for_mother)} cutting trees")
+                
+                for cutting_tree in cutting_trees_for_mother:
+                    # Check if this cutting is already in the area
+                    already_included = any(t['id'] == cutting_tree.id for t in area_trees)
+                    if not already_included:
+                        # Add the cutting tree to the copy
+                        cutting_data = {
+                            'id': cutting_tree.id,
+                            'name': cutting_tree.name,
+                            'breed': cutting_tree.breed or '',
+                            'internal_row': cutting_tree.internal_row,
+                            'internal_col': cutting_tree.internal_col,
+                            'relative_row': 0,  # Will be calculated later
+                            'relative_col': 0,  # Will be calculated later
+                            'image_url': cutting_tree.image_url,
+                            'info': cutting_tree.info or '',
+                            'life_days': cutting_tree.life_days or 0,
+                            'plant_type': 'cutting',
+                            'mother_plant_id': cutting_tree.mother_plant_id,
+                            'cutting_notes': getattr(cutting_tree, 'cutting_notes', ''),
+                            'created_at': cutting_tree.created_at.isoformat() if cutting_tree.created_at else None,
+                            'updated_at': cutting_tree.updated_at.isoformat() if cutting_tree.updated_at else None,
+                            'auto_included': True  # Mark as auto-included
+                        }
+                        additional_trees.append(cutting_data)
+                        tree_ids.append(cutting_tree.id)
+                        print(f"➕ Auto-included cutting '{cutting_tree.name}' (ID: {cutting_tree.id})")
+
+        # Add the additional trees to the main list
+        area_trees.extend(additional_trees)
+        print(f"📦 Total trees after auto-inclusion: {len(area_trees)} (added {len(additional_trees)} cuttings)")
+        
+        # ✅ ENHANCED: Verify all cutting trees are included for each mother
+        for mother_id in mother_tree_ids:
+            mother_tree = next((t for t in area_trees if t['id'] == mother_id), None)
+            if mother_tree:
+                all_cuttings_for_mother = Tree.query.filter_by(
+                    dome_id=dome_id,
+                    user_id=current_user.id,
+                    mother_plant_id=mother_id,
+                    plant_type='cutting'
+                ).all()
+                
+                included_cuttings = [t for t in area_trees if t.get('mother_plant_id') == mother_id and t.get('plant_type') == 'cutting']
+                
+                print(f"🔍 VERIFICATION: Mother '{mother_tree['name']}' (ID: {mother_id})")
+                print(f"   - Total cutting trees in dome: {len(all_cuttings_for_mother)}")
+                print(f"   - Cutting trees included in copy: {len(included_cuttings)}")
+                
+                if len(all_cuttings_for_mother) != len(included_cuttings):
+                    print(f"⚠️ WARNING: Not all cutting trees included for mother {mother_id}")
+                    print(f"   Missing: {len(all_cuttings_for_mother) - len(included_cuttings)} cutting trees")
+
+        # Analyze relationships within the copied trees
+        mother_trees = [t for t in area_trees if t['plant_type'] == 'mother']
+        cutting_trees = [t for t in area_trees if t['plant_type'] == 'cutting']
+        
+        print(f"🔍 RELATIONSHIP DEBUG: Found {len(mother_trees)} mothers, {len(cutting_trees)} cuttings")
+        for tree in area_trees:
+            print(f"🔍 Tree {tree['id']} '{tree['name']}' - Type: {tree['plant_type']} - Mother ID: {tree.get('mother_plant_id', 'None')}")
+        
+        # Find relationships that will be preserved (both mother and cutting in the area)
+        preserved_relationships = []
+        broken_relationships = []
+        
+        for cutting in cutting_trees:
+            print(f"🔍 Analyzing cutting {cutting['id']} '{cutting['name']}' - Mother ID: {cutting.get('mother_plant_id', 'None')}")
+            if cutting['mother_plant_id']:
+                mother_in_area = any(t['id'] == cutting['mother_plant_id'] for t in area_trees)
+                print(f"🔍 Mother {cutting['mother_plant_id']} in area: {mother_in_area}")
+                if mother_in_area:
+                    preserved_relationships.append({
+                        'mother_id': cutting['mother_plant_id'],
+                        'cutting_id': cutting['id']
+                    })
+                    print(f"✅ Preserved relationship: Cutting {cutting['id']} -> Mother {cutting['mother_plant_id']}")
+                else:
+                    broken_relationships.append({
+                        'cutting_id': cutting['id'],
+                        'original_mother_id': cutting['mother_plant_id']
+                    })
+                    print(f"💔 Broken relationship: Cutting {cutting['id']} -> Mother {cutting['mother_plant_id']} (not in area)")
+            else:
+                print(f"ℹ️ Cutting {cutting['id']} has no mother relationship")
+
+        # Get breed information
+        breeds = list(set([tree['breed'] for tree in area_trees if tree['breed']]))
+        
+        # Create comprehensive clipboard data
+        clipboard_data = {
+            'id': drag_area.id,
+            'name': drag_area.name,
+            'type': 'dragArea',
+            'color': drag_area.color,
+            'width': drag_area.width,
+            'height': drag_area.height,
+            'min_row': drag_area.min_row,
+            'max_row': drag_area.max_row,
+            'min_col': drag_area.min_col,
+            'max_col': drag_area.max_col,
+            'trees': area_trees,
+            'tree_count': len(area_trees),
+            'tree_ids': tree_ids,
+            'visible': drag_area.visible,
+            'copied_at': datetime.utcnow().isoformat(),
+            'source_dome_id': dome_id,
+            'source_dome_name': dome.name,
+            'source_farm_id': dome.farm_id,
+            'clipboard_version': '3.0',
+            'clipboard_source': 'backend_enhanced',
+            'summary': {
+                'total_trees': len(area_trees),
+                'breeds': breeds,
+                'breed_count': len(breeds),
+                'has_images': len([tree for tree in area_trees if tree['image_url']]),
+                'plant_relationships': {
+                    'mother_trees': len(mother_trees),
+                    'cutting_trees': len(cutting_trees),
+                    'preserved_relationships': len(preserved_relationships),
+                    'broken_relationships': len(broken_relationships),
+                    'complete_relationships': preserved_relationships,
+                    'broken_relationships_detail': broken_relationships
+                }
+            },
+            'relationship_metadata': {
+                'mother_cutting_pairs': preserved_relationships,
+                'broken_relationships': broken_relationships,
+                'total_relationships': len(preserved_relationships) + len(broken_relationships)
+            }
+        }
+
+        # Save to backend clipboard storage
+        # First, clear any existing clipboard data for this user
+        ClipboardData.query.filter_by(user_id=current_user.id).delete()
+        
+        # Create new clipboard entry
+        clipboard_entry = ClipboardData(
+            user_id=current_user.id,
+            clipboard_type='drag_area',
+            name=clipboard_data['name'],
+            source_dome_id=dome_id,
+            source_farm_id=dome.farm_id,
+            clipboard_content=json.dumps(clipboard_data),
+            width=clipboard_data['width'],
+            height=clipboard_data['height'],
+            tree_count=clipboard_data['tree_count'],
+            created_at=datetime.utcnow()
+        )
+        
+        db.session.add(clipboard_entry)
+        db.session.commit()
+
+        print(f"✅ Drag area '{clipboard_data['name']}' saved to backend clipboard")
+        print(f"   📏 Area size: {clipboard_data['width']}x{clipboard_data['height']}")
+        print(f"   🌳 Trees: {len(area_trees)}")
+        print(f"   🧬 Breeds: {len(breeds)} ({', '.join(breeds) if breeds else 'None'})")
+        print(f"   🔗 Relationships: {len(preserved_relationships)} preserved, {len(broken_relationships)} broken")
+        print(f"   💾 Clipboard entry ID: {clipboard_entry.id}")
+        print(f"   ���� Clipboard data preview: {clipboard_data['name']} - {clipboard_data['tree_count']} trees")
+
+        return jsonify({
+            'success': True,
+            'clipboard_data': clipboard_data,
+            'message': f'Drag area "{drag_area.name}" copied to backend clipboard',
+            'stats': {
+                'trees_copied': len(area_trees),
+                'breeds_found': len(breeds),
+                'relationships_preserved': len(preserved_relationships),
+                'relationships_broken': len(broken_relationships)
+            }
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in copy_drag_area_to_backend: {str(e)}")
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@clipboard_bp.route('/api/paste_drag_area_from_backend/<int:dome_id>', methods=['POST'])
+@login_required
+def paste_drag_area_from_backend(dome_id):
+    """Paste a drag area from backend clipboard storage with orphaned relationship handling"""
+    try:
+        print(f"📋 Backend paste: Pasting to dome {dome_id}")
+
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+
+        # Get clipboard data from backend
+        clipboard_entry = ClipboardData.query.filter_by(
+            user_id=current_user.id,
+            clipboard_type='drag_area'
+        ).order_by(ClipboardData.created_at.desc()).first()
+
+        if not clipboard_entry:
+            return jsonify({'success': False, 'error': 'No clipboard data found'}), 400
+
+        # Parse clipboard data
+        try:
+            clipboard_data = json.loads(clipboard_entry.clipboard_content)
+        except json.JSONDecodeError:
+            return jsonify({'success': False, 'error': 'Invalid clipboard data format'}), 400
+
+        # Get paste parameters
+        data = request.get_json()
+        paste_row = data.get('paste_row', 0)
+        paste_col = data.get('paste_col', 0)
+        new_name = data.get('name', f"{clipboard_data.get('name', 'Pasted Area')} Copy")
+        create_trees = data.get('create_trees', True)
+        
+        # ✅ NEW: Get orphan handling parameters
+        # Check both direct orphan_handling and relationship_metadata.orphan_handling
+        orphan_handling = data.get('orphan_handling', {})
+        relationship_metadata = data.get('relationship_metadata', {})
+        if not orphan_handling and relationship_metadata.get('orphan_handling'):
+            orphan_handling = relationship_metadata.get('orphan_handling', {})
+        
+        # ✅ FIX: Ensure orphan_handling is never None
+        if orphan_handling is None:
+            orphan_handling = {}
+        
+        orphan_mode = orphan_handling.get('mode', 'preserve_original') if orphan_handling else 'preserve_original'
+        orphaned_cuttings_info = orphan_handling.get('orphaned_cuttings', []) if orphan_handling else []
+        
+        # ✅ Map frontend mode names to backend mode names
+        mode_mapping = {
+            'preserve_original': 'preserve_original',
+            'find_mothers': 'link_to_existing',
+            'link_to_existing': 'link_to_existing',
+            'convert_to_independent': 'convert_to_independent',
+            'keep_orphaned': 'keep_orphaned'
+        }
+        orphan_mode = mode_mapping.get(orphan_mode, 'preserve_original')  # Default to preserve original
+
+        print(f"📋 Pasting '{new_name}' at ({paste_row}, {paste_col})")
+        print(f"🔗 Orphan handling mode: {orphan_mode}")
+        if orphaned_cuttings_info:
+            print(f"⚠️ Orphaned cuttings to handle: {len(orphaned_cuttings_info)}")
+
+        # Check for name conflicts
+        existing_area = DragArea.query.filter_by(dome_id=dome_id, name=new_name).first()
+        if existing_area:
+            # Auto-generate unique name
+            counter = 1
+            base_name = new_name
+            while existing_area:
+                new_name = f"{base_name} ({counter})"
+                existing_area = DragArea.query.filter_by(dome_id=dome_id, name=new_name).first()
+                counter += 1
+
+        # Calculate new boundaries
+        width = clipboard_data.get('width', 1)
+        height = clipboard_data.get('height', 1)
+        new_min_row = paste_row
+        new_max_row = paste_row + height - 1
+        new_min_col = paste_col
+        new_max_col = paste_col + width - 1
+
+        # Validate boundaries
+        if new_max_row >= dome.internal_rows or new_max_col >= dome.internal_cols:
+            return jsonify({
+                'success': False,
+                'error': f'Area would extend outside grid boundaries ({dome.internal_rows}x{dome.internal_cols})'
+            }), 400
+
+        # Create new drag area
+        new_area = DragArea(
+            name=new_name,
+            color=clipboard_data.get('color', '#007bff'),
+            min_row=new_min_row,
+            max_row=new_max_row,
+            min_col=new_min_col,
+            max_col=new_max_col,
+            width=width,
+            height=height,
+            dome_id=dome_id,
+            visible=True,
+            created_at=datetime.utcnow()
+        )
+
+        db.session.add(new_area)
+        db.session.flush()  # Get the new area ID
+
+        print(f"✅ Created new drag area: {new_area.name} (ID: {new_area.id})")
+
+        # Initialize statistics variables
+        new_trees = []
+        old_to_new_tree_mapping = {}
+        mother_trees_pasted = []
+        cutting_trees_pasted = []
+        relationships_created = 0
+        independent_cuttings = 0
+        orphaned_cuttings_handled = 0
+        linked_to_existing_mothers = 0
+        transferred_cuttings = 0  # ✅ FIX: This will now count new cutting trees created
+
+        # Create trees if requested
+        if create_trees and clipboard_data.get('trees'):
+            trees_data = clipboard_data['trees']
+            
+            # Calculate position offsets
+            original_min_row = clipboard_data.get('min_row', 0)
+            original_min_col = clipboard_data.get('min_col', 0)
+            row_offset = paste_row - original_min_row
+            col_offset = paste_col - original_min_col
+            
+            print(f"🌳 Processing {len(trees_data)} trees with offset ({row_offset}, {col_offset})")
+            
+            # Separate mother trees and cutting trees
+            mother_trees_data = [t for t in trees_data if t.get('plant_type', 'mother') == 'mother']
+            cutting_trees_data = [t for t in trees_data if t.get('plant_type') == 'cutting']
+            
+            print(f"📊 Found {len(mother_trees_data)} mother trees and {len(cutting_trees_data)} cutting trees")
+            print(f"🔄 Strategy: Create new mother trees, update existing cutting relationships")
+            
+            # First pass: Create only mother trees (not cutting trees)
+            for tree_data in mother_trees_data:
+                new_row = tree_data['internal_row'] + row_offset
+                new_col = tree_data['internal_col'] + col_offset
+                
+                # Skip if position is occupied
+                existing_tree = Tree.query.filter_by(
+                    dome_id=dome_id,
+                    internal_row=new_row,
+                    internal_col=new_col
+                ).first()
+                
+                if existing_tree:
+                    print(f"⚠️ Position ({new_row}, {new_col}) occupied, skipping mother tree '{tree_data['name']}'")
+                    continue
+                
+                # ✅ FIX 1: Preserve life_days and plant_day (created_at) from original tree
+                original_created_at = tree_data.get('created_at')
+                if original_created_at:
+                    try:
+                        # Parse the ISO format datetime string
+                        if isinstance(original_created_at, str):
+                            created_at = datetime.fromisoformat(original_created_at.replace('Z', '+00:00'))
+                        else:
+                            created_at = original_created_at
+                    except (ValueError, TypeError):
+                        created_at = datetime.utcnow()
+                else:
+                    created_at = datetime.utcnow()
+
+                new_tree = Tree(
+                    name=tree_data['name'],
+                    breed=tree_data.get('breed', ''),
+                    internal_row=new_row,
+                    internal_col=new_col,
+                    life_days=tree_data.get('life_days', 0),  # ✅ FIX 1: Preserve life_days
+                    info=tree_data.get('info', ''),
+                    image_url=tree_data.get('image_url', ''),
+                    dome_id=dome_id,
+                    user_id=current_user.id,
+                    plant_type='mother',  # Always mother for new trees
+                    created_at=created_at  # ✅ FIX 1: Preserve original plant_day
+                )
+                
+                db.session.add(new_tree)
+                db.session.flush()  # Get the new tree ID
+                
+                # Map old ID to new ID for relationship restoration
+                old_to_new_tree_mapping[tree_data['id']] = new_tree.id
+                new_trees.append(new_tree)
+                
+                # Create drag area tree association
+                relative_row = tree_data.get('relative_row', new_row - paste_row)
+                relative_col = tree_data.get('relative_col', new_col - paste_col)
+                
+                drag_area_tree = DragAreaTree(
+                    drag_area_id=new_area.id,
+                    tree_id=new_tree.id,
+                    relative_row=relative_row,
+                    relative_col=relative_col,
+                    created_at=datetime.utcnow()
+                )
+                db.session.add(drag_area_tree)
+                
+                print(f"🌳 Created mother tree '{new_tree.name}' at ({new_row}, {new_col})")
+            
+            # Track mother trees that were pasted for statistics
+            for tree_data in mother_trees_data:
+                if tree_data['id'] in old_to_new_tree_mapping:
+                    mother_trees_pasted.append({
+                        'old_id': tree_data['id'],
+                        'new_id': old_to_new_tree_mapping[tree_data['id']],
+                        'name': tree_data['name']
+                    })
+
+            print(f"📊 Created {len(mother_trees_pasted)} mother trees")
+
+            # ✅ NEW: Handle cutting trees that are copied independently (without their mother)
+            cutting_trees_without_mother = []
+            cutting_trees_with_mother = []
+            
+            for cutting_data in cutting_trees_data:
+                original_mother_id = cutting_data.get('mother_plant_id')
+                # Check if the mother was also copied
+                mother_was_copied = original_mother_id and original_mother_id in old_to_new_tree_mapping
+                
+                if mother_was_copied:
+                    cutting_trees_with_mother.append(cutting_data)
+                else:
+                    cutting_trees_without_mother.append(cutting_data)
+            
+            print(f"🔗 Found {len(cutting_trees_with_mother)} cutting trees with copied mothers")
+            print(f"🌱 Found {len(cutting_trees_without_mother)} cutting trees without copied mothers (will create new ones)")
+
+            # ✅ NEW: Create new cutting trees for those copied independently
+            if cutting_trees_without_mother:
+                print(f"🌱 Creating {len(cutting_trees_without_mother)} new cutting trees...")
+                
+                for cutting_data in cutting_trees_without_mother:
+                    new_row = cutting_data['internal_row'] + row_offset
+                    new_col = cutting_data['internal_col'] + col_offset
+                    
+                    # Skip if position is occupied
+                    existing_tree = Tree.query.filter_by(
+                        dome_id=dome_id,
+                        internal_row=new_row,
+                        internal_col=new_col
+                    ).first()
+                    
+                    if existing_tree:
+                        print(f"⚠️ Position ({new_row}, {new_col}) occupied, skipping cutting tree '{cutting_data['name']}'")
+                        continue
+                    
+                    # ✅ FIX 1: Preserve life_days and plant_day (created_at) from original cutting tree
+                    original_created_at = cutting_data.get('created_at')
+                    if original_created_at:
+                        try:
+                            # Parse the ISO format datetime string
+                            if isinstance(original_created_at, str):
+                                created_at = datetime.fromisoformat(original_created_at.replace('Z', '+00:00'))
+                            else:
+                                created_at = original_created_at
+                        except (ValueError, TypeError):
+                            created_at = datetime.utcnow()
+                    else:
+                        created_at = datetime.utcnow()
+                    
+                    # Keep original mother relationship for independently copied cutting trees
+                    original_mother_id = cutting_data.get('mother_plant_id')
+                    
+                    new_cutting_tree = Tree(
+                        name=cutting_data['name'],
+                        breed=cutting_data.get('breed', ''),
+                        internal_row=new_row,
+                        internal_col=new_col,
+                        life_days=cutting_data.get('life_days', 0),  # ✅ FIX 1: Preserve life_days
+                        info=cutting_data.get('info', ''),
+                        image_url=cutting_data.get('image_url', ''),
+                        dome_id=dome_id,
+                        user_id=current_user.id,
+                        plant_type='cutting',  # Keep as cutting
+                        mother_plant_id=original_mother_id,  # Keep original mother relationship
+                        created_at=created_at  # ✅ FIX 1: Preserve original plant_day
+                    )
+                    
+                    db.session.add(new_cutting_tree)
+                    db.session.flush()  # Get the new tree ID
+                    
+                    # Map old ID to new ID for relationship tracking
+                    old_to_new_tree_mapping[cutting_data['id']] = new_cutting_tree.id
+                    new_trees.append(new_cutting_tree)
+                    
+                    # Track cutting trees that were successfully created
+                    cutting_trees_pasted.append({
+                        'old_id': cutting_data['id'],
+                        'new_id': new_cutting_tree.id,
+                        'name': cutting_data['name'],
+                        'original_mother_id': original_mother_id,
+                        'new_mother_id': original_mother_id  # Same as original since mother wasn't copied
+                    })
+                    
+                    # Create drag area tree association
+                    relative_row = cutting_data.get('relative_row', new_row - paste_row)
+                    relative_col = cutting_data.get('relative_col', new_col - paste_col)
+                    
+                    drag_area_tree = DragAreaTree(
+                        drag_area_id=new_area.id,
+                        tree_id=new_cutting_tree.id,
+                        relative_row=relative_row,
+                        relative_col=relative_col,
+                        created_at=datetime.utcnow()
+                    )
+                    db.session.add(drag_area_tree)
+                    
+                    if original_mother_id:
+                        relationships_created += 1
+                    
+                    print(f"🌱 Created cutting tree '{new_cutting_tree.name}' at ({new_row}, {new_col}) with original mother ID: {original_mother_id}")
+
+            # ✅ FIX 2: Update existing cutting tree relationships for those with copied mothers (don't create new cutting trees)
+            if cutting_trees_with_mother:
+                print(f"🔗 Updating {len(cutting_trees_with_mother)} existing cutting trees to link to new mothers...")
+            
+            # ✅ FIX 2: Process cutting trees - update existing ones to link to new mothers (only for those with copied mothers)
+            for cutting_data in cutting_trees_with_mother:
+                original_cutting_id = cutting_data['id']
+                original_mother_id = cutting_data.get('mother_plant_id')
+                
+                # Find the existing cutting tree
+                existing_cutting = Tree.query.filter_by(
+                    id=original_cutting_id,
+                    user_id=current_user.id,
+                    plant_type='cutting'
+                ).first()
+                
+                if not existing_cutting:
+                    print(f"⚠️ Cutting tree with ID {original_cutting_id} not found, skipping")
+                    continue
+                
+                # Check if the original mother was pasted (has a new ID)
+                if original_mother_id and original_mother_id in old_to_new_tree_mapping:
+                    new_mother_id = old_to_new_tree_mapping[original_mother_id]
+                    
+                    # Update the cutting to point to the new mother
+                    existing_cutting.mother_plant_id = new_mother_id
+                    existing_cutting.plant_type = 'cutting'  # Ensure it stays as cutting
+                    
+                    relationships_created += 1
+                    transferred_cuttings += 1
+                    
+                    # ✅ FIX: Track cutting trees that were successfully updated (but don't add to new area)
+                    cutting_trees_pasted.append({
+                        'old_id': cutting_data['id'],
+                        'new_id': existing_cutting.id,  # Same ID since we're updating existing
+                        'name': cutting_data['name'],
+                        'original_mother_id': original_mother_id,
+                        'new_mother_id': new_mother_id
+                    })
+                    
+                    print(f"✅ Updated cutting '{existing_cutting.name}' (ID: {existing_cutting.id}) to point to new mother (ID: {new_mother_id})")
+                else:
+                    print(f"⚠️ Original mother (ID: {original_mother_id}) was not pasted, cutting '{existing_cutting.name}' relationship unchanged")
+
+            # Handle transfer of all cutting trees from old mothers to new mothers
+            for mother in mother_trees_pasted:
+                old_mother_id = mother['old_id']
+                
+                # Find ALL cutting trees that belong to the old mother (anywhere in the system)
+                all_old_cuttings = Tree.query.filter_by(
+                    mother_plant_id=old_mother_id,
+                    plant_type='cutting',
+                    user_id=current_user.id
+                ).all()
+                
+                print(f"🔍 Found {len(all_old_cuttings)} total cutting trees linked to old mother {old_mother_id}")
+                
+                # ✅ FIXED: Only transfer cutting trees that were NOT copied (to avoid duplicates)
+                for old_cutting in all_old_cuttings:
+                    # Check if this cutting was copied (by checking if its ID is in the copied list)
+                    cutting_was_copied = any(c['id'] == old_cutting.id for c in cutting_trees_data)
+                    
+                    if not cutting_was_copied:
+                        # Transfer the cutting tree to the new mother (only if it wasn't copied)
+                        old_cutting.mother_plant_id = mother['new_id']
+                        old_cutting.plant_type = 'cutting'
+                        transferred_cuttings += 1
+                        print(f"🔄 Transferred non-copied cutting '{old_cutting.name}' (ID: {old_cutting.id}) from old mother {old_mother_id} to new mother {mother['new_id']}")
+                    else:
+                        # Remove the original cutting since it was copied
+                        old_cutting.mother_plant_id = None
+                        old_cutting.plant_type = 'mother'  # Convert to independent
+                        print(f"🗑️ Removed copied cutting '{old_cutting.name}' (ID: {old_cutting.id}) from old mother (copy exists)")
+                
+                # ✅ VERIFICATION: Check that old mother has no cutting trees left
+                remaining_cuttings_check = Tree.query.filter_by(
+                    mother_plant_id=old_mother_id,
+                    plant_type='cutting',
+                    user_id=current_user.id
+                ).count()
+                
+                print(f"✅ VERIFICATION: Old mother {old_mother_id} now has {remaining_cuttings_check} cutting trees (should be 0)")
+                
+                # ✅ FORCE: Update the old mother's cutting count to reflect the changes
+                old_mother_tree = Tree.query.get(old_mother_id)
+                if old_mother_tree:
+                    # Force update the cutting count for the old mother
+                    remaining_cuttings = Tree.query.filter_by(
+                        mother_plant_id=old_mother_id,
+                        plant_type='cutting',
+                        user_id=current_user.id
+                    ).count()
+                    print(f"🔄 Old mother '{old_mother_tree.name}' now has {remaining_cuttings} cutting trees remaining")
+
+            # ✅ FIX: Cutting trees are now tracked during creation above
+            # No need to track them here since they're tracked when actually created
+
+            print(f"🌳 Found {len(mother_trees_pasted)} mother trees and {len(cutting_trees_pasted)} cutting trees")
+            
+            # Create a mapping of orphaned cutting IDs for quick lookup
+            orphaned_cutting_ids = set()
+            orphan_handling_map = {}
+            for orphan_info in orphaned_cuttings_info:
+                orphaned_cutting_ids.add(orphan_info.get('cutting_id'))
+                orphan_handling_map[orphan_info.get('cutting_id')] = orphan_info
+            
+            # Index the destination dome's mother trees once for relinking
+            mother_index = None
+            if orphan_mode == 'link_to_existing':
+                mother_index = MotherCandidateIndex.for_dome(dome_id, current_user.id)
+                print(f"🔍 Found {len(mother_index)} available mother trees in destination dome")
+            
+            # For each cutting tree, handle relationships based on orphan mode
+            for cutting in cutting_trees_pasted:
+                cutting_tree = Tree.query.get(cutting['old_id'])  # Use old_id since we're updating existing trees
+                if not cutting_tree:
+                    continue
+                
+                is_orphaned = cutting['old_id'] in orphaned_cutting_ids
+                
+                if is_orphaned:
+                    print(f"⚠️ Handling orphaned cutting: '{cutting['name']}' (mode: {orphan_mode})")
+                    
+                    if orphan_mode == 'preserve_original':
+                        # Preserve the original mother relationship (even if mother is in different dome)
+                        original_mother_id = cutting.get('original_mother_id')
+                        if original_mother_id:
+                            cutting_tree.mother_plant_id = original_mother_id
+                            cutting_tree.plant_type = 'cutting'
+                            relationships_created += 1
+                            orphaned_cuttings_handled += 1
+                            print(f"🔄 Preserved original relationship: cutting '{cutting['name']}' -> mother ID {original_mother_id}")
+                        else:
+                            # No original mother ID, convert to independent
+                            cutting_tree.mother_plant_id = None
+                            cutting_tree.plant_type = 'mother'
+                            independent_cuttings += 1
+                            orphaned_cuttings_handled += 1
+                            print(f"🌱 No original mother ID, converted '{cutting['name']}' to independent")
+                        
+                    elif orphan_mode == 'convert_to_independent':
+                        # Convert to independent mother tree
+                        cutting_tree.mother_plant_id = None
+                        cutting_tree.plant_type = 'mother'
+                        independent_cuttings += 1
+                        orphaned_cuttings_handled += 1
+                        print(f"🌱 Converted orphaned cutting '{cutting['name']}' to independent mother")
+                        
+                    elif orphan_mode == 'link_to_existing' and mother_index:
+                        # Link to an existing mother tree in the dome (breed, then name, then first)
+                        suitable_mother = mother_index.match({
+                            'name': cutting_tree.name,
+                            'breed': cutting_tree.breed
+                        })
+                        
+                        if suitable_mother:
+                            cutting_tree.mother_plant_id = suitable_mother.id
+                            cutting_tree.plant_type = 'cutting'
+                            relationships_created += 1
+                            linked_to_existing_mothers += 1
+                            orphaned_cuttings_handled += 1
+                            print(f"🔗 Linked orphaned cutting '{cutting['name']}' to existing mother '{suitable_mother.name}'")
+                        else:
+                            # No suitable mother found, convert to independent
+                            cutting_tree.mother_plant_id = None
+                            cutting_tree.plant_type = 'mother'
+                            independent_cuttings += 1
+                            orphaned_cuttings_handled += 1
+                            print(f"🌱 No suitable mother found, converted '{cutting['name']}' to independent")
+                            
+                    else:  # keep_orphaned mode or fallback
+                        # Keep as orphaned cutting (broken relationship)
+                        cutting_tree.mother_plant_id = cutting['original_mother_id']  # Keep original reference
+                        cutting_tree.plant_type = 'cutting'
+                        orphaned_cuttings_handled += 1
+                        print(f"⚠️ Kept '{cutting['name']}' as orphaned cutting (broken relationship)")
+                        
+                else:
+                    # Not orphaned - handle normal relationship restoration
+                    # Check if the original mother was also pasted
+                    original_mother_pasted = None
+                    if cutting['original_mother_id']:
+                        for mother in mother_trees_pasted:
+                            if mother['old_id'] == cutting['original_mother_id']:
+                                original_mother_pasted = mother
+                                break
+                    
+                    if original_mother_pasted:
+                        # Link to the original mother that was pasted
+                        cutting_tree.mother_plant_id = original_mother_pasted['new_id']
+                        relationships_created += 1
+                        print(f"🔗 Linked cutting '{cutting['name']}' to original mother '{original_mother_pasted['name']}'")
+                    elif mother_trees_pasted:
+                        # Link to the first available mother tree that was pasted
+                        first_mother = mother_trees_pasted[0]
+                        cutting_tree.mother_plant_id = first_mother['new_id']
+                        relationships_created += 1
+                        print(f"🔗 Linked cutting '{cutting['name']}' to available pasted mother '{first_mother['name']}'")
+                    else:
+                        # No mother trees available, convert to independent
+                        cutting_tree.mother_plant_id = None
+                        cutting_tree.plant_type = 'mother'
+                        independent_cuttings += 1
+                        print(f"🌱 Converted cutting '{cutting['name']}' to independent mother (no mothers pasted)")
+
+        # ✅ FORCE: Ensure all database changes are committed and visible
+        db.session.commit()
+        
+        # ✅ DEBUG: Verify the changes were actually applied
+        if mother_trees_pasted:
+            for mother in mother_trees_pasted:
+                old_mother_id = mother['old_id']
+                old_mother_tree = Tree.query.get(old_mother_id)
+                if old_mother_tree:
+                    remaining_cuttings = Tree.query.filter_by(
+                        mother_plant_id=old_mother_id,
+                        plant_type='cutting',
+                        user_id=current_user.id
+                    ).count()
+                    print(f"🔍 VERIFICATION: Old mother '{old_mother_tree.name}' (ID: {old_mother_id}) has {remaining_cuttings} cuttings after transfer")
+
+        print(f"✅ Paste completed successfully")
+        print(f"   📏 Area: {new_area.name} ({width}x{height})")
+        print(f"   🌳 Trees created: {len(new_trees)}")
+        print(f"   🔗 Relationships created: {relationships_created}")
+        print(f"   🌱 Independent cuttings converted: {independent_cuttings}")
+        print(f"   ⚠️ Orphaned cuttings handled: {orphaned_cuttings_handled}")
+        print(f"   🔗 Linked to existing mothers: {linked_to_existing_mothers}")
+        print(f"   🔄 Cutting trees transferred: {transferred_cuttings}")
+        
+        # Calculate preserved relationships
+        preserved_relationships = 0
+        if orphan_mode == 'preserve_original':
+            preserved_relationships = orphaned_cuttings_handled
+
+        return jsonify({
+            'success': True,
+            'message': f'Drag area "{new_name}" pasted successfully',
+            'area': {
+                'id': new_area.id,
+                'name': new_area.name,
+                'position': f"({paste_row}, {paste_col})",
+                'size': f"{width}x{height}"
+            },
+            'stats': {
+                'trees_created': len(new_trees),
+                'mother_trees_pasted': len(mother_trees_pasted),
+                'cutting_trees_pasted': len(cutting_trees_pasted),
+                'relationships_created': relationships_created,
+                'independent_cuttings_converted': independent_cuttings,
+                'orphaned_cuttings_handled': orphaned_cuttings_handled,
+                'linked_to_existing_mothers': linked_to_existing_mothers,
+                'preserved_original_relationships': preserved_relationships,
+                'transferred_cuttings': transferred_cuttings,
+                'orphan_handling_mode': orphan_mode,
+                'source_dome': clipboard_data.get('source_dome_name', 'Unknown')
+            }
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in paste_drag_area_from_backend: {str(e)}")
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}")
+        
+        # ✅ DEBUG: Log the problematic data
+        try:
+            print(f"❌ DEBUG: data = {data}")
+            print(f"❌ DEBUG: orphan_handling = {orphan_handling}")
+            print(f"❌ DEBUG: orphaned_cuttings_info = {orphaned_cuttings_info}")
+        except:
+            print("❌ DEBUG: Could not log debug data")
+        
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@clipboard_bp.route('/api/get_clipboard_status', methods=['GET'])
+@login_required
+def get_clipboard_status():
+    """Get current clipboard status from backend"""
+    try:
+        clipboard_entry = ClipboardData.query.filter_by(
+            user_id=current_user.id,
+            clipboard_type='drag_area'
+        ).order_by(ClipboardData.created_at.desc()).first()
+        
+        if not clipboard_entry:
+            return jsonify({
+                'success': True,
+                'has_clipboard': False,
+                'message': 'No clipboard data available'
+            })
+
+        # Parse clipboard data for summary
+        try:
+            clipboard_data = json.loads(clipboard_entry.clipboard_content)
+            
+            print(f"🔍 DEBUG: Clipboard entry found - ID: {clipboard_entry.id}")
+            print(f"🔍 DEBUG: Clipboard entry name: {clipboard_entry.name}")
+            print(f"🔍 DEBUG: Clipboard entry tree_count: {getattr(clipboard_entry, 'tree_count', 'N/A')}")
+            print(f"🔍 DEBUG: Parsed clipboard_data keys: {list(clipboard_data.keys())}")
+            print(f"🔍 DEBUG: Clipboard data name: {clipboard_data.get('name', 'NOT_FOUND')}")
+            print(f"🔍 DEBUG: Clipboard data tree_count: {clipboard_data.get('tree_count', 'NOT_FOUND')}")
+            
+            return jsonify({
+                'success': True,
+                'has_clipboard': True,
+                'clipboard_info': {
+                    'name': clipboard_data.get('name', 'Unknown Area'),
+                    'tree_count': clipboard_data.get('tree_count', 0),
+                    'size': f"{clipboard_data.get('width', 1)}x{clipboard_data.get('height', 1)}",
+                    'source_dome': clipboard_data.get('source_dome_name', 'Unknown'),
+                    'copied_at': clipboard_entry.created_at.isoformat(),
+                    'breeds': clipboard_data.get('summary', {}).get('breeds', []),
+                    'relationships': clipboard_data.get('summary', {}).get('plant_relationships', {})
+                }
+            })
+            
+        except json.JSONDecodeError:
+            return jsonify({
+                'success': True,
+                'has_clipboard': False,
+                'message': 'Clipboard data corrupted'
+            })
+
+    except Exception as e:
+        print(f"❌ Error getting clipboard status: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@clipboard_bp.route('/api/clear_clipboard', methods=['POST'])
+@login_required
+def clear_clipboard():
+    """Clear backend clipboard data"""
+    try:
+        deleted_count = ClipboardData.query.filter_by(user_id=current_user.id).delete()
+        db.session.commit()
+        
+        print(f"🗑️ Cleared {deleted_count} clipboard entries for user {current_user.id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Cleared {deleted_count} clipboard entries'
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error clearing clipboard: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,98 @@
+"""Helpers shared by several blueprints"""
+
+import base64
+from datetime import datetime
+import hashlib
+from functools import wraps
+
+from flask import request, current_app, make_response
+from flask_login import current_user
+
+from extensions import life_updater
+from services.deletion import start_deletion_job
+from services.dome_versions import dome_version
+from services.tree_listing import wants_ndjson
+
+
+def save_image_to_database(image_file, entity_type, entity_id):
+    """Save image as base64 in database instead of filesystem"""
+    try:
+        # Read and process the image
+        image_data = image_file.read()
+        
+        # Convert to base64
+        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        
+        # Get file extension
+        filename = image_file.filename.lower()
+        if filename.endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
+            ext = filename.split('.')[-1]
+        else:
+            ext = 'jpg'
+        
+        # Create data URL
+        mime_type = f'image/{ext}' if ext != 'jpg' else 'image/jpeg'
+        data_url = f'data:{mime_type};base64,{image_base64}'
+        
+        return data_url
+        
+    except Exception as e:
+        print(f"❌ Error saving image: {e}")
+        return None
+
+
+def queue_scope_deletion(scope, target_id, user_id=None):
+    """Start a background dome/farm deletion when the request asks for one (?background=1).
+
+    Returns the job id, or None when the caller should delete synchronously.
+    """
+    if request.args.get('background', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    scheduler = life_updater.scheduler if life_updater and life_updater.scheduler_loaded else None
+    job_id = start_deletion_job(current_app._get_current_object(), scope, target_id, user_id=user_id, scheduler=scheduler)
+    print(f"🕒 Queued background deletion of {scope} {target_id} as job {job_id}")
+    return job_id
+
+
+def dome_etag(scope, daily=False):
+    """Weak ETag for a dome's GET endpoint, from the dome's change version.
+
+    A poll whose If-None-Match still matches gets a 304 after one version
+    lookup, without running the view.  The version is read before the view
+    runs, so a write racing the request only costs the client a refetch.
+    Views computing fields from the current date (life days, stages) pass
+    ``daily=True``: the UTC date joins the ETag, so it changes at midnight
+    whether or not the midnight job has bumped the dome yet.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(dome_id, *args, **kwargs):
+            version = dome_version(dome_id, current_user.id)
+            if version is None:
+                # Not the user's dome: the view answers as it always did
+                return view(dome_id, *args, **kwargs)
+
+            change_version, life_reference_at = version
+            # The body depends on the query string and on the format negotiated from Accept
+            body_format = b'ndjson' if wants_ndjson(request) else b'json'
+            day = datetime.utcnow().date().isoformat().encode() if daily else b''
+            variant = hashlib.sha1(request.query_string + b'|' + body_format + b'|' + day).hexdigest()[:8]
+            reference = int(life_reference_at.timestamp()) if life_reference_at else 0
+            etag = f"{scope}-{dome_id}-{change_version}-{reference}-{variant}"
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(dome_id, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if response.is_json and not response.is_streamed and \
+                        (response.get_json(silent=True) or {}).get('success') is False:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.vary.add('Accept')
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,1166 @@
+"""Dome routes: dome CRUD, moves/swaps, the grid page and grid resizing"""
+
+import time
+from datetime import datetime, timedelta
+
+from flask import Blueprint, render_template, request, jsonify, redirect, session, flash, url_for
+from flask_login import login_required, current_user
+
+from models import db, Farm, Dome, Tree, DragArea, DragAreaTree, PlantRelationship, TreeBreed
+from services.breeds import BreedDictionary
+from services.deletion import delete_scope
+from blueprints.common import queue_scope_deletion
+
+
+domes_bp = Blueprint('domes', __name__)
+
+
+# ============= FARM MANAGEMENT ROUTES =============
+# ✅ MAKE SURE you only have ONE grid route like this:
+@domes_bp.route('/grid/<int:dome_id>')
+@login_required
+def grid(dome_id):
+    """Enhanced grid route with improved drag area persistence"""
+    try:
+        print(f"🎯 Grid route called for dome_id: {dome_id}")
+        print(f"🎯 User ID: {current_user.id}")
+        
+        # Get the dome and verify ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            print(f"❌ Dome {dome_id} not found for user {current_user.id}")
+            flash('Dome not found', 'error')
+            return redirect(url_for('farms.farms'))
+        
+        print(f"✅ Dome found: {dome.name}")
+        
+        # Get all trees for this dome with explicit loading
+        trees = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+        print(f"✅ Found {len(trees)} trees for dome {dome_id}")
+        
+        # Convert trees to JSON-serializable dictionaries; breeds are sent as codes into breed_names
+        breeds = BreedDictionary()
+        trees_data = []
+        for tree in trees:
+            try:
+                tree_dict = {
+                    'id': tree.id,
+                    'name': tree.name,
+                    'breed_code': breeds.code(tree.breed),
+                    'dome_id': tree.dome_id,
+                    'internal_row': tree.internal_row,
+                    'internal_col': tree.internal_col,
+                    'image_url': tree.image_url,
+                    'info': tree.info or '',
+                    'life_days': tree.life_days or 0,
+                    'user_id': tree.user_id,
+                    'plant_type': getattr(tree, 'plant_type', 'mother'),
+                    'cutting_notes': getattr(tree, 'cutting_notes', ''),
+                    # ✅ CRITICAL: Include mother_plant_id for relationship preservation
+                    'mother_plant_id': getattr(tree, 'mother_plant_id', None),
+                    'life_stage': tree.get_life_stage() if hasattr(tree, 'get_life_stage') else 'Unknown',
+                    'age_category': tree.get_age_category() if hasattr(tree, 'get_age_category') else 'unknown',
+                    'position_string': f"({tree.internal_row}, {tree.internal_col})",
+                    'created_at': tree.created_at.isoformat() if tree.created_at else None,
+                    'updated_at': tree.updated_at.isoformat() if tree.updated_at else None
+                }
+                trees_data.append(tree_dict)
+                print(f"🌳 Grid Tree {tree.id} '{tree.name}' - Breed: '{tree.breed or 'None'}' - Position: ({tree.internal_row}, {tree.internal_col})")
+                
+            except Exception as tree_error:
+                print(f"⚠️ Error processing tree {tree.id}: {tree_error}")
+                # Add basic tree data even if enhanced processing fails
+                basic_tree_dict = {
+                    'id': tree.id,
+                    'name': tree.name,
+                    'breed_code': breeds.code(tree.breed),
+                    'dome_id': tree.dome_id,
+                    'internal_row': tree.internal_row,
+                    'internal_col': tree.internal_col,
+                    'image_url': tree.image_url,
+                    'info': tree.info or '',
+                    'life_days': tree.life_days or 0,
+                    'user_id': tree.user_id,
+                    'plant_type': 'mother',
+                    'cutting_notes': '',
+                    'life_stage': 'Unknown',
+                    'age_category': 'unknown',
+                    'position_string': f"({tree.internal_row}, {tree.internal_col})",
+                    'created_at': None,
+                    'updated_at': None
+                }
+                trees_data.append(basic_tree_dict)
+        
+        # ✅ ENHANCED: Load drag areas with better error handling and explicit relationships
+        drag_areas = []
+        drag_areas_count = 0
+        drag_areas_errors = []
+        
+        try:
+            # ✅ FIXED: Use explicit join to ensure relationships are loaded
+            from sqlalchemy.orm import joinedload
+            
+            try:
+                # Try to load with relationships
+                drag_areas_db = DragArea.query.options(
+                    joinedload(DragArea.drag_area_trees).joinedload(DragAreaTree.tree)
+                ).filter_by(dome_id=dome_id).all()
+                print(f"✅ Loaded drag areas with relationships using joinedload")
+            except Exception as join_error:
+                print(f"⚠️ Joinedload failed, falling back to basic query: {join_error}")
+                # Fallback to basic query
+                drag_areas_db = DragArea.query.filter_by(dome_id=dome_id).all()
+            
+            drag_areas_count = len(drag_areas_db)
+            print(f"🔍 Found {drag_areas_count} drag areas in database for dome {dome_id}")
+            
+            for area in drag_areas_db:
+                try:
+                    # ✅ ENHANCED: Validate area data before processing
+                    if not area:
+                        drag_areas_errors.append("Null drag area found")
+                        continue
+                    
+                    if not hasattr(area, 'id') or area.id is None:
+                        drag_areas_errors.append("Drag area missing ID")
+                        continue
+                    
+                    # ✅ ENHANCED: Get trees in this drag area with better error handling
+                    area_trees = []
+                    tree_ids = []
+                    
+                    try:
+                        # Check if drag_area_trees relationship exists and is loaded
+                        if hasattr(area, 'drag_area_trees'):
+                            drag_area_trees = area.drag_area_trees
+                            
+                            # If relationship is not loaded, query explicitly
+                            if not drag_area_trees:
+                                drag_area_trees = DragAreaTree.query.filter_by(drag_area_id=area.id).all()
+                                print(f"🔄 Explicitly loaded {len(drag_area_trees)} drag area trees for area {area.id}")
+                            
+                            for dat in drag_area_trees:
+                                if dat and hasattr(dat, 'tree_id') and dat.tree_id:
+                                    tree_ids.append(dat.tree_id)
+                                    
+                                    # Get tree data
+                                    tree = dat.tree if hasattr(dat, 'tree') and dat.tree else None
+                                    if not tree:
+                                        # Query tree explicitly if not loaded
+                                        tree = Tree.query.filter_by(id=dat.tree_id).first()
+                                    
+                                    if tree:
+                                        tree_data = {
+                                            'id': tree.id,
+                                            'name': tree.name,
+                                            'breed': tree.breed or '',
+                                            'relative_row': getattr(dat, 'relative_row', 0),
+                                            'relative_col': getattr(dat, 'relative_col', 0),
+                                            'absolute_row': tree.internal_row,
+                                            'absolute_col': tree.internal_col
+                                        }
+                                        area_trees.append(tree_data)
+                                    else:
+                                        print(f"⚠️ Tree {dat.tree_id} not found for drag area {area.id}")
+                        else:
+                            print(f"⚠️ No drag_area_trees relationship for area {area.id}")
+                            
+                    except Exception as tree_error:
+                        error_msg = f"Error loading trees for drag area {area.id}: {tree_error}"
+                        print(f"⚠️ {error_msg}")
+                        drag_areas_errors.append(error_msg)
+                    
+                    # ✅ ENHANCED: Create drag area data structure with validation
+                    try:
+                        drag_area_data = {
+                            'id': area.id,
+                            'name': area.name or f'Drag Area {area.id}',
+                            'color': getattr(area, 'color', '#007bff') or '#007bff',
+                            'minRow': area.min_row if area.min_row is not None else 0,
+                            'maxRow': area.max_row if area.max_row is not None else 0,
+                            'minCol': area.min_col if area.min_col is not None else 0,
+                            'maxCol': area.max_col if area.max_col is not None else 0,
+                            'width': getattr(area, 'width', None) or (area.max_col - area.min_col + 1),
+                            'height': getattr(area, 'height', None) or (area.max_row - area.min_row + 1),
+                            'visible': getattr(area, 'visible', True),
+                            'tree_ids': tree_ids,
+                            'tree_count': len(area_trees),
+                            'trees': area_trees,
+                            'cell_count': (getattr(area, 'width', None) or (area.max_col - area.min_col + 1)) * (getattr(area, 'height', None) or (area.max_row - area.min_row + 1)),
+                            'bounds_string': f"({area.min_row},{area.min_col}) to ({area.max_row},{area.max_col})",
+                            'size_string': f"{getattr(area, 'width', None) or (area.max_col - area.min_col + 1)}×{getattr(area, 'height', None) or (area.max_row - area.min_row + 1)}",
+                            'created_at': area.created_at.isoformat() if hasattr(area, 'created_at') and area.created_at else None,
+                            'updated_at': area.updated_at.isoformat() if hasattr(area, 'updated_at') and area.updated_at else None
+                        }
+                        
+                        # ✅ ENHANCED: Validate drag area data integrity
+                        if drag_area_data['width'] <= 0 or drag_area_data['height'] <= 0:
+                            print(f"⚠️ Invalid area dimensions for area {area.id}: {drag_area_data['width']}x{drag_area_data['height']}")
+                            drag_area_data['width'] = max(1, drag_area_data['width'])
+                            drag_area_data['height'] = max(1, drag_area_data['height'])
+                        
+                        drag_areas.append(drag_area_data)
+                        
+                        print(f"🔲 Drag Area {area.id} '{drag_area_data['name']}' - Position: ({drag_area_data['minRow']},{drag_area_data['minCol']}) to ({drag_area_data['maxRow']},{drag_area_data['maxCol']}) - Trees: {len(area_trees)} - Visible: {drag_area_data['visible']}")
+                        
+                    except Exception as data_error:
+                        error_msg = f"Error creating data structure for drag area {area.id}: {data_error}"
+                        print(f"⚠️ {error_msg}")
+                        drag_areas_errors.append(error_msg)
+                        continue
+                    
+                except Exception as area_error:
+                    error_msg = f"Error processing drag area {getattr(area, 'id', 'unknown')}: {area_error}"
+                    print(f"⚠️ {error_msg}")
+                    drag_areas_errors.append(error_msg)
+                    continue
+                    
+        except Exception as drag_error:
+            error_msg = f"Error loading drag areas from database: {drag_error}"
+            print(f"❌ {error_msg}")
+            drag_areas_errors.append(error_msg)
+            import traceback
+            print(f"❌ Drag areas traceback: {traceback.format_exc()}")
+            drag_areas = []
+        
+        # ✅ ENHANCED: Calculate statistics with error handling
+        try:
+            area_stats = {
+                'drag_areas_count': len(drag_areas),
+                'total_areas': len(drag_areas),
+                'total_drag_trees': sum(area.get('tree_count', 0) for area in drag_areas),
+                'visible_drag_areas': len([area for area in drag_areas if area.get('visible', True)]),
+                'drag_areas_db_count': drag_areas_count,
+                'areas_loaded_successfully': len(drag_areas) == drag_areas_count and len(drag_areas_errors) == 0,
+                'loading_errors': drag_areas_errors,
+                'error_count': len(drag_areas_errors),
+                # Regular areas disabled
+                'regular_areas_count': 0,
+                'total_regular_cells': 0,
+                'total_regular_trees': 0,
+                'visible_regular_areas': 0,
+                'regular_areas_db_count': 0
+            }
+        except Exception as stats_error:
+            print(f"⚠️ Error calculating area stats: {stats_error}")
+            area_stats = {
+                'drag_areas_count': len(drag_areas),
+                'total_areas': len(drag_areas),
+                'total_drag_trees': 0,
+                'visible_drag_areas': len(drag_areas),
+                'drag_areas_db_count': drag_areas_count,
+                'areas_loaded_successfully': False,
+                'loading_errors': drag_areas_errors,
+                'error_count': len(drag_areas_errors),
+                'regular_areas_count': 0,
+                'total_regular_cells': 0,
+                'total_regular_trees': 0,
+                'visible_regular_areas': 0,
+                'regular_areas_db_count': 0
+            }
+        
+        # ✅ Breed analysis
+        try:
+            trees_with_breeds = [tree for tree in trees if tree.breed and tree.breed.strip()]
+            unique_breeds = list(set([tree.breed for tree in trees_with_breeds]))
+            breed_summary = f"{len(trees_with_breeds)}/{len(trees)} trees have breeds"
+            
+            print(f"🧬 Breed summary: {breed_summary}")
+            print(f"🧬 Unique breeds: {unique_breeds}")
+        except Exception as breed_error:
+            print(f"⚠️ Error analyzing breeds: {breed_error}")
+            trees_with_breeds = []
+            unique_breeds = []
+            breed_summary = "Breed analysis failed"
+        
+        # ✅ ENHANCED: Log loading results
+        print(f"📊 Drag Areas Loading Summary:")
+        print(f"   - Database query returned: {drag_areas_count} areas")
+        print(f"   - Successfully processed: {len(drag_areas)} areas")
+        print(f"   - Processing errors: {len(drag_areas_errors)}")
+        print(f"   - Visible areas: {area_stats['visible_drag_areas']}")
+        print(f"   - Total trees in areas: {area_stats['total_drag_trees']}")
+        
+        if drag_areas_errors:
+            print(f"⚠️ Drag area loading errors:")
+            for error in drag_areas_errors:
+                print(f"   - {error}")
+        
+        print(f"🎯 Rendering grid.html for dome {dome_id} with area stats: {area_stats}")
+        
+        # ✅ ENHANCED: Template data with comprehensive error information
+        try:
+            template_data = {
+                'dome': dome,
+                'trees_data': trees_data,
+                'breed_names': breeds.names,
+                'trees': trees,
+                'drag_areas': drag_areas,
+                'regular_areas': [],  # Empty - no regular areas
+                'area_stats': area_stats,
+                'breed_summary': breed_summary,
+                'unique_breeds': unique_breeds,
+                'tree_count': len(trees),
+                'rows': dome.internal_rows or 10,
+                'cols': dome.internal_cols or 10,
+                'dome_id': dome_id,
+                'dome_name': dome.name,
+                'dome_size_string': f"{dome.internal_rows or 10}×{dome.internal_cols or 10}",
+                'timestamp': int(time.time()),
+                'current_user': current_user,
+                'debug_info': {
+                    'areas_loaded_successfully': area_stats.get('areas_loaded_successfully', False),
+                    'drag_areas_db_count': drag_areas_count,
+                    'drag_areas_processed': len(drag_areas),
+                    'loading_errors': drag_areas_errors,
+                    'error_count': len(drag_areas_errors),
+                    'system_mode': 'DRAG_AREAS_ONLY',
+                    'refresh_timestamp': datetime.utcnow().isoformat()
+                }
+            }
+            
+            # ✅ ENHANCED: Detailed template data logging
+            print(f"📊 Template data summary:")
+            print(f"   - Dome: {dome.name} ({dome.internal_rows}x{dome.internal_cols})")
+            print(f"   - Trees: {len(trees_data)} items")
+            print(f"   - Drag Areas: {len(drag_areas)} items (DB: {drag_areas_count})")
+            print(f"   - Regular Areas: 0 items (DISABLED)")
+            print(f"   - Visible Drag Areas: {area_stats['visible_drag_areas']}")
+            print(f"   - Areas loaded successfully: {area_stats.get('areas_loaded_successfully', False)}")
+            print(f"   - Loading errors: {len(drag_areas_errors)}")
+            print(f"   - System Mode: DRAG_AREAS_ONLY")
+            print(f"   - Refresh timestamp: {template_data['debug_info']['refresh_timestamp']}")
+            
+            return render_template('grid.html', **template_data)
+            
+        except Exception as template_error:
+            print(f"❌ Error preparing template data: {template_error}")
+            import traceback
+            print(f"❌ Template preparation traceback: {traceback.format_exc()}")
+            
+            # ✅ ENHANCED: Fallback with error information
+            fallback_data = {
+                'dome': dome,
+                'trees_data': trees_data,
+                'breed_names': breeds.names,
+                'trees': trees,
+                'drag_areas': [],
+                'regular_areas': [],
+                'area_stats': {
+                    'drag_areas_count': 0, 
+                    'regular_areas_count': 0,
+                    'areas_loaded_successfully': False,
+                    'loading_errors': [f"Template preparation failed: {str(template_error)}"],
+                    'error_count': 1
+                },
+                'breed_summary': 'Data loading failed',
+                'unique_breeds': [],
+                'tree_count': len(trees),
+                'rows': dome.internal_rows or 10,
+                'cols': dome.internal_cols or 10,
+                'current_user': current_user,
+                'debug_info': {
+                    'fallback_mode': True,
+                    'template_error': str(template_error)
+                }
+            }
+            
+            return render_template('grid.html', **fallback_data)
+                                 
+    except Exception as e:
+        print(f"❌ Critical error in grid route: {str(e)}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        flash('An error occurred while loading the grid', 'error')
+        return redirect(url_for('farms.farms'))
+
+
+@domes_bp.route('/create_dome', methods=['POST'])
+@login_required
+def create_dome():
+    try:
+        data = request.get_json()
+        name = data.get('name')
+        grid_row = data.get('grid_row')
+        grid_col = data.get('grid_col')
+        farm_id = data.get('farm_id')  # Required for all domes now
+        
+        if not name or grid_row is None or grid_col is None or not farm_id:
+            return jsonify({'success': False, 'error': 'Missing required fields (name, position, farm_id)'})
+        
+        # Verify farm ownership
+        farm = Farm.query.filter_by(id=farm_id, user_id=current_user.id).first()
+        if not farm:
+            return jsonify({'success': False, 'error': 'Farm not found or access denied'})
+        
+        # Check if position is occupied within this farm
+        existing_dome = Dome.query.filter_by(
+            grid_row=grid_row, 
+            grid_col=grid_col,
+            user_id=current_user.id,
+            farm_id=farm_id
+        ).first()
+        
+        if existing_dome:
+            return jsonify({'success': False, 'error': 'Position already occupied in this farm'})
+        
+        # Create new dome with default 5x5 internal grid
+        new_dome = Dome(
+            name=name,
+            grid_row=grid_row,
+            grid_col=grid_col,
+            internal_rows=5,  # Default 5x5 internal grid
+            internal_cols=5,
+            user_id=current_user.id,
+            farm_id=farm_id  # Always required now
+        )
+        
+        db.session.add(new_dome)
+        db.session.commit()
+        
+        print(f"✅ Dome created: {new_dome.name} at ({grid_row}, {grid_col}) in farm {farm_id}")
+        
+        return jsonify({
+            'success': True, 
+            'message': 'Dome created successfully',
+            'dome': {
+                'id': new_dome.id,
+                'name': new_dome.name,
+                'grid_row': new_dome.grid_row,
+                'grid_col': new_dome.grid_col,
+                'internal_rows': new_dome.internal_rows,
+                'internal_cols': new_dome.internal_cols,
+                'farm_id': new_dome.farm_id
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error creating dome: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@domes_bp.route('/move_dome/<int:dome_id>', methods=['POST'])
+@login_required
+def move_dome(dome_id):
+    try:
+        data = request.get_json()
+        new_row = data.get('grid_row')
+        new_col = data.get('grid_col')
+        
+        if new_row is None or new_col is None:
+            return jsonify({'success': False, 'error': 'Missing grid position'})
+        
+        # Get the dome
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'})
+        
+        # Ensure dome belongs to a farm
+        if not dome.farm_id:
+            return jsonify({'success': False, 'error': 'Invalid dome - must belong to a farm'})
+        
+        # Check if target position is occupied within the same farm
+        existing_dome = Dome.query.filter_by(
+            grid_row=new_row, 
+            grid_col=new_col,
+            user_id=current_user.id,
+            farm_id=dome.farm_id
+        ).first()
+        
+        if existing_dome and existing_dome.id != dome_id:
+            return jsonify({'success': False, 'error': 'Target position already occupied in this farm'})
+        
+        # Update dome position
+        old_position = f"({dome.grid_row}, {dome.grid_col})"
+        dome.grid_row = new_row
+        dome.grid_col = new_col
+        db.session.commit()
+        
+        print(f"✅ Dome moved: {dome.name} from {old_position} to ({new_row}, {new_col}) in farm {dome.farm_id}")
+        
+        return jsonify({'success': True, 'message': 'Dome moved successfully'})
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error moving dome: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@domes_bp.route('/swap_domes', methods=['POST'])
+@login_required
+def swap_domes():
+    try:
+        data = request.get_json()
+        dome1_id = data.get('dome1_id')
+        dome2_id = data.get('dome2_id')
+        dome1_new_row = data.get('dome1_new_row')
+        dome1_new_col = data.get('dome1_new_col')
+        dome2_new_row = data.get('dome2_new_row')
+        dome2_new_col = data.get('dome2_new_col')
+        
+        if not all([dome1_id, dome2_id, dome1_new_row is not None, dome1_new_col is not None, 
+                   dome2_new_row is not None, dome2_new_col is not None]):
+            return jsonify({'success': False, 'error': 'Missing required fields'})
+        
+        # Get both domes
+        dome1 = Dome.query.filter_by(id=dome1_id, user_id=current_user.id).first()
+        dome2 = Dome.query.filter_by(id=dome2_id, user_id=current_user.id).first()
+        
+        if not dome1 or not dome2:
+            return jsonify({'success': False, 'error': 'One or both domes not found'})
+        
+        # ✅ FIXED: Ensure both domes are in the same context (same farm or both global)
+        if dome1.farm_id != dome2.farm_id:
+            return jsonify({'success': False, 'error': 'Cannot swap domes between different farm contexts'})
+        
+        # Store old positions for logging
+        dome1_old = f"({dome1.grid_row}, {dome1.grid_col})"
+        dome2_old = f"({dome2.grid_row}, {dome2.grid_col})"
+        
+        # Swap positions
+        dome1.grid_row = dome1_new_row
+        dome1.grid_col = dome1_new_col
+        dome2.grid_row = dome2_new_row
+        dome2.grid_col = dome2_new_col
+        
+        db.session.commit()
+        
+        context = f"farm {dome1.farm_id}" if dome1.farm_id else "global"
+        print(f"✅ Domes swapped: {dome1.name} {dome1_old} ↔ {dome2.name} {dome2_old} in {context}")
+        
+        return jsonify({'success': True, 'message': 'Domes swapped successfully'})
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error swapping domes: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@domes_bp.route('/api/dome/<int:dome_id>/grid', methods=['POST'])
+@login_required
+def update_dome_grid_size(dome_id):
+    """Update dome grid size"""
+    try:
+        print(f"🔧 Grid size update request for dome {dome_id}")
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            print(f"❌ Dome {dome_id} not found for user {current_user.id}")
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get request data
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        # Extract data (handle both grid_type and direct rows/cols)
+        new_rows = data.get('rows')
+        new_cols = data.get('cols')
+        grid_type = data.get('grid_type', f'dome_{dome_id}')  # Optional field
+        
+        print(f"🔧 Request data: rows={new_rows}, cols={new_cols}, grid_type={grid_type}")
+        
+        # Validate input
+        if not isinstance(new_rows, int) or not isinstance(new_cols, int):
+            return jsonify({'success': False, 'error': 'Rows and cols must be integers'}), 400
+        
+        if new_rows < 1 or new_cols < 1:
+            return jsonify({'success': False, 'error': 'Grid size must be at least 1x1'}), 400
+        
+        if new_rows > 100 or new_cols > 100:
+            return jsonify({'success': False, 'error': 'Grid size cannot exceed 100x100'}), 400
+        
+        print(f"🔧 Updating dome {dome_id} grid size from {dome.internal_rows}x{dome.internal_cols} to {new_rows}x{new_cols}")
+        
+        # One aggregate over trees, drag areas and regular areas; the offending
+        # rows are only fetched when something would fall outside
+        conflicts = dome.find_resize_conflicts(new_rows, new_cols)
+        
+        trees_outside_new_bounds = conflicts['trees']
+        if trees_outside_new_bounds:
+            print(f"❌ Cannot resize: {len(trees_outside_new_bounds)} trees would be outside bounds")
+            return jsonify({
+                'success': False, 
+                'error': f'Cannot resize: {len(trees_outside_new_bounds)} trees would be outside the new grid bounds',
+                'affected_trees': trees_outside_new_bounds,
+                'details': f'New size: {new_rows}x{new_cols}, Affected trees at positions: {[t["position"] for t in trees_outside_new_bounds]}'
+            }), 400
+        
+        areas_outside_new_bounds = conflicts['drag_areas']
+        if areas_outside_new_bounds:
+            print(f"❌ Cannot resize: {len(areas_outside_new_bounds)} drag areas would be outside bounds")
+            return jsonify({
+                'success': False,
+                'error': f'Cannot resize: {len(areas_outside_new_bounds)} drag areas would be outside the new grid bounds',
+                'affected_areas': areas_outside_new_bounds,
+                'details': f'New size: {new_rows}x{new_cols}, Affected areas: {[a["name"] for a in areas_outside_new_bounds]}'
+            }), 400
+        
+        regular_areas_outside_bounds = conflicts['regular_areas']
+        if regular_areas_outside_bounds:
+            print(f"❌ Cannot resize: {len(regular_areas_outside_bounds)} regular areas would be outside bounds")
+            return jsonify({
+                'success': False,
+                'error': f'Cannot resize: {len(regular_areas_outside_bounds)} regular areas would be outside the new grid bounds',
+                'affected_regular_areas': regular_areas_outside_bounds,
+                'details': f'New size: {new_rows}x{new_cols}, Affected areas: {[a["name"] for a in regular_areas_outside_bounds]}'
+            }), 400
+        
+        # Update dome grid size
+        old_rows = dome.internal_rows
+        old_cols = dome.internal_cols
+        
+        dome.internal_rows = new_rows
+        dome.internal_cols = new_cols
+        dome.updated_at = datetime.utcnow()
+        
+        # Commit changes
+        db.session.commit()
+        
+        print(f"✅ Successfully updated dome {dome_id} grid size from {old_rows}x{old_cols} to {new_rows}x{new_cols}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Grid size updated to {new_rows}x{new_cols}',
+            'dome': {
+                'id': dome.id,
+                'name': dome.name,
+                'internal_rows': dome.internal_rows,
+                'internal_cols': dome.internal_cols,
+                'farm_id': dome.farm_id
+            },
+            'old_size': {'rows': old_rows, 'cols': old_cols},
+            'new_size': {'rows': new_rows, 'cols': new_cols},
+            'grid_type': grid_type
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error updating dome grid size: {str(e)}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@domes_bp.route('/update_dome_grid/<int:dome_id>', methods=['POST'])
+@login_required
+def update_dome_grid(dome_id):
+    """Update dome internal grid size"""
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        data = request.get_json()
+        new_rows = data.get('rows')
+        new_cols = data.get('cols')
+        
+        print(f"🔧 Updating dome {dome_id} internal grid size to {new_rows}x{new_cols}")
+        
+        # Validation
+        if not new_rows or not new_cols:
+            return jsonify({'success': False, 'error': 'Rows and columns are required'}), 400
+        
+        try:
+            new_rows = int(new_rows)
+            new_cols = int(new_cols)
+        except (ValueError, TypeError):
+            return jsonify({'success': False, 'error': 'Invalid grid size values'}), 400
+        
+        # Validate size bounds
+        if new_rows < 1 or new_cols < 1 or new_rows > 100 or new_cols > 100:
+            return jsonify({'success': False, 'error': 'Grid size must be between 1x1 and 100x100'}), 400
+        
+        # Check if shrinking would affect existing trees or areas
+        if new_rows < (dome.internal_rows or 5) or new_cols < (dome.internal_cols or 5):
+            conflicts = dome.find_resize_conflicts(new_rows, new_cols)
+            
+            if conflicts['trees']:
+                tree_names = [tree['name'] for tree in conflicts['trees']]
+                return jsonify({
+                    'success': False, 
+                    'error': f'Cannot shrink grid. Trees would be affected: {", ".join(tree_names)}'
+                }), 400
+            
+            affected_areas = conflicts['drag_areas'] + conflicts['regular_areas']
+            if affected_areas:
+                area_names = [area['name'] for area in affected_areas]
+                return jsonify({
+                    'success': False,
+                    'error': f'Cannot shrink grid. Areas would be affected: {", ".join(area_names)}'
+                }), 400
+        
+        # Update dome internal grid size
+        dome.internal_rows = new_rows
+        dome.internal_cols = new_cols
+        dome.updated_at = datetime.utcnow()
+        
+        db.session.commit()
+        
+        print(f"✅ Dome {dome_id} internal grid size updated to {new_rows}x{new_cols}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Dome grid updated to {new_rows}x{new_cols}',
+            'dome': {
+                'id': dome.id,
+                'internal_rows': dome.internal_rows,
+                'internal_cols': dome.internal_cols
+            }
+        })
+        
+    except Exception as e:
+        print(f"❌ Error updating dome grid size: {str(e)}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@domes_bp.route('/domes')
+@login_required
+def domes():
+    """Redirect to farms - no more global domes"""
+    flash('Please select a farm to view its domes', 'info')
+    return redirect(url_for('farms.farms'))
+
+
+@domes_bp.route('/api/dome/<int:dome_id>/breeds')
+@login_required
+def get_dome_breeds(dome_id):
+    """Get breeds for a dome's farm"""
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get breeds for this dome's farm
+        breeds = TreeBreed.query.filter_by(
+            farm_id=dome.farm_id, 
+            user_id=current_user.id, 
+            is_active=True
+        ).all()
+        
+        usage = TreeBreed.usage_counts(breed.id for breed in breeds)
+        breeds_data = [breed.to_dict(usage.get(breed.id, TreeBreed.EMPTY_USAGE)) for breed in breeds]
+        
+        return jsonify({
+            'success': True,
+            'breeds': breeds_data,
+            'count': len(breeds_data)
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting dome breeds: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@domes_bp.route('/update_dome_name/<int:dome_id>', methods=['POST'])
+@login_required
+def update_dome_name(dome_id):
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify(success=False, error="Dome not found"), 404
+        
+        data = request.json
+        dome.name = data.get('name', dome.name)
+        db.session.commit()
+        
+        return jsonify(success=True)
+        
+    except Exception as e:
+        print(f"Error updating dome name: {e}")
+        db.session.rollback()
+        return jsonify(success=False, error=str(e)), 500
+
+
+@domes_bp.route('/delete_dome/<int:dome_id>', methods=['DELETE'])
+def delete_dome(dome_id):
+    try:
+        print(f"🗑️ Starting dome deletion for dome_id: {dome_id}")
+        print(f"🔍 Session data: {dict(session)}")
+        print(f"🔍 Session keys: {list(session.keys())}")
+        
+        # ✅ FIXED: Correct authentication logic
+        user_id = None
+        
+        # Method 1: Check for _user_id (Flask-Login format)
+        if '_user_id' in session:
+            user_id = session['_user_id']
+            print(f"✅ Found _user_id in session: {user_id}")
+        
+        # Method 2: Check for user_id (standard format)
+        elif 'user_id' in session:
+            user_id = session['user_id']
+            print(f"✅ Found user_id in session: {user_id}")
+        
+        # Method 3: Check for id
+        elif 'id' in session:
+            user_id = session['id']
+            print(f"✅ Found id in session: {user_id}")
+        
+        # ✅ FALLBACK: Use dome owner if no session auth found
+        if not user_id:
+            print("⚠️ No user authentication found, using dome owner fallback")
+            dome_check = db.session.query(Dome).filter_by(id=dome_id).first()
+            if dome_check:
+                user_id = dome_check.user_id
+                print(f"🔧 Using dome owner as user_id: {user_id}")
+            else:
+                print(f"❌ Dome {dome_id} not found in database")
+                return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        if not user_id:
+            print("❌ No user authentication available")
+            return jsonify({'success': False, 'error': 'User not authenticated'}), 401
+        
+        # Find the dome and verify ownership
+        dome = db.session.query(Dome).filter_by(id=dome_id, user_id=user_id).first()
+        if not dome:
+            print(f"❌ Dome {dome_id} not found or not owned by user {user_id}")
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        print(f"✅ Found dome: {dome.name} (ID: {dome_id}) owned by user {user_id}")
+        
+        dome_name = dome.name
+        
+        # ✅ Ordered bulk DELETEs in one transaction (optionally as a background job)
+        job_id = queue_scope_deletion('dome', dome_id, user_id)
+        if job_id:
+            return jsonify({
+                'success': True,
+                'message': f'Deletion of dome "{dome_name}" started',
+                'job_id': job_id,
+                'status_url': url_for('farms.get_deletion_job_status', job_id=job_id)
+            }), 202
+        
+        result = delete_scope('dome', dome_id)
+        deleted = result['deleted']
+        
+        print(f"✅ Dome deletion completed successfully!")
+        print(f"📊 Summary: {deleted['trees']} trees, {deleted['drag_areas']} drag areas, {deleted['regular_areas']} regular areas, {deleted['relationships']} relationships")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Dome "{dome_name}" deleted successfully',
+            'deleted': deleted
+        })
+        
+    except Exception as e:
+        print(f"❌ Error deleting dome: {e}")
+        db.session.rollback()
+        
+        # More specific error handling
+        if "NOT NULL constraint failed" in str(e):
+            error_msg = "Database constraint error: Unable to delete dome due to related data."
+        elif "FOREIGN KEY constraint failed" in str(e):
+            error_msg = "Foreign key constraint error: Please delete related areas and trees first."
+        elif "no such table" in str(e):
+            error_msg = "Database schema error: Missing required tables."
+        elif "not defined" in str(e):
+            error_msg = "Model definition error: Missing required models."
+        else:
+            error_msg = f"Database error: {str(e)}"
+        
+        return jsonify({
+            'success': False,
+            'error': error_msg,
+            'details': str(e)
+        }), 500
+
+
+@domes_bp.route('/force_delete_dome/<int:dome_id>', methods=['DELETE'])
+def force_delete_dome(dome_id):
+    try:
+        print(f"🚨 Force deleting dome {dome_id}")
+        print(f"🔍 Session data: {dict(session)}")
+        
+        # ✅ FIXED: Same authentication logic as above
+        user_id = None
+        
+        if '_user_id' in session:
+            user_id = session['_user_id']
+        elif 'user_id' in session:
+            user_id = session['user_id']
+        elif 'id' in session:
+            user_id = session['id']
+        
+        # ✅ FALLBACK: Use dome owner for force delete
+        if not user_id:
+            print("⚠️ No user authentication found for force delete, using dome owner fallback")
+            dome_check = db.session.query(Dome).filter_by(id=dome_id).first()
+            if dome_check:
+                user_id = dome_check.user_id
+                print(f"🔧 Using dome owner as user_id: {user_id}")
+            else:
+                return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Verify dome exists (skip ownership check for force delete)
+        dome = db.session.query(Dome).filter_by(id=dome_id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        print(f"✅ Force deleting dome: {dome.name} (ID: {dome_id})")
+        
+        job_id = queue_scope_deletion('dome', dome_id, user_id)
+        if job_id:
+            return jsonify({
+                'success': True,
+                'message': 'Dome force deletion started',
+                'job_id': job_id,
+                'status_url': url_for('farms.get_deletion_job_status', job_id=job_id)
+            }), 202
+        
+        result = delete_scope('dome', dome_id)
+        
+        print(f"✅ Force delete completed for dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Dome force deleted successfully',
+            'deleted': result['deleted']
+        })
+        
+    except Exception as e:
+        print(f"❌ Force delete failed: {e}")
+        db.session.rollback()
+        
+        return jsonify({
+            'success': False,
+            'error': f'Force delete failed: {str(e)}'
+        }), 500
+
+
+# ============= DOME IMAGE MANAGEMENT =============
+@domes_bp.route('/delete_dome_noauth/<int:dome_id>', methods=['DELETE'])
+def delete_dome_noauth(dome_id):
+    """
+    TEMPORARY ROUTE FOR TESTING - REMOVE IN PRODUCTION
+    This bypasses authentication to test the deletion logic
+    """
+    try:
+        print(f"🚨 NO-AUTH deletion for dome {dome_id} (TESTING ONLY)")
+        
+        # Find the dome without authentication check
+        dome = db.session.query(Dome).filter_by(id=dome_id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        print(f"✅ Found dome: {dome.name} (ID: {dome_id})")
+        dome_name = dome.name
+        
+        # Use the same deletion service as the authenticated route
+        result = delete_scope('dome', dome_id)
+        
+        print(f"✅ NO-AUTH deletion completed for dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Dome "{dome_name}" deleted successfully (no-auth)',
+            'deleted': result['deleted']
+        })
+        
+    except Exception as e:
+        print(f"❌ NO-AUTH deletion failed: {e}")
+        db.session.rollback()
+        
+        return jsonify({
+            'success': False,
+            'error': f'NO-AUTH deletion failed: {str(e)}'
+        }), 500
+
+
+# Update your dome_info route in app.py to handle the count error
+@domes_bp.route('/dome_info/<int:dome_id>')
+@login_required
+def dome_info(dome_id):
+    """Display dome information page"""
+    try:
+        print(f"🎯 Dome info route called for dome_id: {dome_id}")
+        print(f"🎯 User ID: {current_user.id}")
+        
+        # Get dome with ownership verification
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            print(f"❌ Dome {dome_id} not found or access denied")
+            flash('Dome not found or access denied', 'error')
+            return redirect(url_for('farms.farms'))
+        
+        print(f"✅ Dome found: {dome_id}")
+        
+        # ✅ FIXED: Safer tree counting
+        try:
+            tree_count = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).count()
+            print(f"✅ Tree count using .count(): {tree_count}")
+        except Exception as count_error:
+            print(f"⚠️ .count() method failed: {count_error}")
+            try:
+                trees_list = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+                tree_count = len(trees_list)
+                print(f"✅ Tree count using len(): {tree_count}")
+            except Exception as len_error:
+                print(f"⚠️ len() method also failed: {len_error}")
+                tree_count = 0
+                print("⚠️ Using fallback count: 0")
+        
+        # ✅ FIXED: Safer mother/cutting counts
+        try:
+            mother_count = Tree.query.filter_by(
+                dome_id=dome_id, 
+                user_id=current_user.id, 
+                plant_type='mother'
+            ).count()
+        except:
+            try:
+                all_trees = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+                mother_count = len([t for t in all_trees if t.plant_type == 'mother'])
+            except:
+                mother_count = 0
+        
+        try:
+            cutting_count = Tree.query.filter_by(
+                dome_id=dome_id, 
+                user_id=current_user.id, 
+                plant_type='cutting'
+            ).count()
+        except:
+            try:
+                all_trees = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+                cutting_count = len([t for t in all_trees if t.plant_type == 'cutting'])
+            except:
+                cutting_count = 0
+        
+        # ✅ FIXED: Safer relationship count
+        try:
+            relationship_count = PlantRelationship.query.filter_by(dome_id=dome_id, user_id=current_user.id).count()
+        except:
+            try:
+                all_relationships = PlantRelationship.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+                relationship_count = len(all_relationships)
+            except:
+                relationship_count = 0
+        
+        # Calculate dome statistics
+        total_capacity = dome.internal_rows * dome.internal_cols
+        occupancy_rate = (tree_count / total_capacity * 100) if total_capacity > 0 else 0
+        
+        # Get recent activity (last 30 days)
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        try:
+            recent_trees = Tree.query.filter(
+                Tree.dome_id == dome_id,
+                Tree.user_id == current_user.id,
+                Tree.created_at >= thirty_days_ago
+            ).count()
+        except:
+            try:
+                all_trees = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+                recent_trees = len([t for t in all_trees if t.created_at and t.created_at >= thirty_days_ago])
+            except:
+                recent_trees = 0
+        
+        try:
+            recent_relationships = PlantRelationship.query.filter(
+                PlantRelationship.dome_id == dome_id,
+                PlantRelationship.user_id == current_user.id,
+                PlantRelationship.cutting_date >= thirty_days_ago
+            ).count()
+        except:
+            try:
+                all_relationships = PlantRelationship.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+                recent_relationships = len([r for r in all_relationships if r.cutting_date and r.cutting_date >= thirty_days_ago])
+            except:
+                recent_relationships = 0
+        
+        # Prepare dome statistics
+        dome_stats = {
+            'dome': dome.to_dict(),
+            'capacity': {
+                'total': total_capacity,
+                'occupied': tree_count,
+                'available': total_capacity - tree_count,
+                'occupancy_rate': round(occupancy_rate, 1)
+            },
+            'trees': {
+                'total': tree_count,
+                'mothers': mother_count,
+                'cuttings': cutting_count,
+                'recent': recent_trees
+            },
+            'relationships': {
+                'total': relationship_count,
+                'recent': recent_relationships
+            }
+        }
+        
+        print(f"📊 Dome stats calculated: {tree_count} trees, {mother_count} mothers, {cutting_count} cuttings")
+        
+        # ✅ FIXED: Pass all required variables to template
+        return render_template('dome_info.html', 
+                             dome=dome, 
+                             dome_stats=dome_stats,
+                             tree_count=tree_count,  # ✅ ADD THIS
+                             mother_count=mother_count,  # ✅ ADD THIS
+                             cutting_count=cutting_count,  # ✅ ADD THIS
+                             relationship_count=relationship_count,  # ✅ ADD THIS
+                             total_capacity=total_capacity,  # ✅ ADD THIS
+                             occupancy_rate=round(occupancy_rate, 1),  # ✅ ADD THIS
+                             current_user=current_user)
+        
+    except Exception as e:
+        print(f"❌ Error in dome_info route: {str(e)}")
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}")
+        flash('Error loading dome information', 'error')
+        return redirect(url_for('farms.farms'))
+
+
+# ============= DOME GRID SIZE MANAGEMENT =============
+@domes_bp.route('/update_dome_size/<int:dome_id>', methods=['POST'])
+@login_required
+def update_dome_size(dome_id):
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify(success=False, error="Dome not found"), 404
+        
+        data = request.json
+        new_rows = data.get('rows', dome.internal_rows)
+        new_cols = data.get('cols', dome.internal_cols)
+        
+        # Validate size
+        if new_rows < 1 or new_cols < 1 or new_rows > 50 or new_cols > 50:
+            return jsonify(success=False, error="Grid size must be between 1x1 and 50x50"), 400
+        
+        # Check if shrinking would affect existing trees or areas
+        if new_rows < dome.internal_rows or new_cols < dome.internal_cols:
+            conflicts = dome.find_resize_conflicts(new_rows, new_cols)
+            
+            if conflicts['trees']:
+                tree_names = [tree['name'] for tree in conflicts['trees']]
+                return jsonify(
+                    success=False, 
+                    error=f"Cannot shrink grid. Trees would be affected: {', '.join(tree_names)}"
+                ), 400
+            
+            affected_areas = conflicts['drag_areas'] + conflicts['regular_areas']
+            if affected_areas:
+                area_names = [area['name'] for area in affected_areas]
+                return jsonify(
+                    success=False,
+                    error=f"Cannot shrink grid. Areas would be affected: {', '.join(area_names)}"
+                ), 400
+        
+        # Update dome size
+        dome.internal_rows = new_rows
+        dome.internal_cols = new_cols
+        
+        db.session.commit()
+        
+        return jsonify(success=True)
+        
+    except Exception as e:
+        print(f"Error updating dome size: {e}")
+        db.session.rollback()
+        return jsonify(success=False, error=str(e)), 500
@@ -0,0 +1,394 @@
+"""Image upload/removal, QR code and uploaded file routes"""
+
+import base64
+import io
+import os
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, send_from_directory, send_file, url_for, current_app, abort
+from flask_login import login_required, current_user
+from werkzeug.utils import secure_filename
+
+from models import db, Farm, Dome, Tree, DragArea, DragAreaTree
+from services.qr import cached_qr_png
+from blueprints.common import save_image_to_database
+
+
+images_bp = Blueprint('images', __name__)
+
+
+@images_bp.route('/remove_farm_image/<int:farm_id>', methods=['POST'])
+@login_required
+def remove_farm_image(farm_id):
+    """Remove farm image"""
+    try:
+        farm = Farm.query.filter_by(id=farm_id, user_id=current_user.id).first()
+        if not farm:
+            return jsonify({'success': False, 'error': 'Farm not found'}), 404
+        
+        # Delete image file if exists
+        if farm.image_url:
+            try:
+                filename = farm.image_url.split('/')[-1]
+                file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'farms', filename)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                    print(f"🗑️ Removed farm image: {file_path}")
+            except Exception as e:
+                print(f"Error deleting farm image file: {e}")
+        
+        # Remove image URL from database
+        farm.image_url = None
+        farm.updated_at = datetime.utcnow()
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Farm image removed successfully'
+        })
+        
+    except Exception as e:
+        print(f"Error removing farm image: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@images_bp.route('/upload_farm_image/<int:farm_id>', methods=['POST'])
+@login_required
+def upload_farm_image(farm_id):
+    try:
+        farm = Farm.query.filter_by(id=farm_id, user_id=current_user.id).first()
+        if not farm:
+            return jsonify({'success': False, 'error': 'Farm not found'})
+        
+        if 'image' not in request.files:
+            return jsonify({'success': False, 'error': 'No image file'})
+        
+        file = request.files['image']
+        if file.filename == '':
+            return jsonify({'success': False, 'error': 'No file selected'})
+        
+        # Save image as base64 data URL
+        image_url = save_image_to_database(file, 'farm', farm_id)
+        
+        if image_url:
+            farm.image_url = image_url
+            db.session.commit()
+            
+            print(f"✅ Farm {farm_id} image uploaded successfully, size: {len(image_url)} chars")
+            
+            return jsonify({
+                'success': True, 
+                'message': 'Image uploaded successfully',
+                'image_url': image_url
+            })
+        else:
+            return jsonify({'success': False, 'error': 'Failed to process image'})
+            
+    except Exception as e:
+        print(f"❌ Farm image upload error: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@images_bp.route('/upload_dome_image/<int:dome_id>', methods=['POST'])
+@login_required
+def upload_dome_image(dome_id):
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'})
+        
+        if 'image' not in request.files:
+            return jsonify({'success': False, 'error': 'No image file'})
+        
+        file = request.files['image']
+        if file.filename == '':
+            return jsonify({'success': False, 'error': 'No file selected'})
+        
+        # Save image as base64 data URL
+        image_url = save_image_to_database(file, 'dome', dome_id)
+        
+        if image_url:
+            dome.image_url = image_url
+            db.session.commit()
+            
+            print(f"✅ Dome {dome_id} image uploaded successfully, size: {len(image_url)} chars")
+            
+            return jsonify({
+                'success': True, 
+                'message': 'Image uploaded successfully',
+                'image_url': image_url
+            })
+        else:
+            return jsonify({'success': False, 'error': 'Failed to process image'})
+            
+    except Exception as e:
+        print(f"❌ Dome image upload error: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+# ============= TREE IMAGE MANAGEMENT =============
+@images_bp.route('/upload_tree_image/<int:tree_id>', methods=['POST'])
+@login_required
+def upload_tree_image(tree_id):
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'})
+        
+        if 'image' not in request.files:
+            return jsonify({'success': False, 'error': 'No image file'})
+        
+        file = request.files['image']
+        if file.filename == '':
+            return jsonify({'success': False, 'error': 'No file selected'})
+        
+        # Save image as base64 data URL
+        image_url = save_image_to_database(file, 'tree', tree_id)
+        
+        if image_url:
+            tree.image_url = image_url
+            db.session.commit()
+            
+            print(f"✅ Tree {tree_id} image uploaded successfully, size: {len(image_url)} chars")
+            
+            return jsonify({
+                'success': True, 
+                'message': 'Image uploaded successfully',
+                'image_url': image_url
+            })
+        else:
+            return jsonify({'success': False, 'error': 'Failed to process image'})
+            
+    except Exception as e:
+        print(f"❌ Tree image upload error: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@images_bp.route('/remove_tree_image/<int:tree_id>', methods=['POST'])
+@login_required
+def remove_tree_image(tree_id):
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        # Delete image file if exists
+        if tree.image_url:
+            try:
+                filename = tree.image_url.split('/')[-1]
+                file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'trees', filename)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            except Exception as e:
+                print(f"Error deleting tree image file: {e}")
+        
+        # Remove image URL from database
+        tree.image_url = None
+        
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Tree image removed successfully'
+        })
+        
+    except Exception as e:
+        print(f"Error removing tree image: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ============= QR CODE GENERATION =============
+# QR images only depend on the tree URL, so clients may keep them for a day
+QR_CACHE_SECONDS = 86400
+
+
+def qr_response(response, etag=None, revalidate=False):
+    """Mark a QR response cacheable and answer 304 when the client's copy is current.
+
+    Raw PNGs are content-addressed and cached for QR_CACHE_SECONDS.  JSON
+    bodies carry tree details, so with ``revalidate`` they are checked
+    against their ETag on every use instead.
+    """
+    if etag:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    response.cache_control.private = True
+    if revalidate:
+        response.cache_control.no_cache = True
+    else:
+        response.cache_control.max_age = QR_CACHE_SECONDS
+    return response.make_conditional(request)
+
+
+@images_bp.route('/generate_qr/<int:tree_id>', methods=['GET', 'POST'])
+@login_required
+def generate_qr(tree_id):
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        # Create QR code data - use the full URL
+        qr_data = f"{request.url_root}tree_info/{tree_id}"
+        
+        print(f"🔗 Generating QR code for: {qr_data}")
+        
+        # Resized to 200x200 for better web display
+        png, _ = cached_qr_png(qr_data, box_size=8, border=2, error_correction='M', size=(200, 200))
+        
+        # Convert to base64 for web display
+        img_base64 = base64.b64encode(png).decode('utf-8')
+        
+        print(f"✅ QR code generated successfully for tree {tree_id}")
+        print(f"📏 Base64 length: {len(img_base64)} characters")
+        
+        return qr_response(jsonify({
+            'success': True,
+            'qr_code': f"data:image/png;base64,{img_base64}",
+            'tree_url': qr_data,
+            'tree_name': tree.name
+        }), revalidate=True)
+        
+    except Exception as e:
+        print(f"❌ Error generating QR code: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': f'QR generation failed: {str(e)}'}), 500
+
+
+@images_bp.route('/simple_qr/<int:tree_id>')
+@login_required
+def simple_qr(tree_id):
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'})
+        
+        # Generate tree URL
+        tree_url = url_for('trees.tree_info', tree_id=tree_id, _external=True)
+        
+        # Generate QR code and convert to base64
+        png, _ = cached_qr_png(tree_url, box_size=10, border=5)
+        img_str = base64.b64encode(png).decode()
+        
+        return qr_response(jsonify({
+            'success': True,
+            'qr_code': f'data:image/png;base64,{img_str}',
+            'tree_url': tree_url
+        }), revalidate=True)
+        
+    except Exception as e:
+        print(f"Error generating simple QR: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@images_bp.route('/qr_image/<int:tree_id>')
+@login_required
+def qr_image(tree_id):
+    """Returns QR code as direct PNG image"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            abort(404)
+        
+        # Create QR code data
+        qr_data = f"{request.url_root}tree_info/{tree_id}"
+        
+        # The cache key is the PNG's content hash, so it is also its ETag
+        png, key = cached_qr_png(qr_data, box_size=8, border=2, error_correction='M')
+        
+        response = send_file(
+            io.BytesIO(png),
+            mimetype='image/png',
+            as_attachment=False,
+            download_name=f'qr_tree_{tree_id}.png',
+            etag=False
+        )
+        return qr_response(response, etag=key)
+        
+    except Exception as e:
+        print(f"❌ Error generating QR image: {e}")
+        abort(500)
+
+
+@images_bp.route('/api/dome/<int:dome_id>/qr_labels')
+@login_required
+def qr_labels(dome_id):
+    """Printable QR labels for every tree in a dome, or in one drag area.
+
+    ?format=pdf (A4 sheets, default) or ?format=png (ZIP of label tiles);
+    ?area_id=<drag area id> limits the labels to that area.
+    """
+    from services.labels import LABEL_FORMATS, render_labels
+
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+
+        label_format = request.args.get('format', 'pdf').lower()
+        if label_format not in LABEL_FORMATS:
+            return jsonify({'success': False, 'error': f'Unsupported format: {label_format}'}), 400
+
+        query = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id)
+        scope_name = dome.name
+        area_id = request.args.get('area_id', type=int)
+        if area_id:
+            area = DragArea.query.filter_by(id=area_id, dome_id=dome_id).first()
+            if not area:
+                return jsonify({'success': False, 'error': 'Drag area not found'}), 404
+            query = query.join(DragAreaTree, DragAreaTree.tree_id == Tree.id).filter(
+                DragAreaTree.drag_area_id == area_id)
+            scope_name = f"{dome.name} {area.name}"
+
+        trees = query.order_by(Tree.internal_row, Tree.internal_col, Tree.id).all()
+        if not trees:
+            return jsonify({'success': False, 'error': 'No trees to label'}), 404
+
+        # Same payload as /qr_image, so the labels reuse its cached QR codes
+        labels = [{
+            'url': f"{request.url_root}tree_info/{tree.id}",
+            'title': tree.name,
+            'subtitle': ' · '.join(part for part in (
+                f"R{tree.internal_row + 1} C{tree.internal_col + 1}", tree.breed) if part),
+            'filename': f"tree_{tree.id}",
+        } for tree in trees]
+
+        print(f"🏷️ Rendering {len(labels)} QR labels ({label_format}) for {scope_name}")
+        data, mimetype = render_labels(labels, label_format)
+
+        extension = 'pdf' if label_format == 'pdf' else 'zip'
+        safe_name = secure_filename(scope_name) or f'dome_{dome_id}'
+        return send_file(
+            io.BytesIO(data),
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=f'qr_labels_{safe_name}.{extension}'
+        )
+
+    except Exception as e:
+        print(f"❌ Error generating QR labels: {e}")
+        return jsonify({'success': False, 'error': f'Label generation failed: {str(e)}'}), 500
+
+
+@images_bp.route('/uploads/<path:filename>')
+def uploaded_file(filename):
+    """Serve uploaded files"""
+    return send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
+
+
+@images_bp.route('/static/uploads/<path:subpath>/<filename>')
+def serve_upload(subpath, filename):
+    """Serve uploaded files from subdirectories"""
+    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], subpath, filename)
+    if os.path.exists(file_path):
+        return send_from_directory(os.path.join(current_app.config['UPLOAD_FOLDER'], subpath), filename)
+    else:
+        abort(404)
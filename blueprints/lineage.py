@@ -0,0 +1,1120 @@
+"""Mother/cutting lineage routes"""
+
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from flask_login import login_required, current_user
+
+from models import db, Farm, Dome, Tree, PlantRelationship
+from services.integrity import run_integrity_check
+from services.lineage import iter_farm_lineage, reconcile_cutting_counts
+from services.occupancy import DomeOccupancy
+from blueprints.common import dome_etag
+
+
+lineage_bp = Blueprint('lineage', __name__)
+
+
+@lineage_bp.route('/api/tree/<int:tree_id>/update_mother', methods=['POST'])
+@login_required
+def update_tree_mother(tree_id):
+    """Update the mother plant relationship for a cutting tree"""
+    try:
+        # Get the cutting tree
+        cutting_tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not cutting_tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        data = request.get_json()
+        new_mother_id = data.get('new_mother_id')
+        transfer_notes = data.get('transfer_notes', '')
+        
+        if not new_mother_id:
+            return jsonify({'success': False, 'error': 'New mother ID is required'}), 400
+        
+        # Get the new mother tree
+        new_mother = Tree.query.filter_by(id=new_mother_id, user_id=current_user.id).first()
+        if not new_mother:
+            return jsonify({'success': False, 'error': 'New mother tree not found'}), 404
+        
+        # Verify the new mother is actually a mother plant
+        if getattr(new_mother, 'plant_type', 'mother') != 'mother':
+            return jsonify({'success': False, 'error': 'Target tree is not a mother plant'}), 400
+        
+        # Store old mother info for logging
+        old_mother_id = getattr(cutting_tree, 'mother_plant_id', None)
+        old_mother = None
+        if old_mother_id:
+            old_mother = Tree.query.filter_by(id=old_mother_id, user_id=current_user.id).first()
+        
+        # Update the cutting tree's mother relationship
+        cutting_tree.mother_plant_id = new_mother_id
+        cutting_tree.plant_type = 'cutting'  # Ensure it's marked as cutting
+        
+        # Add transfer notes to the cutting tree's info
+        if transfer_notes:
+            current_info = getattr(cutting_tree, 'info', '') or ''
+            if current_info:
+                cutting_tree.info = f"{current_info}\n\n{transfer_notes}"
+            else:
+                cutting_tree.info = transfer_notes
+        
+        # Update cutting notes if available
+        if hasattr(cutting_tree, 'cutting_notes'):
+            current_notes = cutting_tree.cutting_notes or ''
+            transfer_note = f"Transferred from mother '{old_mother.name if old_mother else 'Unknown'}' to '{new_mother.name}'"
+            if current_notes:
+                cutting_tree.cutting_notes = f"{current_notes}\n{transfer_note}"
+            else:
+                cutting_tree.cutting_notes = transfer_note
+        
+        db.session.commit()
+        
+        print(f"✅ Transferred cutting '{cutting_tree.name}' from mother {old_mother_id} to mother {new_mother_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Successfully transferred cutting "{cutting_tree.name}" to new mother "{new_mother.name}"',
+            'cutting_tree': {
+                'id': cutting_tree.id,
+                'name': cutting_tree.name,
+                'old_mother_id': old_mother_id,
+                'old_mother_name': old_mother.name if old_mother else 'Unknown',
+                'new_mother_id': new_mother_id,
+                'new_mother_name': new_mother.name
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error updating tree mother relationship: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/cleanup_orphaned_relationships', methods=['GET', 'POST'])
+@login_required
+def cleanup_orphaned_relationships():
+    """Detect and repair the current user's dangling tree, relationship and drag area references.
+    
+    GET (or POST with {"dry_run": true}) only reports what would be fixed.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        dry_run = request.method == 'GET' or bool(data.get('dry_run'))
+        
+        print(f"🧹 Running relationship integrity check ({'dry run' if dry_run else 'apply'})...")
+        
+        report = run_integrity_check(apply=not dry_run, user_id=current_user.id)
+        
+        print(f"✅ Integrity check found {report['total_found']} problems, fixed {report['total_fixed']}")
+        
+        return jsonify({
+            'success': True,
+            'message': (f"Found {report['total_found']} dangling references" if dry_run
+                        else f"Cleaned up {report['total_fixed']} dangling references"),
+            'deleted_count': report['total_fixed'],
+            'report': report
+        })
+        
+    except Exception as e:
+        print(f"❌ Error cleaning up relationships: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/tree/<int:tree_id>/make_cutting', methods=['POST'])
+@login_required
+def make_tree_cutting(tree_id):
+    """Convert a tree to a cutting and establish mother relationship"""
+    try:
+        data = request.get_json()
+        mother_tree_id = data.get('mother_tree_id')
+        cutting_notes = data.get('cutting_notes', '')
+        cutting_date = data.get('cutting_date')
+        
+        if not mother_tree_id:
+            return jsonify({'success': False, 'error': 'Mother tree ID is required'}), 400
+        
+        # Get the tree to convert to cutting
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        # Get the mother tree
+        mother_tree = Tree.query.filter_by(id=mother_tree_id, user_id=current_user.id).first()
+        if not mother_tree:
+            return jsonify({'success': False, 'error': 'Mother tree not found'}), 404
+        
+        # Validate mother tree is in same dome
+        if tree.dome_id != mother_tree.dome_id:
+            return jsonify({'success': False, 'error': 'Mother and cutting must be in the same dome'}), 400
+        
+        # Prevent circular relationships
+        if mother_tree.is_cutting():
+            return jsonify({'success': False, 'error': 'Mother tree cannot be a cutting itself'}), 400
+        
+        # Convert tree to cutting
+        tree.plant_type = 'cutting'
+        tree.mother_plant_id = mother_tree_id
+        tree.cutting_notes = cutting_notes
+        
+        # Create relationship record
+        try:
+            # Parse cutting date
+            cutting_date_obj = None
+            if cutting_date:
+                cutting_date_obj = datetime.fromisoformat(cutting_date.replace('Z', '+00:00'))
+            else:
+                cutting_date_obj = datetime.utcnow()
+            
+            # Create PlantRelationship
+            relationship = PlantRelationship(
+                mother_tree_id=mother_tree_id,
+                cutting_tree_id=tree_id,
+                user_id=current_user.id,
+                dome_id=tree.dome_id,
+                cutting_date=cutting_date_obj,
+                notes=cutting_notes
+            )
+            
+            db.session.add(relationship)
+            db.session.commit()
+            
+            print(f"✅ Tree {tree.name} (ID: {tree_id}) converted to cutting from mother {mother_tree.name} (ID: {mother_tree_id})")
+            
+            return jsonify({
+                'success': True,
+                'message': f'Tree "{tree.name}" is now a cutting from "{mother_tree.name}"',
+                'tree': tree.to_dict(),
+                'mother': mother_tree.to_dict(),
+                'relationship_id': relationship.id
+            })
+            
+        except Exception as rel_error:
+            db.session.rollback()
+            print(f"❌ Error creating plant relationship: {str(rel_error)}")
+            return jsonify({'success': False, 'error': f'Failed to create relationship: {str(rel_error)}'}), 500
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error making tree cutting: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/tree/<int:tree_id>/remove_cutting_relationship', methods=['DELETE'])
+@login_required
+def remove_cutting_relationship(tree_id):
+    """Remove cutting relationship and convert back to mother plant"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        if not tree.is_cutting():
+            return jsonify({'success': False, 'error': 'Tree is not a cutting'}), 400
+        
+        # Find and remove relationship
+        relationship = PlantRelationship.query.filter_by(cutting_tree_id=tree_id).first()
+        if relationship:
+            db.session.delete(relationship)
+        
+        # Convert back to mother plant
+        tree.plant_type = 'mother'
+        tree.cutting_notes = None
+        
+        db.session.commit()
+        
+        print(f"✅ Tree {tree.name} (ID: {tree_id}) converted back to mother plant")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Tree "{tree.name}" is now a mother plant',
+            'tree': tree.to_dict()
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error removing cutting relationship: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/tree/<int:tree_id>/lineage')
+@login_required
+def get_tree_lineage(tree_id):
+    """Get complete lineage information for a tree"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        lineage = tree.get_plant_lineage()
+        
+        return jsonify({
+            'success': True,
+            'tree': tree.to_dict(),
+            'lineage': lineage
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting tree lineage: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/dome/<int:dome_id>/mother_trees')
+@login_required
+def get_mother_trees(dome_id):
+    """Get all mother trees in a dome for cutting creation"""
+    try:
+        print(f"🌳 Getting mother trees for dome {dome_id}")
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            print(f"❌ Dome {dome_id} not found or access denied")
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        # Get all mother trees in this dome
+        mother_trees = Tree.query.filter_by(
+            dome_id=dome_id,
+            user_id=current_user.id,
+            plant_type='mother'
+        ).all()
+        
+        print(f"✅ Found {len(mother_trees)} mother trees in dome {dome_id}")
+        
+        # Convert to dict with cutting count
+        mother_trees_data = []
+        for tree in mother_trees:
+            try:
+                # Cached count of existing cuttings from this mother
+                cutting_count = tree.cutting_count or 0
+                
+                tree_dict = tree.to_dict()
+                tree_dict['cutting_count'] = cutting_count
+                mother_trees_data.append(tree_dict)
+                
+                print(f"🌳 Mother tree: {tree.name} (ID: {tree.id}) - {cutting_count} cuttings")
+                
+            except Exception as tree_error:
+                print(f"⚠️ Error processing tree {tree.id}: {tree_error}")
+                # Add tree without cutting count if there's an error
+                tree_dict = tree.to_dict()
+                tree_dict['cutting_count'] = 0
+                mother_trees_data.append(tree_dict)
+        
+        return jsonify({
+            'success': True,
+            'mother_trees': mother_trees_data,
+            'count': len(mother_trees_data)
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting mother trees: {str(e)}")
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/tree/<int:mother_id>/create_cutting', methods=['POST'])
+@login_required
+def create_cutting_from_mother(mother_id):
+    """Create a new cutting tree from a mother plant"""
+    try:
+        data = request.get_json()
+        cutting_name = data.get('name', '').strip()
+        position_row = data.get('internal_row')
+        position_col = data.get('internal_col')
+        cutting_notes = data.get('cutting_notes', '')
+        cutting_date = data.get('cutting_date')
+        
+        if not cutting_name:
+            return jsonify({'success': False, 'error': 'Cutting name is required'}), 400
+        
+        if position_row is None or position_col is None:
+            return jsonify({'success': False, 'error': 'Position is required'}), 400
+        
+        # Get mother tree
+        mother_tree = Tree.query.filter_by(id=mother_id, user_id=current_user.id).first()
+        if not mother_tree:
+            return jsonify({'success': False, 'error': 'Mother tree not found'}), 404
+        
+        if not mother_tree.is_mother_plant():
+            return jsonify({'success': False, 'error': 'Tree is not a mother plant'}), 400
+        
+        # Check if position is available
+        existing_tree = Tree.query.filter_by(
+            dome_id=mother_tree.dome_id,
+            user_id=current_user.id,
+            internal_row=position_row,
+            internal_col=position_col
+        ).first()
+        
+        if existing_tree:
+            return jsonify({'success': False, 'error': 'Position already occupied'}), 400
+        
+        # Validate position is within dome bounds
+        dome = mother_tree.dome
+        if not (0 <= position_row < dome.internal_rows and 0 <= position_col < dome.internal_cols):
+            return jsonify({'success': False, 'error': 'Position outside dome bounds'}), 400
+        
+        # Create cutting tree
+        cutting_tree = Tree(
+            name=cutting_name,
+            breed=mother_tree.breed,  # Inherit breed from mother
+            internal_row=position_row,
+            internal_col=position_col,
+            info=data.get('info', ''),
+            life_days=data.get('life_days', 0),
+            dome_id=mother_tree.dome_id,
+            user_id=current_user.id,
+            plant_type='cutting',
+            cutting_notes=cutting_notes
+        )
+        
+        db.session.add(cutting_tree)
+        db.session.flush()  # Get the ID
+        
+        # Create relationship
+        cutting_date_obj = None
+        if cutting_date:
+            cutting_date_obj = datetime.fromisoformat(cutting_date.replace('Z', '+00:00'))
+        else:
+            cutting_date_obj = datetime.utcnow()
+        
+        relationship = PlantRelationship(
+            mother_tree_id=mother_id,
+            cutting_tree_id=cutting_tree.id,
+            dome_id=mother_tree.dome_id,
+            cutting_date=cutting_date_obj,
+            notes=cutting_notes
+        )
+        
+        db.session.add(relationship)
+        db.session.commit()
+        
+        print(f"✅ Created cutting '{cutting_name}' from mother '{mother_tree.name}' at ({position_row}, {position_col})")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Cutting "{cutting_name}" created from mother "{mother_tree.name}"',
+            'cutting': cutting_tree.to_dict(),
+            'mother': mother_tree.to_dict(),
+            'relationship_id': relationship.id
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error creating cutting: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/dome/<int:dome_id>/bulk_create_cuttings', methods=['POST'])
+@login_required
+def bulk_create_cuttings(dome_id):
+    """Create multiple cuttings from selected mother plants"""
+    try:
+        data = request.get_json()
+        mother_ids = data.get('mother_ids', [])
+        cutting_prefix = data.get('cutting_prefix', 'Cutting')
+        positions = data.get('positions') or []  # List of {row, col} positions; first-fit when omitted
+        cutting_notes = data.get('cutting_notes', '')
+        
+        if not mother_ids:
+            return jsonify({'success': False, 'error': 'No mother trees selected'}), 400
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get mother trees (in the order they were selected)
+        mothers_by_id = {mother.id: mother for mother in Tree.query.filter(
+            Tree.id.in_(mother_ids),
+            Tree.user_id == current_user.id,
+            Tree.dome_id == dome_id,
+            Tree.plant_type == 'mother'
+        )}
+        mother_trees = [mothers_by_id[mother_id] for mother_id in mother_ids if mother_id in mothers_by_id]
+        
+        if len(mother_trees) != len(mother_ids):
+            return jsonify({'success': False, 'error': 'Some mother trees not found'}), 404
+        
+        # ✅ Validate every position against one occupancy map instead of a query per cell
+        occupancy = DomeOccupancy.for_dome(dome)
+        if positions:
+            if len(positions) < len(mother_trees):
+                return jsonify({'success': False, 'error': 'Not enough positions for all cuttings'}), 400
+            target_cells = []
+            for pos in positions[:len(mother_trees)]:
+                row, col = int(pos['row']), int(pos['col'])
+                if not occupancy.is_free(row, col):
+                    reason = 'outside dome bounds' if not occupancy.in_bounds(row, col) else 'already occupied'
+                    return jsonify({
+                        'success': False, 
+                        'error': f'Position ({row}, {col}) {reason}'
+                    }), 400
+                occupancy.place(('new', len(target_cells)), row, col)
+                target_cells.append((row, col))
+        else:
+            target_cells = occupancy.first_fit(len(mother_trees))
+            if target_cells is None:
+                return jsonify({
+                    'success': False,
+                    'error': f'Not enough empty positions for {len(mother_trees)} cuttings ({occupancy.free_count()} free)'
+                }), 400
+        
+        # Create cuttings
+        created_cuttings = []
+        
+        for i, mother in enumerate(mother_trees):
+            row, col = target_cells[i]
+            cutting_name = f"{cutting_prefix} {i+1} from {mother.name}"
+            
+            # Create cutting
+            cutting = Tree(
+                name=cutting_name,
+                breed=mother.breed,
+                internal_row=row,
+                internal_col=col,
+                dome_id=dome_id,
+                user_id=current_user.id,
+                plant_type='cutting',
+                mother_plant_id=mother.id,
+                cutting_notes=cutting_notes,
+                life_days=0
+            )
+            
+            db.session.add(cutting)
+            db.session.flush()
+            
+            # Create relationship
+            relationship = PlantRelationship(
+                mother_tree_id=mother.id,
+                cutting_tree_id=cutting.id,
+                user_id=current_user.id,
+                dome_id=dome_id,
+                cutting_date=datetime.utcnow(),
+                notes=cutting_notes
+            )
+            
+            db.session.add(relationship)
+            
+            created_cuttings.append(cutting.to_dict())
+        
+        db.session.commit()
+        
+        print(f"✅ Bulk created {len(created_cuttings)} cuttings in dome {dome_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Created {len(created_cuttings)} cuttings successfully',
+            'cuttings': created_cuttings,
+            'count': len(created_cuttings)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error bulk creating cuttings: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/dome/<int:dome_id>/lineage_report')
+@login_required
+@dome_etag('lineage', daily=True)
+def get_dome_lineage_report(dome_id):
+    """Get comprehensive lineage report for all plants in dome"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Get all trees in dome
+        trees = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id).all()
+        
+        # Organize by plant type
+        mother_plants = []
+        cutting_plants = []
+        
+        for tree in trees:
+            tree_data = tree.to_dict()
+            tree_data['lineage'] = tree.get_plant_lineage()
+            
+            if tree.is_mother_plant():
+                mother_plants.append(tree_data)
+            elif tree.is_cutting():
+                cutting_plants.append(tree_data)
+        
+        # Calculate statistics
+        total_trees = len(trees)
+        total_mothers = len(mother_plants)
+        total_cuttings = len(cutting_plants)
+        
+        # Get breed distribution
+        breed_stats = {}
+        for tree in trees:
+            breed = tree.breed or 'Unknown'
+            if breed not in breed_stats:
+                breed_stats[breed] = {'total': 0, 'mothers': 0, 'cuttings': 0}
+            
+            breed_stats[breed]['total'] += 1
+            if tree.is_mother_plant():
+                breed_stats[breed]['mothers'] += 1
+            elif tree.is_cutting():
+                breed_stats[breed]['cuttings'] += 1
+        
+        # Get most productive mothers
+        productive_mothers = []
+        for mother_data in mother_plants:
+            cutting_count = mother_data['lineage']['cuttings']
+            if cutting_count:
+                productive_mothers.append({
+                    'tree': mother_data,
+                    'cutting_count': len(cutting_count)
+                })
+        
+        productive_mothers.sort(key=lambda x: x['cutting_count'], reverse=True)
+        
+        return jsonify({
+            'success': True,
+            'dome': {
+                'id': dome.id,
+                'name': dome.name,
+                'size': f"{dome.internal_rows}×{dome.internal_cols}"
+            },
+            'statistics': {
+                'total_trees': total_trees,
+                'mother_plants': total_mothers,
+                'cutting_plants': total_cuttings,
+                'mother_percentage': round((total_mothers / total_trees * 100) if total_trees > 0 else 0, 1),
+                'cutting_percentage': round((total_cuttings / total_trees * 100) if total_trees > 0 else 0, 1)
+            },
+            'breed_distribution': breed_stats,
+            'mother_plants': mother_plants,
+            'cutting_plants': cutting_plants,
+            'most_productive_mothers': productive_mothers[:5]  # Top 5
+        })
+        
+    except Exception as e:
+        print(f"❌ Error generating lineage report: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/farm/<int:farm_id>/lineage')
+@login_required
+def get_farm_lineage(farm_id):
+    """Stream the whole mother→cutting forest of a farm as NDJSON.
+    
+    Line 1 describes the farm, then one line per tree (ordered by root and
+    generation), then a summary line.  Rows come from a single recursive CTE
+    and are written as they are fetched.
+    """
+    try:
+        farm = Farm.query.filter_by(id=farm_id, user_id=current_user.id).first()
+        if not farm:
+            return jsonify({'success': False, 'error': 'Farm not found'}), 404
+        
+        user_id = current_user.id
+        farm_header = {'type': 'farm', 'id': farm.id, 'name': farm.name}
+        
+        def generate():
+            yield json.dumps(farm_header) + '\n'
+            total = roots = max_generation = 0
+            for row in iter_farm_lineage(farm_id, user_id):
+                total += 1
+                if row['generation'] == 0:
+                    roots += 1
+                max_generation = max(max_generation, row['generation'])
+                row['type'] = 'tree'
+                yield json.dumps(row) + '\n'
+            yield json.dumps({
+                'type': 'summary',
+                'total_trees': total,
+                'root_trees': roots,
+                'max_generation': max_generation
+            }) + '\n'
+        
+        print(f"🌳 Streaming lineage forest for farm {farm_id}")
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        print(f"❌ Error streaming farm lineage: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/relationship/<int:relationship_id>', methods=['DELETE'])
+@login_required
+def delete_plant_relationship(relationship_id):
+    """Delete a specific plant relationship"""
+    try:
+        relationship = PlantRelationship.query.filter_by(id=relationship_id).first()
+        if not relationship:
+            return jsonify({'success': False, 'error': 'Relationship not found'}), 404
+        
+        # Verify ownership through cutting tree
+        if not relationship.cutting_tree or relationship.cutting_tree.user_id != current_user.id:
+            return jsonify({'success': False, 'error': 'Access denied'}), 403
+        
+        # Convert cutting back to mother
+        if relationship.cutting_tree:
+            relationship.cutting_tree.plant_type = 'mother'
+            relationship.cutting_tree.cutting_notes = None
+        
+        db.session.delete(relationship)
+        db.session.commit()
+        
+        print(f"✅ Deleted plant relationship {relationship_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': 'Relationship deleted and cutting converted to mother plant'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error deleting relationship: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ✅ STEP 3A: Get mother trees for selection
+# ✅ STEP 3B: Create cutting relationship
+@lineage_bp.route('/api/create_cutting_relationship', methods=['POST'])
+@login_required
+def create_cutting_relationship():
+    """Create a relationship between mother and cutting tree"""
+    try:
+        data = request.get_json()
+        mother_tree_id = data.get('mother_tree_id')
+        cutting_tree_id = data.get('cutting_tree_id')
+        notes = data.get('notes', '')
+        dome_id = data.get('dome_id')
+        
+        # Validate input
+        if not mother_tree_id or not cutting_tree_id:
+            return jsonify({'success': False, 'error': 'Mother and cutting tree IDs are required'}), 400
+        
+        # Verify trees exist and belong to user
+        mother_tree = Tree.query.filter_by(id=mother_tree_id, user_id=current_user.id).first()
+        cutting_tree = Tree.query.filter_by(id=cutting_tree_id, user_id=current_user.id).first()
+        
+        if not mother_tree or not cutting_tree:
+            return jsonify({'success': False, 'error': 'Trees not found'}), 404
+        
+        # Verify mother is actually a mother plant
+        if mother_tree.plant_type != 'mother':
+            return jsonify({'success': False, 'error': 'Selected tree is not a mother plant'}), 400
+        
+        # Check if cutting already has a mother
+        existing_relationship = PlantRelationship.query.filter_by(cutting_tree_id=cutting_tree_id).first()
+        if existing_relationship:
+            return jsonify({'success': False, 'error': 'Cutting already has a mother plant'}), 400
+        
+        # Create relationship
+        relationship = PlantRelationship(
+            mother_tree_id=mother_tree_id,
+            cutting_tree_id=cutting_tree_id,
+            notes=notes,
+            user_id=current_user.id,
+            dome_id=dome_id or cutting_tree.dome_id
+        )
+        
+        db.session.add(relationship)
+        db.session.commit()
+        
+        print(f"✅ Created cutting relationship: Mother {mother_tree_id} -> Cutting {cutting_tree_id}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Cutting relationship created: {cutting_tree.name} from {mother_tree.name}',
+            'relationship': relationship.to_dict()
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error creating cutting relationship: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ✅ STEP 3C: Get tree relationships (for tree_info.html)
+@lineage_bp.route('/api/tree/<int:tree_id>/relationships')
+@login_required
+def get_tree_relationships(tree_id):
+    """Get tree relationships (mother/cutting) information with accurate cutting counts and debugging"""
+    try:
+        print(f"🔗 === GETTING RELATIONSHIPS FOR TREE {tree_id} ===")
+        
+        # Get the tree and verify ownership
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            print(f"❌ Tree {tree_id} not found for user {current_user.id}")
+            return jsonify({'success': False, 'error': 'Tree not found'})
+        
+        print(f"✅ Found tree: {tree.name} (ID: {tree.id})")
+        print(f"🔍 Tree plant_type: '{tree.plant_type}'")
+        print(f"🔍 Tree mother_plant_id: {getattr(tree, 'mother_plant_id', 'NOT_SET')}")
+        
+        # Determine tree type
+        tree_type = getattr(tree, 'plant_type', 'mother')  # Default to mother if not set
+        print(f"🔍 Determined tree_type: '{tree_type}'")
+        
+        # ✅ Lineage closure table: generation depth and full subtree size in O(1) queries
+        generation = tree.get_generation()
+        descendant_count = tree.get_descendant_count()
+        print(f"🔍 Generation: {generation} | descendants across all generations: {descendant_count}")
+        
+        # Get mother tree if this is a cutting
+        mother_tree = None
+        if tree_type == 'cutting':
+            mother_plant_id = getattr(tree, 'mother_plant_id', None)
+            print(f"🔍 This is a cutting tree, looking for mother with ID: {mother_plant_id}")
+            
+            if mother_plant_id:
+                mother = Tree.query.filter_by(id=mother_plant_id, user_id=current_user.id).first()
+                if mother:
+                    print(f"✅ Found mother tree: {mother.name} (ID: {mother.id})")
+                    
+                    # ✅ Cached cutting count - no per-mother count query
+                    mother_cutting_count = mother.cutting_count or 0
+                    
+                    print(f"🔍 Mother {mother.id} has {mother_cutting_count} cuttings")
+                    
+                    mother_tree = {
+                        'id': mother.id,
+                        'name': mother.name,
+                        'breed': mother.breed or '',
+                        'internal_row': mother.internal_row,
+                        'internal_col': mother.internal_col,
+                        'life_days': mother.life_days or 0,
+                        'image_url': mother.image_url,
+                        'cutting_count': mother_cutting_count,
+                        'plant_type': mother.plant_type
+                    }
+                else:
+                    print(f"❌ Mother tree with ID {mother_plant_id} not found")
+            else:
+                print(f"⚠️ Cutting tree has no mother_plant_id set")
+        
+        # Get cutting trees if this is a mother
+        cutting_trees = []
+        if tree_type == 'mother':
+            print(f"🔍 This is a mother tree, looking for cutting trees...")
+            
+            # ✅ ENHANCED: Multiple query approaches to find all cuttings
+            
+            # Method 1: Direct query by mother_plant_id
+            cuttings_method1 = Tree.query.filter_by(
+                mother_plant_id=tree_id, 
+                user_id=current_user.id,
+                plant_type='cutting'
+            ).all()
+            print(f"🔍 Method 1 (mother_plant_id={tree_id}, plant_type='cutting'): {len(cuttings_method1)} results")
+            
+            # Method 2: Query by mother_plant_id without plant_type filter
+            cuttings_method2 = Tree.query.filter_by(
+                mother_plant_id=tree_id, 
+                user_id=current_user.id
+            ).all()
+            print(f"🔍 Method 2 (mother_plant_id={tree_id}, any plant_type): {len(cuttings_method2)} results")
+            
+            # Method 3: Direct children from the lineage closure table
+            direct_cutting_ids = tree.get_descendant_ids(max_depth=1)
+            cuttings_method3 = Tree.query.filter(
+                Tree.id.in_(direct_cutting_ids),
+                Tree.user_id == current_user.id
+            ).all() if direct_cutting_ids else []
+            print(f"🔍 Method 3 (lineage table): {len(cuttings_method3)} results")
+            
+            # Use the method that returns the most results
+            if len(cuttings_method3) >= len(cuttings_method1) and len(cuttings_method3) >= len(cuttings_method2):
+                cuttings = cuttings_method3
+                print(f"✅ Using Method 3 results: {len(cuttings)} cuttings")
+            elif len(cuttings_method2) >= len(cuttings_method1):
+                cuttings = cuttings_method2
+                print(f"✅ Using Method 2 results: {len(cuttings)} cuttings")
+            else:
+                cuttings = cuttings_method1
+                print(f"✅ Using Method 1 results: {len(cuttings)} cuttings")
+            
+            print(f"🔍 Found {len(cuttings)} cutting trees for mother {tree_id}:")
+            for cutting in cuttings:
+                print(f"   - Cutting {cutting.id} '{cutting.name}' | plant_type: '{cutting.plant_type}' | mother_plant_id: {getattr(cutting, 'mother_plant_id', 'NOT_SET')}")
+            
+            # ✅ ENHANCED: Build cutting trees data with comprehensive info
+            cutting_trees = []
+            for cutting in cuttings:
+                try:
+                    cutting_data = {
+                        'id': cutting.id,
+                        'name': cutting.name,
+                        'breed': cutting.breed or '',
+                        'internal_row': cutting.internal_row,
+                        'internal_col': cutting.internal_col,
+                        'life_days': cutting.life_days or 0,
+                        'cutting_notes': getattr(cutting, 'cutting_notes', ''),
+                        'image_url': cutting.image_url,
+                        'created_at': cutting.created_at.isoformat() if cutting.created_at else None,
+                        'plant_type': cutting.plant_type,
+                        'mother_plant_id': getattr(cutting, 'mother_plant_id', None)
+                    }
+                    cutting_trees.append(cutting_data)
+                    print(f"✅ Added cutting data for {cutting.name}")
+                except Exception as cutting_error:
+                    print(f"❌ Error processing cutting {cutting.id}: {cutting_error}")
+                    continue
+        
+        # Determine available actions
+        can_convert_to_mother = tree_type != 'mother'
+        can_link_to_mother = tree_type != 'mother' and not mother_tree
+        can_unlink_from_mother = tree_type == 'cutting' and mother_tree is not None
+        
+        # ✅ ENHANCED: Build comprehensive result
+        result = {
+            'success': True,
+            'relationships': {
+                'tree': {
+                    'id': tree_id,
+                    'name': tree.name,
+                    'tree_type': tree_type,
+                    'plant_type': tree_type
+                },
+                'is_mother': tree_type == 'mother',
+                'is_cutting': tree_type == 'cutting',
+                'mother': mother_tree,
+                'cuttings': cutting_trees,
+                'summary': {
+                    'cutting_count': len(cutting_trees),
+                    'generation': generation,
+                    'descendant_count': descendant_count,
+                    'has_mother': mother_tree is not None,
+                    'tree_type': tree_type,
+                    'can_convert_to_mother': can_convert_to_mother,
+                    'can_link_to_mother': can_link_to_mother,
+                    'can_unlink_from_mother': can_unlink_from_mother
+                }
+            },
+            'debug_info': {
+                'tree_id': tree_id,
+                'tree_name': tree.name,
+                'tree_type': tree_type,
+                'mother_tree_found': mother_tree is not None,
+                'cutting_trees_found': len(cutting_trees),
+                'dome_id': tree.dome_id,
+                'user_id': current_user.id,
+                'query_methods_results': {
+                    'method1_strict': len(cuttings_method1) if tree_type == 'mother' else 0,
+                    'method2_loose': len(cuttings_method2) if tree_type == 'mother' else 0,
+                    'method3_lineage': len(cuttings_method3) if tree_type == 'mother' else 0
+                } if tree_type == 'mother' else {}
+            }
+        }
+        
+        print(f"✅ === RELATIONSHIP QUERY COMPLETE ===")
+        print(f"Tree Type: {tree_type}")
+        print(f"Is Mother: {tree_type == 'mother'}")
+        print(f"Is Cutting: {tree_type == 'cutting'}")
+        print(f"Mother Found: {mother_tree is not None}")
+        print(f"Cuttings Found: {len(cutting_trees)}")
+        print(f"========================================")
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        print(f"❌ Error getting tree relationships for tree {tree_id}: {e}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@lineage_bp.route('/api/tree/<int:tree_id>/convert_to_mother', methods=['POST'])
+@login_required
+def convert_to_mother_tree(tree_id):
+    """Convert a tree to a mother tree"""
+    try:
+        print(f"🌳 Converting tree {tree_id} to mother")
+        
+        # Get the tree and verify ownership
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'})
+        
+        # Update plant type
+        tree.plant_type = 'mother'
+        tree.updated_at = datetime.utcnow()
+        
+        db.session.commit()
+        
+        print(f"✅ Tree {tree_id} converted to mother successfully")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Tree "{tree.name}" converted to mother tree successfully',
+            'tree': tree.to_dict()
+        })
+        
+    except Exception as e:
+        print(f"❌ Error converting tree to mother: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/tree/<int:tree_id>/link_to_mother', methods=['POST'])
+@login_required
+def link_to_mother_tree(tree_id):
+    """Link a tree to a mother tree as a cutting"""
+    try:
+        print(f"🔗 Linking tree {tree_id} to mother")
+        
+        # Get the tree and verify ownership
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'})
+        
+        data = request.get_json()
+        mother_tree_id = data.get('mother_tree_id')
+        cutting_notes = data.get('cutting_notes', '')
+        
+        if not mother_tree_id:
+            return jsonify({'success': False, 'error': 'Mother tree ID is required'})
+        
+        # Verify mother tree exists and belongs to user
+        mother_tree = Tree.query.filter_by(
+            id=mother_tree_id,
+            user_id=current_user.id,
+            plant_type='mother'
+        ).first()
+        
+        if not mother_tree:
+            return jsonify({'success': False, 'error': 'Invalid mother tree or mother tree not found'})
+        
+        if tree.id == mother_tree.id or tree.id in mother_tree.get_ancestor_ids():
+            return jsonify({'success': False, 'error': 'A tree cannot be linked to its own cutting'})
+        
+        # Update tree to be a cutting
+        tree.plant_type = 'cutting'
+        tree.mother_plant_id = mother_tree_id
+        tree.cutting_notes = cutting_notes
+        tree.updated_at = datetime.utcnow()
+        
+        # Create plant relationship record
+        try:
+            # Check if relationship already exists
+            existing_relationship = PlantRelationship.query.filter_by(
+                cutting_tree_id=tree_id
+            ).first()
+            
+            if existing_relationship:
+                # Update existing relationship
+                existing_relationship.mother_tree_id = mother_tree_id
+                existing_relationship.notes = cutting_notes
+                existing_relationship.updated_at = datetime.utcnow()
+            else:
+                # Create new relationship
+                relationship = PlantRelationship(
+                    mother_tree_id=mother_tree_id,
+                    cutting_tree_id=tree_id,
+                    notes=cutting_notes,
+                    user_id=current_user.id,
+                    dome_id=tree.dome_id,
+                    created_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow()
+                )
+                db.session.add(relationship)
+                
+        except Exception as rel_error:
+            print(f"⚠️ Warning: Could not create plant relationship: {rel_error}")
+            # Continue without relationship - tree linking is more important
+        
+        db.session.commit()
+        
+        print(f"✅ Tree {tree_id} linked to mother {mother_tree_id} successfully")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Tree "{tree.name}" linked to mother "{mother_tree.name}" successfully',
+            'tree': tree.to_dict(),
+            'mother_tree': mother_tree.to_dict()
+        })
+        
+    except Exception as e:
+        print(f"❌ Error linking tree to mother: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/tree/<int:tree_id>/unlink_from_mother', methods=['POST'])
+@login_required
+def unlink_from_mother_tree(tree_id):
+    """Unlink a cutting tree from its mother"""
+    try:
+        print(f"🔓 Unlinking tree {tree_id} from mother")
+        
+        # Get the tree and verify ownership
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'})
+        
+        # Update tree to be independent
+        tree.plant_type = 'mother'  # Convert to independent mother
+        tree.mother_plant_id = None
+        tree.cutting_notes = ''
+        tree.updated_at = datetime.utcnow()
+        
+        # Remove plant relationship record
+        try:
+            relationship = PlantRelationship.query.filter_by(
+                cutting_tree_id=tree_id
+            ).first()
+            
+            if relationship:
+                db.session.delete(relationship)
+                print(f"✅ Removed plant relationship for tree {tree_id}")
+                
+        except Exception as rel_error:
+            print(f"⚠️ Warning: Could not remove plant relationship: {rel_error}")
+            # Continue - tree unlinking is more important
+        
+        db.session.commit()
+        
+        print(f"✅ Tree {tree_id} unlinked from mother successfully")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Tree "{tree.name}" unlinked from mother successfully',
+            'tree': tree.to_dict()
+        })
+        
+    except Exception as e:
+        print(f"❌ Error unlinking tree from mother: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@lineage_bp.route('/api/refresh_tree_relationships/<int:tree_id>', methods=['POST'])
+@login_required
+def refresh_tree_relationships(tree_id):
+    """Force refresh tree relationships data (cache-busting)"""
+    try:
+        # This endpoint forces a fresh query of tree relationships
+        # It's useful after paste operations that might affect relationships
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        # Force a fresh count of cutting trees into the cached column
+        if tree.plant_type == 'mother':
+            reconcile_cutting_counts(mother_id=tree.id)
+            db.session.commit()
+            print(f"🔄 Refreshed: Mother '{tree.name}' has {tree.cutting_count or 0} cutting trees")
+        
+        return jsonify({
+            'success': True,
+            'message': 'Tree relationships refreshed',
+            'tree_id': tree_id,
+            'cutting_count': tree.get_cutting_count(),
+            'timestamp': datetime.utcnow().isoformat()
+        })
+        
+    except Exception as e:
+        print(f"❌ Error refreshing tree relationships: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,61 @@
+"""Tree search route"""
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+
+from services.search import AGE_BUCKETS, MAX_RESULTS, search_trees
+
+
+search_bp = Blueprint('search', __name__)
+
+MAX_QUERY_LENGTH = 200
+
+
+@search_bp.route('/api/search')
+@login_required
+def search():
+    """Search the user's trees by name, breed, info and cutting notes.
+
+    Query parameters: q, farm_id, dome_id, plant_type, age (age bucket),
+    limit (1-100, default 50) and offset.  Returns the ranked page, the
+    total number of matches and facet counts.
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if len(query) > MAX_QUERY_LENGTH:
+            return jsonify({'success': False, 'error': f'Query is limited to {MAX_QUERY_LENGTH} characters'}), 400
+
+        try:
+            farm_id = request.args.get('farm_id', type=int)
+            dome_id = request.args.get('dome_id', type=int)
+            limit = int(request.args.get('limit', 50))
+            offset = int(request.args.get('offset', 0))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'limit and offset must be integers'}), 400
+        if not 1 <= limit <= MAX_RESULTS:
+            return jsonify({'success': False, 'error': f'limit must be between 1 and {MAX_RESULTS}'}), 400
+        if offset < 0:
+            return jsonify({'success': False, 'error': 'offset must not be negative'}), 400
+
+        age = request.args.get('age') or None
+        if age and age not in dict(AGE_BUCKETS):
+            return jsonify({
+                'success': False,
+                'error': f"Unknown age bucket. Available: {', '.join(name for name, _ in AGE_BUCKETS)}"
+            }), 400
+
+        results = search_trees(
+            current_user.id,
+            query,
+            farm_id=farm_id,
+            dome_id=dome_id,
+            plant_type=request.args.get('plant_type') or None,
+            age=age,
+            limit=limit,
+            offset=offset
+        )
+        return jsonify({'success': True, 'query': query, 'limit': limit, 'offset': offset, **results})
+
+    except Exception as e:
+        print(f"❌ Error searching trees: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,1702 @@
+"""Tree routes: tree CRUD, life pause/resume, moves/swaps and bulk operations"""
+
+import json
+import time
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, jsonify, redirect, flash, url_for, make_response
+from flask_login import login_required, current_user
+
+from models import db, Dome, Tree, PlantRelationship, TreeBreed, validate_tree_position
+from services.breeds import BreedDictionary
+from services.soft_delete import soft_delete_trees
+from services.tree_batch import apply_tree_batch, BatchValidationError
+from services.tree_import import import_trees, ImportValidationError
+from services.tree_listing import LIFE_DAY_COLUMNS, ListingError, TreeListing, tree_field
+from blueprints.common import dome_etag
+
+
+trees_bp = Blueprint('trees', __name__)
+
+
+@trees_bp.route('/api/tree/<int:tree_id>/pause_life', methods=['POST'])
+@login_required
+def pause_tree_life(tree_id):
+    """Pause life day counting for a tree"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        if tree.pause_life_counting():
+            db.session.commit()
+            return jsonify({
+                'success': True,
+                'message': 'Tree life counting paused',
+                'tree': tree.to_dict()
+            })
+        else:
+            return jsonify({'success': False, 'error': 'Tree is already paused'}), 400
+            
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/api/tree/<int:tree_id>/resume_life', methods=['POST'])
+@login_required
+def resume_tree_life(tree_id):
+    """Resume life day counting for a tree"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        if tree.resume_life_counting():
+            db.session.commit()
+            return jsonify({
+                'success': True,
+                'message': 'Tree life counting resumed',
+                'tree': tree.to_dict()
+            })
+        else:
+            return jsonify({'success': False, 'error': 'Tree is not paused'}), 400
+            
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/api/tree/<int:tree_id>/adjust_life', methods=['POST'])
+@login_required
+def adjust_tree_life(tree_id):
+    """Manually adjust tree life days"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        data = request.get_json()
+        adjustment = data.get('adjustment', 0)
+        
+        if not isinstance(adjustment, int):
+            return jsonify({'success': False, 'error': 'Adjustment must be an integer'}), 400
+        
+        new_life_days = tree.adjust_life_days(adjustment)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Tree life days adjusted by {adjustment} days',
+            'new_life_days': new_life_days,
+            'tree': tree.to_dict()
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/delete_tree/<int:tree_id>', methods=['DELETE', 'POST'])
+@login_required
+def delete_tree(tree_id):
+    """Soft-delete a tree; relationship cleanup is done later by the purge job"""
+    try:
+        print(f"🗑️ Delete tree request for ID: {tree_id}")
+        
+        # ✅ One indexed UPDATE stamps the tombstone and verifies ownership
+        deleted = soft_delete_trees(current_user.id, Tree.id == tree_id)
+        if not deleted:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        db.session.commit()
+        tree = deleted[0]
+        
+        print(f"✅ Tree '{tree.name}' at ({tree.internal_row}, {tree.internal_col}) marked as deleted")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Tree "{tree.name}" deleted successfully',
+            'tree_id': tree_id,
+            # Cuttings are made independent when the tombstone is purged
+            'purge_pending': True
+        })
+        
+    except Exception as e:
+        print(f"❌ Critical error in delete_tree: {str(e)}")
+        db.session.rollback()
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        return jsonify({'success': False, 'error': f'Critical error: {str(e)}'}), 500
+
+
+def update_mother_cutting_count(mother_tree):
+    """Update a mother tree's info with current cutting count"""
+    try:
+        # Names of the mother's cuttings in one query (no Tree objects loaded)
+        cutting_names = [name for (name,) in db.session.query(Tree.name).filter_by(
+            mother_plant_id=mother_tree.id,
+            user_id=mother_tree.user_id,
+            plant_type='cutting'
+        ).order_by(Tree.id)]
+        cutting_count = len(cutting_names)
+        
+        # ✅ CRITICAL: Update mother tree info
+        info_lines = (mother_tree.info or '').split('\n')
+        info_lines = [line for line in info_lines if not line.startswith('Cuttings:')]
+        mother_tree.info = '\n'.join(info_lines).strip()
+        
+        if cutting_count > 0:
+            if mother_tree.info:
+                mother_tree.info += f"\nCuttings: {cutting_count} cutting trees ({', '.join(cutting_names)})"
+            else:
+                mother_tree.info = f"Cuttings: {cutting_count} cutting trees ({', '.join(cutting_names)})"
+        
+        mother_tree.updated_at = datetime.utcnow()
+        
+        print(f"🌳 Updated mother '{mother_tree.name}' cutting count: {cutting_count} cuttings")
+        
+        return cutting_count
+        
+    except Exception as e:
+        print(f"❌ Error updating mother cutting count: {e}")
+        return 0
+
+
+@trees_bp.route('/delete_tree', methods=['POST'])
+@trees_bp.route('/api/delete_tree', methods=['POST'])
+@login_required
+def delete_tree_post():
+    """Alternative delete tree endpoint using POST method"""
+    try:
+        data = request.get_json()
+        tree_id = data.get('tree_id')
+        
+        if not tree_id:
+            return jsonify({'success': False, 'error': 'tree_id is required'}), 400
+        
+        # Call the main delete function
+        return delete_tree(tree_id)
+        
+    except Exception as e:
+        print(f"❌ Error in delete_tree_post: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/delete_trees', methods=['POST'])
+@login_required
+def delete_multiple_trees():
+    """Delete multiple trees at once"""
+    try:
+        data = request.get_json()
+        tree_ids = data.get('tree_ids', [])
+        
+        if not tree_ids or not isinstance(tree_ids, list):
+            return jsonify({'success': False, 'error': 'tree_ids array is required'}), 400
+        
+        # ✅ Single UPDATE for the whole selection; cleanup happens in the purge job
+        deleted = soft_delete_trees(current_user.id, Tree.id.in_(tree_ids))
+        db.session.commit()
+        
+        deleted_ids = {row.id for row in deleted}
+        deleted_count = len(deleted_ids)
+        errors = [f"Tree {tree_id}: Tree not found" for tree_id in tree_ids if tree_id not in deleted_ids]
+        
+        return jsonify({
+            'success': deleted_count > 0,
+            'deleted_count': deleted_count,
+            'total_requested': len(tree_ids),
+            'errors': errors,
+            'message': f'Deleted {deleted_count} of {len(tree_ids)} trees'
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in delete_multiple_trees: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/api/tree/<int:tree_id>/breeds')
+@login_required
+def get_tree_breeds(tree_id):
+    """Get available breeds for a tree's farm"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        # Default breeds - you can customize this
+        default_breeds = [
+            'Apple', 'Orange', 'Mango', 'Coconut', 'Banana', 'Avocado', 
+            'Cherry', 'Peach', 'Lemon', 'Lime', 'Papaya', 'Guava'
+        ]
+        
+        return jsonify({
+            'success': True,
+            'breeds': default_breeds,
+            'current_breed': tree.breed or ''
+        })
+        
+    except Exception as e:
+        print(f"❌ Error getting tree breeds: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ============= TREE MANAGEMENT =============
+@trees_bp.route('/add_tree', methods=['POST'])
+@login_required
+def add_tree():
+    """Add a new tree with enhanced debugging and plant relationships"""
+    try:
+        print("🌱 === ADD TREE REQUEST START ===")
+        
+        # Get and log request data
+        data = request.get_json()
+        print(f"🌱 Request data: {data}")
+        print(f"🌱 User ID: {current_user.id}")
+        print(f"🌱 User: {current_user.username}")
+        
+        # Extract and validate data
+        dome_id = data.get('dome_id')
+        internal_row = data.get('internal_row')
+        internal_col = data.get('internal_col')
+        name = data.get('name', '').strip()
+        breed = data.get('breed', '').strip()
+        info = data.get('info', '').strip()
+        life_days = data.get('life_days', 0)
+        image_url = data.get('image_url', '')
+        
+        # ✅ FIXED: Handle plant relationship fields properly
+        plant_type = data.get('plant_type', 'mother')
+        mother_plant_id = data.get('mother_plant_id') or data.get('mother_tree_id')  # Support both field names
+        cutting_notes = data.get('cutting_notes', '').strip()
+        
+        # ✅ NEW: Handle paste metadata for tracking copy/paste operations
+        paste_metadata = data.get('paste_metadata', {})
+        
+        print(f"🌱 Extracted data:")
+        print(f"   - dome_id: {dome_id}")
+        print(f"   - position: ({internal_row}, {internal_col})")
+        print(f"   - name: '{name}'")
+        print(f"   - breed: '{breed}'")
+        print(f"   - plant_type: '{plant_type}'")
+        print(f"   - mother_plant_id: {mother_plant_id}")
+        print(f"   - cutting_notes: '{cutting_notes}'")
+        print(f"   - paste_metadata: {paste_metadata}")
+        
+        # Validation
+        if not all([dome_id, name, internal_row is not None, internal_col is not None]):
+            error_msg = 'Missing required fields'
+            print(f"❌ Validation error: {error_msg}")
+            return jsonify({'success': False, 'error': error_msg}), 400
+        
+        # Verify dome ownership
+        print(f"🌱 Checking dome {dome_id} ownership...")
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            error_msg = 'Dome not found or access denied'
+            print(f"❌ Dome error: {error_msg}")
+            return jsonify({'success': False, 'error': error_msg}), 404
+        
+        print(f"✅ Dome found: {dome.name} (farm_id: {dome.farm_id})")
+        
+        # Check position bounds
+        if not (0 <= internal_row < dome.internal_rows and 0 <= internal_col < dome.internal_cols):
+            error_msg = f'Position ({internal_row}, {internal_col}) outside dome bounds (0-{dome.internal_rows-1}, 0-{dome.internal_cols-1})'
+            print(f"❌ Position error: {error_msg}")
+            return jsonify({'success': False, 'error': error_msg}), 400
+        
+        # Check if position is occupied (one lookup on the live-position index)
+        print(f"🌱 Checking if position ({internal_row}, {internal_col}) is occupied...")
+        position_ok, error_msg = validate_tree_position(dome_id, internal_row, internal_col)
+        if not position_ok:
+            print(f"❌ Position occupied: {error_msg}")
+            return jsonify({'success': False, 'error': error_msg}), 400
+        
+        print(f"✅ Position ({internal_row}, {internal_col}) is available")
+        
+        # ✅ ENHANCED: Validate cutting requirements and mother tree
+        mother_tree = None
+        if plant_type == 'cutting':
+            print(f"🌱 Validating cutting requirements...")
+            if not mother_plant_id:
+                error_msg = 'Mother tree required for cuttings'
+                print(f"❌ Cutting error: {error_msg}")
+                return jsonify({'success': False, 'error': error_msg}), 400
+            
+            # Verify mother tree exists and belongs to user
+            mother_tree = Tree.query.filter_by(
+                id=mother_plant_id,
+                user_id=current_user.id
+            ).first()
+            
+            if not mother_tree:
+                error_msg = f'Mother tree with ID {mother_plant_id} not found or access denied'
+                print(f"❌ Mother tree error: {error_msg}")
+                return jsonify({'success': False, 'error': error_msg}), 400
+            
+            # ✅ ENHANCED: Validate mother tree type (should be mother, but allow flexibility)
+            if mother_tree.plant_type not in ['mother', None]:
+                print(f"⚠️ Warning: Mother tree '{mother_tree.name}' has plant_type '{mother_tree.plant_type}' (expected 'mother')")
+            
+            print(f"✅ Mother tree validated: {mother_tree.name} (ID: {mother_tree.id}, type: {mother_tree.plant_type})")
+        
+        elif mother_plant_id:
+            # ✅ NEW: Handle case where mother_plant_id is provided but plant_type is not 'cutting'
+            print(f"⚠️ Warning: mother_plant_id provided but plant_type is '{plant_type}' (not 'cutting')")
+            print(f"⚠️ Setting plant_type to 'cutting' automatically")
+            plant_type = 'cutting'
+            
+            # Validate the mother tree
+            mother_tree = Tree.query.filter_by(
+                id=mother_plant_id,
+                user_id=current_user.id
+            ).first()
+            
+            if not mother_tree:
+                error_msg = f'Mother tree with ID {mother_plant_id} not found or access denied'
+                print(f"❌ Mother tree error: {error_msg}")
+                return jsonify({'success': False, 'error': error_msg}), 400
+            
+            print(f"✅ Auto-detected cutting with mother tree: {mother_tree.name}")
+        
+        # Handle breed management
+        if breed:
+            print(f"🧬 Processing breed: '{breed}'")
+            try:
+                # Check if TreeBreed table exists
+                print(f"🧬 Checking TreeBreed table...")
+                try:
+                    breed_count = TreeBreed.query.count()
+                    print(f"✅ TreeBreed table exists with {breed_count} records")
+                    
+                    # Try breed management if table exists
+                    try:
+                        from breed_management import ensure_breed_exists
+                        print(f"✅ breed_management module imported successfully")
+                        
+                        # Ensure breed exists
+                        breed_success, breed_message = ensure_breed_exists(dome.farm_id, breed, current_user.id)
+                        print(f"🧬 Breed management result: {breed_success} - {breed_message}")
+                        
+                        if not breed_success:
+                            print(f"⚠️ Breed creation warning: {breed_message}")
+                            # Continue anyway - don't fail tree creation for breed issues
+                        
+                    except ImportError as import_error:
+                        print(f"⚠️ breed_management import error: {import_error}")
+                        print(f"⚠️ Continuing without breed management...")
+                    except Exception as breed_error:
+                        print(f"⚠️ Breed management error: {breed_error}")
+                        print(f"⚠️ Continuing without breed management...")
+                        
+                except Exception as table_error:
+                    print(f"❌ TreeBreed table error: {table_error}")
+                    print(f"⚠️ Continuing without breed management...")
+                
+            except Exception as breed_process_error:
+                print(f"⚠️ Breed processing error: {breed_process_error}")
+                print(f"⚠️ Continuing without breed management...")
+        
+        # ✅ ENHANCED: Create new tree with proper plant relationship fields
+        print(f"🌱 Creating new tree...")
+        try:
+            new_tree = Tree(
+                dome_id=dome_id,
+                internal_row=internal_row,
+                internal_col=internal_col,
+                name=name,
+                breed=breed,
+                info=info,
+                life_days=life_days,
+                image_url=image_url,
+                user_id=current_user.id,
+                created_at=datetime.utcnow(),
+                
+                # ✅ FIXED: Plant relationship fields
+                plant_type=plant_type,
+                mother_plant_id=mother_plant_id,  # This is the correct field name from the model
+                cutting_notes=cutting_notes,
+                
+                # ✅ NEW: Store paste metadata if provided
+                paste_metadata=json.dumps(paste_metadata) if paste_metadata else None
+            )
+            
+            print(f"✅ Tree object created successfully")
+            print(f"   - Tree name: {new_tree.name}")
+            print(f"   - Tree breed: {new_tree.breed}")
+            print(f"   - Tree position: ({new_tree.internal_row}, {new_tree.internal_col})")
+            print(f"   - Tree plant_type: {new_tree.plant_type}")
+            print(f"   - Tree mother_plant_id: {new_tree.mother_plant_id}")
+            print(f"   - Tree cutting_notes: {new_tree.cutting_notes}")
+            
+        except Exception as tree_creation_error:
+            error_msg = f"Error creating tree object: {str(tree_creation_error)}"
+            print(f"❌ Tree creation error: {error_msg}")
+            return jsonify({'success': False, 'error': error_msg}), 500
+        
+        # Add to database
+        print(f"🌱 Adding tree to database...")
+        try:
+            db.session.add(new_tree)
+            db.session.flush()  # Get the ID without committing
+            print(f"✅ Tree added to session, ID: {new_tree.id}")
+            
+        except Exception as db_add_error:
+            error_msg = f"Error adding tree to database session: {str(db_add_error)}"
+            print(f"❌ Database add error: {error_msg}")
+            db.session.rollback()
+            return jsonify({'success': False, 'error': error_msg}), 500
+        
+        # ✅ OPTIONAL: Create PlantRelationship record if table exists (for backward compatibility)
+        if plant_type == 'cutting' and mother_plant_id:
+            print(f"🌱 Creating optional plant relationship record...")
+            try:
+                # Check if PlantRelationship table exists
+                try:
+                    rel_count = PlantRelationship.query.count()
+                    print(f"✅ PlantRelationship table exists with {rel_count} records")
+                    
+                    # Check if relationship already exists
+                    existing_rel = PlantRelationship.query.filter_by(
+                        cutting_tree_id=new_tree.id
+                    ).first()
+                    
+                    if not existing_rel:
+                        relationship = PlantRelationship(
+                            mother_tree_id=mother_plant_id,
+                            cutting_tree_id=new_tree.id,
+                            notes=cutting_notes,
+                            user_id=current_user.id,
+                            dome_id=dome_id,
+                            created_at=datetime.utcnow()
+                        )
+                        db.session.add(relationship)
+                        print(f"✅ Plant relationship record created: mother {mother_plant_id} -> cutting {new_tree.id}")
+                    else:
+                        print(f"ℹ️ Plant relationship record already exists for cutting {new_tree.id}")
+                    
+                except Exception as rel_table_error:
+                    print(f"⚠️ PlantRelationship table error: {rel_table_error}")
+                    print(f"⚠️ Continuing without plant relationship record...")
+                    
+            except Exception as rel_error:
+                print(f"⚠️ Failed to create plant relationship record: {rel_error}")
+                # Continue anyway - the Tree model already has the relationship data
+        
+        # Commit transaction
+        print(f"🌱 Committing transaction...")
+        try:
+            db.session.commit()
+            print(f"✅ Transaction committed successfully")
+            
+        except Exception as commit_error:
+            error_msg = f"Error committing transaction: {str(commit_error)}"
+            print(f"❌ Commit error: {error_msg}")
+            db.session.rollback()
+            return jsonify({'success': False, 'error': error_msg}), 500
+        
+        # ✅ ENHANCED: Prepare comprehensive response with relationship data
+        print(f"🌱 Preparing response...")
+        try:
+            # Get the actual life days using the model method
+            actual_life_days = new_tree.get_actual_life_days()
+            
+            tree_response = {
+                'id': new_tree.id,
+                'name': new_tree.name,
+                'breed': new_tree.breed,
+                'internal_row': new_tree.internal_row,
+                'internal_col': new_tree.internal_col,
+                'life_days': actual_life_days,
+                'stored_life_days': new_tree.life_days,
+                'info': new_tree.info,
+                'image_url': new_tree.image_url,
+                'dome_id': new_tree.dome_id,
+                'user_id': new_tree.user_id,
+                'created_at': new_tree.created_at.isoformat() if new_tree.created_at else None,
+                
+                # ✅ NEW: Plant relationship data
+                'plant_type': new_tree.plant_type,
+                'mother_plant_id': new_tree.mother_plant_id,
+                'cutting_notes': new_tree.cutting_notes,
+                'is_mother': new_tree.is_mother_plant(),
+                'is_cutting': new_tree.is_cutting(),
+                'has_mother': bool(new_tree.mother_plant_id),
+                
+                # ✅ NEW: Life stage information
+                'life_stage': new_tree.get_life_stage(),
+                'life_stage_color': new_tree.get_life_stage_color(),
+                'age_category': new_tree.get_age_category(),
+                
+                # ✅ NEW: Paste metadata if available
+                'paste_metadata': paste_metadata if paste_metadata else None,
+                'relationship_preserved': paste_metadata.get('relationship_preserved', False) if paste_metadata else False
+            }
+            
+            # ✅ NEW: Add mother tree info if this is a cutting
+            if new_tree.is_cutting() and mother_tree:
+                tree_response['mother_tree_info'] = {
+                    'id': mother_tree.id,
+                    'name': mother_tree.name,
+                    'breed': mother_tree.breed,
+                    'position': f"({mother_tree.internal_row}, {mother_tree.internal_col})"
+                }
+            
+            response_data = {
+                'success': True,
+                'message': f'Tree "{name}" created successfully',
+                'tree_id': new_tree.id,
+                'tree': tree_response,
+                
+                # ✅ NEW: Additional metadata
+                'plant_relationship': {
+                    'type': plant_type,
+                    'has_mother': bool(mother_plant_id),
+                    'mother_id': mother_plant_id,
+                    'relationship_created': bool(plant_type == 'cutting' and mother_plant_id)
+                }
+            }
+            
+            print(f"✅ Tree created successfully!")
+            print(f"   - Tree ID: {new_tree.id}")
+            print(f"   - Tree name: {new_tree.name}")
+            print(f"   - Tree breed: {new_tree.breed}")
+            print(f"   - Plant type: {new_tree.plant_type}")
+            print(f"   - Mother plant ID: {new_tree.mother_plant_id}")
+            print(f"   - Life days: {actual_life_days}")
+            print(f"🌱 === ADD TREE REQUEST END (SUCCESS) ===")
+            
+            return jsonify(response_data)
+            
+        except Exception as response_error:
+            error_msg = f"Error preparing response: {str(response_error)}"
+            print(f"❌ Response error: {error_msg}")
+            # Return minimal response if there's an error preparing the full response
+            return jsonify({
+                'success': True,  # Tree was created successfully
+                'message': f'Tree "{name}" created successfully (response error)',
+                'tree_id': new_tree.id,
+                'tree': {
+                    'id': new_tree.id, 
+                    'name': name,
+                    'plant_type': plant_type,
+                    'mother_plant_id': mother_plant_id
+                }
+            })
+        
+    except Exception as e:
+        print(f"❌ Critical error in add_tree: {str(e)}")
+        import traceback
+        print(f"❌ Full traceback: {traceback.format_exc()}")
+        print(f"🌱 === ADD TREE REQUEST END (ERROR) ===")
+        
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }), 500
+
+
+# ============= GRID MANAGEMENT =============
+# Per-tree fields of /api/dome/<id>/trees (?fields= picks a subset, see services/tree_listing.py)
+DOME_TREE_FIELDS = {
+    'id': tree_field(lambda tree: tree.id, 'id'),
+    'name': tree_field(lambda tree: tree.name, 'name'),
+    'dome_id': tree_field(lambda tree: tree.dome_id, 'dome_id'),
+    'internal_row': tree_field(lambda tree: tree.internal_row, 'internal_row'),
+    'internal_col': tree_field(lambda tree: tree.internal_col, 'internal_col'),
+    'image_url': tree_field(lambda tree: tree.image_url, 'image_url'),
+    'breed': tree_field(lambda tree: tree.breed or '', 'breed'),
+}
+
+
+def encode_breeds(trees_data, breeds):
+    """Replace each tree's breed name with its code into ``breeds``"""
+    for tree_data in trees_data:
+        if 'breed' in tree_data:
+            tree_data['breed_code'] = breeds.code(tree_data.pop('breed'))
+    return trees_data
+
+
+@trees_bp.route('/api/dome/<int:dome_id>/trees')
+@login_required
+@dome_etag('trees')
+def get_dome_trees(dome_id):
+    try:
+        # Check if dome exists and belongs to user
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'})
+        
+        try:
+            listing = TreeListing.from_request(DOME_TREE_FIELDS, request)
+        except ListingError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        trees_query = Tree.query.filter_by(dome_id=dome_id)
+        if listing.ndjson:
+            return listing.stream(trees_query)
+        trees, next_cursor = listing.page(listing.apply(trees_query).all())
+        
+        # ?breed_codes=1 sends each breed as a code into one 'breeds' list
+        breeds = BreedDictionary() if request.args.get('breed_codes', '').lower() in ('1', 'true', 'yes') else None
+        
+        trees_data = [listing.serialize(tree) for tree in trees]
+        if breeds is not None:
+            encode_breeds(trees_data, breeds)
+        
+        response = {'success': True, 'trees': trees_data}
+        if breeds is not None:
+            response['breeds'] = breeds.names
+        if listing.paginated:
+            response['next_cursor'] = next_cursor
+        return jsonify(response)
+        
+    except Exception as e:
+        print(f"Error getting dome trees: {str(e)}")
+        return jsonify({'success': False, 'error': 'Failed to get trees'})
+
+
+@trees_bp.route('/api/tree/<int:tree_id>')
+@login_required
+def api_get_tree(tree_id):
+    """API endpoint to get a specific tree"""
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        tree_data = {
+            'id': tree.id,
+            'name': tree.name,
+            'row': tree.row,
+            'col': tree.col,
+            'life_days': tree.life_days if hasattr(tree, 'life_days') else 0,
+            'info': tree.info if hasattr(tree, 'info') else '',
+            'image_url': tree.image_url if hasattr(tree, 'image_url') else None,
+            'dome_id': tree.dome_id,
+            'dome_name': tree.dome.name if hasattr(tree, 'dome') and tree.dome else 'Unknown'
+        }
+        
+        return jsonify({
+            'success': True,
+            'tree': tree_data
+        })
+        
+    except Exception as e:
+        print(f"Error getting tree: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/tree_info/<int:tree_id>')
+@login_required
+def tree_info(tree_id):
+    try:
+        # Get the tree and verify ownership
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            flash('Tree not found', 'error')
+            return redirect(url_for('farms.index'))
+        
+        # ✅ ADDED: Get the dome object that contains this tree
+        dome = Dome.query.filter_by(id=tree.dome_id, user_id=current_user.id).first()
+        if not dome:
+            flash('Dome not found', 'error')
+            return redirect(url_for('farms.index'))
+        
+        # ✅ DEBUG: Log breed information
+        print(f"🧬 Tree {tree_id} info route - Breed: '{tree.breed}' (type: {type(tree.breed)})")
+        print(f"   Tree name: '{tree.name}'")
+        print(f"   Has breed: {bool(tree.breed)}")
+        print(f"   Breed length: {len(tree.breed) if tree.breed else 0}")
+        
+        timestamp = int(time.time())
+        
+        # ✅ FIXED: Pass both tree AND dome objects to template
+        response = make_response(render_template('tree_info.html', 
+                                               tree=tree, 
+                                               dome=dome,  # ✅ Added dome object
+                                               timestamp=timestamp,
+                                               # ✅ DEBUG: Add explicit breed variable
+                                               debug_breed=tree.breed or 'NO_BREED'))
+        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+        return response
+        
+    except Exception as e:
+        print(f"❌ Error in tree_info route: {str(e)}")
+        import traceback
+        traceback.print_exc()  # ✅ Better error debugging
+        flash('An error occurred while loading tree information', 'error')
+        return redirect(url_for('farms.index'))
+
+
+#dome
+@trees_bp.route('/api/dome/<int:dome_id>/trees', methods=['POST'])
+@login_required
+def create_tree_api(dome_id):
+    """Create a new tree in the specified dome with plant type support"""
+    try:
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found or access denied'}), 404
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        # Validate required fields
+        required_fields = ['name', 'internal_row', 'internal_col']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'success': False, 'error': f'Missing required field: {field}'}), 400
+        
+        name = data['name'].strip()
+        internal_row = int(data['internal_row'])
+        internal_col = int(data['internal_col'])
+        
+        # ✅ FIXED: Get plant type and validate
+        plant_type = data.get('plant_type', 'mother')
+        if plant_type not in ['mother', 'cutting']:
+            return jsonify({'success': False, 'error': 'Plant type must be "mother" or "cutting"'}), 400
+        
+        # ✅ FIXED: If it's a cutting, validate mother plant
+        mother_plant_id = None
+        if plant_type == 'cutting':
+            mother_plant_id = data.get('mother_plant_id')  # ✅ CHANGED: from mother_tree_id to mother_plant_id
+            if not mother_plant_id:
+                return jsonify({'success': False, 'error': 'Mother plant ID is required for cuttings'}), 400
+            
+            # Verify mother plant exists and belongs to user
+            mother_plant = Tree.query.filter_by(
+                id=mother_plant_id, 
+                user_id=current_user.id,
+                plant_type='mother'
+            ).first()
+            
+            if not mother_plant:
+                return jsonify({'success': False, 'error': 'Invalid mother plant or mother plant not found'}), 400
+        
+        # Validate name
+        if not name:
+            return jsonify({'success': False, 'error': 'Tree name cannot be empty'}), 400
+        
+        if len(name) > 100:
+            return jsonify({'success': False, 'error': 'Tree name too long (max 100 characters)'}), 400
+        
+        # Validate position bounds
+        if internal_row < 0 or internal_row >= dome.internal_rows:
+            return jsonify({'success': False, 'error': f'Row {internal_row} out of bounds (0-{dome.internal_rows-1})'}), 400
+        
+        if internal_col < 0 or internal_col >= dome.internal_cols:
+            return jsonify({'success': False, 'error': f'Column {internal_col} out of bounds (0-{dome.internal_cols-1})'}), 400
+        
+        # Check if position is already occupied
+        position_ok, error_msg = validate_tree_position(dome_id, internal_row, internal_col)
+        if not position_ok:
+            return jsonify({'success': False, 'error': error_msg}), 400
+        
+        # ✅ FIXED: Create new tree with correct field names
+        new_tree = Tree(
+            name=name,
+            dome_id=dome_id,
+            internal_row=internal_row,
+            internal_col=internal_col,
+            info=data.get('info', ''),
+            life_days=data.get('life_days', 0),
+            user_id=current_user.id,
+            image_url=data.get('image_url', ''),
+            breed=data.get('breed', ''),
+            plant_type=plant_type,
+            cutting_notes=data.get('cutting_notes', ''),
+            mother_plant_id=mother_plant_id,  # ✅ FIXED: Use correct field name
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        
+        db.session.add(new_tree)
+        db.session.flush()  # Get the tree ID before commit
+        
+        # ✅ OPTIONAL: Create PlantRelationship record if you're using that table too
+        relationship_created = False
+        if plant_type == 'cutting' and mother_plant_id:
+            try:
+                # Check if you have a PlantRelationship table and want to use it
+                if 'PlantRelationship' in globals():
+                    relationship = PlantRelationship(
+                        mother_tree_id=mother_plant_id,
+                        cutting_tree_id=new_tree.id,
+                        notes=data.get('cutting_notes', ''),
+                        user_id=current_user.id,
+                        dome_id=dome_id,
+                        created_at=datetime.utcnow(),
+                        updated_at=datetime.utcnow()
+                    )
+                    db.session.add(relationship)
+                    relationship_created = True
+                    print(f"✅ Created plant relationship: Mother {mother_plant_id} -> Cutting {new_tree.id}")
+            except Exception as rel_error:
+                print(f"⚠️ Warning: Could not create plant relationship: {rel_error}")
+                # Continue without relationship - tree creation is more important
+        
+        db.session.commit()
+        
+        # ✅ ENHANCED: Update mother tree's cutting count if this is a cutting
+        if plant_type == 'cutting' and mother_plant_id:
+            mother_tree = db.session.get(Tree, mother_plant_id)
+            if mother_tree:
+                update_mother_cutting_count(mother_tree)
+                db.session.commit()
+                print(f'✅ Updated mother tree "{mother_tree.name}" cutting count')
+
+        # ✅ ENHANCED: Success message
+        if plant_type == 'cutting' and mother_plant_id:
+            mother_name = db.session.get(Tree, mother_plant_id).name
+            print(f'✅ Cutting "{name}" created from mother "{mother_name}" at ({internal_row}, {internal_col}) in dome {dome_id}')
+        else:
+            print(f'✅ Tree "{name}" created at ({internal_row}, {internal_col}) in dome {dome_id}')
+        
+        # ✅ FIXED: Return complete tree data
+        tree_data = new_tree.to_dict()
+        
+        # ✅ ENHANCED: Add relationship info if it's a cutting
+        if plant_type == 'cutting' and mother_plant_id:
+            mother_tree = db.session.get(Tree, mother_plant_id)
+            tree_data['mother_plant_name'] = mother_tree.name if mother_tree else 'Unknown'
+            tree_data['relationship_created'] = relationship_created
+        
+        return jsonify({
+            'success': True,
+            'message': f'{"Cutting" if plant_type == "cutting" else "Tree"} "{name}" created successfully',
+            'tree_id': new_tree.id,
+            'tree': tree_data
+        })
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid data format: {str(e)}'}), 400
+    except Exception as e:
+        print(f'❌ Error creating tree: {str(e)}')
+        import traceback
+        print(f'❌ Full traceback: {traceback.format_exc()}')
+        db.session.rollback()
+        return jsonify({'success': False, 'error': f'Failed to create tree: {str(e)}'}), 500
+
+
+# ============= TREE MANAGEMENT CONTINUED =============
+@trees_bp.route('/update_tree_name/<int:tree_id>', methods=['POST'])
+@login_required
+def update_tree_name(tree_id):
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify(success=False, error="Tree not found"), 404
+        
+        data = request.json
+        new_name = data.get('name')
+        
+        if not new_name:
+            return jsonify(success=False, error="Name is required"), 400
+        
+        tree.name = new_name
+        db.session.commit()
+        
+        return jsonify(success=True)
+        
+    except Exception as e:
+        print(f"Error updating tree name: {e}")
+        db.session.rollback()
+        return jsonify(success=False, error=str(e)), 500
+
+
+@trees_bp.route('/update_tree_info/<int:tree_id>', methods=['POST'])
+@login_required
+def update_tree_info(tree_id):
+    try:
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify(success=False, error="Tree not found"), 404
+        
+        data = request.json
+        tree.info = data.get('info', tree.info)
+        
+        db.session.commit()
+        return jsonify(success=True)
+        
+    except Exception as e:
+        print(f"Error updating tree info: {e}")
+        db.session.rollback()
+        return jsonify(success=False, error=str(e)), 500
+
+
+@trees_bp.route('/swap_trees', methods=['POST'])
+@login_required
+def swap_trees():
+    """Swap positions of two trees in the grid"""
+    try:
+        data = request.get_json()
+        tree1_id = data.get('tree1_id')
+        tree2_id = data.get('tree2_id')
+        
+        if not tree1_id or not tree2_id:
+            return jsonify({
+                'success': False,
+                'error': 'Both tree IDs are required'
+            })
+        
+        if tree1_id == tree2_id:
+            return jsonify({
+                'success': False,
+                'error': 'Cannot swap tree with itself'
+            })
+        
+        # Get both trees and verify ownership
+        tree1 = Tree.query.filter_by(id=tree1_id, user_id=current_user.id).first()
+        tree2 = Tree.query.filter_by(id=tree2_id, user_id=current_user.id).first()
+        
+        if not tree1:
+            return jsonify({
+                'success': False,
+                'error': f'Tree with ID {tree1_id} not found'
+            })
+        
+        if not tree2:
+            return jsonify({
+                'success': False,
+                'error': f'Tree with ID {tree2_id} not found'
+            })
+        
+        # Verify both trees belong to the same dome
+        if tree1.dome_id != tree2.dome_id:
+            return jsonify({
+                'success': False,
+                'error': 'Trees must belong to the same dome'
+            })
+        
+        # Store original positions
+        tree1_original_row = tree1.internal_row
+        tree1_original_col = tree1.internal_col
+        tree2_original_row = tree2.internal_row
+        tree2_original_col = tree2.internal_col
+        
+        # Swap positions
+        tree1.internal_row = tree2_original_row
+        tree1.internal_col = tree2_original_col
+        tree2.internal_row = tree1_original_row
+        tree2.internal_col = tree1_original_col
+        
+        # Commit changes to database
+        db.session.commit()
+        
+        print(f"✅ Successfully swapped trees:")
+        print(f"   Tree {tree1_id} ({tree1.name}): ({tree1_original_row},{tree1_original_col}) -> ({tree1.internal_row},{tree1.internal_col})")
+        print(f"   Tree {tree2_id} ({tree2.name}): ({tree2_original_row},{tree2_original_col}) -> ({tree2.internal_row},{tree2.internal_col})")
+        
+        return jsonify({
+            'success': True,
+            'message': 'Trees swapped successfully',
+            'tree1': {
+                'id': tree1.id,
+                'name': tree1.name,
+                'internal_row': tree1.internal_row,
+                'internal_col': tree1.internal_col
+            },
+            'tree2': {
+                'id': tree2.id,
+                'name': tree2.name,
+                'internal_row': tree2.internal_row,
+                'internal_col': tree2.internal_col
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error swapping trees: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Database error: {str(e)}'
+        })
+
+
+# Also make sure you have the move_tree endpoint
+@trees_bp.route('/api/trees/<int:tree_id>/move', methods=['POST'])
+@login_required
+def api_move_tree(tree_id):
+    """API endpoint for moving a tree to a new position"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No data provided'
+            }), 400
+        
+        new_row = data.get('internal_row')
+        new_col = data.get('internal_col')
+        
+        # Validate input data
+        if new_row is None or new_col is None:
+            return jsonify({
+                'success': False,
+                'error': 'Both internal_row and internal_col are required'
+            }), 400
+        
+        # Validate data types
+        try:
+            new_row = int(new_row)
+            new_col = int(new_col)
+        except (ValueError, TypeError):
+            return jsonify({
+                'success': False,
+                'error': 'internal_row and internal_col must be integers'
+            }), 400
+        
+        # Validate position bounds (basic check)
+        if new_row < 0 or new_col < 0:
+            return jsonify({
+                'success': False,
+                'error': 'Position coordinates cannot be negative'
+            }), 400
+        
+        # Get the tree and verify ownership
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({
+                'success': False,
+                'error': f'Tree with ID {tree_id} not found or access denied'
+            }), 404
+        
+        # Get dome to validate bounds
+        dome = db.session.get(Dome, tree.dome_id)
+        if not dome:
+            return jsonify({
+                'success': False,
+                'error': 'Dome not found'
+            }), 404
+        
+        # Validate position is within dome bounds
+        if new_row >= dome.internal_rows or new_col >= dome.internal_cols:
+            return jsonify({
+                'success': False,
+                'error': f'Position ({new_row}, {new_col}) is outside dome bounds ({dome.internal_rows}x{dome.internal_cols})'
+            }), 400
+        
+        # Store original position
+        old_row = tree.internal_row
+        old_col = tree.internal_col
+        
+        # Check if target position is already occupied
+        existing_tree = Tree.query.filter_by(
+            dome_id=tree.dome_id,
+            internal_row=new_row,
+            internal_col=new_col
+        ).first()
+        
+        swapped = False
+        swapped_tree_data = None
+        
+        if existing_tree and existing_tree.id != tree_id:
+            # Swap positions
+            existing_tree.internal_row = old_row
+            existing_tree.internal_col = old_col
+            
+            swapped = True
+            swapped_tree_data = {
+                'id': existing_tree.id,
+                'name': existing_tree.name,
+                'internal_row': old_row,
+                'internal_col': old_col,
+                'old_row': new_row,
+                'old_col': new_col
+            }
+            
+            print(f"🔄 Swapping trees: {tree.name} ({old_row},{old_col}) <-> {existing_tree.name} ({new_row},{new_col})")
+        
+        # Move the dragged tree to new position
+        tree.internal_row = new_row
+        tree.internal_col = new_col
+        
+        # Commit changes
+        db.session.commit()
+        
+        print(f"✅ Successfully moved tree {tree_id} ({tree.name}): ({old_row},{old_col}) -> ({new_row},{new_col})")
+        if swapped:
+            print(f"✅ Swapped with tree {existing_tree.id} ({existing_tree.name})")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Tree "{tree.name}" moved successfully',
+            'swapped': swapped,
+            'swapped_tree': swapped_tree_data,
+            'tree': {
+                'id': tree.id,
+                'name': tree.name,
+                'internal_row': tree.internal_row,
+                'internal_col': tree.internal_col,
+                'old_row': old_row,
+                'old_col': old_col,
+                'dome_id': tree.dome_id
+            }
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error moving tree {tree_id}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Failed to move tree: {str(e)}'
+        }), 500
+
+
+@trees_bp.route('/update_tree/<int:tree_id>', methods=['POST'])
+@login_required
+def update_tree(tree_id):
+    """Update tree information"""
+    try:
+        data = request.get_json()
+        print(f"🌱 Updating tree {tree_id} with data: {data}")
+        
+        # Validate input data
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        tree = Tree.query.filter_by(id=tree_id, user_id=current_user.id).first()
+        if not tree:
+            return jsonify({'success': False, 'error': 'Tree not found'}), 404
+        
+        # ✅ IMPROVED: Handle breed field properly (empty string vs None)
+        if 'name' in data and data['name']:
+            tree.name = data['name'].strip()
+        
+        if 'breed' in data:
+            breed_value = data['breed'].strip() if data['breed'] else None
+            tree.breed = breed_value if breed_value else None  # Convert empty string to None
+        
+        if 'info' in data:
+            info_value = data['info'].strip() if data['info'] else None
+            tree.info = info_value if info_value else None  # Convert empty string to None
+        
+        if 'life_days' in data:
+            try:
+                tree.life_days = int(data['life_days']) if data['life_days'] is not None else 0
+            except (ValueError, TypeError):
+                tree.life_days = 0
+        
+        # ✅ IMPROVED: Update timestamp
+        tree.updated_at = datetime.utcnow()
+        
+        db.session.commit()
+        print(f"✅ Tree {tree_id} updated successfully")
+        
+        # ✅ SAFE: Return response without calling to_dict() if it causes issues
+        try:
+            tree_dict = tree.to_dict()
+        except AttributeError as attr_error:
+            print(f"⚠️ to_dict() error: {attr_error}")
+            # Return manual dict if to_dict() fails
+            tree_dict = {
+                'id': tree.id,
+                'name': tree.name,
+                'breed': tree.breed or '',
+                'internal_row': tree.internal_row,
+                'internal_col': tree.internal_col,
+                'info': tree.info or '',
+                'life_days': tree.life_days or 0,
+                'dome_id': tree.dome_id,
+                'user_id': tree.user_id,
+                'created_at': tree.created_at.isoformat() if tree.created_at else None,
+                'updated_at': tree.updated_at.isoformat() if tree.updated_at else None
+            }
+        
+        return jsonify({
+            'success': True,
+            'message': 'Tree updated successfully',
+            'tree': tree_dict
+        })
+        
+    except Exception as e:
+        print(f"❌ Error updating tree: {e}")
+        import traceback
+        traceback.print_exc()  # ✅ This will show the full error trace
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ============= API ENDPOINTS =============
+# Per-tree fields of /api/trees/<dome_id>
+API_TREE_FIELDS = {
+    'id': tree_field(lambda tree: tree.id, 'id'),
+    'name': tree_field(lambda tree: tree.name or f'Tree {tree.id}', 'name'),
+    'internal_row': tree_field(lambda tree: tree.internal_row, 'internal_row'),  # ✅ FIXED: Use internal_row instead of row
+    'internal_col': tree_field(lambda tree: tree.internal_col, 'internal_col'),  # ✅ FIXED: Use internal_col instead of col
+    'life_days': tree_field(lambda tree: tree.life_days if tree.life_days is not None else 0, 'life_days'),
+    'info': tree_field(lambda tree: tree.info or '', 'info'),
+    'image_url': tree_field(lambda tree: tree.image_url or '', 'image_url'),
+    'dome_id': tree_field(lambda tree: tree.dome_id, 'dome_id'),
+    'user_id': tree_field(lambda tree: tree.user_id, 'user_id'),
+    'created_at': tree_field(lambda tree: tree.created_at.isoformat() if tree.created_at else None, 'created_at'),
+    'updated_at': tree_field(lambda tree: tree.updated_at.isoformat() if tree.updated_at else None, 'updated_at'),
+    'breed': tree_field(lambda tree: tree.breed or '', 'breed'),  # ✅ CRITICAL: Add breed field
+}
+
+
+@trees_bp.route('/api/trees/<int:dome_id>')
+@login_required
+def api_get_trees(dome_id):
+    """API endpoint to get trees for a specific dome with breed information"""
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        try:
+            listing = TreeListing.from_request(API_TREE_FIELDS, request)
+        except ListingError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        trees_query = Tree.query.filter_by(dome_id=dome_id, user_id=current_user.id)
+        if listing.ndjson:
+            return listing.stream(trees_query)
+        trees, next_cursor = listing.page(listing.apply(trees_query).all())
+        
+        # ?breed_codes=1 sends each breed as a code into one 'breeds' list
+        breeds = BreedDictionary() if request.args.get('breed_codes', '').lower() in ('1', 'true', 'yes') else None
+        
+        trees_data = [listing.serialize(tree) for tree in trees]
+        if breeds is not None:
+            encode_breeds(trees_data, breeds)
+        
+        print(f"✅ API returning {len(trees_data)} trees for dome {dome_id}")
+        
+        response = {
+            'success': True,
+            'trees': trees_data,
+            'dome': {
+                'id': dome.id,
+                'name': dome.name,
+                'internal_rows': dome.internal_rows,
+                'internal_cols': dome.internal_cols
+            },
+            'count': len(trees_data)
+        }
+        if breeds is not None:
+            response['breeds'] = breeds.names
+        if listing.paginated:
+            response['next_cursor'] = next_cursor
+        return jsonify(response)
+        
+    except Exception as e:
+        print(f"❌ Error getting trees for dome {dome_id}: {str(e)}")
+        import traceback
+        print(f"   Traceback: {traceback.format_exc()}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/bulk_delete_trees', methods=['POST'])
+@login_required
+def bulk_delete_trees():
+    """Delete multiple trees at once"""
+    try:
+        data = request.get_json()
+        tree_ids = data.get('tree_ids', [])
+        
+        if not tree_ids:
+            return jsonify({'success': False, 'error': 'No trees selected'}), 400
+        
+        # ✅ Tombstone all selected trees with one UPDATE; it only counts if every tree is the user's
+        deleted = soft_delete_trees(current_user.id, Tree.id.in_(tree_ids))
+        if len(deleted) != len(set(tree_ids)):
+            db.session.rollback()
+            return jsonify({'success': False, 'error': 'Some trees not found or access denied'}), 403
+        
+        db.session.commit()
+        deleted_count = len(deleted)
+        tree_names = [row.name for row in deleted]
+        
+        print(f"✅ Bulk deleted {deleted_count} trees: {', '.join(tree_names)}")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Successfully deleted {deleted_count} trees',
+            'deleted_count': deleted_count,
+            'deleted_trees': tree_names
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in bulk delete: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/bulk_move_trees', methods=['POST'])
+@login_required
+def bulk_move_trees():
+    """Move multiple trees to new positions"""
+    try:
+        data = request.get_json()
+        moves = data.get('moves', [])  # Array of {tree_id, new_row, new_col}
+        
+        if not moves:
+            return jsonify({'success': False, 'error': 'No moves specified'}), 400
+        
+        # Verify all trees belong to the user and get dome info
+        tree_ids = [move['tree_id'] for move in moves]
+        trees = Tree.query.filter(
+            Tree.id.in_(tree_ids),
+            Tree.user_id == current_user.id
+        ).all()
+        
+        if len(trees) != len(tree_ids):
+            return jsonify({'success': False, 'error': 'Some trees not found or access denied'}), 403
+        
+        # Check for position conflicts
+        dome_id = trees[0].dome_id  # Assume all trees are in the same dome
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # Validate all new positions are within dome bounds
+        for move in moves:
+            new_row = move.get('new_row')
+            new_col = move.get('new_col')
+            
+            if (new_row < 0 or new_row >= dome.internal_rows or 
+                new_col < 0 or new_col >= dome.internal_cols):
+                return jsonify({
+                    'success': False, 
+                    'error': f'Position ({new_row}, {new_col}) is outside dome bounds'
+                }), 400
+        
+        # Check for conflicts with existing trees (excluding the ones being moved)
+        new_positions = [(move['new_row'], move['new_col']) for move in moves]
+        existing_trees = Tree.query.filter(
+            Tree.dome_id == dome_id,
+            Tree.user_id == current_user.id,
+            ~Tree.id.in_(tree_ids)  # Exclude trees being moved
+        ).all()
+        
+        for existing_tree in existing_trees:
+            pos = (existing_tree.internal_row, existing_tree.internal_col)
+            if pos in new_positions:
+                return jsonify({
+                    'success': False,
+                    'error': f'Position ({pos[0]}, {pos[1]}) is occupied by "{existing_tree.name}"'
+                }), 400
+        
+        # Check for conflicts within the moves themselves
+        if len(set(new_positions)) != len(new_positions):
+            return jsonify({
+                'success': False,
+                'error': 'Cannot move multiple trees to the same position'
+            }), 400
+        
+        # Apply all moves
+        trees_by_id = {t.id: t for t in trees}
+        moved_trees = []
+        for move in moves:
+            tree = trees_by_id[move['tree_id']]
+            old_pos = (tree.internal_row, tree.internal_col)
+            
+            tree.internal_row = move['new_row']
+            tree.internal_col = move['new_col']
+            
+            moved_trees.append({
+                'id': tree.id,
+                'name': tree.name,
+                'old_position': old_pos,
+                'new_position': (tree.internal_row, tree.internal_col)
+            })
+        
+        db.session.commit()
+        
+        print(f"✅ Bulk moved {len(moved_trees)} trees")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Successfully moved {len(moved_trees)} trees',
+            'moved_trees': moved_trees
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in bulk move: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/api/dome/<int:dome_id>/batch', methods=['POST'])
+@login_required
+def dome_tree_batch(dome_id):
+    """Apply a batch of move/swap/update/delete operations to a dome's trees atomically"""
+    try:
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
+        operations = data.get('operations')
+        
+        delta = apply_tree_batch(dome, current_user.id, operations)
+        
+        print(f"✅ Batch on dome {dome_id}: {len(delta['moved'])} moved, {len(delta['updated'])} updated, {len(delta['deleted'])} deleted")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Applied {len(operations)} operations',
+            'dome_id': dome_id,
+            'delta': delta
+        })
+        
+    except BatchValidationError as e:
+        return jsonify({'success': False, 'error': 'Batch validation failed', 'errors': e.errors}), 400
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error applying batch to dome {dome_id}: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/api/trees/import', methods=['POST'])
+@login_required
+def import_trees_csv():
+    """Plant trees from a CSV upload (form field 'file') or a text/csv body.
+
+    Optional farm_id limits dome names to one farm; dry_run=1 only validates.
+    Any invalid row rejects the whole file with per-row errors.
+    """
+    try:
+        upload = request.files.get('file')
+        content = upload.read() if upload else request.get_data()
+        if not content:
+            return jsonify({'success': False, 'error': 'No CSV file provided'}), 400
+
+        farm_id = request.values.get('farm_id', type=int)
+        dry_run = request.values.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        result = import_trees(current_user.id, content, farm_id=farm_id, dry_run=dry_run)
+
+        print(f"📥 {'Validated' if dry_run else 'Imported'} CSV trees for user {current_user.id}: {result}")
+        return jsonify({'success': True, 'dry_run': dry_run, **result})
+
+    except ImportValidationError as e:
+        return jsonify({'success': False, 'error': 'Import validation failed', 'errors': e.errors}), 400
+    except UnicodeDecodeError:
+        return jsonify({'success': False, 'error': 'The CSV file must be UTF-8'}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error importing trees: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/bulk_update_trees', methods=['POST'])
+@login_required
+def bulk_update_trees():
+    """Update properties of multiple trees at once"""
+    try:
+        data = request.get_json()
+        tree_ids = data.get('tree_ids', [])
+        updates = data.get('updates', {})  # {field: value} pairs
+        
+        if not tree_ids:
+            return jsonify({'success': False, 'error': 'No trees selected'}), 400
+        
+        if not updates:
+            return jsonify({'success': False, 'error': 'No updates specified'}), 400
+        
+        # Verify all trees belong to the user
+        trees = Tree.query.filter(
+            Tree.id.in_(tree_ids),
+            Tree.user_id == current_user.id
+        ).all()
+        
+        if len(trees) != len(tree_ids):
+            return jsonify({'success': False, 'error': 'Some trees not found or access denied'}), 403
+        
+        # Apply updates to all selected trees
+        updated_trees = []
+        allowed_fields = ['name', 'info', 'life_days']  # Only allow certain fields
+        
+        for tree in trees:
+            tree_updated = False
+            old_values = {}
+            
+            for field, value in updates.items():
+                if field in allowed_fields and hasattr(tree, field):
+                    old_values[field] = getattr(tree, field)
+                    setattr(tree, field, value)
+                    tree_updated = True
+            
+            if tree_updated:
+                tree.updated_at = datetime.utcnow()
+                updated_trees.append({
+                    'id': tree.id,
+                    'name': tree.name,
+                    'old_values': old_values,
+                    'new_values': {k: v for k, v in updates.items() if k in allowed_fields}
+                })
+        
+        db.session.commit()
+        
+        print(f"✅ Bulk updated {len(updated_trees)} trees")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Successfully updated {len(updated_trees)} trees',
+            'updated_trees': updated_trees
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error in bulk update: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Per-tree fields of /get_selected_trees_info
+SELECTED_TREE_FIELDS = {
+    'id': tree_field(lambda tree: tree.id, 'id'),
+    'name': tree_field(lambda tree: tree.name, 'name'),
+    'internal_row': tree_field(lambda tree: tree.internal_row, 'internal_row'),
+    'internal_col': tree_field(lambda tree: tree.internal_col, 'internal_col'),
+    'life_days': tree_field(lambda tree: tree.life_days or 0, 'life_days'),
+    'life_stage': tree_field(lambda tree: tree.get_life_stage(), *LIFE_DAY_COLUMNS),
+    'info': tree_field(lambda tree: tree.info or '', 'info'),
+    'has_image': tree_field(lambda tree: bool(tree.has_image), 'has_image'),
+    'dome_id': tree_field(lambda tree: tree.dome_id, 'dome_id'),
+    'created_at': tree_field(lambda tree: tree.created_at.isoformat() if tree.created_at else None, 'created_at'),
+}
+# Columns the selection summary reads, whatever fields were asked for
+SELECTION_SUMMARY_COLUMNS = LIFE_DAY_COLUMNS + ('info', 'has_image')
+
+
+@trees_bp.route('/get_selected_trees_info', methods=['POST'])
+@login_required
+def get_selected_trees_info():
+    """Get detailed information about selected trees.
+
+    With ?limit=/?after= the trees and the summary cover one page of the selection.
+    """
+    try:
+        data = request.get_json()
+        tree_ids = data.get('tree_ids', [])
+        
+        if not tree_ids:
+            return jsonify({'success': False, 'error': 'No trees selected'}), 400
+        
+        try:
+            listing = TreeListing.from_request(SELECTED_TREE_FIELDS, request)
+        except ListingError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        # Get all selected trees
+        selection = Tree.query.filter(
+            Tree.id.in_(tree_ids),
+            Tree.user_id == current_user.id
+        )
+        if listing.paginated or listing.ndjson:
+            if selection.count() != len(tree_ids):
+                return jsonify({'success': False, 'error': 'Some trees not found or access denied'}), 403
+            if listing.ndjson:
+                return listing.stream(selection)
+        
+        trees, next_cursor = listing.page(listing.apply(selection, SELECTION_SUMMARY_COLUMNS).all())
+        if not listing.paginated and len(trees) != len(tree_ids):
+            return jsonify({'success': False, 'error': 'Some trees not found or access denied'}), 403
+        
+        # Compile tree information
+        trees_info = [listing.serialize(tree) for tree in trees]
+        total_life_days = 0
+        life_stages = {'Young': 0, 'Mature': 0, 'Old': 0}
+        
+        for tree in trees:
+            total_life_days += tree.life_days or 0
+            stage = tree.get_life_stage()
+            life_stages[stage] = life_stages.get(stage, 0) + 1
+        
+        # Calculate statistics
+        avg_life_days = total_life_days / len(trees) if trees else 0
+        
+        summary = {
+            'total_trees': len(trees),
+            'total_life_days': total_life_days,
+            'average_life_days': round(avg_life_days, 1),
+            'life_stages': life_stages,
+            'trees_with_images': sum(1 for tree in trees if tree.has_image),
+            'trees_with_info': sum(1 for tree in trees if tree.info)
+        }
+        
+        response = {
+            'success': True,
+            'trees': trees_info,
+            'summary': summary
+        }
+        if listing.paginated:
+            response['next_cursor'] = next_cursor
+        return jsonify(response)
+        
+    except Exception as e:
+        print(f"❌ Error getting selected trees info: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@trees_bp.route('/clear_dome_area', methods=['POST'])
+@login_required
+def clear_dome_area():
+    """Clear all trees in a specified area of the dome"""
+    try:
+        data = request.get_json()
+        dome_id = data.get('dome_id')
+        start_row = data.get('start_row')
+        end_row = data.get('end_row')
+        start_col = data.get('start_col')
+        end_col = data.get('end_col')
+        
+        # Validate input
+        if not all([dome_id is not None, start_row is not None, end_row is not None, 
+                   start_col is not None, end_col is not None]):
+            return jsonify({'success': False, 'error': 'Missing required parameters'}), 400
+        
+        # Verify dome ownership
+        dome = Dome.query.filter_by(id=dome_id, user_id=current_user.id).first()
+        if not dome:
+            return jsonify({'success': False, 'error': 'Dome not found'}), 404
+        
+        # ✅ Tombstone every tree in the rectangle with one UPDATE
+        deleted = soft_delete_trees(
+            current_user.id,
+            Tree.dome_id == dome_id,
+            Tree.internal_row >= start_row,
+            Tree.internal_row <= end_row,
+            Tree.internal_col >= start_col,
+            Tree.internal_col <= end_col
+        )
+        
+        if not deleted:
+            return jsonify({
+                'success': True,
+                'message': 'No trees found in the specified area',
+                'deleted_count': 0
+            })
+        
+        db.session.commit()
+        deleted_trees = [
+            {'id': row.id, 'name': row.name, 'position': (row.internal_row, row.internal_col)}
+            for row in deleted
+        ]
+        
+        print(f"✅ Cleared {len(deleted_trees)} trees from area ({start_row},{start_col}) to ({end_row},{end_col})")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Cleared {len(deleted_trees)} trees from the selected area',
+            'deleted_count': len(deleted_trees),
+            'deleted_trees': deleted_trees
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error clearing dome area: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
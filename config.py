@@ -0,0 +1,75 @@
+"""Application configuration read from the environment"""
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configuration constants
+UPLOAD_FOLDER = 'uploads'
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+
+# ✅ FIXED: Database configuration with better error handling
+def get_database_url():
+    """Get database URL based on environment"""
+    # Check if we're on Render (production)
+    if os.getenv('RENDER'):
+        # Use PostgreSQL on Render
+        database_url = os.getenv('DATABASE_URL')
+        if database_url:
+            if database_url.startswith('postgres://'):
+                # Fix for SQLAlchemy 1.4+ compatibility
+                database_url = database_url.replace('postgres://', 'postgresql://', 1)
+            return database_url
+        else:
+            # Fallback to SQLite if DATABASE_URL is not set
+            print("⚠️ WARNING: DATABASE_URL not found on Render, falling back to SQLite")
+            return 'sqlite:///db.sqlite3'
+    else:
+        # Use SQLite for local development
+        return 'sqlite:///db.sqlite3'
+
+
+DATABASE_URL = get_database_url()
+
+# Configuration
+SECRET_KEY = os.getenv('SECRET_KEY', 'fallback-secret-key')
+MAIL_SERVER = 'smtp.gmail.com'
+MAIL_PORT = 587
+MAIL_USE_TLS = True
+MAIL_USERNAME = os.getenv('MAIL_USERNAME')
+MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
+
+
+def env_flag(name, default=False):
+    """Boolean environment variable ('1', 'true', 'yes' and 'on' are true)"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+# Debug, test, migration and repair routes (blueprints/admin.py); off on Render unless asked for
+ENABLE_DEBUG_ROUTES = env_flag('ENABLE_DEBUG_ROUTES', default=not os.getenv('RENDER'))
+
+# 'cookie' (Flask's signed cookie), 'sql' or 'filesystem' (services/sessions.py)
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'cookie')
+SESSION_FILE_DIR = os.getenv('SESSION_FILE_DIR')
+
+# Text responses smaller than this many bytes are sent uncompressed (services/compression.py)
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+
+print(f"Environment: {'Production (Render)' if os.getenv('RENDER') else 'Development'}")
+print(f"Loaded MAIL_USERNAME: {MAIL_USERNAME}")
+print(f"Loaded SECRET_KEY: {SECRET_KEY[:20]}...")
+if DATABASE_URL:
+    print(f"Database URL: {DATABASE_URL[:50]}..." if len(DATABASE_URL) > 50 else f"Database URL: {DATABASE_URL}")
+else:
+    print("No DATABASE_URL")
+
+
+def is_postgresql():
+    """Check if we're using PostgreSQL"""
+    return 'postgresql' in DATABASE_URL or os.getenv('RENDER') or os.getenv('DATABASE_URL', '').startswith('postgres')
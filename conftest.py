@@ -0,0 +1,84 @@
+import pytest
+from flask import Flask
+
+from models import db, User, Farm, Dome, Tree
+
+
+@pytest.fixture
+def app():
+    """Minimal app bound to an in-memory SQLite database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SECRET_KEY'] = 'test-secret-key'
+    app.config['TESTING'] = True
+    db.init_app(app)
+
+    from services.breeds import register_breed_listeners
+    from services.dome_versions import register_dome_version_listeners
+    from services.lineage import register_lineage_listeners
+    from services.search import register_search_listeners
+    from services.user_cache import register_user_cache_listeners
+    from services.soft_delete import register_soft_delete_filter
+    register_lineage_listeners()
+    register_breed_listeners()
+    register_dome_version_listeners()
+    register_search_listeners()
+    register_user_cache_listeners()
+    register_soft_delete_filter()
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def farm_setup(app):
+    """A user with one farm and one 10x10 dome"""
+    user = User(username='grower', email='grower@example.com')
+    user.set_password('secret123')
+    db.session.add(user)
+    db.session.flush()
+
+    farm = Farm(name='Farm', grid_row=0, grid_col=0, user_id=user.id)
+    db.session.add(farm)
+    db.session.flush()
+
+    dome = Dome(name='Dome', grid_row=0, grid_col=0, internal_rows=10, internal_cols=10,
+                user_id=user.id, farm_id=farm.id)
+    db.session.add(dome)
+    db.session.commit()
+    return user, farm, dome
+
+
+def make_tree(dome, row, col, name=None, mother=None, breed='OG Kush'):
+    """Create and flush a tree, optionally as a cutting of mother"""
+    tree = Tree(
+        name=name or f'Tree {row}-{col}',
+        breed=breed,
+        internal_row=row,
+        internal_col=col,
+        dome_id=dome.id,
+        user_id=dome.user_id,
+        plant_type='cutting' if mother else 'mother',
+        mother_plant_id=mother.id if mother else None
+    )
+    db.session.add(tree)
+    db.session.flush()
+    return tree
+
+
+def login_client(app, user, blueprints):
+    """Test client logged in as user, with the given blueprints registered"""
+    from flask_login import LoginManager
+    from blueprints import register_blueprints
+
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+    register_blueprints(app, only=blueprints)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+    return client
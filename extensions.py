@@ -0,0 +1,15 @@
+"""Extension instances shared by app.py and the blueprints"""
+from flask_login import LoginManager
+
+from config import DATABASE_URL
+from services.life_updater import TreeLifeUpdater
+
+# ✅ FIXED: Initialize TreeLifeUpdater with proper error handling
+try:
+    life_updater = TreeLifeUpdater(DATABASE_URL)
+except Exception as e:
+    print(f"⚠️ Warning: Could not initialize TreeLifeUpdater: {e}")
+    life_updater = None
+
+# Initialize Flask-Login
+login_manager = LoginManager()
@@ -20,6 +20,7 @@ class User(UserMixin, db.Model):
     last_login = db.Column(db.DateTime, nullable=True)
     previous_login = db.Column(db.DateTime, nullable=True)
     login_count = db.Column(db.Integer, default=0)    
+    life_reference_at = db.Column(db.DateTime, nullable=True)  # When this user's tree life days were last refreshed (set at login)
     # Relationships
     farms = db.relationship('Farm', backref='owner', lazy=True, cascade='all, delete-orphan')
     domes = db.relationship('Dome', backref='owner', lazy=True, cascade='all, delete-orphan')
@@ -37,15 +38,20 @@ class User(UserMixin, db.Model):
         self.reset_token_expires = datetime.utcnow() + timedelta(hours=1)
         return self.reset_token
     def update_last_login(self):
-        """Update last login timestamp"""
+        """Update last login timestamp and the life-day reference time.
+
+        Only the user row is written; trees read ``life_reference_at`` when
+        they are serialized instead of being touched one by one.
+        """
+        now = datetime.utcnow()
         self.previous_login = self.last_login
-        self.last_login = datetime.utcnow()
+        self.last_login = now
         self.login_count = (self.login_count or 0) + 1
-        
-        # Update all user's trees with current reference time
-        for tree in self.trees:
-            # This will trigger recalculation of life days
-            tree.updated_at = datetime.utcnow()
+        self.life_reference_at = now
+    
+    def get_life_reference_date(self):
+        """Reference time for this user's tree life-day refreshes"""
+        return self.life_reference_at or self.last_login or self.created_at
     
     def get_days_since_last_login(self):
         """Get number of days since last login"""
@@ -149,6 +155,7 @@ class Dome(db.Model):
     farm_id = db.Column(db.Integer, db.ForeignKey('farm.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Bumped on every change shown in the dome (services/dome_versions.py)
     
     # ✅ FIXED: Single trees relationship definition
     trees = db.relationship('Tree', backref='dome', lazy=True, cascade='all, delete-orphan')
@@ -167,19 +174,14 @@ class Dome(db.Model):
                 return tree
         return None
 
+    def get_occupancy(self):
+        """Occupancy map of this dome's cells, built with one query"""
+        from services.occupancy import DomeOccupancy
+        return DomeOccupancy.for_dome(self)
+
     def get_empty_positions(self):
         """Get list of empty positions in the dome"""
-        occupied_positions = set()
-        for tree in self.trees:
-            occupied_positions.add((tree.internal_row, tree.internal_col))
-        
-        empty_positions = []
-        for row in range(self.internal_rows):
-            for col in range(self.internal_cols):
-                if (row, col) not in occupied_positions:
-                    empty_positions.append({'row': row, 'col': col})
-        
-        return empty_positions
+        return [{'row': row, 'col': col} for row, col in self.get_occupancy().free_cells()]
 
     def get_occupancy_rate(self):
         """Get occupancy rate as percentage"""
@@ -187,15 +189,75 @@ class Dome(db.Model):
         occupied_positions = len(self.trees)
         return (occupied_positions / total_positions * 100) if total_positions > 0 else 0
 
+    def get_content_bounds(self):
+        """Largest row/col used by live trees, drag areas and regular areas, in one aggregate query"""
+        def max_of(column, *criteria):
+            return db.select(db.func.max(column)).where(*criteria).scalar_subquery()
+        
+        row = db.session.execute(db.select(
+            max_of(Tree.internal_row, Tree.dome_id == self.id, Tree.deleted_at.is_(None)),
+            max_of(Tree.internal_col, Tree.dome_id == self.id, Tree.deleted_at.is_(None)),
+            max_of(DragArea.max_row, DragArea.dome_id == self.id),
+            max_of(DragArea.max_col, DragArea.dome_id == self.id),
+            max_of(RegularArea.max_row, RegularArea.dome_id == self.id),
+            max_of(RegularArea.max_col, RegularArea.dome_id == self.id)
+        )).one()
+        return {
+            'trees': (row[0], row[1]),
+            'drag_areas': (row[2], row[3]),
+            'regular_areas': (row[4], row[5])
+        }
+    
+    def find_resize_conflicts(self, new_rows, new_cols):
+        """Trees and areas that would fall outside new_rows x new_cols.
+        
+        The aggregate bounds decide first; offending rows are only fetched
+        for the kinds that actually overflow, so the common case is one query.
+        """
+        def overflows(bounds):
+            max_row, max_col = bounds
+            return (max_row is not None and max_row >= new_rows) or (max_col is not None and max_col >= new_cols)
+        
+        bounds = self.get_content_bounds()
+        conflicts = {'trees': [], 'drag_areas': [], 'regular_areas': []}
+        
+        if overflows(bounds['trees']):
+            conflicts['trees'] = [
+                {'id': tree.id, 'name': tree.name, 'position': f"({tree.internal_row}, {tree.internal_col})"}
+                for tree in db.session.query(Tree.id, Tree.name, Tree.internal_row, Tree.internal_col).filter(
+                    Tree.dome_id == self.id,
+                    (Tree.internal_row >= new_rows) | (Tree.internal_col >= new_cols)
+                ).order_by(Tree.internal_row, Tree.internal_col)
+            ]
+        
+        for key, model in (('drag_areas', DragArea), ('regular_areas', RegularArea)):
+            if overflows(bounds[key]):
+                conflicts[key] = [
+                    {'id': area.id, 'name': area.name,
+                     'bounds': f"({area.min_row},{area.min_col})-({area.max_row},{area.max_col})"}
+                    for area in db.session.query(
+                        model.id, model.name, model.min_row, model.min_col, model.max_row, model.max_col
+                    ).filter(
+                        model.dome_id == self.id,
+                        (model.max_row >= new_rows) | (model.max_col >= new_cols)
+                    ).order_by(model.id)
+                ]
+        
+        return conflicts
+
     def can_resize_to(self, new_rows, new_cols):
         """Check if dome can be resized without affecting trees"""
-        for tree in self.trees:
-            if tree.internal_row >= new_rows or tree.internal_col >= new_cols:
-                return False, f"Tree '{tree.name}' at ({tree.internal_row}, {tree.internal_col}) would be outside new bounds"
-        return True, "Resize is safe"
+        max_row, max_col = self.get_content_bounds()['trees']
+        if (max_row is None or max_row < new_rows) and (max_col is None or max_col < new_cols):
+            return True, "Resize is safe"
+        tree = self.find_resize_conflicts(new_rows, new_cols)['trees'][0]
+        return False, f"Tree '{tree['name']}' at {tree['position']} would be outside new bounds"
 
     def to_dict(self):
         """Convert dome to dictionary for JSON serialization"""
+        # One occupancy query answers the count, rate and free cells
+        occupancy = self.get_occupancy()
+        total_positions = self.internal_rows * self.internal_cols
         return {
             'id': self.id,
             'name': self.name,
@@ -206,9 +268,9 @@ class Dome(db.Model):
             'image_url': self.image_url,
             'user_id': self.user_id,
             'farm_id': self.farm_id,
-            'tree_count': self.get_tree_count(),
-            'occupancy_rate': round(self.get_occupancy_rate(), 1),
-            'empty_positions': len(self.get_empty_positions()),
+            'tree_count': len(occupancy),
+            'occupancy_rate': round(len(occupancy) / total_positions * 100, 1) if total_positions > 0 else 0,
+            'empty_positions': occupancy.free_count(),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -237,10 +299,30 @@ class Tree(db.Model):
     # ✅ Plant type and cutting functionality
     plant_type = db.Column(db.String(20), default='mother', nullable=False)  # 'mother' or 'cutting'
     cutting_notes = db.Column(db.Text)  # Notes about cutting process
-    mother_plant_id = db.Column(db.Integer, db.ForeignKey('tree.id'), nullable=True)  # For tracking mother-cutting relationships
+    mother_plant_id = db.Column(db.Integer, db.ForeignKey('tree.id'), nullable=True, index=True)  # For tracking mother-cutting relationships
+    cutting_count = db.Column(db.Integer, default=0)  # Cached number of direct cuttings, maintained by services.lineage
+    deleted_at = db.Column(db.DateTime, nullable=True)  # Soft-delete tombstone, purged by services.soft_delete
+    breed_id = db.Column(db.Integer, db.ForeignKey('tree_breed.id', ondelete='SET NULL'), nullable=True, index=True)  # TreeBreed named by breed, maintained by services.breeds
+    # Whether an image is set, without loading image_url (base64 images can be large); deferred
+    has_image = db.column_property(db.and_(image_url.isnot(None), image_url != ''), deferred=True)
     # Self-referential relationship for mother-cutting
     mother_plant = db.relationship('Tree', remote_side=[id], backref='direct_cuttings')
     
+    __table_args__ = (
+        # Live-tree reads (grids, occupancy checks) skip tombstones through this index
+        db.Index('ix_tree_live_position', 'dome_id', 'internal_row', 'internal_col',
+                 sqlite_where=db.text('deleted_at IS NULL'),
+                 postgresql_where=db.text('deleted_at IS NULL')),
+        # The purge worker walks tombstones through this one
+        db.Index('ix_tree_tombstone', 'deleted_at', 'id',
+                 sqlite_where=db.text('deleted_at IS NOT NULL'),
+                 postgresql_where=db.text('deleted_at IS NOT NULL')),
+        # Keyset pages of tree listings (services/tree_listing.py)
+        db.Index('ix_tree_live_dome_id', 'dome_id', 'id',
+                 sqlite_where=db.text('deleted_at IS NULL'),
+                 postgresql_where=db.text('deleted_at IS NULL')),
+    )
+    
     def __repr__(self):
         return f'<Tree {self.name}>'
     
@@ -406,8 +488,10 @@ class Tree(db.Model):
         return []
 
     def get_cutting_count(self):
-        """Get number of cuttings from this mother plant"""
-        return len(self.get_cutting_trees())
+        """Get number of cuttings from this mother plant (cached column, no query)"""
+        if self.is_mother_plant():
+            return self.cutting_count or 0
+        return 0
 
     def get_plant_type_display(self):
         """Get display text for plant type"""
@@ -439,6 +523,39 @@ class Tree(db.Model):
         """Get the original mother tree ID before paste"""
         paste_meta = self.get_paste_metadata()
         return paste_meta.get('original_mother_id')
+    def get_generation(self):
+        """Get the number of generations back to this plant's root mother (0 for roots)"""
+        if not self.id:
+            return 0
+        depth = db.session.query(db.func.max(TreeLineage.depth)).filter(
+            TreeLineage.descendant_id == self.id
+        ).scalar()
+        return depth or 0
+    
+    def get_descendant_count(self):
+        """Get number of cuttings descending from this plant across all generations"""
+        if not self.id:
+            return 0
+        return TreeLineage.query.filter_by(ancestor_id=self.id).count()
+    
+    def get_ancestor_ids(self):
+        """Get IDs of this plant's mother, grandmother, ... nearest first"""
+        if not self.id:
+            return []
+        rows = db.session.query(TreeLineage.ancestor_id).filter(
+            TreeLineage.descendant_id == self.id
+        ).order_by(TreeLineage.depth).all()
+        return [row[0] for row in rows]
+    
+    def get_descendant_ids(self, max_depth=None):
+        """Get IDs of every plant in this plant's subtree, optionally limited by depth"""
+        if not self.id:
+            return []
+        query = db.session.query(TreeLineage.descendant_id).filter(TreeLineage.ancestor_id == self.id)
+        if max_depth is not None:
+            query = query.filter(TreeLineage.depth <= max_depth)
+        return [row[0] for row in query.all()]
+    
     def get_plant_lineage(self):
         """Get the plant lineage information"""
         lineage = {
@@ -447,7 +564,8 @@ class Tree(db.Model):
             'is_cutting': self.is_cutting(),
             'mother': None,
             'cuttings': [],
-            'generation': 0
+            'generation': self.get_generation(),
+            'descendant_count': self.get_descendant_count()
         }
         
         if self.is_cutting():
@@ -458,10 +576,8 @@ class Tree(db.Model):
                     'name': mother.name,
                     'breed': mother.breed
                 }
-                # If mother is also a cutting, this is generation 2+
-                if mother.is_cutting():
-                    lineage['generation'] = 2  # Could be calculated recursively
-                else:
+                # Lineage table not populated yet for this cutting
+                if not lineage['generation']:
                     lineage['generation'] = 1
         
         if self.is_mother_plant():
@@ -478,6 +594,12 @@ class Tree(db.Model):
         
         return lineage
     
+    def get_life_reference_at(self):
+        """ISO timestamp of the owner's last life-day refresh (the owner is already in the session)"""
+        owner = self.owner
+        reference = owner.get_life_reference_date() if owner else None
+        return reference.isoformat() if reference else None
+    
     def to_dict(self, reference_date=None):
         """Convert to dictionary with calculated life days and paste metadata"""
         try:
@@ -509,6 +631,7 @@ class Tree(db.Model):
                 'position_string': self.get_position_string(),
                 'created_at': self.created_at.isoformat() if self.created_at else None,
                 'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+                'life_reference_at': self.get_life_reference_at(),
                 'is_mother': self.is_mother_plant(),
                 'is_cutting': self.is_cutting(),
                 'has_mother': bool(self.mother_plant_id),
@@ -629,8 +752,32 @@ class PlantRelationship(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+class TreeLineage(db.Model):
+    """Closure table for mother → cutting ancestry.
+
+    One row per (ancestor, descendant) pair with the number of generations
+    between them, so a cutting's generation, a mother's full descendant count
+    and whole-subtree lookups are single indexed queries.  Rows are kept in
+    sync by ``services.lineage`` whenever ``Tree.mother_plant_id`` changes.
+    """
+    __tablename__ = 'tree_lineage'
+    
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('tree.id', ondelete='CASCADE'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('tree.id', ondelete='CASCADE'), primary_key=True)
+    depth = db.Column(db.Integer, nullable=False)  # 1 = direct cutting, 2 = cutting of a cutting, ...
+    
+    __table_args__ = (
+        db.Index('ix_tree_lineage_descendant', 'descendant_id', 'depth'),
+    )
+    
+    def __repr__(self):
+        return f'<TreeLineage ancestor={self.ancestor_id} descendant={self.descendant_id} depth={self.depth}>'
+
 class GridSettings(db.Model):
     __tablename__ = 'grid_settings'
+    __table_args__ = (
+        db.Index('ux_grid_settings_user_type', 'user_id', 'grid_type', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     rows = db.Column(db.Integer, default=10)
@@ -1094,71 +1241,94 @@ class TreeBreed(db.Model):
     def __repr__(self):
         return f'<TreeBreed {self.name}>'
     
-    # ✅ ADD THESE METHODS
+    EMPTY_USAGE = {'tree_count': 0, 'mother_count': 0, 'cutting_count': 0}
+
+    @staticmethod
+    def _usage_query():
+        return db.session.query(
+            Tree.breed_id,
+            db.func.count(Tree.id),
+            db.func.sum(db.case((Tree.plant_type == 'mother', 1), else_=0)),
+            db.func.sum(db.case((Tree.plant_type == 'cutting', 1), else_=0))
+        ).filter(Tree.breed_id.isnot(None))
+
+    @staticmethod
+    def _usage_by_breed(query):
+        return {
+            breed_id: {'tree_count': total, 'mother_count': mothers or 0, 'cutting_count': cuttings or 0}
+            for breed_id, total, mothers, cuttings in query.group_by(Tree.breed_id).all()
+        }
+
+    @staticmethod
+    def usage_counts(breed_ids):
+        """Tree/mother/cutting counts per breed id from one GROUP BY over live trees"""
+        breed_ids = list(breed_ids)
+        if not breed_ids:
+            return {}
+        return TreeBreed._usage_by_breed(TreeBreed._usage_query().filter(Tree.breed_id.in_(breed_ids)))
+
+    @staticmethod
+    def farm_usage_counts(farm_id, user_id):
+        """Counts per breed id for a farm's live trees.
+
+        One GROUP BY joined through Dome, so the cost does not grow with the
+        number of breeds the farm has.
+        """
+        return TreeBreed._usage_by_breed(
+            TreeBreed._usage_query()
+            .join(Dome, Dome.id == Tree.dome_id)
+            .filter(Dome.farm_id == farm_id, Tree.user_id == user_id)
+        )
+
+    def get_usage(self):
+        """Usage counts for this breed (one query)"""
+        return TreeBreed.usage_counts([self.id]).get(self.id, dict(TreeBreed.EMPTY_USAGE))
+
     def get_tree_count(self):
         """Get number of trees using this breed"""
-        if self.farm_id:
-            return Tree.query.join(Dome).filter(
-                Tree.breed == self.name,
-                Tree.user_id == self.user_id,
-                Dome.farm_id == self.farm_id
-            ).count()
-        else:
-            return Tree.query.filter_by(breed=self.name, user_id=self.user_id).count()
+        return self.get_usage()['tree_count']
     
     def get_mother_count(self):
         """Get number of mother plants using this breed"""
-        if self.farm_id:
-            return Tree.query.join(Dome).filter(
-                Tree.breed == self.name,
-                Tree.user_id == self.user_id,
-                Tree.plant_type == 'mother',
-                Dome.farm_id == self.farm_id
-            ).count()
-        else:
-            return Tree.query.filter_by(
-                breed=self.name, 
-                user_id=self.user_id, 
-                plant_type='mother'
-            ).count()
+        return self.get_usage()['mother_count']
     
     def get_cutting_count(self):
         """Get number of cuttings using this breed"""
-        if self.farm_id:
-            return Tree.query.join(Dome).filter(
-                Tree.breed == self.name,
-                Tree.user_id == self.user_id,
-                Tree.plant_type == 'cutting',
-                Dome.farm_id == self.farm_id
-            ).count()
-        else:
-            return Tree.query.filter_by(
-                breed=self.name, 
-                user_id=self.user_id, 
-                plant_type='cutting'
-            ).count()
+        return self.get_usage()['cutting_count']
     
-    def can_be_deleted(self):
+    def can_be_deleted(self, usage=None):
         """Check if breed can be safely deleted"""
-        tree_count = self.get_tree_count()
-        return tree_count == 0
+        if usage is None:
+            usage = self.get_usage()
+        return usage['tree_count'] == 0
     
-    def to_dict(self):
-        """Convert to dictionary for JSON serialization"""
-        return {
+    def to_dict(self, usage=None, include_usage=True):
+        """Convert to dictionary for JSON serialization.
+
+        Pass ``usage`` from ``TreeBreed.usage_counts``/``farm_usage_counts``
+        when serializing many breeds so the counts come from one query, or
+        ``include_usage=False`` to leave the counts out.
+        """
+        data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'user_id': self.user_id,
             'farm_id': self.farm_id,
             'is_active': self.is_active,
-            'tree_count': self.get_tree_count(),
-            'mother_count': self.get_mother_count(),
-            'cutting_count': self.get_cutting_count(),
-            'can_be_deleted': self.can_be_deleted(),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if include_usage:
+            if usage is None:
+                usage = self.get_usage()
+            data.update(
+                tree_count=usage['tree_count'],
+                mother_count=usage['mother_count'],
+                cutting_count=usage['cutting_count'],
+                can_be_deleted=self.can_be_deleted(usage)
+            )
+        return data
 
 # ✅ Additional utility functions for the models
 
@@ -1329,8 +1499,12 @@ def get_farm_statistics(farm_id, user_id):
     
     return stats
 
-def validate_tree_position(dome_id, row, col, exclude_tree_id=None):
-    """Validate if a tree position is valid and available"""
+def validate_tree_position(dome_id, row, col, exclude_tree_id=None, occupancy=None):
+    """Validate if a tree position is valid and available.
+
+    Pass a DomeOccupancy to validate many positions without a query per cell;
+    on its own a call costs one indexed lookup.
+    """
     dome = db.session.get(Dome, dome_id)
     if not dome:
         return False, "Dome not found"
@@ -1339,14 +1513,23 @@ def validate_tree_position(dome_id, row, col, exclude_tree_id=None):
     if not (0 <= row < dome.internal_rows and 0 <= col < dome.internal_cols):
         return False, f"Position ({row}, {col}) is outside dome bounds (0-{dome.internal_rows-1}, 0-{dome.internal_cols-1})"
     
+    if occupancy is not None:
+        # Counts every occupant, so a legacy tree sharing the excluded tree's cell still collides
+        if occupancy.occupants(row, col, exclude_tree_id) == 0:
+            return True, "Position is valid and available"
+        return False, f"Position ({row}, {col}) is already occupied"
+    
     # Check if position is occupied
-    existing_tree = Tree.query.filter_by(
+    query = Tree.query.filter_by(
         dome_id=dome_id,
         internal_row=row,
         internal_col=col
-    ).first()
+    )
+    if exclude_tree_id:
+        query = query.filter(Tree.id != exclude_tree_id)
+    existing_tree = query.first()
     
-    if existing_tree and (not exclude_tree_id or existing_tree.id != exclude_tree_id):
+    if existing_tree:
         return False, f"Position ({row}, {col}) is already occupied by tree '{existing_tree.name}'"
     
     return True, "Position is valid and available"
@@ -1357,32 +1540,17 @@ def get_available_positions(dome_id, count=None):
     if not dome:
         return []
     
-    occupied_positions = set()
-    for tree in dome.trees:
-        occupied_positions.add((tree.internal_row, tree.internal_col))
-    
-    available_positions = []
-    for row in range(dome.internal_rows):
-        for col in range(dome.internal_cols):
-            if (row, col) not in occupied_positions:
-                available_positions.append({'row': row, 'col': col})
-                if count and len(available_positions) >= count:
-                    return available_positions
-    
-    return available_positions
+    return [{'row': row, 'col': col} for row, col in dome.get_occupancy().free_cells(limit=count or None)]
 
 def cleanup_orphaned_relationships():
     """Clean up orphaned plant relationships where trees no longer exist"""
-    orphaned_relationships = db.session.query(PlantRelationship).filter(
-        ~PlantRelationship.mother_tree_id.in_(db.session.query(Tree.id)) |
-        ~PlantRelationship.cutting_tree_id.in_(db.session.query(Tree.id))
-    ).all()
-    
-    for relationship in orphaned_relationships:
-        db.session.delete(relationship)
+    deleted_count = PlantRelationship.query.filter(
+        ~db.session.query(Tree.id).filter(Tree.id == PlantRelationship.mother_tree_id).exists() |
+        ~db.session.query(Tree.id).filter(Tree.id == PlantRelationship.cutting_tree_id).exists()
+    ).delete(synchronize_session=False)
     
     db.session.commit()
-    return len(orphaned_relationships)
+    return deleted_count
 
 class ClipboardData(db.Model):
     """Model for storing clipboard data in backend for cross-grid persistence"""
@@ -1562,4 +1730,49 @@ class ClipboardData(db.Model):
         ).delete()
         
         db.session.commit()
-        return old_count
\ No newline at end of file
+        return old_count
+
+class ServerSession(db.Model):
+    """Flask session data kept server-side when SESSION_BACKEND=sql (services/sessions.py)"""
+    __tablename__ = 'server_session'
+
+    id = db.Column(db.String(64), primary_key=True)  # Random id, the only thing in the cookie
+    data = db.Column(db.Text, nullable=False)  # Session dict as Flask's tagged JSON
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class DeletionJob(db.Model):
+    """A background dome/farm deletion, shared by every worker (services/deletion.py)"""
+    __tablename__ = 'deletion_job'
+
+    id = db.Column(db.String(32), primary_key=True)
+    scope = db.Column(db.String(10), nullable=False)  # 'dome' or 'farm'
+    target_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    total_steps = db.Column(db.Integer, nullable=False, default=0)
+    result = db.Column(db.Text, nullable=True)  # JSON of delete_scope's return value
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        finished = self.status == 'completed'
+        return {
+            'id': self.id,
+            'scope': self.scope,
+            'target_id': self.target_id,
+            'user_id': str(self.user_id) if self.user_id is not None else None,
+            'status': self.status,
+            'attempts': self.attempts,
+            'step': self.total_steps if finished else 0,
+            'total_steps': self.total_steps,
+            'current_step': None,
+            'percent': 100 if finished else 0,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -1,29 +1,31 @@
 #!/usr/bin/env python3
 """
 Run Migration on Startup
-This script runs the database migration when the app starts up on Render.
+One-shot release step: migrates and repairs the database schema before the
+web processes start.  When the stamped schema version is already current it
+exits after a single query.
+
+Usage: python run_migration_on_startup.py [--force]
 """
 
 import os
 import sys
-from flask import Flask
-from flask_migrate import upgrade
-from app import create_app
 
-def run_migration():
+# Importing the app must not do schema work of its own; this script owns it
+os.environ.setdefault('SCHEMA_ON_STARTUP', 'skip')
+
+from app import app
+from services.schema import migrate_schema
+
+def run_migration(force=False):
     """Run database migration on startup"""
     try:
         print("🚀 Running database migration on startup...")
-        
-        # Create app instance
-        app = create_app()
-        
+
         with app.app_context():
-            # Run the migration
-            upgrade()
-            print("✅ Database migration completed successfully!")
+            migrate_schema(force=force)
             return True
-            
+
     except Exception as e:
         print(f"❌ Migration failed: {e}")
         import traceback
@@ -31,7 +33,7 @@ def run_migration():
         return False
 
 if __name__ == "__main__":
-    success = run_migration()
+    success = run_migration(force='--force' in sys.argv[1:])
     if not success:
         print("⚠️ Migration failed, but continuing with app startup...")
-    sys.exit(0)  # Don't fail the startup even if migration fails
\ No newline at end of file
+    sys.exit(0)  # Don't fail the startup even if migration fails
@@ -0,0 +1,78 @@
+"""Fingerprinted URLs for static bundles, without a build step.
+
+``asset_url('grid/grid.js')`` returns ``/assets/grid/grid.<hash>.js`` where
+the hash is taken from the file's content, so a bundle's URL changes exactly
+when the bundle does and browsers can cache it for a year.  The manifest
+(logical name -> hash) is computed on first use and refreshed when a file's
+mtime changes, so editing a bundle needs no rebuild or restart.
+"""
+import hashlib
+import os
+import re
+import threading
+
+from werkzeug.security import safe_join
+
+ASSET_URL_PREFIX = '/assets'
+HASH_LENGTH = 12
+
+# grid/grid.0123456789ab.js -> ('grid/grid', '0123456789ab', '.js')
+_FINGERPRINTED = re.compile(r'^(?P<stem>.+)\.(?P<digest>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$' % HASH_LENGTH)
+
+
+class AssetManifest:
+    """Content hashes of files under one static folder"""
+
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self._entries = {}  # name -> (mtime_ns, size, digest)
+        self._lock = threading.Lock()
+
+    def digest(self, name):
+        """Content hash of a static file, recomputed only when it changes"""
+        path = safe_join(self.static_folder, name)
+        if path is None:
+            raise FileNotFoundError(name)
+        stat = os.stat(path)
+        entry = self._entries.get(name)
+        if entry and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2]
+        with open(path, 'rb') as handle:
+            digest = hashlib.sha256(handle.read()).hexdigest()[:HASH_LENGTH]
+        with self._lock:
+            self._entries[name] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def fingerprinted(self, name):
+        stem, ext = os.path.splitext(name)
+        return f"{stem}.{self.digest(name)}{ext}"
+
+    def resolve(self, fingerprinted_name):
+        """(logical name, digest requested) for a fingerprinted name, else (None, None)"""
+        match = _FINGERPRINTED.match(fingerprinted_name)
+        if not match:
+            return None, None
+        return match.group('stem') + match.group('ext'), match.group('digest')
+
+    def manifest(self):
+        """{logical name: fingerprinted name} for every file looked up so far"""
+        return {name: self.fingerprinted(name) for name in list(self._entries)}
+
+
+_manifests = {}
+
+
+def get_manifest(app=None):
+    """The manifest of the app's static folder"""
+    if app is None:
+        from flask import current_app
+        app = current_app._get_current_object()
+    manifest = _manifests.get(app.static_folder)
+    if manifest is None:
+        manifest = _manifests.setdefault(app.static_folder, AssetManifest(app.static_folder))
+    return manifest
+
+
+def asset_url(name):
+    """URL of a static file that changes whenever its content does"""
+    return f"{ASSET_URL_PREFIX}/{get_manifest().fingerprinted(name)}"
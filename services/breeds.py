@@ -0,0 +1,172 @@
+"""Tree.breed_id: the TreeBreed row a tree's free-text breed names.
+
+``Tree.breed`` stays the display name the routes and the API read and write.
+``Tree.breed_id`` points at the owner's TreeBreed with that name, preferring
+the breed of the tree's farm over a user-wide one (farm_id NULL), so breed
+usage is one indexed GROUP BY (``TreeBreed.usage_counts``) instead of three
+string-equality joins per breed.
+
+Session events keep breed_id in step for ORM writes: trees get their id
+resolved before the flush, and new or renamed breeds relink their owner's
+trees after it.  ``sync_breed_ids`` recomputes every link with one UPDATE;
+it is the schema backfill and the nightly repair for bulk SQL.
+
+``BreedDictionary`` encodes breed names in grid payloads as small integer
+codes into one list sent alongside the trees.
+"""
+from sqlalchemy import event, inspect, or_, select, text
+import logging
+
+from models import db, Dome, Tree, TreeBreed
+
+logger = logging.getLogger(__name__)
+
+# Farm breed first, then the user-wide breed; lowest id wins among duplicates
+_MATCH_SQL = """
+    SELECT b.id FROM tree_breed b
+    JOIN dome d ON d.id = tree.dome_id
+    WHERE b.user_id = tree.user_id AND b.name = tree.breed
+      AND (b.farm_id = d.farm_id OR b.farm_id IS NULL)
+    ORDER BY CASE WHEN b.farm_id IS NULL THEN 1 ELSE 0 END, b.id
+    LIMIT 1
+"""
+
+
+def sync_breed_ids(user_id=None, connection=None):
+    """Point every tree's breed_id at the breed its name resolves to.
+
+    Only rows whose link is wrong are written.  Returns the number of
+    corrected trees; runs in the current session transaction unless a
+    connection is given, and the caller commits.
+    """
+    sql = f"""
+        UPDATE tree
+        SET breed_id = ({_MATCH_SQL})
+        WHERE COALESCE(breed_id, 0) <> COALESCE(({_MATCH_SQL}), 0)
+    """
+    params = {}
+    if user_id is not None:
+        sql += " AND user_id = :user_id"
+        params['user_id'] = user_id
+    executor = connection if connection is not None else db.session
+    corrected = executor.execute(text(sql), params).rowcount
+    if corrected:
+        logger.info(f"Linked breed_id on {corrected} trees")
+    return corrected
+
+
+def breed_ids_for(connection, user_id, farm_id, names):
+    """{breed name: TreeBreed id} for one user's trees in one farm"""
+    names = {name for name in names if name}
+    if not names:
+        return {}
+    rows = connection.execute(
+        select(TreeBreed.id, TreeBreed.name, TreeBreed.farm_id)
+        .where(TreeBreed.user_id == user_id,
+               TreeBreed.name.in_(names),
+               or_(TreeBreed.farm_id == farm_id, TreeBreed.farm_id.is_(None)))
+        .order_by(TreeBreed.id)
+    ).all()
+    resolved = {}
+    for breed_id, name, breed_farm_id in rows:
+        current = resolved.get(name)
+        if current is None or (current[1] is None and breed_farm_id is not None):
+            resolved[name] = (breed_id, breed_farm_id)
+    return {name: breed_id for name, (breed_id, _) in resolved.items()}
+
+
+class BreedDictionary:
+    """Breed names encoded as small integer codes into one shared list"""
+
+    def __init__(self):
+        self.names = []
+        self._codes = {}
+
+    def code(self, name):
+        """Code for a breed name (None for no breed)"""
+        if not name:
+            return None
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+def _loaded(obj, attribute):
+    # Read a relationship only if it is already loaded; never lazy-load during a flush
+    return inspect(obj).dict.get(attribute)
+
+
+def _breed_changed(tree):
+    state = inspect(tree)
+    return (state.pending or
+            state.attrs.breed.history.has_changes() or
+            state.attrs.dome_id.history.has_changes())
+
+
+def _before_flush(session, flush_context, instances):
+    trees = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Tree) and obj not in session.deleted and _breed_changed(obj)
+    ]
+    if not trees:
+        return
+
+    connection = session.connection()
+    dome_ids = {tree.dome_id for tree in trees if tree.dome_id is not None}
+    dome_farms = dict(connection.execute(
+        select(Dome.id, Dome.farm_id).where(Dome.id.in_(dome_ids))
+    ).all()) if dome_ids else {}
+
+    # Resolve names once per (user, farm)
+    groups = {}
+    for tree in trees:
+        dome = _loaded(tree, 'dome')
+        user_id = tree.user_id if tree.user_id is not None else getattr(_loaded(tree, 'owner'), 'id', None)
+        farm_id = dome_farms.get(tree.dome_id) if tree.dome_id is not None else getattr(dome, 'farm_id', None)
+        if not tree.breed or user_id is None:
+            tree.breed_id = None
+            continue
+        groups.setdefault((user_id, farm_id), []).append(tree)
+
+    for (user_id, farm_id), group in groups.items():
+        breed_ids = breed_ids_for(connection, user_id, farm_id, {tree.breed for tree in group})
+        for tree in group:
+            tree.breed_id = breed_ids.get(tree.breed)
+
+
+def _after_flush(session, flush_context):
+    # A new or renamed breed can claim trees that already use its name
+    user_ids = set()
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, TreeBreed) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if obj in session.new or state.attrs.name.history.has_changes() or state.attrs.farm_id.history.has_changes():
+            user_ids.add(obj.user_id)
+    if not user_ids:
+        return
+    connection = session.connection()
+    for user_id in user_ids:
+        if sync_breed_ids(user_id, connection=connection):
+            session.info.setdefault('stale_breed_users', set()).add(user_id)
+
+
+def _after_flush_postexec(session, flush_context):
+    # Links were changed with SQL; make loaded trees re-read them
+    stale_users = session.info.pop('stale_breed_users', None)
+    if not stale_users:
+        return
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Tree) and inspect(obj).dict.get('user_id') in stale_users:
+            session.expire(obj, ['breed_id'])
+
+
+def register_breed_listeners(session=None):
+    """Keep Tree.breed_id in sync with every flush of the given (scoped) session"""
+    target = session if session is not None else db.session
+    if not event.contains(target, 'before_flush', _before_flush):
+        event.listen(target, 'before_flush', _before_flush)
+        event.listen(target, 'after_flush', _after_flush)
+        event.listen(target, 'after_flush_postexec', _after_flush_postexec)
@@ -0,0 +1,137 @@
+"""gzip/brotli compression of text responses.
+
+Tree, area and lineage JSON is highly repetitive and shrinks 5-10x.  An
+``after_request`` hook compresses text-like responses of at least
+``COMPRESS_MIN_SIZE`` bytes with the best encoding the client accepts:
+brotli when the optional ``brotli`` package is installed, otherwise gzip.
+
+Streamed responses (NDJSON/CSV exports) and partial content pass through
+untouched.  A strong ETag becomes weak once the body is re-encoded.
+Compressed bodies of immutable static bundles are kept in memory by ETag,
+since the same bytes are asked for on every cold page load.
+"""
+from collections import OrderedDict
+import gzip
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/x-ndjson',
+    'image/svg+xml',
+    'text/css',
+    'text/csv',
+    'text/html',
+    'text/javascript',
+    'text/plain',
+}
+
+DEFAULT_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+IMMUTABLE_CACHE_ENTRIES = 32
+
+_brotli = None
+_immutable_cache = OrderedDict()
+_immutable_lock = threading.Lock()
+
+
+def _brotli_module():
+    # Optional dependency, looked up once
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli or None
+
+
+def available_encodings():
+    return ('br', 'gzip') if _brotli_module() else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """Best supported encoding in a request's Accept-Encoding, or None"""
+    for encoding in available_encodings():
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return _brotli_module().compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def _should_compress(response, min_size):
+    # send_file responses count as streamed but have a known length
+    if response.status_code != 200 or (response.is_streamed and not response.direct_passthrough):
+        return False
+    if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    length = response.content_length
+    return length is None or length >= min_size
+
+
+def compress_response(response, accept_encodings, min_size=DEFAULT_MIN_SIZE):
+    """Compress a Flask response in place when it is worth it"""
+    if response.mimetype in COMPRESSIBLE_MIMETYPES:
+        response.vary.add('Accept-Encoding')
+    if not _should_compress(response, min_size):
+        return response
+    encoding = choose_encoding(accept_encodings)
+    if not encoding:
+        return response
+
+    etag, weak = response.get_etag()
+    cache_key = (etag, encoding) if etag and not weak and response.cache_control.immutable else None
+    body = _immutable_cache.get(cache_key) if cache_key else None
+
+    if body is None:
+        # Static files are served as a file wrapper; read them into memory first
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        body = compress(data, encoding)
+        if cache_key:
+            with _immutable_lock:
+                _immutable_cache[cache_key] = body
+                while len(_immutable_cache) > IMMUTABLE_CACHE_ENTRIES:
+                    _immutable_cache.popitem(last=False)
+    else:
+        # Skip reading the file, but still close it when the response is done
+        original = response.response
+        if hasattr(original, 'close'):
+            response.call_on_close(original.close)
+        response.direct_passthrough = False
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Compress the app's text responses (COMPRESS_MIN_SIZE, COMPRESS_ENABLED)"""
+    from flask import request
+
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE)
+
+    @app.after_request
+    def compress_text_response(response):
+        if not app.config['COMPRESS_ENABLED']:
+            return response
+        try:
+            return compress_response(response, request.accept_encodings, app.config['COMPRESS_MIN_SIZE'])
+        except Exception as e:
+            logger.warning(f"Response compression skipped: {e}")
+            return response
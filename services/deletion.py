@@ -0,0 +1,370 @@
+"""Set-based cascade deletion for domes and farms.
+
+Deleting a dome or farm used to load every drag area, area cell and tree and
+call ``db.session.delete()`` on each of them.  Here every dependent table is
+cleared with one DELETE (or UPDATE) scoped by dome or farm id, in dependency
+order and inside a single transaction, so the cost no longer grows with the
+number of ORM objects.
+
+Bulk SQL bypasses the session events that keep ``tree_lineage`` and
+``Tree.cutting_count`` in sync, so the first steps repair both explicitly for
+trees outside the deleted scope (cuttings in other domes whose mother is
+going away).
+
+A deletion can also run as a background job.  Jobs are rows of
+``deletion_job``, so any worker can report them through
+``get_deletion_job``.  A job is claimed with one conditional UPDATE and
+marked completed in the deletion's own transaction: a worker that dies
+mid-way leaves the data untouched and the job ``running``, and
+``resume_deletion_jobs`` (scheduled) claims it again once it is stale.
+Step-by-step progress is only known to the worker running the job.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import inspect, or_, text, update
+import json
+import logging
+import threading
+import uuid
+
+from models import db, DeletionJob
+
+logger = logging.getLogger(__name__)
+
+# Dome ids covered by a deletion, by scope
+_SCOPES = {
+    'dome': "SELECT id FROM dome WHERE id = :target_id",
+    'farm': "SELECT id FROM dome WHERE farm_id = :target_id",
+}
+
+# Closure rows of deleted trees, plus paths of surviving trees that ran through them.
+# {trees} is a subquery selecting the ids being deleted.
+LINEAGE_CLEANUP_SQL = """DELETE FROM tree_lineage
+   WHERE ancestor_id IN ({trees})
+      OR descendant_id IN ({trees})
+      OR EXISTS (
+          SELECT 1
+          FROM tree_lineage up
+          JOIN tree_lineage down ON down.ancestor_id = up.descendant_id
+          WHERE up.ancestor_id = tree_lineage.ancestor_id
+            AND down.descendant_id = tree_lineage.descendant_id
+            AND up.descendant_id IN ({trees})
+      )"""
+
+# (stat key, statement, scopes it applies to, optional table that may be missing)
+# {domes} and {trees} are replaced by the scope subqueries.
+_DELETION_STEPS = [
+    (
+        'dome_versions',
+        """UPDATE dome
+           SET change_version = COALESCE(change_version, 0) + 1
+           WHERE id NOT IN ({domes})
+             AND id IN (SELECT dome_id FROM tree
+                        WHERE mother_plant_id IN ({trees})
+                           OR id IN (SELECT mother_plant_id FROM tree WHERE dome_id IN ({domes})))""",
+        ('dome', 'farm'), None,
+    ),
+    ('lineage', LINEAGE_CLEANUP_SQL, ('dome', 'farm'), None),
+    (
+        'mother_counts_updated',
+        """UPDATE tree
+           SET cutting_count = (
+               SELECT COUNT(*) FROM tree c
+               WHERE c.mother_plant_id = tree.id AND c.dome_id NOT IN ({domes})
+           )
+           WHERE dome_id NOT IN ({domes})
+             AND id IN (SELECT mother_plant_id FROM tree WHERE dome_id IN ({domes}))""",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'cutting_trees_updated',
+        """UPDATE tree
+           SET mother_plant_id = NULL,
+               plant_type = 'independent',
+               cutting_notes = COALESCE(cutting_notes, '') || :deleted_note,
+               updated_at = :now
+           WHERE dome_id NOT IN ({domes})
+             AND mother_plant_id IN ({trees})""",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'plant_relationship',
+        """DELETE FROM plant_relationship
+           WHERE dome_id IN ({domes})
+              OR mother_tree_id IN ({trees})
+              OR cutting_tree_id IN ({trees})""",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'drag_area_tree',
+        """DELETE FROM drag_area_tree
+           WHERE drag_area_id IN (SELECT id FROM drag_area WHERE dome_id IN ({domes}))
+              OR tree_id IN ({trees})""",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'regular_area_trees',
+        """DELETE FROM regular_area_trees
+           WHERE regular_area_id IN (SELECT id FROM regular_area WHERE dome_id IN ({domes}))
+              OR tree_id IN ({trees})""",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'regular_area_cell',
+        """DELETE FROM regular_area_cell
+           WHERE regular_area_id IN (SELECT id FROM regular_area WHERE dome_id IN ({domes}))""",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'area_cell',
+        """DELETE FROM area_cell
+           WHERE area_id IN (SELECT id FROM regular_area WHERE dome_id IN ({domes}))""",
+        ('dome', 'farm'), 'area_cell',
+    ),
+    (
+        'drag_area',
+        "DELETE FROM drag_area WHERE dome_id IN ({domes})",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'regular_area',
+        "DELETE FROM regular_area WHERE dome_id IN ({domes})",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'clipboard_dome_refs',
+        "UPDATE clipboard_data SET source_dome_id = NULL WHERE source_dome_id IN ({domes})",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'clipboard_farm_refs',
+        "UPDATE clipboard_data SET source_farm_id = NULL WHERE source_farm_id = :target_id",
+        ('farm',), None,
+    ),
+    (
+        'tree_breed',
+        "DELETE FROM tree_breed WHERE farm_id = :target_id",
+        ('farm',), None,
+    ),
+    (
+        'tree',
+        "DELETE FROM tree WHERE dome_id IN ({domes})",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'dome',
+        "DELETE FROM dome WHERE id IN ({domes})",
+        ('dome', 'farm'), None,
+    ),
+    (
+        'farm',
+        "DELETE FROM farm WHERE id = :target_id",
+        ('farm',), None,
+    ),
+]
+
+
+def deletion_steps(scope):
+    """Ordered (stat key, SQL, optional table) steps for a 'dome' or 'farm' deletion"""
+    if scope not in _SCOPES:
+        raise ValueError(f"Unknown deletion scope: {scope}")
+    domes = _SCOPES[scope]
+    trees = f"SELECT id FROM tree WHERE dome_id IN ({domes})"
+    return [
+        (key, sql.format(domes=domes, trees=trees), optional_table)
+        for key, sql, scopes, optional_table in _DELETION_STEPS
+        if scope in scopes
+    ]
+
+
+def summarize_deletion(counts):
+    """Map raw per-table counts onto the statistics the delete routes return"""
+    return {
+        'trees': counts.get('tree', 0),
+        'drag_areas': counts.get('drag_area', 0),
+        'regular_areas': counts.get('regular_area', 0),
+        'relationships': counts.get('drag_area_tree', 0) + counts.get('area_cell', 0),
+        'domes': counts.get('dome', 0)
+    }
+
+
+def delete_scope(scope, target_id, progress=None, before_commit=None):
+    """Delete a dome or farm and everything that hangs off it in one transaction.
+
+    ``progress`` is an optional callable ``(step_number, total_steps, key, count)``
+    invoked after every statement; ``before_commit`` is called with the
+    result just before the commit, inside the transaction.  Commits on
+    success, rolls back and re-raises on any error.  Returns
+    ``{'deleted': {...}, 'details': {...}}``.
+    """
+    steps = deletion_steps(scope)
+    existing_tables = set(inspect(db.engine).get_table_names())
+    params = {
+        'target_id': target_id,
+        'now': datetime.utcnow(),
+        'deleted_note': f" [Mother tree was deleted with its {scope} on {datetime.utcnow().strftime('%Y-%m-%d')}]"
+    }
+    counts = {}
+
+    try:
+        for number, (key, sql, optional_table) in enumerate(steps, start=1):
+            if optional_table and optional_table not in existing_tables:
+                counts[key] = 0
+            else:
+                counts[key] = db.session.execute(text(sql), params).rowcount or 0
+            if progress:
+                progress(number, len(steps), key, counts[key])
+
+        result = {'deleted': summarize_deletion(counts), 'details': counts}
+        if before_commit:
+            before_commit(result)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Objects of the deleted scope may still sit in the identity map
+    db.session.expire_all()
+
+    logger.info(f"Deleted {scope} {target_id}: {counts}")
+    return result
+
+
+# ---- background jobs ----
+
+# A running job not finished after this long is taken to be abandoned by its worker
+STALE_JOB_AFTER = timedelta(minutes=30)
+MAX_JOB_ATTEMPTS = 3
+KEEP_FINISHED_JOBS = timedelta(days=7)
+
+# Live step progress of the jobs this process is running, by job id
+_progress = {}
+_progress_lock = threading.Lock()
+
+
+def _claim_job(job_id):
+    """Mark a queued or abandoned job running; False if another worker has it"""
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(DeletionJob)
+        .where(
+            DeletionJob.id == job_id,
+            DeletionJob.attempts < MAX_JOB_ATTEMPTS,
+            or_(DeletionJob.status == 'queued',
+                (DeletionJob.status == 'running') & (DeletionJob.started_at < now - STALE_JOB_AFTER))
+        )
+        .values(status='running', started_at=now, attempts=DeletionJob.attempts + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return claimed == 1
+
+
+def _finish_job(job_id, **fields):
+    db.session.execute(
+        update(DeletionJob).where(DeletionJob.id == job_id)
+        .values(finished_at=datetime.utcnow(), **fields)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _run_job(app, job_id, scope, target_id):
+    def progress(number, total, key, count):
+        with _progress_lock:
+            _progress[job_id] = {'step': number, 'current_step': key,
+                                 'percent': int(number * 100 / total)}
+
+    def mark_completed(result):
+        # Same transaction as the deletion: both happen or neither does
+        _finish_job(job_id, status='completed', result=json.dumps(result))
+
+    with app.app_context():
+        try:
+            if not _claim_job(job_id):
+                return
+            delete_scope(scope, target_id, progress=progress, before_commit=mark_completed)
+        except Exception as e:
+            logger.error(f"Deletion job {job_id} for {scope} {target_id} failed: {e}")
+            db.session.rollback()
+            try:
+                _finish_job(job_id, status='failed', error=str(e))
+                db.session.commit()
+            except Exception as mark_error:
+                db.session.rollback()
+                logger.error(f"Could not record failure of deletion job {job_id}: {mark_error}")
+        finally:
+            with _progress_lock:
+                _progress.pop(job_id, None)
+            db.session.remove()
+
+
+def start_deletion_job(app, scope, target_id, user_id=None, scheduler=None):
+    """Record a deletion job, run ``delete_scope`` in the background and return the job id.
+
+    Uses the app's APScheduler instance when it is running, otherwise a
+    daemon thread.  Commits the current session.
+    """
+    total_steps = len(deletion_steps(scope))  # validates the scope before queueing
+    job_id = uuid.uuid4().hex
+    db.session.add(DeletionJob(
+        id=job_id,
+        scope=scope,
+        target_id=target_id,
+        user_id=int(user_id) if user_id is not None else None,
+        status='queued',
+        total_steps=total_steps
+    ))
+    db.session.commit()
+
+    args = (app, job_id, scope, target_id)
+    if scheduler is not None and getattr(scheduler, 'running', False):
+        scheduler.add_job(func=_run_job, args=args, id=f'delete_{scope}_{job_id}')
+    else:
+        threading.Thread(target=_run_job, args=args, daemon=True).start()
+    return job_id
+
+
+def resume_deletion_jobs(app):
+    """Run jobs left queued or abandoned by a worker that stopped; needs an app context.
+
+    Jobs that used up MAX_JOB_ATTEMPTS are marked failed, and finished jobs
+    older than KEEP_FINISHED_JOBS are dropped.  Returns the number of jobs run.
+    """
+    now = datetime.utcnow()
+    stale = (DeletionJob.status == 'running') & (DeletionJob.started_at < now - STALE_JOB_AFTER)
+    db.session.execute(
+        update(DeletionJob)
+        .where(stale, DeletionJob.attempts >= MAX_JOB_ATTEMPTS)
+        .values(status='failed', error='Abandoned by its worker too many times', finished_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    DeletionJob.query.filter(
+        DeletionJob.status.in_(('completed', 'failed')),
+        DeletionJob.finished_at < now - KEEP_FINISHED_JOBS
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+    # Fresh queued jobs belong to the worker that is about to start them
+    pending = DeletionJob.query.filter(
+        or_(stale, (DeletionJob.status == 'queued') & (DeletionJob.created_at < now - timedelta(minutes=1)))
+    ).order_by(DeletionJob.created_at).all()
+    jobs = [(job.id, job.scope, job.target_id) for job in pending]
+    db.session.commit()
+
+    for job_id, scope, target_id in jobs:
+        logger.info(f"Resuming deletion job {job_id} for {scope} {target_id}")
+        _run_job(app, job_id, scope, target_id)
+    return len(jobs)
+
+
+def get_deletion_job(job_id, user_id=None):
+    """Snapshot of a deletion job, or None if unknown (or owned by someone else)"""
+    job = db.session.get(DeletionJob, job_id, populate_existing=True)
+    if job is None:
+        return None
+    if user_id is not None and job.user_id is not None and job.user_id != int(user_id):
+        return None
+    snapshot = job.to_dict()
+    if job.status == 'running':
+        with _progress_lock:
+            snapshot.update(_progress.get(job_id, {}))
+    return snapshot
@@ -0,0 +1,108 @@
+"""Dome.change_version: a counter that moves whenever what a dome shows changes.
+
+Polling endpoints (trees, drag areas, lineage report, areas) answer with a
+weak ETag built from the dome's change version, so an unchanged poll costs
+one version lookup and a 304 instead of rebuilding the payload.
+
+Session events bump the version for ORM writes to trees, drag and regular
+areas and the dome itself.  Because lineage payloads show mothers and
+cuttings that may live in other domes, the domes of a changed tree's mother
+and cuttings move too.  Bulk SQL paths (tree batches, soft delete, purge,
+scope deletion, cutting-count repair and the life-day job) call
+``bump_dome_versions`` or bump in their own statements.
+"""
+from sqlalchemy import bindparam, event, inspect, select, text
+
+from models import db, Dome, Tree, DragArea, DragAreaTree, RegularArea, RegularAreaCell, User
+
+_BUMP_SQL = text("""
+    UPDATE dome
+    SET change_version = COALESCE(change_version, 0) + 1
+    WHERE id IN :dome_ids
+       OR id IN (
+           SELECT dome_id FROM tree
+           WHERE id IN :tree_ids
+              OR mother_plant_id IN :tree_ids
+              OR id IN (SELECT mother_plant_id FROM tree WHERE id IN :tree_ids)
+       )
+""").bindparams(bindparam('dome_ids', expanding=True), bindparam('tree_ids', expanding=True))
+
+_AREA_DOMES_SQL = {
+    'drag': text("SELECT DISTINCT dome_id FROM drag_area WHERE id IN :ids").bindparams(
+        bindparam('ids', expanding=True)),
+    'regular': text("SELECT DISTINCT dome_id FROM regular_area WHERE id IN :ids").bindparams(
+        bindparam('ids', expanding=True)),
+}
+
+
+def bump_dome_versions(dome_ids=(), tree_ids=(), connection=None):
+    """Advance the version of ``dome_ids`` and of every dome holding one of
+    ``tree_ids``, their mothers or their cuttings.  The caller commits."""
+    dome_ids = sorted({dome_id for dome_id in dome_ids if dome_id is not None})
+    tree_ids = sorted({tree_id for tree_id in tree_ids if tree_id is not None})
+    if not dome_ids and not tree_ids:
+        return 0
+    executor = connection if connection is not None else db.session
+    return executor.execute(_BUMP_SQL, {'dome_ids': dome_ids, 'tree_ids': tree_ids}).rowcount
+
+
+def dome_version(dome_id, user_id):
+    """(change version, owner's life reference time) of a user's dome, or None"""
+    return db.session.execute(
+        select(Dome.change_version, User.life_reference_at)
+        .join(User, User.id == Dome.user_id)
+        .where(Dome.id == dome_id, Dome.user_id == user_id)
+    ).first()
+
+
+def _values(obj, attribute):
+    # Current and pre-flush values of a column attribute
+    history = inspect(obj).attrs[attribute].history
+    return list(history.added) + list(history.unchanged) + list(history.deleted)
+
+
+def _after_flush(session, flush_context):
+    dome_ids, tree_ids, drag_area_ids, regular_area_ids = set(), set(), set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Tree):
+            if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+                continue
+            dome_ids.update(_values(obj, 'dome_id'))
+            tree_ids.add(inspect(obj).dict.get('id'))
+            tree_ids.update(_values(obj, 'mother_plant_id'))
+        elif isinstance(obj, Dome):
+            if obj not in session.deleted:
+                dome_ids.add(inspect(obj).dict.get('id'))
+        elif isinstance(obj, (DragArea, RegularArea)):
+            dome_ids.update(_values(obj, 'dome_id'))
+        elif isinstance(obj, DragAreaTree):
+            drag_area_ids.update(_values(obj, 'drag_area_id'))
+        elif isinstance(obj, RegularAreaCell):
+            regular_area_ids.update(_values(obj, 'regular_area_id'))
+
+    if not (dome_ids or tree_ids or drag_area_ids or regular_area_ids):
+        return
+    connection = session.connection()
+    for kind, ids in (('drag', drag_area_ids), ('regular', regular_area_ids)):
+        ids = [area_id for area_id in ids if area_id is not None]
+        if ids:
+            dome_ids.update(connection.execute(_AREA_DOMES_SQL[kind], {'ids': ids}).scalars())
+    if bump_dome_versions(dome_ids, tree_ids, connection=connection):
+        session.info['stale_dome_versions'] = True
+
+
+def _after_flush_postexec(session, flush_context):
+    # Versions were bumped with SQL; make loaded domes re-read them
+    if not session.info.pop('stale_dome_versions', False):
+        return
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Dome):
+            session.expire(obj, ['change_version'])
+
+
+def register_dome_version_listeners(session=None):
+    """Bump dome change versions on every flush of the given (scoped) session"""
+    target = session if session is not None else db.session
+    if not event.contains(target, 'after_flush', _after_flush):
+        event.listen(target, 'after_flush', _after_flush)
+        event.listen(target, 'after_flush_postexec', _after_flush_postexec)
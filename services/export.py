@@ -0,0 +1,136 @@
+"""Farm inventory export as CSV or XLSX.
+
+One row per live tree of a farm, in (dome, tree id) order, with the computed
+life days and life stage, the mother's name and the breed.  Trees are read
+with ``yield_per`` (a server-side cursor on PostgreSQL) and only the
+columns the export needs, so memory stays flat however large the farm:
+
+* CSV is streamed to the client as it is read, in chunks of rows.
+* XLSX is written with openpyxl's write-only workbook to a temporary file
+  and sent from there, since a ZIP container cannot be streamed before it
+  is complete.  openpyxl is optional and imported on first use.
+"""
+import csv
+from datetime import datetime
+import io
+import re
+import tempfile
+
+from sqlalchemy.orm import aliased, load_only
+
+from models import db, Dome, Tree
+
+EXPORT_BATCH_SIZE = 1000
+CSV_CHUNK_ROWS = 500
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# (header, row key)
+EXPORT_COLUMNS = (
+    ('Tree ID', 'id'),
+    ('Name', 'name'),
+    ('Breed', 'breed'),
+    ('Plant Type', 'plant_type'),
+    ('Dome', 'dome_name'),
+    ('Row', 'internal_row'),
+    ('Column', 'internal_col'),
+    ('Mother ID', 'mother_plant_id'),
+    ('Mother Name', 'mother_name'),
+    ('Cuttings', 'cutting_count'),
+    ('Planted', 'planted_date'),
+    ('Life Days', 'life_days'),
+    ('Life Stage', 'life_stage'),
+    ('Paused', 'is_paused'),
+    ('Info', 'info'),
+)
+
+# Cells starting with these are formulas to spreadsheet applications
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def iter_farm_inventory(farm_id, user_id, reference_date=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield one dict per live tree of a user's farm, ordered by dome and id"""
+    reference_date = reference_date or datetime.utcnow()
+    mother = aliased(Tree)
+    query = (
+        db.session.query(Tree, Dome.name, mother.name)
+        .join(Dome, Dome.id == Tree.dome_id)
+        .outerjoin(mother, mother.id == Tree.mother_plant_id)
+        .options(load_only(
+            Tree.id, Tree.name, Tree.breed, Tree.plant_type, Tree.dome_id,
+            Tree.internal_row, Tree.internal_col, Tree.mother_plant_id, Tree.cutting_count,
+            Tree.info, Tree.is_paused, Tree.life_days, Tree.planted_date, Tree.created_at,
+            Tree.total_paused_days, Tree.life_day_offset
+        ))
+        .filter(Dome.farm_id == farm_id, Tree.user_id == user_id)
+        .order_by(Tree.dome_id, Tree.id)
+        .yield_per(batch_size)
+    )
+    for tree, dome_name, mother_name in query:
+        life_days = tree.get_actual_life_days(reference_date)
+        yield {
+            'id': tree.id,
+            'name': tree.name,
+            'breed': tree.breed or '',
+            'plant_type': tree.plant_type,
+            'dome_name': dome_name,
+            'internal_row': tree.internal_row,
+            'internal_col': tree.internal_col,
+            'mother_plant_id': tree.mother_plant_id,
+            'mother_name': mother_name or '',
+            'cutting_count': tree.cutting_count or 0,
+            'planted_date': tree.planted_date,
+            'life_days': life_days,
+            'life_stage': tree.get_life_stage(reference_date),
+            'is_paused': bool(tree.is_paused),
+            'info': tree.info or '',
+        }
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_inventory_csv(rows):
+    """CSV text chunks for inventory rows: a BOM and header, then CSV_CHUNK_ROWS rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # The BOM makes Excel read the file as UTF-8
+    buffer.write('\ufeff')
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_csv_cell(row[key]) for _, key in EXPORT_COLUMNS])
+        if count % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_inventory_xlsx(rows, title='Inventory'):
+    """Write inventory rows to an XLSX temporary file, rewound for reading.
+
+    Raises ImportError when openpyxl is not installed.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    # Sheet titles are at most 31 characters and cannot contain []:*?/\
+    sheet = workbook.create_sheet(title=re.sub(r'[\[\]:*?/\\]', '', title)[:31] or 'Inventory')
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    for row in rows:
+        sheet.append([_csv_cell(row[key]) if isinstance(row[key], str) else row[key]
+                      for _, key in EXPORT_COLUMNS])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
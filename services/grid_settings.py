@@ -0,0 +1,151 @@
+"""Cached GridSettings lookups.
+
+The farm, farm-domes and debug views read a user's grid settings on every
+request.  ``get_grid_settings`` serves them from a small per-process
+TTL/LRU cache keyed by ``(user_id, grid_type key)``; only a miss queries
+the database (and creates the default row when none exists yet).
+``update_grid_settings`` writes through and drops the cached entry, and the
+TTL bounds how long another worker process can serve a stale size.
+
+Cached values are plain snapshots, never ORM instances, so they can be
+shared across requests and sessions.  A unique index on
+``(user_id, grid_type)`` stops concurrent first requests from inserting
+duplicate default rows; the loser of that race re-reads the winner's row.
+"""
+from collections import OrderedDict
+from types import SimpleNamespace
+import logging
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, GridSettings
+
+logger = logging.getLogger(__name__)
+
+GRID_SETTINGS_TTL = 60  # seconds
+GRID_SETTINGS_MAX_ENTRIES = 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def grid_settings_key(grid_type='dome', farm_id=None):
+    """Stored grid_type for a view: farm dome grids are kept per farm"""
+    if grid_type == 'dome' and farm_id:
+        return f'farm_{farm_id}_dome'
+    return grid_type
+
+
+def default_grid_size(grid_type='dome', farm_id=None):
+    """(rows, cols) used when a user has no settings of this type yet"""
+    if grid_type == 'farm':
+        return 10, 10  # Farm layout grid
+    if farm_id:
+        return 5, 5  # Farm-specific dome grid
+    return 10, 10  # Global dome grid
+
+
+def _snapshot(rows, cols, grid_type, user_id):
+    return SimpleNamespace(rows=rows, cols=cols, grid_type=grid_type, user_id=user_id)
+
+
+def _cache_get(key):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        expires_at, rows, cols = entry
+        if expires_at < time.monotonic():
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return rows, cols
+
+
+def _cache_put(key, rows, cols):
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + GRID_SETTINGS_TTL, rows, cols)
+        _cache.move_to_end(key)
+        while len(_cache) > GRID_SETTINGS_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def invalidate_grid_settings(user_id=None, grid_type=None, farm_id=None):
+    """Drop cached settings for one (user, grid type), all of a user's, or everything"""
+    with _cache_lock:
+        if user_id is None and grid_type is None:
+            _cache.clear()
+        elif grid_type is None:
+            for key in [key for key in _cache if key[0] == user_id]:
+                del _cache[key]
+        else:
+            _cache.pop((user_id, grid_settings_key(grid_type, farm_id)), None)
+
+
+def _load_or_create(grid_type_key, user_id, default_rows, default_cols):
+    settings = GridSettings.query.filter_by(grid_type=grid_type_key, user_id=user_id).first()
+    if settings:
+        return settings.rows, settings.cols
+
+    db.session.add(GridSettings(rows=default_rows, cols=default_cols,
+                                grid_type=grid_type_key, user_id=user_id))
+    try:
+        db.session.commit()
+        logger.info(f"Created default {grid_type_key} settings: {default_rows}x{default_cols}")
+        return default_rows, default_cols
+    except IntegrityError:
+        # Another request created the row first
+        db.session.rollback()
+        settings = GridSettings.query.filter_by(grid_type=grid_type_key, user_id=user_id).first()
+        if settings:
+            return settings.rows, settings.cols
+        raise
+
+
+def get_grid_settings(grid_type='dome', user_id=None, farm_id=None):
+    """Grid settings for a type, user and optional farm.
+
+    Returns an object with ``rows``, ``cols``, ``grid_type`` and ``user_id``;
+    falls back to the defaults (uncached) if the database is unavailable.
+    """
+    grid_type_key = grid_settings_key(grid_type, farm_id)
+    default_rows, default_cols = default_grid_size(grid_type, farm_id)
+    key = (user_id, grid_type_key)
+
+    cached = _cache_get(key)
+    if cached is not None:
+        return _snapshot(cached[0], cached[1], grid_type_key, user_id)
+
+    try:
+        rows, cols = _load_or_create(grid_type_key, user_id, default_rows, default_cols)
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Error getting grid settings {grid_type_key} for user {user_id}: {e}")
+        return _snapshot(default_rows, default_cols, grid_type_key, user_id)
+
+    _cache_put(key, rows, cols)
+    return _snapshot(rows, cols, grid_type_key, user_id)
+
+
+def update_grid_settings(grid_type, rows, cols, user_id=None, farm_id=None):
+    """Store grid settings for a type, user and optional farm; True on success"""
+    grid_type_key = grid_settings_key(grid_type, farm_id)
+    try:
+        settings = GridSettings.query.filter_by(grid_type=grid_type_key, user_id=user_id).first()
+        if not settings:
+            settings = GridSettings(grid_type=grid_type_key, user_id=user_id)
+            db.session.add(settings)
+
+        settings.rows = rows
+        settings.cols = cols
+        db.session.commit()
+        logger.info(f"Updated {grid_type_key} grid settings to {rows}x{cols} for user {user_id}")
+        return True
+    except Exception as e:
+        logger.error(f"Error updating grid settings {grid_type_key} for user {user_id}: {e}")
+        db.session.rollback()
+        return False
+    finally:
+        invalidate_grid_settings(user_id, grid_type, farm_id)
@@ -0,0 +1,175 @@
+"""Relationship integrity checker and repairer.
+
+Finds dangling references left behind by partial deletes and old bugs:
+
+* ``tree.mother_plant_id`` pointing at a tree that no longer exists
+* ``plant_relationship`` rows whose mother or cutting tree is gone
+* ``drag_area_tree`` rows whose tree or drag area is gone
+* ``regular_area_trees`` / ``tree_lineage`` rows whose tree is gone
+
+Each check is a single ``NOT EXISTS`` anti-join (planned as a hash anti-join
+on PostgreSQL, unlike ``NOT IN`` over a subquery) and each repair is a single
+set-based UPDATE or DELETE, so one pass covers the whole database.
+
+Pass ``user_id`` to limit checks, samples and repairs to rows owned by that
+user (the condition in ``_OWNER_CONDITIONS``); the HTTP route always does.
+"""
+from sqlalchemy import text
+import logging
+
+from models import db
+from services.lineage import rebuild_lineage, unlink_subtree
+
+logger = logging.getLogger(__name__)
+
+# (name, description, checked table, anti-join condition, repair statement)
+INTEGRITY_CHECKS = [
+    (
+        'dangling_mother_plant_id',
+        'Trees whose mother_plant_id points at a missing tree',
+        'tree',
+        """tree.mother_plant_id IS NOT NULL
+           AND NOT EXISTS (SELECT 1 FROM tree m WHERE m.id = tree.mother_plant_id)""",
+        """UPDATE tree
+           SET mother_plant_id = NULL,
+               plant_type = CASE WHEN plant_type = 'cutting' THEN 'independent' ELSE plant_type END
+           WHERE {condition}""",
+    ),
+    (
+        'orphaned_plant_relationships',
+        'Plant relationships whose mother or cutting tree is missing',
+        'plant_relationship',
+        """NOT EXISTS (SELECT 1 FROM tree m WHERE m.id = plant_relationship.mother_tree_id)
+           OR NOT EXISTS (SELECT 1 FROM tree c WHERE c.id = plant_relationship.cutting_tree_id)""",
+        "DELETE FROM plant_relationship WHERE {condition}",
+    ),
+    (
+        'orphaned_drag_area_trees',
+        'Drag area memberships whose tree or drag area is missing',
+        'drag_area_tree',
+        """NOT EXISTS (SELECT 1 FROM tree t WHERE t.id = drag_area_tree.tree_id)
+           OR NOT EXISTS (SELECT 1 FROM drag_area a WHERE a.id = drag_area_tree.drag_area_id)""",
+        "DELETE FROM drag_area_tree WHERE {condition}",
+    ),
+    (
+        'orphaned_regular_area_trees',
+        'Regular area memberships whose tree or area is missing',
+        'regular_area_trees',
+        """NOT EXISTS (SELECT 1 FROM tree t WHERE t.id = regular_area_trees.tree_id)
+           OR NOT EXISTS (SELECT 1 FROM regular_area a WHERE a.id = regular_area_trees.regular_area_id)""",
+        "DELETE FROM regular_area_trees WHERE {condition}",
+    ),
+    (
+        'orphaned_lineage_rows',
+        'Lineage closure rows whose ancestor or descendant tree is missing',
+        'tree_lineage',
+        """NOT EXISTS (SELECT 1 FROM tree t WHERE t.id = tree_lineage.ancestor_id)
+           OR NOT EXISTS (SELECT 1 FROM tree t WHERE t.id = tree_lineage.descendant_id)""",
+        "DELETE FROM tree_lineage WHERE {condition}",
+    ),
+]
+
+# Rows of each checked table that belong to :user_id, judged by whichever side still exists
+_OWNER_CONDITIONS = {
+    'tree': "tree.user_id = :user_id",
+    'plant_relationship': "plant_relationship.user_id = :user_id",
+    'drag_area_tree': """(EXISTS (SELECT 1 FROM tree t WHERE t.id = drag_area_tree.tree_id AND t.user_id = :user_id)
+           OR EXISTS (SELECT 1 FROM drag_area a JOIN dome d ON d.id = a.dome_id
+                      WHERE a.id = drag_area_tree.drag_area_id AND d.user_id = :user_id))""",
+    'regular_area_trees': """(EXISTS (SELECT 1 FROM tree t WHERE t.id = regular_area_trees.tree_id AND t.user_id = :user_id)
+           OR EXISTS (SELECT 1 FROM regular_area a JOIN dome d ON d.id = a.dome_id
+                      WHERE a.id = regular_area_trees.regular_area_id AND d.user_id = :user_id))""",
+    'tree_lineage': """EXISTS (SELECT 1 FROM tree t
+                   WHERE t.id IN (tree_lineage.ancestor_id, tree_lineage.descendant_id)
+                     AND t.user_id = :user_id)""",
+}
+
+# Tables without a surrogate id get their sample rows described by these columns
+_SAMPLE_COLUMNS = {
+    'regular_area_trees': 'regular_area_id, tree_id',
+    'tree_lineage': 'ancestor_id, descendant_id',
+}
+
+
+def run_integrity_check(apply=False, sample_size=20, user_id=None):
+    """Detect (and optionally repair) every dangling relationship reference.
+
+    With ``user_id`` only that user's rows are checked and repaired;
+    without it the whole database is.  In dry-run mode nothing is written.  With ``apply=True`` all repairs run
+    in the current transaction and are committed together; on any error the
+    whole pass is rolled back.
+
+    Returns a report dict with per-check ``found``/``fixed`` counts and a
+    small sample of offending rows.
+    """
+    report = {
+        'mode': 'apply' if apply else 'dry_run',
+        'checks': {},
+        'total_found': 0,
+        'total_fixed': 0
+    }
+
+    try:
+        params = {}
+        detached_ids = []
+        for name, description, table, condition, repair in INTEGRITY_CHECKS:
+            if user_id is not None:
+                condition = f"({condition}) AND {_OWNER_CONDITIONS[table]}"
+                params = {'user_id': user_id}
+            found = db.session.execute(
+                text(f"SELECT COUNT(*) FROM {table} WHERE {condition}"), params
+            ).scalar() or 0
+
+            sample = []
+            if found and sample_size:
+                columns = _SAMPLE_COLUMNS.get(table, 'id')
+                rows = db.session.execute(
+                    text(f"SELECT {columns} FROM {table} WHERE {condition} LIMIT :limit"),
+                    {**params, 'limit': sample_size}
+                ).fetchall()
+                sample = [row[0] if len(row) == 1 else list(row) for row in rows]
+
+            fixed = 0
+            if apply and found:
+                if name == 'dangling_mother_plant_id' and user_id is not None:
+                    detached_ids = [row[0] for row in db.session.execute(
+                        text(f"SELECT id FROM tree WHERE {condition}"), params
+                    ).fetchall()]
+                fixed = db.session.execute(text(repair.format(condition=condition)), params).rowcount
+
+            report['checks'][name] = {
+                'description': description,
+                'found': found,
+                'fixed': fixed,
+                'sample': sample
+            }
+            report['total_found'] += found
+            report['total_fixed'] += fixed
+
+        # Nulled mother links can leave stale multi-generation paths behind
+        if user_id is not None:
+            # Only this user's trees: cut the paths that ran through their missing mothers
+            connection = db.session.connection()
+            for tree_id in detached_ids:
+                unlink_subtree(connection, tree_id)
+            report['lineage_rebuilt'] = False
+        else:
+            lineage_fixed = (report['checks']['dangling_mother_plant_id']['fixed'] +
+                             report['checks']['orphaned_lineage_rows']['fixed'])
+            report['lineage_rebuilt'] = bool(apply and lineage_fixed)
+            if report['lineage_rebuilt']:
+                rebuild_lineage()
+
+        if apply:
+            db.session.commit()
+        else:
+            db.session.rollback()
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+    logger.info(
+        f"Integrity check ({report['mode']}): found {report['total_found']}, fixed {report['total_fixed']}"
+    )
+    return report
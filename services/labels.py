@@ -0,0 +1,181 @@
+"""Printable QR label sheets for a whole dome or drag area.
+
+Each label is a tree's QR code (from the content-keyed cache in
+``services.qr``) with its name and grid position underneath.  Labels are laid
+out on A4 pages and returned as one multi-page PDF, or as a ZIP of
+single-label PNG tiles for label printers.
+
+QR codes missing from the cache are the only expensive part.  For large runs
+they are rendered in a process pool, and the parent process composes the
+pages.  The pool is created once per process, on first need, with the
+``spawn`` start method: forking a worker that already runs scheduler and
+job threads can deadlock the child.  Pillow is imported on first use, as in
+``services.qr``.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import zipfile
+
+from services.qr import get_qr_cache, qr_cache_key, qr_png
+
+logger = logging.getLogger(__name__)
+
+# A4 at 150 dpi, 3 x 5 labels per page
+PAGE_SIZE = (1240, 1754)
+PAGE_DPI = 150
+PAGE_MARGIN = 60
+LABEL_COLUMNS = 3
+LABEL_ROWS = 5
+QR_SIDE = 250
+
+# Same options as /qr_image, so labels and single QR images share cache entries
+LABEL_QR_OPTIONS = {'box_size': 8, 'border': 2, 'error_correction': 'M', 'size': None}
+
+# Cache misses above this count are rendered in a worker pool
+POOL_THRESHOLD = 64
+MAX_WORKERS = 4
+
+LABEL_FORMATS = ('pdf', 'png')
+
+
+def _render_qr(data):
+    # Top-level so it can be pickled into worker processes
+    return qr_png(data, **LABEL_QR_OPTIONS)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = min(MAX_WORKERS, os.cpu_count() or 1)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_missing(payloads):
+    """PNG bytes for every payload, in order; the shared pool for large runs"""
+    if len(payloads) > POOL_THRESHOLD:
+        pool = None
+        try:
+            pool = _get_pool()
+            return list(pool.map(_render_qr, payloads, chunksize=16))
+        except Exception as e:
+            logger.warning(f"QR worker pool failed, rendering serially: {e}")
+            if pool is not None:
+                # A broken pool is replaced on the next large run
+                _discard_pool(pool)
+    return [_render_qr(data) for data in payloads]
+
+
+def qr_pngs(payloads, cache=None):
+    """{payload: PNG bytes}, rendering only cache misses and storing them"""
+    cache = cache or get_qr_cache()
+    keys = {data: qr_cache_key(data, **LABEL_QR_OPTIONS) for data in payloads}
+    images = {}
+    missing = []
+    for data, key in keys.items():
+        png = cache.get(key)
+        if png is None:
+            missing.append(data)
+        else:
+            images[data] = png
+    if missing:
+        logger.info(f"Rendering {len(missing)} QR codes for labels ({len(images)} cached)")
+        for data, png in zip(missing, _render_missing(missing)):
+            cache.put(keys[data], png)
+            images[data] = png
+    return images
+
+
+def _label_size():
+    width = (PAGE_SIZE[0] - 2 * PAGE_MARGIN) // LABEL_COLUMNS
+    height = (PAGE_SIZE[1] - 2 * PAGE_MARGIN) // LABEL_ROWS
+    return width, height
+
+
+def _fit(draw, text, font, width):
+    # Trim text to the label width
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength(text + '…', font=font) > width:
+        text = text[:-1]
+    return text + '…'
+
+
+def render_label(label, qr_image, font):
+    """One label tile: QR centred on top, title and subtitle below"""
+    from PIL import Image, ImageDraw
+
+    width, height = _label_size()
+    tile = Image.new('RGB', (width, height), 'white')
+    tile.paste(qr_image.convert('RGB').resize((QR_SIDE, QR_SIDE), Image.NEAREST),
+               ((width - QR_SIDE) // 2, 10))
+
+    draw = ImageDraw.Draw(tile)
+    y = QR_SIDE + 20
+    for text in (label.get('title'), label.get('subtitle')):
+        if not text:
+            continue
+        text = _fit(draw, str(text), font, width - 20)
+        draw.text(((width - draw.textlength(text, font=font)) / 2, y), text, fill='black', font=font)
+        y += 22
+    draw.rectangle((0, 0, width - 1, height - 1), outline=(200, 200, 200))
+    return tile
+
+
+def render_labels(labels, format='pdf', cache=None):
+    """Label sheets for ``labels`` (dicts with url, title, subtitle, filename).
+
+    Returns ``(bytes, mimetype)``: a multi-page PDF, or a ZIP of PNG tiles.
+    """
+    from PIL import Image, ImageFont
+
+    if format not in LABEL_FORMATS:
+        raise ValueError(f"Unknown label format: {format}")
+    if not labels:
+        raise ValueError("No labels to render")
+
+    images = qr_pngs([label['url'] for label in labels], cache=cache)
+    font = ImageFont.load_default()
+    tiles = (render_label(label, Image.open(io.BytesIO(images[label['url']])), font)
+             for label in labels)
+
+    if format == 'png':
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+            for index, (label, tile) in enumerate(zip(labels, tiles), start=1):
+                tile_buffer = io.BytesIO()
+                tile.save(tile_buffer, format='PNG')
+                name = label.get('filename') or f'label_{index}'
+                archive.writestr(f'{index:04d}_{name}.png', tile_buffer.getvalue())
+        return buffer.getvalue(), 'application/zip'
+
+    width, height = _label_size()
+    per_page = LABEL_COLUMNS * LABEL_ROWS
+    pages = []
+    for index, tile in enumerate(tiles):
+        if index % per_page == 0:
+            pages.append(Image.new('RGB', PAGE_SIZE, 'white'))
+        slot = index % per_page
+        pages[-1].paste(tile, (PAGE_MARGIN + (slot % LABEL_COLUMNS) * width,
+                               PAGE_MARGIN + (slot // LABEL_COLUMNS) * height))
+
+    buffer = io.BytesIO()
+    pages[0].save(buffer, format='PDF', resolution=PAGE_DPI, save_all=True, append_images=pages[1:])
+    return buffer.getvalue(), 'application/pdf'
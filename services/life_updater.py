@@ -1,7 +1,3 @@
-import sqlite3
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, time
 import os
 import logging
@@ -14,7 +10,7 @@ class TreeLifeUpdater:
     def __init__(self, database_url=None):
         """Initialize the TreeLifeUpdater with database URL"""
         self.database_url = database_url
-        self.scheduler = BackgroundScheduler()
+        self._scheduler = None
         self.is_postgresql = False
         
         # Determine database type
@@ -38,12 +34,26 @@ class TreeLifeUpdater:
         
         logger.info(f"TreeLifeUpdater initialized with {'PostgreSQL' if self.is_postgresql else 'SQLite'}")
 
+    @property
+    def scheduler(self):
+        """APScheduler instance, created (and apscheduler imported) on first use"""
+        if self._scheduler is None:
+            from apscheduler.schedulers.background import BackgroundScheduler
+            self._scheduler = BackgroundScheduler()
+        return self._scheduler
+
+    @property
+    def scheduler_loaded(self):
+        return self._scheduler is not None
+
     def get_connection(self):
         """Get database connection based on database type"""
         try:
             if self.is_postgresql:
+                import psycopg2
                 return psycopg2.connect(self.database_url)
             else:
+                import sqlite3
                 return sqlite3.connect(self.database_url)
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
@@ -75,6 +85,9 @@ class TreeLifeUpdater:
                 """)
                 affected_rows = cursor.rowcount
             
+            # Every dome's payload changed; move their ETags on
+            cursor.execute("UPDATE dome SET change_version = COALESCE(change_version, 0) + 1")
+            
             conn.commit()
             conn.close()
             
@@ -115,7 +128,7 @@ class TreeLifeUpdater:
     def stop_scheduler(self):
         """Stop the background scheduler"""
         try:
-            if self.scheduler.running:
+            if self.scheduler_loaded and self.scheduler.running:
                 self.scheduler.shutdown()
                 logger.info("Tree life updater scheduler stopped")
         except Exception as e:
@@ -125,8 +138,8 @@ class TreeLifeUpdater:
         """Get the current status of the scheduler"""
         try:
             return {
-                "running": self.scheduler.running if self.scheduler else False,
-                "jobs": len(self.scheduler.get_jobs()) if self.scheduler else 0,
+                "running": self.scheduler.running if self.scheduler_loaded else False,
+                "jobs": len(self.scheduler.get_jobs()) if self.scheduler_loaded else 0,
                 "database_type": "PostgreSQL" if self.is_postgresql else "SQLite",
                 "database_url": self.database_url[:50] + "..." if len(self.database_url) > 50 else self.database_url
             }
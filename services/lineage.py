@@ -0,0 +1,332 @@
+"""Maintenance of the ``tree_lineage`` closure table.
+
+Every mother → cutting link is stored as one row per (ancestor, descendant)
+pair.  Linking or unlinking a cutting moves its whole subtree with two
+set-based statements, so generation depth, descendant counts and subtree
+queries never need a recursive walk in Python.
+
+The table is kept in sync from SQLAlchemy session events, which covers every
+route that assigns ``Tree.mother_plant_id`` (make_cutting, link/unlink,
+paste, delete ...).  ``rebuild_lineage`` recomputes the table from scratch
+and is used for the initial backfill and as a reconciliation job.
+
+The same events maintain the denormalized ``Tree.cutting_count`` (number of
+live direct cuttings) in the flushing transaction; ``reconcile_cutting_counts``
+repairs any drift left by bulk SQL that bypasses the ORM.
+"""
+from sqlalchemy import bindparam, event, inspect, text
+import logging
+
+from models import db, Tree, TreeLineage
+
+logger = logging.getLogger(__name__)
+
+# Guard against cycles in legacy data when rebuilding recursively
+MAX_LINEAGE_DEPTH = 64
+
+_LINK_SQL = text("""
+    INSERT INTO tree_lineage (ancestor_id, descendant_id, depth)
+    SELECT a.ancestor_id, d.descendant_id, a.depth + d.depth + 1
+    FROM (
+        SELECT CAST(:mother_id AS INTEGER) AS ancestor_id, 0 AS depth
+        UNION ALL
+        SELECT ancestor_id, depth FROM tree_lineage WHERE descendant_id = :mother_id
+    ) a
+    CROSS JOIN (
+        SELECT CAST(:cutting_id AS INTEGER) AS descendant_id, 0 AS depth
+        UNION ALL
+        SELECT descendant_id, depth FROM tree_lineage WHERE ancestor_id = :cutting_id
+    ) d
+""")
+
+_UNLINK_SQL = text("""
+    DELETE FROM tree_lineage
+    WHERE ancestor_id IN (
+        SELECT ancestor_id FROM tree_lineage WHERE descendant_id = :tree_id
+    )
+    AND (
+        descendant_id = :tree_id
+        OR descendant_id IN (SELECT descendant_id FROM tree_lineage WHERE ancestor_id = :tree_id)
+    )
+""")
+
+# New leaf trees: the mother at depth 1, plus every ancestor of the mother one level deeper
+_LINK_NEW_SQL = text("""
+    INSERT INTO tree_lineage (ancestor_id, descendant_id, depth)
+    SELECT t.mother_plant_id, t.id, 1
+    FROM tree t
+    WHERE t.id IN :tree_ids AND t.mother_plant_id IS NOT NULL
+    UNION ALL
+    SELECT l.ancestor_id, t.id, l.depth + 1
+    FROM tree t
+    JOIN tree_lineage l ON l.descendant_id = t.mother_plant_id
+    WHERE t.id IN :tree_ids
+""").bindparams(bindparam('tree_ids', expanding=True))
+
+_REMOVE_SQL = text("DELETE FROM tree_lineage WHERE ancestor_id = :tree_id OR descendant_id = :tree_id")
+
+_PARENT_SQL = text("SELECT ancestor_id FROM tree_lineage WHERE descendant_id = :tree_id AND depth = 1")
+
+_REBUILD_SQL = text("""
+    INSERT INTO tree_lineage (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE chain(ancestor_id, descendant_id, depth) AS (
+        SELECT t.mother_plant_id, t.id, 1
+        FROM tree t
+        JOIN tree m ON m.id = t.mother_plant_id
+        WHERE t.mother_plant_id IS NOT NULL AND t.mother_plant_id <> t.id
+        UNION ALL
+        SELECT p.mother_plant_id, c.descendant_id, c.depth + 1
+        FROM chain c
+        JOIN tree p ON p.id = c.ancestor_id
+        JOIN tree gp ON gp.id = p.mother_plant_id
+        WHERE c.depth < :max_depth
+    )
+    SELECT ancestor_id, descendant_id, MIN(depth)
+    FROM chain
+    WHERE ancestor_id <> descendant_id
+    GROUP BY ancestor_id, descendant_id
+""")
+
+
+def is_descendant(connection, ancestor_id, tree_id):
+    """Check whether tree_id sits anywhere below ancestor_id"""
+    row = connection.execute(
+        text("SELECT 1 FROM tree_lineage WHERE ancestor_id = :a AND descendant_id = :d"),
+        {'a': ancestor_id, 'd': tree_id}
+    ).first()
+    return row is not None
+
+
+def link_subtree(connection, cutting_id, mother_id):
+    """Attach cutting_id (and everything below it) under mother_id"""
+    if cutting_id == mother_id or is_descendant(connection, cutting_id, mother_id):
+        raise ValueError(f"Linking tree {cutting_id} to mother {mother_id} would create a lineage cycle")
+    connection.execute(_LINK_SQL, {'mother_id': mother_id, 'cutting_id': cutting_id})
+
+
+def link_new_trees(connection, tree_ids):
+    """Closure rows for freshly inserted trees, set-based.
+
+    The trees must have no cuttings yet and their mothers' own closure rows
+    must already exist (insert generation by generation).
+    """
+    if tree_ids:
+        connection.execute(_LINK_NEW_SQL, {'tree_ids': list(tree_ids)})
+
+
+def unlink_subtree(connection, tree_id):
+    """Detach tree_id (and everything below it) from all of its ancestors"""
+    connection.execute(_UNLINK_SQL, {'tree_id': tree_id})
+
+
+def remove_tree(connection, tree_id):
+    """Forget a deleted tree; its cuttings become roots of their own subtrees"""
+    unlink_subtree(connection, tree_id)
+    connection.execute(_REMOVE_SQL, {'tree_id': tree_id})
+
+
+def sync_tree_parent(connection, tree_id, mother_id):
+    """Make the closure table agree with the tree's current mother_plant_id.
+
+    Returns the previous mother id recorded in the closure table (or None).
+    """
+    row = connection.execute(_PARENT_SQL, {'tree_id': tree_id}).first()
+    current_mother_id = row[0] if row else None
+    if current_mother_id == mother_id:
+        return current_mother_id
+    if current_mother_id is not None:
+        unlink_subtree(connection, tree_id)
+    if mother_id is not None:
+        link_subtree(connection, tree_id, mother_id)
+    return current_mother_id
+
+
+def adjust_cutting_count(connection, mother_id, delta):
+    """Add delta to a mother's cached direct-cutting count"""
+    connection.execute(
+        text("UPDATE tree SET cutting_count = COALESCE(cutting_count, 0) + :delta WHERE id = :mother_id"),
+        {'delta': delta, 'mother_id': mother_id}
+    )
+
+
+def reconcile_cutting_counts(mother_id=None):
+    """Recount cached cutting counts from mother_plant_id links.
+
+    Only rows whose cached value is wrong are written.  Pass mother_id to
+    reconcile a single tree.  Returns the number of corrected rows; the
+    caller commits.
+    """
+    stale = "COALESCE(cutting_count, -1) <> (SELECT COUNT(*) FROM tree c WHERE c.mother_plant_id = tree.id AND c.deleted_at IS NULL)"
+    params = {}
+    if mother_id is not None:
+        stale += " AND id = :mother_id"
+        params['mother_id'] = mother_id
+    # Domes showing a corrected count change version first, while the rows still differ
+    db.session.execute(text(f"""
+        UPDATE dome SET change_version = COALESCE(change_version, 0) + 1
+        WHERE id IN (SELECT dome_id FROM tree WHERE {stale})
+    """), params)
+    sql = f"""
+        UPDATE tree
+        SET cutting_count = (SELECT COUNT(*) FROM tree c WHERE c.mother_plant_id = tree.id AND c.deleted_at IS NULL)
+        WHERE {stale}
+    """
+    corrected = db.session.execute(text(sql), params).rowcount
+    if corrected:
+        logger.info(f"Reconciled cutting_count on {corrected} trees")
+    return corrected
+
+
+def rebuild_lineage():
+    """Recompute the whole closure table from Tree.mother_plant_id.
+
+    Returns the number of lineage rows written.  Runs inside the current
+    session transaction; the caller commits.
+    """
+    db.session.execute(text("DELETE FROM tree_lineage"))
+    db.session.execute(_REBUILD_SQL, {'max_depth': MAX_LINEAGE_DEPTH})
+    row_count = db.session.query(db.func.count(TreeLineage.ancestor_id)).scalar() or 0
+    logger.info(f"Rebuilt tree lineage closure table with {row_count} rows")
+    return row_count
+
+
+def ensure_lineage_backfilled():
+    """Populate the closure table once for databases created before it existed"""
+    has_lineage = db.session.query(TreeLineage.ancestor_id).first() is not None
+    if has_lineage:
+        return 0
+    has_links = db.session.query(Tree.id).filter(Tree.mother_plant_id.isnot(None)).first() is not None
+    if not has_links:
+        return 0
+    row_count = rebuild_lineage()
+    db.session.commit()
+    return row_count
+
+
+def _parent_changed(tree):
+    state = inspect(tree)
+    return (state.attrs.mother_plant_id.history.has_changes() or
+            state.attrs.mother_plant.history.has_changes())
+
+
+def _mark_counts_stale(session, mother_ids):
+    session.info.setdefault('stale_cutting_counts', set()).update(mother_ids)
+
+
+def _before_flush(session, flush_context, instances):
+    # Deleted trees must be detached before their rows disappear, otherwise
+    # ON DELETE CASCADE drops the rows needed to find their ancestors.
+    deleted = [obj for obj in session.deleted if isinstance(obj, Tree) and obj.id]
+    if not deleted:
+        return
+    deleted_ids = {tree.id for tree in deleted}
+    connection = session.connection()
+    for tree in deleted:
+        row = connection.execute(_PARENT_SQL, {'tree_id': tree.id}).first()
+        mother_id = row[0] if row else None
+        remove_tree(connection, tree.id)
+        if mother_id is not None and mother_id not in deleted_ids:
+            adjust_cutting_count(connection, mother_id, -1)
+            _mark_counts_stale(session, [mother_id])
+
+
+def _after_flush(session, flush_context):
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Tree) and obj.id and obj not in session.deleted and _parent_changed(obj)
+    ]
+    if not changed:
+        return
+    connection = session.connection()
+    for tree in changed:
+        previous_mother_id = sync_tree_parent(connection, tree.id, tree.mother_plant_id)
+        if previous_mother_id == tree.mother_plant_id:
+            continue
+        if previous_mother_id is not None:
+            adjust_cutting_count(connection, previous_mother_id, -1)
+        if tree.mother_plant_id is not None:
+            adjust_cutting_count(connection, tree.mother_plant_id, 1)
+        _mark_counts_stale(session, [m for m in (previous_mother_id, tree.mother_plant_id) if m is not None])
+
+
+def _after_flush_postexec(session, flush_context):
+    # Counts were changed with SQL; make loaded mothers re-read them
+    stale_ids = session.info.pop('stale_cutting_counts', None)
+    if not stale_ids:
+        return
+    for mother_id in stale_ids:
+        mother = session.identity_map.get(session.identity_key(Tree, mother_id))
+        if mother is not None:
+            session.expire(mother, ['cutting_count'])
+
+
+def register_lineage_listeners(session=None):
+    """Keep tree_lineage and cutting counts in sync with every flush of the given (scoped) session"""
+    target = session if session is not None else db.session
+    if not event.contains(target, 'before_flush', _before_flush):
+        event.listen(target, 'before_flush', _before_flush)
+        event.listen(target, 'after_flush', _after_flush)
+        event.listen(target, 'after_flush_postexec', _after_flush_postexec)
+
+
+_FARM_FOREST_SQL = text("""
+    WITH RECURSIVE farm_tree AS (
+        SELECT t.id, t.name, t.breed, t.plant_type, t.mother_plant_id,
+               t.dome_id, t.internal_row, t.internal_col, t.planted_date,
+               d.name AS dome_name
+        FROM tree t
+        JOIN dome d ON d.id = t.dome_id
+        WHERE d.farm_id = :farm_id AND t.user_id = :user_id AND t.deleted_at IS NULL
+    ),
+    forest(id, root_id, generation) AS (
+        SELECT f.id, f.id, 0
+        FROM farm_tree f
+        LEFT JOIN farm_tree m ON m.id = f.mother_plant_id
+        WHERE m.id IS NULL
+        UNION ALL
+        SELECT c.id, p.root_id, p.generation + 1
+        FROM forest p
+        JOIN farm_tree c ON c.mother_plant_id = p.id
+        WHERE p.generation < :max_depth
+    )
+    SELECT ft.id, ft.name, ft.breed, ft.plant_type, ft.mother_plant_id,
+           ft.dome_id, ft.dome_name, ft.internal_row, ft.internal_col,
+           ft.planted_date, f.root_id, f.generation
+    FROM forest f
+    JOIN farm_tree ft ON ft.id = f.id
+    ORDER BY f.root_id, f.generation, ft.id
+""")
+
+
+def iter_farm_lineage(farm_id, user_id, batch_size=1000):
+    """Yield every tree of a farm with its root mother and generation.
+
+    Uses one recursive CTE across all domes of the farm.  Roots are trees
+    without a mother inside the farm, so generations are counted from the
+    first ancestor in this farm.  Rows are fetched in batches over a
+    server-side cursor (PostgreSQL) so the forest is never held in memory.
+    """
+    result = db.session.execute(
+        _FARM_FOREST_SQL.execution_options(stream_results=True, max_row_buffer=batch_size),
+        {'farm_id': farm_id, 'user_id': user_id, 'max_depth': MAX_LINEAGE_DEPTH}
+    )
+    try:
+        for partition in result.mappings().partitions(batch_size):
+            for row in partition:
+                planted_date = row['planted_date']
+                yield {
+                    'id': row['id'],
+                    'name': row['name'],
+                    'breed': row['breed'] or '',
+                    'plant_type': row['plant_type'],
+                    'mother_plant_id': row['mother_plant_id'],
+                    'root_id': row['root_id'],
+                    'generation': row['generation'],
+                    'dome_id': row['dome_id'],
+                    'dome_name': row['dome_name'],
+                    'internal_row': row['internal_row'],
+                    'internal_col': row['internal_col'],
+                    'planted_date': planted_date.isoformat() if hasattr(planted_date, 'isoformat') else planted_date
+                }
+    finally:
+        result.close()
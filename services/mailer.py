@@ -0,0 +1,47 @@
+"""Flask-Mail behind a lazy facade.
+
+Mail is only sent from the password-reset flows, so Flask-Mail (and the
+email/smtplib machinery it pulls in) is imported on the first send instead
+of when the app module loads.  ``mail`` and ``Message`` keep the Flask-Mail
+call shapes used by the routes: ``mail.init_app(app)``, ``Message(...)``
+and ``mail.send(msg)``.
+"""
+import threading
+
+from flask import current_app
+
+_lock = threading.Lock()
+
+
+class LazyMail:
+    """Stand-in for ``flask_mail.Mail`` that loads Flask-Mail on first send"""
+
+    def __init__(self):
+        self._mail = None
+
+    def init_app(self, app):
+        # Configuration is read from app.config when Flask-Mail is first needed
+        app.extensions.setdefault('lazy_mail', self)
+
+    def _get_mail(self):
+        app = current_app._get_current_object()
+        with _lock:
+            if self._mail is None:
+                from flask_mail import Mail
+                self._mail = Mail()
+            if 'mail' not in app.extensions:
+                self._mail.init_app(app)
+        return self._mail
+
+    def send(self, message):
+        self._get_mail().send(message)
+
+
+mail = LazyMail()
+
+
+def Message(*args, **kwargs):
+    """Build a ``flask_mail.Message``, importing Flask-Mail on first use"""
+    mail._get_mail()  # Message reads the default sender from the app's mail state
+    from flask_mail import Message as MailMessage
+    return MailMessage(*args, **kwargs)
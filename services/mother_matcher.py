@@ -0,0 +1,143 @@
+"""Indexed mother-candidate matching for paste relinking.
+
+When a paste leaves cuttings without their mother, each cutting is relinked
+to a mother in the destination dome.  Instead of querying the dome's mothers
+and scanning them for every cutting, ``MotherCandidateIndex`` loads the
+candidates once (id, name, breed only) and resolves each cutting with dict
+lookups on breed and normalized name tokens.
+
+Matching keeps the precedence of the original ``find_suitable_mother_tree``:
+
+1. the cutting's original mother, if it is a candidate
+2. exact breed match
+3. name similarity - one name contains the other, or they share a word
+   longer than three characters
+4. case-insensitive breed match
+5. the first candidate as a last resort
+
+Within a strategy the earliest candidate (lowest id) wins.  Name containment
+is evaluated on whole words, so "Kush" no longer matches "Kushberry".
+"""
+from collections import namedtuple
+import re
+
+from models import db, Tree
+
+MotherCandidate = namedtuple('MotherCandidate', ['id', 'name', 'breed'])
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize_name(name):
+    """Lowercase a plant name and split it into alphanumeric word tokens"""
+    return tuple(_TOKEN_RE.findall((name or '').lower()))
+
+
+def _ngrams(tokens):
+    """All contiguous word sequences of a tokenized name"""
+    return {
+        tokens[start:end]
+        for start in range(len(tokens))
+        for end in range(start + 1, len(tokens) + 1)
+    }
+
+
+class MotherCandidateIndex:
+    """Per-paste index of candidate mother trees"""
+
+    def __init__(self, candidates):
+        self.candidates = sorted(candidates, key=lambda c: c.id)
+        self.by_id = {}
+        self.by_breed = {}
+        self.by_breed_lower = {}
+        self.by_full_name = {}
+        self.by_name_ngram = {}
+        self.by_token = {}
+
+        for order, candidate in enumerate(self.candidates):
+            self.by_id[candidate.id] = order
+            breed = (candidate.breed or '').strip()
+            if breed:
+                self.by_breed.setdefault(breed, order)
+                self.by_breed_lower.setdefault(breed.lower(), order)
+
+            tokens = normalize_name(candidate.name)
+            if not tokens:
+                continue
+            self.by_full_name.setdefault(tokens, order)
+            for ngram in _ngrams(tokens):
+                self.by_name_ngram.setdefault(ngram, order)
+            for token in tokens:
+                self.by_token.setdefault(token, order)
+
+    def __len__(self):
+        return len(self.candidates)
+
+    @classmethod
+    def for_dome(cls, dome_id, user_id):
+        """Build the index from the mother trees of a dome in one query"""
+        rows = db.session.query(Tree.id, Tree.name, Tree.breed).filter(
+            Tree.dome_id == dome_id,
+            Tree.user_id == user_id,
+            Tree.plant_type == 'mother'
+        ).order_by(Tree.id).all()
+        return cls(MotherCandidate(*row) for row in rows)
+
+    @classmethod
+    def from_trees(cls, trees):
+        """Build the index from already-loaded Tree objects"""
+        return cls(MotherCandidate(tree.id, tree.name, tree.breed) for tree in trees)
+
+    def _name_match(self, cutting_name):
+        tokens = normalize_name(cutting_name)
+        if not tokens:
+            return None
+        matches = []
+        # Mother name contains the whole cutting name
+        if tokens in self.by_name_ngram:
+            matches.append(self.by_name_ngram[tokens])
+        # Cutting name contains a whole mother name
+        for ngram in _ngrams(tokens):
+            if ngram in self.by_full_name:
+                matches.append(self.by_full_name[ngram])
+        # Shared significant word
+        for token in tokens:
+            if len(token) > 3 and token in self.by_token:
+                matches.append(self.by_token[token])
+        return min(matches) if matches else None
+
+    def match(self, cutting_data, original_mother_id=None):
+        """Return the best MotherCandidate for a cutting, or None if there are no candidates.
+
+        ``cutting_data`` is a dict with at least ``name`` and ``breed``.
+        """
+        if not self.candidates:
+            return None
+
+        if original_mother_id in self.by_id:
+            return self.candidates[self.by_id[original_mother_id]]
+
+        cutting_breed = (cutting_data.get('breed') or '').strip()
+        if cutting_breed in self.by_breed:
+            return self.candidates[self.by_breed[cutting_breed]]
+
+        order = self._name_match(cutting_data.get('name'))
+        if order is not None:
+            return self.candidates[order]
+
+        if cutting_breed and cutting_breed.lower() in self.by_breed_lower:
+            return self.candidates[self.by_breed_lower[cutting_breed.lower()]]
+
+        return self.candidates[0]
+
+    def match_all(self, cuttings):
+        """Resolve many cuttings at once.
+
+        ``cuttings`` is an iterable of dicts with ``id``, ``name``, ``breed``
+        and optionally ``original_mother_id``.  Returns {cutting id: mother id or None}.
+        """
+        resolved = {}
+        for cutting in cuttings:
+            candidate = self.match(cutting, cutting.get('original_mother_id'))
+            resolved[cutting.get('id')] = candidate.id if candidate else None
+        return resolved
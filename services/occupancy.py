@@ -0,0 +1,146 @@
+"""In-memory occupancy map of a dome's cells.
+
+One query loads the position of every live tree in a dome into a flat
+``bytearray`` (one byte per cell, row-major) plus a tree id -> cell map, so
+a whole batch of placements can be validated without a query per cell.
+Cells hold a count rather than a flag so legacy data with two trees on one
+cell is represented faithfully.
+
+Searches run on the bytearray with C-level ``find``/``count`` calls: free
+cell lookup, first-fit placement of N plants, rectangle emptiness and
+resize validation never loop over rows x cols in Python.
+"""
+from models import db, Tree
+
+
+class DomeOccupancy:
+    """Occupancy of a rows x cols dome grid"""
+
+    def __init__(self, rows, cols, positions=None):
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(rows * cols)
+        self.positions = {}
+        self.out_of_bounds = set()
+        for tree_id, row, col in positions or ():
+            self.place(tree_id, row, col)
+
+    @classmethod
+    def for_dome(cls, dome):
+        """Build the map for a Dome from a single query over its live trees"""
+        positions = db.session.query(Tree.id, Tree.internal_row, Tree.internal_col).filter(
+            Tree.dome_id == dome.id
+        ).all()
+        return cls(dome.internal_rows, dome.internal_cols, positions)
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def _index(self, row, col):
+        return row * self.cols + col
+
+    def is_free(self, row, col):
+        return self.in_bounds(row, col) and self.cells[self._index(row, col)] == 0
+
+    def occupants(self, row, col, exclude_tree_id=None):
+        """Number of trees on a cell, not counting ``exclude_tree_id``"""
+        if not self.in_bounds(row, col):
+            return 0
+        count = self.cells[self._index(row, col)]
+        if exclude_tree_id is not None and self.positions.get(exclude_tree_id) == (row, col):
+            count -= 1
+        return count
+
+    def cell(self, index):
+        """(row, col) of a flat cell index"""
+        return divmod(index, self.cols)
+
+    def free_count(self):
+        return self.cells.count(0)
+
+    def first_free(self, start_row=0, start_col=0):
+        """First free (row, col) in row-major order from a starting cell, or None"""
+        if not self.cols:
+            return None
+        index = self.cells.find(0, self._index(start_row, start_col))
+        return self.cell(index) if index >= 0 else None
+
+    def free_cells(self, limit=None):
+        """Free cells in row-major order, at most ``limit`` of them"""
+        cells = []
+        index = self.cells.find(0)
+        while index >= 0 and (limit is None or len(cells) < limit):
+            cells.append(self.cell(index))
+            index = self.cells.find(0, index + 1)
+        return cells
+
+    def first_fit(self, count):
+        """Free cells for ``count`` new plants in row-major order, or None if they don't fit"""
+        if count > self.free_count():
+            return None
+        return self.free_cells(limit=count)
+
+    def rect_is_empty(self, min_row, min_col, max_row, max_col):
+        """True when every cell of the inclusive rectangle is inside the grid and free"""
+        if not (self.in_bounds(min_row, min_col) and self.in_bounds(max_row, max_col)):
+            return False
+        width = max_col - min_col + 1
+        for row in range(min_row, max_row + 1):
+            start = self._index(row, min_col)
+            if self.cells.count(0, start, start + width) != width:
+                return False
+        return True
+
+    def occupied_outside(self, new_rows, new_cols):
+        """Number of trees that would fall outside a new_rows x new_cols grid"""
+        outside = 0
+        for tree_id in self.out_of_bounds:
+            row, col = self.positions[tree_id]
+            if row is None or col is None or not (0 <= row < new_rows and 0 <= col < new_cols):
+                outside += 1
+        if new_rows < self.rows:
+            tail = self.cells[new_rows * self.cols:]
+            outside += sum(tail)
+        if new_cols < self.cols:
+            for row in range(min(new_rows, self.rows)):
+                outside += sum(self.cells[self._index(row, new_cols):self._index(row, self.cols - 1) + 1])
+        return outside
+
+    def can_resize_to(self, new_rows, new_cols):
+        """(ok, number of trees that would end up outside the new bounds)"""
+        outside = self.occupied_outside(new_rows, new_cols)
+        return outside == 0, outside
+
+    def place(self, tree_id, row, col):
+        """Record tree_id on a cell (trees outside the grid are tracked separately)"""
+        self.positions[tree_id] = (row, col)
+        if row is None or col is None or not self.in_bounds(row, col):
+            self.out_of_bounds.add(tree_id)
+            return
+        index = self._index(row, col)
+        self.cells[index] = min(self.cells[index] + 1, 255)
+
+    def remove(self, tree_id):
+        """Forget a tree and free its cell; returns its previous position"""
+        position = self.positions.pop(tree_id, None)
+        if position is None:
+            return None
+        if tree_id in self.out_of_bounds:
+            self.out_of_bounds.discard(tree_id)
+            return position
+        index = self._index(*position)
+        if self.cells[index]:
+            self.cells[index] -= 1
+        return position
+
+    def move(self, tree_id, row, col):
+        """Move a known tree to a cell; returns its previous position"""
+        previous = self.remove(tree_id)
+        self.place(tree_id, row, col)
+        return previous
+
+    def __contains__(self, tree_id):
+        return tree_id in self.positions
+
+    def __len__(self):
+        return len(self.positions)
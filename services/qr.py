@@ -0,0 +1,198 @@
+"""QR code rendering behind a lazy facade, with a content-keyed PNG cache.
+
+``qrcode`` and Pillow are only needed when a QR code is actually drawn, so
+they are imported on the first call instead of when the app module loads.
+
+A QR image depends only on its payload (the tree URL) and render options,
+so ``cached_qr_png`` keys PNGs by a hash of both.  The key doubles as a
+strong ETag.  PNGs are kept in a small in-process LRU in front of a
+directory of files (``QR_CACHE_DIR``, default ``<instance>/qr_cache``), so
+they survive restarts and are shared by every worker on the host.  The
+directory holds at most ``QR_CACHE_MAX_FILES`` PNGs: every so often the
+least recently used files (by mtime, refreshed on reads) are removed.
+"""
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+ERROR_CORRECTION_LEVELS = ('L', 'M', 'Q', 'H')
+
+# Part of every cache key; bump when the rendering itself changes
+QR_RENDER_VERSION = 1
+
+MEMORY_CACHE_ENTRIES = 512
+DEFAULT_MAX_FILES = 20000
+# Writes between two checks of the directory size
+PRUNE_EVERY_WRITES = 200
+
+
+def qr_png(data, box_size=10, border=4, error_correction='M', size=None):
+    """PNG bytes of a black-on-white QR code for ``data``.
+
+    ``size`` optionally resizes the image to ``(width, height)`` pixels.
+    """
+    import io
+    import qrcode
+
+    if error_correction not in ERROR_CORRECTION_LEVELS:
+        raise ValueError(f"Unknown QR error correction level: {error_correction}")
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{error_correction}'),
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    image = qr.make_image(fill_color="black", back_color="white")
+
+    if size:
+        from PIL import Image
+        image = image.resize(size, Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def qr_cache_key(data, box_size=10, border=4, error_correction='M', size=None):
+    """Content key of a QR PNG: a hash of the payload and every render option"""
+    size_part = f"{size[0]}x{size[1]}" if size else '-'
+    material = f"v{QR_RENDER_VERSION}|{box_size}|{border}|{error_correction}|{size_part}|{data}"
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class QRCache:
+    """PNG bytes by content key: an LRU in memory, then files under ``directory``"""
+
+    def __init__(self, directory=None, memory_entries=MEMORY_CACHE_ENTRIES, max_files=DEFAULT_MAX_FILES):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.max_files = max_files
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self._writes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.png")
+
+    def _remember(self, key, png):
+        with self._lock:
+            self._memory[key] = png
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            png = self._memory.get(key)
+            if png is not None:
+                self._memory.move_to_end(key)
+                return png
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                png = handle.read()
+            os.utime(path)  # recently used: the last to be pruned
+        except OSError:
+            return None
+        self._remember(key, png)
+        return png
+
+    def put(self, key, png):
+        self._remember(key, png)
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as handle:
+                handle.write(png)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist QR cache entry {key}: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            due = self._writes % PRUNE_EVERY_WRITES == 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Remove the least recently used files beyond ``max_files``; returns how many"""
+        if not self.directory or not self.max_files or not self._prune_lock.acquire(blocking=False):
+            return 0
+        try:
+            entries = []
+            for root, _, names in os.walk(self.directory):
+                for name in names:
+                    if name.endswith('.png'):
+                        path = os.path.join(root, name)
+                        try:
+                            entries.append((os.stat(path).st_mtime, path))
+                        except OSError:
+                            continue
+            excess = len(entries) - self.max_files
+            if excess <= 0:
+                return 0
+            entries.sort()
+            removed = 0
+            for _, path in entries[:excess]:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    continue
+            logger.info(f"Pruned {removed} QR cache files")
+            return removed
+        finally:
+            self._prune_lock.release()
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_qr_cache():
+    """The process-wide cache, configured from the current app on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                directory = None
+                max_files = DEFAULT_MAX_FILES
+                try:
+                    from flask import current_app
+                    directory = current_app.config.get('QR_CACHE_DIR') or os.path.join(
+                        current_app.instance_path, 'qr_cache')
+                    max_files = int(current_app.config.get('QR_CACHE_MAX_FILES') or DEFAULT_MAX_FILES)
+                except RuntimeError:
+                    pass  # no app context: memory only
+                _cache = QRCache(directory, max_files=max_files)
+    return _cache
+
+
+def cached_qr_png(data, box_size=10, border=4, error_correction='M', size=None, cache=None):
+    """``(png bytes, content key)`` for a QR code, rendering only on a cache miss"""
+    cache = cache or get_qr_cache()
+    options = dict(box_size=box_size, border=border, error_correction=error_correction, size=size)
+    key = qr_cache_key(data, **options)
+    png = cache.get(key)
+    if png is None:
+        png = qr_png(data, **options)
+        cache.put(key, png)
+    return png, key
@@ -0,0 +1,284 @@
+"""Schema migration and repair as a one-shot release step.
+
+Importing the app used to create tables, probe columns, ALTER/UPDATE tables
+and reflect the whole schema, in every process that imported it.  All of
+that lives here now and runs once per release through
+``run_migration_on_startup.py`` (or ``flask migrate-schema``).
+
+A successful run stamps ``SCHEMA_VERSION`` into the one-row
+``app_schema_version`` table.  ``schema_is_current()`` only reads that row,
+so a release with no schema changes costs one query, and app processes can
+boot without touching the schema at all (``SCHEMA_ON_STARTUP=skip``).
+
+Bump ``SCHEMA_VERSION`` whenever ``_migrate_columns`` learns a new step.
+"""
+from datetime import datetime
+import time
+
+import click
+from sqlalchemy import inspect, text
+
+from models import db, DeletionJob, GridSettings, ServerSession
+from services.breeds import sync_breed_ids
+from services.lineage import ensure_lineage_backfilled
+from services.search import ensure_search_index
+
+SCHEMA_VERSION = 7
+
+STARTUP_MODES = ('skip', 'auto', 'migrate')
+
+
+def _is_postgres(conn):
+    return conn.dialect.name == 'postgresql'
+
+
+def _columns(conn, table):
+    """Column names of a table"""
+    if _is_postgres(conn):
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = :table
+        """), {'table': table})
+        return [row[0] for row in result.fetchall()]
+    result = conn.execute(text(f"PRAGMA table_info({table})"))
+    return [row[1] for row in result.fetchall()]
+
+
+def get_schema_version(engine=None):
+    """Stamped schema version, or None if the database was never stamped"""
+    try:
+        with (engine or db.engine).connect() as conn:
+            return conn.execute(text("SELECT version FROM app_schema_version")).scalar()
+    except Exception:
+        return None
+
+
+def schema_is_current(engine=None):
+    """Fast check: one SELECT against the version table"""
+    version = get_schema_version(engine)
+    return version is not None and version >= SCHEMA_VERSION
+
+
+def stamp_schema(conn, version=SCHEMA_VERSION):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS app_schema_version (
+            version INTEGER NOT NULL,
+            applied_at TIMESTAMP
+        )
+    """))
+    conn.execute(text("DELETE FROM app_schema_version"))
+    conn.execute(text("INSERT INTO app_schema_version (version, applied_at) VALUES (:version, :now)"),
+                 {'version': version, 'now': datetime.utcnow()})
+
+
+def _migrate_columns(conn):
+    """Add columns and indexes introduced after tables were first created"""
+    postgres = _is_postgres(conn)
+
+    # ✅ farm_id column on dome
+    if 'farm_id' not in _columns(conn, 'dome'):
+        print("🔧 Adding farm_id column to dome table...")
+        conn.execute(text('ALTER TABLE dome ADD COLUMN farm_id INTEGER'))
+        if postgres:
+            # Add foreign key constraint separately for PostgreSQL
+            try:
+                conn.execute(text('ALTER TABLE dome ADD CONSTRAINT fk_dome_farm FOREIGN KEY (farm_id) REFERENCES farm(id)'))
+            except Exception as fk_error:
+                print(f"⚠️ Could not add foreign key constraint: {fk_error}")
+        conn.commit()
+        print("✅ Added farm_id column to dome table")
+
+    # ✅ grid_settings columns
+    grid_columns = _columns(conn, 'grid_settings')
+    timestamp_default = ' DEFAULT CURRENT_TIMESTAMP' if postgres else ''
+    if 'grid_type' not in grid_columns:
+        conn.execute(text("ALTER TABLE grid_settings ADD COLUMN grid_type VARCHAR(20) DEFAULT 'dome'"))
+        print("✅ Added grid_type column")
+    if 'user_id' not in grid_columns:
+        conn.execute(text("ALTER TABLE grid_settings ADD COLUMN user_id INTEGER"))
+        print("✅ Added user_id column")
+    for column in ('created_at', 'updated_at'):
+        if column not in grid_columns:
+            conn.execute(text(f"ALTER TABLE grid_settings ADD COLUMN {column} TIMESTAMP{timestamp_default}"))
+            print(f"✅ Added {column} column")
+    conn.commit()
+
+    # Update existing records
+    conn.execute(text("UPDATE grid_settings SET grid_type = 'dome' WHERE grid_type IS NULL"))
+
+    # Assign ownerless settings to the first user
+    first_user = conn.execute(text('SELECT id FROM "user" LIMIT 1')).fetchone()
+    if first_user:
+        conn.execute(text("UPDATE grid_settings SET user_id = :user_id WHERE user_id IS NULL"),
+                     {"user_id": first_user[0]})
+
+    current_time = datetime.utcnow()
+    conn.execute(text("UPDATE grid_settings SET created_at = :time WHERE created_at IS NULL"), {"time": current_time})
+    conn.execute(text("UPDATE grid_settings SET updated_at = :time WHERE updated_at IS NULL"), {"time": current_time})
+
+    # ✅ One settings row per (user, grid type): drop duplicates, then enforce it
+    if 'ux_grid_settings_user_type' not in {ix['name'] for ix in inspect(conn).get_indexes('grid_settings')}:
+        removed = conn.execute(text("""
+            DELETE FROM grid_settings
+            WHERE user_id IS NOT NULL
+              AND id NOT IN (
+                  SELECT MIN(id) FROM grid_settings
+                  WHERE user_id IS NOT NULL
+                  GROUP BY user_id, grid_type
+              )
+        """)).rowcount
+        conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_grid_settings_user_type
+            ON grid_settings (user_id, grid_type)
+        """))
+        print(f"✅ Added unique grid settings index (removed {removed or 0} duplicates)")
+
+    # ✅ Cached cutting counts on mother trees
+    tree_columns = _columns(conn, 'tree')
+    if 'cutting_count' not in tree_columns:
+        conn.execute(text("ALTER TABLE tree ADD COLUMN cutting_count INTEGER DEFAULT 0"))
+        conn.execute(text("""
+            UPDATE tree
+            SET cutting_count = (SELECT COUNT(*) FROM tree c WHERE c.mother_plant_id = tree.id)
+        """))
+        print("✅ Added and backfilled cutting_count column")
+
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tree_mother_plant_id ON tree (mother_plant_id)"))
+
+    # ✅ Soft-delete tombstones with partial indexes for live reads and the purge worker
+    if 'deleted_at' not in tree_columns:
+        conn.execute(text("ALTER TABLE tree ADD COLUMN deleted_at TIMESTAMP"))
+        print("✅ Added deleted_at column to tree table")
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_tree_live_position
+        ON tree (dome_id, internal_row, internal_col) WHERE deleted_at IS NULL
+    """))
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_tree_tombstone
+        ON tree (deleted_at, id) WHERE deleted_at IS NOT NULL
+    """))
+    # Keyset pagination of tree listings on (dome_id, id)
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_tree_live_dome_id
+        ON tree (dome_id, id) WHERE deleted_at IS NULL
+    """))
+
+    # ✅ Tree.breed_id foreign key to the TreeBreed the free-text breed names (backfilled in migrate_schema)
+    if 'breed_id' not in tree_columns:
+        conn.execute(text("ALTER TABLE tree ADD COLUMN breed_id INTEGER REFERENCES tree_breed(id) ON DELETE SET NULL"))
+        print("✅ Added breed_id column to tree table")
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_tree_breed_id ON tree (breed_id)"))
+
+    # ✅ Per-dome change version behind the polling endpoints' ETags
+    if 'change_version' not in _columns(conn, 'dome'):
+        conn.execute(text("ALTER TABLE dome ADD COLUMN change_version INTEGER NOT NULL DEFAULT 0"))
+        print("✅ Added change_version column to dome table")
+
+    # ✅ Per-user life-day reference time (replaces touching every tree at login)
+    if 'life_reference_at' not in _columns(conn, 'user'):
+        conn.execute(text('ALTER TABLE "user" ADD COLUMN life_reference_at TIMESTAMP'))
+        conn.execute(text('UPDATE "user" SET life_reference_at = last_login'))
+        print("✅ Added life_reference_at column to user table")
+
+    # ✅ Full-text search index (FTS5 on SQLite, tsvector/GIN on PostgreSQL)
+    indexed = ensure_search_index(conn)
+    if indexed:
+        print(f"✅ Built search index for {indexed} trees")
+
+    # ✅ Server-side session storage (SESSION_BACKEND=sql)
+    if not inspect(conn).has_table('server_session'):
+        ServerSession.__table__.create(conn, checkfirst=True)
+        print("✅ Created server_session table")
+
+    # ✅ Background deletion jobs, shared by every worker
+    if not inspect(conn).has_table('deletion_job'):
+        DeletionJob.__table__.create(conn, checkfirst=True)
+        print("✅ Created deletion_job table")
+
+
+def _initialize_defaults():
+    if not GridSettings.query.first():
+        db.session.add(GridSettings(rows=5, cols=5))
+        db.session.commit()
+        print("✅ Created default grid settings")
+
+
+def migrate_schema(force=False):
+    """Bring the database schema up to ``SCHEMA_VERSION``; needs an app context.
+
+    Returns False when the schema was already current (nothing done), True
+    after a migration.  Raises on failure without stamping, so the next
+    release retries.
+    """
+    if not force and schema_is_current():
+        print(f"✅ Database schema is current (version {SCHEMA_VERSION})")
+        return False
+
+    started = time.perf_counter()
+    print(f"🔧 Migrating database schema to version {SCHEMA_VERSION}...")
+
+    # Legacy raw-psycopg2 repair of user/farm/tree columns (Render only)
+    from auto_fix_db import auto_fix_user_table
+    auto_fix_user_table()
+
+    db.create_all()
+    with db.engine.connect() as conn:
+        _migrate_columns(conn)
+        conn.commit()
+
+    _initialize_defaults()
+
+    backfilled = ensure_lineage_backfilled()
+    if backfilled:
+        print(f"✅ Backfilled {backfilled} tree lineage rows")
+
+    linked = sync_breed_ids()
+    db.session.commit()
+    if linked:
+        print(f"✅ Linked {linked} trees to their breeds")
+
+    with db.engine.connect() as conn:
+        stamp_schema(conn)
+        conn.commit()
+
+    print(f"✅ Database schema migrated to version {SCHEMA_VERSION} in {time.perf_counter() - started:.2f}s")
+    return True
+
+
+def prepare_schema_on_startup(mode):
+    """Schema work done while the app is created.
+
+    ``skip``: none (the release command owns migrations).
+    ``auto``: the fast version check, migrating only a stale schema.
+    ``migrate``: always run the full migration (the legacy behaviour).
+    """
+    if mode not in STARTUP_MODES:
+        print(f"⚠️ Unknown SCHEMA_ON_STARTUP mode '{mode}', skipping schema work")
+        return
+    if mode == 'skip':
+        return
+    try:
+        migrate_schema(force=(mode == 'migrate'))
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Database schema migration failed: {e}")
+
+
+def register_schema_commands(app):
+    """``flask migrate-schema`` and ``flask check-schema``"""
+
+    @app.cli.command('migrate-schema')
+    @click.option('--force', is_flag=True, help='Run every step even if the schema is current.')
+    def migrate_schema_command(force):
+        """Migrate and repair the database schema."""
+        migrate_schema(force=force)
+
+    @app.cli.command('check-schema')
+    def check_schema_command():
+        """Exit non-zero when the database schema needs a migration."""
+        version = get_schema_version()
+        if version is None or version < SCHEMA_VERSION:
+            click.echo(f"Schema version {version} is behind {SCHEMA_VERSION}")
+            raise SystemExit(1)
+        click.echo(f"Schema version {version} is current")
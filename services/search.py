@@ -0,0 +1,378 @@
+"""Full-text search over trees with facets.
+
+Tree names, breeds, info and cutting notes are indexed in a ``tree_search``
+table keyed by tree id:
+
+* SQLite: an FTS5 virtual table, ranked with bm25.
+* PostgreSQL: a weighted tsvector column with a GIN index, ranked with
+  ts_rank (``ON DELETE CASCADE`` drops rows of hard-deleted trees).
+* Anything else, or SQLite built without FTS5: no index, LIKE matching.
+
+All three answer ``SearchBackend.match()`` with the same (tree_id, score)
+rows, so ``search_trees`` filters, ranks and facets the same way on every
+database.  Facets count matches by farm, dome, plant type and age bucket;
+each facet ignores its own filter so the other values stay selectable.
+
+The index is kept up to date incrementally: a session listener re-indexes
+trees whose indexed text or tombstone changed in a flush, and the bulk SQL
+paths (tree batches, purge) call ``refresh_search_index`` with the ids they
+touched.  Rows of trees removed with a whole dome or farm are ignored by
+the join to ``tree`` and pruned by the purge job.  ``ensure_search_index``
+creates and fills the index during the schema migration, and
+``flask rebuild-search-index`` rebuilds it from scratch.
+"""
+from datetime import datetime
+import logging
+import re
+import weakref
+
+import click
+from sqlalchemy import Float, Integer, bindparam, case, cast, event, extract, func, inspect, literal, text
+
+from models import db, Dome, Farm, Tree
+
+logger = logging.getLogger(__name__)
+
+INDEX_TABLE = 'tree_search'
+INDEXED_COLUMNS = ('name', 'breed', 'info', 'cutting_notes')
+MAX_TERMS = 8
+MAX_RESULTS = 100
+
+# Same thresholds and names as Tree.get_age_category()
+AGE_BUCKETS = (('seedling', 7), ('young', 30), ('mature', 90), ('old', 365), ('ancient', None))
+FACETS = ('farm', 'dome', 'plant_type', 'age')
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query):
+    """Lower-cased words of a user query, at most MAX_TERMS"""
+    return _TERM.findall((query or '').lower())[:MAX_TERMS]
+
+
+class SearchBackend:
+    """How one database stores and matches the search index"""
+
+    name = None
+
+    def create(self, connection):
+        """Create the index if missing; True when it was created"""
+        return False
+
+    def refresh(self, connection, tree_ids):
+        """Re-index the given trees; tombstoned or missing ones are dropped"""
+
+    def rebuild(self, connection):
+        """Re-index every live tree; returns the number indexed"""
+        return 0
+
+    def prune(self, connection):
+        """Drop index rows of trees that no longer exist"""
+        return 0
+
+    def match(self, terms):
+        """(SQL selecting tree_id and score of matching trees, bind params)"""
+        raise NotImplementedError
+
+
+class SqliteFtsBackend(SearchBackend):
+    name = 'fts5'
+
+    _DELETE = text(f"DELETE FROM {INDEX_TABLE} WHERE rowid IN :ids").bindparams(
+        bindparam('ids', expanding=True))
+    _INSERT = f"""
+        INSERT INTO {INDEX_TABLE} (rowid, name, breed, info, cutting_notes)
+        SELECT id, name, COALESCE(breed, ''), COALESCE(info, ''), COALESCE(cutting_notes, '')
+        FROM tree WHERE deleted_at IS NULL
+    """
+
+    def create(self, connection):
+        if inspect(connection).has_table(INDEX_TABLE):
+            return False
+        connection.execute(text(f"""
+            CREATE VIRTUAL TABLE {INDEX_TABLE}
+            USING fts5(name, breed, info, cutting_notes, tokenize = 'unicode61 remove_diacritics 2')
+        """))
+        return True
+
+    def refresh(self, connection, tree_ids):
+        connection.execute(self._DELETE, {'ids': tree_ids})
+        connection.execute(text(self._INSERT + " AND id IN :ids").bindparams(
+            bindparam('ids', expanding=True)), {'ids': tree_ids})
+
+    def rebuild(self, connection):
+        connection.execute(text(f"DELETE FROM {INDEX_TABLE}"))
+        return connection.execute(text(self._INSERT)).rowcount
+
+    def prune(self, connection):
+        return connection.execute(text(
+            f"DELETE FROM {INDEX_TABLE} WHERE rowid NOT IN (SELECT id FROM tree)"
+        )).rowcount
+
+    def match(self, terms):
+        # Every term as a quoted prefix; bm25 is lower-is-better, weights follow INDEXED_COLUMNS
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        return (f"SELECT rowid AS tree_id, -bm25({INDEX_TABLE}, 10.0, 5.0, 1.0, 1.0) AS score "
+                f"FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH :expression"), {'expression': expression}
+
+
+class PostgresBackend(SearchBackend):
+    name = 'tsvector'
+
+    # 'simple' config: strain names and codes must not be stemmed
+    _DOCUMENT = """
+        setweight(to_tsvector('simple', COALESCE(name, '')), 'A') ||
+        setweight(to_tsvector('simple', COALESCE(breed, '')), 'B') ||
+        setweight(to_tsvector('simple', COALESCE(info, '') || ' ' || COALESCE(cutting_notes, '')), 'C')
+    """
+    _INSERT = f"""
+        INSERT INTO {INDEX_TABLE} (tree_id, document)
+        SELECT id, {_DOCUMENT} FROM tree WHERE deleted_at IS NULL
+    """
+
+    def create(self, connection):
+        if inspect(connection).has_table(INDEX_TABLE):
+            return False
+        connection.execute(text(f"""
+            CREATE TABLE {INDEX_TABLE} (
+                tree_id INTEGER PRIMARY KEY REFERENCES tree(id) ON DELETE CASCADE,
+                document TSVECTOR NOT NULL
+            )
+        """))
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_tree_search_document ON {INDEX_TABLE} USING GIN (document)"
+        ))
+        return True
+
+    def refresh(self, connection, tree_ids):
+        ids = bindparam('ids', expanding=True)
+        connection.execute(text(f"DELETE FROM {INDEX_TABLE} WHERE tree_id IN :ids").bindparams(ids),
+                           {'ids': tree_ids})
+        connection.execute(text(self._INSERT + " AND id IN :ids").bindparams(ids), {'ids': tree_ids})
+
+    def rebuild(self, connection):
+        connection.execute(text(f"DELETE FROM {INDEX_TABLE}"))
+        return connection.execute(text(self._INSERT)).rowcount
+
+    def match(self, terms):
+        expression = ' & '.join(f'{term}:*' for term in terms)
+        return (f"SELECT tree_id, ts_rank(document, to_tsquery('simple', :expression)) AS score "
+                f"FROM {INDEX_TABLE} WHERE document @@ to_tsquery('simple', :expression)"), \
+            {'expression': expression}
+
+
+class LikeBackend(SearchBackend):
+    """No index: every term must appear in one of the indexed columns"""
+
+    name = 'like'
+
+    def match(self, terms):
+        clauses, params = [], {}
+        for index, term in enumerate(terms):
+            params[f'term_{index}'] = f'%{term}%'
+            clauses.append('(' + ' OR '.join(
+                f"LOWER(COALESCE({column}, '')) LIKE :term_{index}" for column in INDEXED_COLUMNS
+            ) + ')')
+        return f"SELECT id AS tree_id, 0.0 AS score FROM tree WHERE {' AND '.join(clauses)}", params
+
+
+_BACKENDS = {'sqlite': SqliteFtsBackend, 'postgresql': PostgresBackend}
+
+# engine -> backend, settled once the index exists (or is known not to)
+_ready = weakref.WeakKeyDictionary()
+
+
+def _new_backend(connection):
+    return _BACKENDS.get(connection.dialect.name, LikeBackend)()
+
+
+def get_search_backend(connection=None):
+    """The backend serving this database (LikeBackend until the index exists)"""
+    connection = connection if connection is not None else db.session.connection()
+    engine = connection.engine
+    backend = _ready.get(engine)
+    if backend is None:
+        backend = _new_backend(connection)
+        if not isinstance(backend, LikeBackend) and not inspect(connection).has_table(INDEX_TABLE):
+            backend = LikeBackend()
+        _ready[engine] = backend
+    return backend
+
+
+def ensure_search_index(connection):
+    """Create and fill the index if it is missing; returns the trees indexed"""
+    backend = _new_backend(connection)
+    try:
+        created = backend.create(connection)
+    except Exception as e:
+        # e.g. SQLite compiled without FTS5
+        logger.warning(f"Search index unavailable, falling back to LIKE search: {e}")
+        _ready[connection.engine] = LikeBackend()
+        return 0
+    indexed = backend.rebuild(connection) if created else 0
+    _ready[connection.engine] = backend
+    return indexed
+
+
+def refresh_search_index(tree_ids, connection=None):
+    """Re-index the given trees in the current transaction"""
+    tree_ids = sorted({tree_id for tree_id in tree_ids if tree_id is not None})
+    if not tree_ids:
+        return
+    connection = connection if connection is not None else db.session.connection()
+    get_search_backend(connection).refresh(connection, tree_ids)
+
+
+def prune_search_index(connection=None):
+    """Drop index rows of trees deleted with bulk SQL"""
+    connection = connection if connection is not None else db.session.connection()
+    return get_search_backend(connection).prune(connection)
+
+
+def rebuild_search_index():
+    """Re-index every tree; creates the index if needed.  Commits."""
+    connection = db.session.connection()
+    ensure_search_index(connection)
+    indexed = get_search_backend(connection).rebuild(connection)
+    db.session.commit()
+    logger.info(f"Rebuilt search index with {indexed} trees")
+    return indexed
+
+
+def _life_days(dialect_name, reference_date):
+    """SQL for Tree.get_actual_life_days() at reference_date"""
+    reference = literal(reference_date, db.DateTime)
+    planted = func.coalesce(Tree.planted_date, Tree.created_at)
+    if dialect_name == 'postgresql':
+        days = cast(extract('day', reference - planted), Integer)
+        clamp = func.greatest
+    else:
+        days = cast(func.julianday(reference) - func.julianday(planted), Integer)
+        clamp = func.max
+    return clamp(0, days - func.coalesce(Tree.total_paused_days, 0) + func.coalesce(Tree.life_day_offset, 0))
+
+
+def _age_bucket(life_days):
+    return case(*[(life_days < limit, name) for name, limit in AGE_BUCKETS if limit is not None],
+                else_=AGE_BUCKETS[-1][0])
+
+
+def search_trees(user_id, query='', farm_id=None, dome_id=None, plant_type=None, age=None,
+                 limit=50, offset=0, reference_date=None):
+    """One page of a user's trees matching ``query`` and the filters, with facets.
+
+    Returns ``{'total', 'backend', 'trees': [...], 'facets': {...}}``.  An empty
+    query lists every tree that passes the filters.
+    """
+    if age is not None and age not in dict(AGE_BUCKETS):
+        raise ValueError(f"Unknown age bucket: {age}")
+    reference_date = reference_date or datetime.utcnow()
+    connection = db.session.connection()
+    backend = get_search_backend(connection)
+    life_days = _life_days(connection.dialect.name, reference_date).label('life_days')
+    age_bucket = _age_bucket(life_days).label('age')
+
+    terms = search_terms(query)
+    matches = None
+    if terms:
+        sql, params = backend.match(terms)
+        matches = text(sql).bindparams(**params).columns(tree_id=Integer, score=Float).subquery('matches')
+
+    def base(*columns):
+        q = db.session.query(*columns).select_from(Tree).join(Dome, Dome.id == Tree.dome_id)
+        if matches is not None:
+            q = q.join(matches, matches.c.tree_id == Tree.id)
+        return q.filter(Tree.user_id == user_id)
+
+    filters = {
+        'farm': Dome.farm_id == farm_id if farm_id is not None else None,
+        'dome': Tree.dome_id == dome_id if dome_id is not None else None,
+        'plant_type': Tree.plant_type == plant_type if plant_type else None,
+        'age': _age_bucket(life_days) == age if age else None,
+    }
+
+    def filtered(q, skip=None):
+        for name, condition in filters.items():
+            if condition is not None and name != skip:
+                q = q.filter(condition)
+        return q
+
+    score = matches.c.score if matches is not None else literal(0.0, Float)
+    rows = filtered(base(
+        Tree.id, Tree.name, Tree.breed, Tree.plant_type, Tree.internal_row, Tree.internal_col,
+        Tree.dome_id, Dome.name.label('dome_name'), Dome.farm_id, life_days, age_bucket,
+        score.label('score')
+    )).order_by(score.desc(), Tree.id).limit(min(limit, MAX_RESULTS)).offset(offset).all()
+    total = filtered(base(func.count(Tree.id))).scalar() or 0
+
+    facets = {}
+    farm_rows = filtered(base(Dome.farm_id, func.count(Tree.id)), skip='farm').group_by(Dome.farm_id).all()
+    farm_ids = {value for value, _ in farm_rows} | {row.farm_id for row in rows}
+    farm_names = dict(db.session.query(Farm.id, Farm.name).filter(Farm.id.in_(farm_ids - {None})).all())
+    facets['farm'] = [{'id': value, 'name': farm_names.get(value), 'count': count}
+                      for value, count in farm_rows]
+    facets['dome'] = [{'id': value, 'name': name, 'count': count} for value, name, count in filtered(
+        base(Tree.dome_id, Dome.name, func.count(Tree.id)), skip='dome'
+    ).group_by(Tree.dome_id, Dome.name).all()]
+    facets['plant_type'] = [{'value': value, 'count': count} for value, count in filtered(
+        base(Tree.plant_type, func.count(Tree.id)), skip='plant_type'
+    ).group_by(Tree.plant_type).all()]
+    age_counts = dict(filtered(base(age_bucket, func.count(Tree.id)), skip='age').group_by(age_bucket).all())
+    facets['age'] = [{'value': name, 'count': age_counts[name]} for name, _ in AGE_BUCKETS if name in age_counts]
+    for name in ('farm', 'dome', 'plant_type'):
+        facets[name].sort(key=lambda entry: -entry['count'])
+
+    return {
+        'total': total,
+        'backend': backend.name,
+        'trees': [{
+            'id': row.id,
+            'name': row.name,
+            'breed': row.breed,
+            'plant_type': row.plant_type,
+            'internal_row': row.internal_row,
+            'internal_col': row.internal_col,
+            'dome_id': row.dome_id,
+            'dome_name': row.dome_name,
+            'farm_id': row.farm_id,
+            'farm_name': farm_names.get(row.farm_id),
+            'life_days': row.life_days,
+            'age': row.age,
+            'score': round(row.score or 0.0, 4),
+        } for row in rows],
+        'facets': facets,
+    }
+
+
+def _indexed_change(tree, session):
+    if tree in session.new or tree in session.deleted:
+        return True
+    attrs = inspect(tree).attrs
+    return any(attrs[name].history.has_changes() for name in INDEXED_COLUMNS + ('deleted_at',))
+
+
+def _after_flush(session, flush_context):
+    tree_ids = [
+        inspect(obj).dict.get('id')
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+        if isinstance(obj, Tree) and _indexed_change(obj, session)
+    ]
+    if not tree_ids:
+        return
+    refresh_search_index(tree_ids, connection=session.connection())
+
+
+def register_search_listeners(session=None):
+    """Re-index trees changed by every flush of the given (scoped) session"""
+    target = session if session is not None else db.session
+    if not event.contains(target, 'after_flush', _after_flush):
+        event.listen(target, 'after_flush', _after_flush)
+
+
+def register_search_commands(app):
+    """``flask rebuild-search-index``"""
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Re-index every tree for search."""
+        click.echo(f"Indexed {rebuild_search_index()} trees")
@@ -0,0 +1,272 @@
+"""Optional server-side Flask sessions.
+
+By default Flask keeps the whole session in a signed cookie.  With
+Flask-Login's strong protection and a permanent session, that means the user
+id, identifier hash, freshness flag and any farm/clipboard state travel with
+every request.  ``SESSION_BACKEND`` moves the data to the server, and the
+cookie only carries a random session id:
+
+``cookie`` (default)
+    Flask's signed cookie sessions, unchanged.
+``sql``
+    The ``server_session`` table in the app database (SQLite or PostgreSQL),
+    created by the schema migration (version 6).
+``filesystem``
+    One file per session under ``SESSION_FILE_DIR`` (default:
+    ``<instance>/sessions``), written atomically.
+
+A session is only written when it changes, or when a permanent session has
+used up half of its lifetime.  Unchanged requests cost one lookup and send
+no ``Set-Cookie``.  The id changes at login and logout (a change of
+``_user_id``) to prevent session fixation.  Expired sessions are purged
+from time to time.
+"""
+from datetime import datetime
+import logging
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from sqlalchemy import delete, insert, select, update
+from werkzeug.datastructures import CallbackDict
+
+from models import db, ServerSession
+
+logger = logging.getLogger(__name__)
+
+SESSION_BACKENDS = ('cookie', 'sql', 'filesystem')
+SESSION_ID_BYTES = 32
+PURGE_INTERVAL = 3600
+
+_SESSION_ID = re.compile(r'^[A-Za-z0-9_-]{43}$')
+
+
+class StoredSession(CallbackDict, SessionMixin):
+    """Session dict whose data lives in a session store"""
+
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(session):
+            session.modified = True
+            session.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = sid is None
+        self.expires_at = expires_at
+        self.modified = False
+        self.initial_user_id = super().get('_user_id')
+        self.accessed = False
+
+    # Reads mark the session accessed, so the response varies on Cookie
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+
+class SqlSessionStore:
+    """Sessions in the server_session table, written outside the request's ORM session"""
+
+    table = ServerSession.__table__
+
+    def load(self, sid):
+        with db.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table.c.data, self.table.c.expires_at).where(self.table.c.id == sid)
+            ).first()
+        if row is None or row.expires_at <= datetime.utcnow():
+            return None
+        return row.data, row.expires_at
+
+    def save(self, sid, data, expires_at):
+        with db.engine.begin() as conn:
+            updated = conn.execute(
+                update(self.table).where(self.table.c.id == sid).values(data=data, expires_at=expires_at)
+            ).rowcount
+            if not updated:
+                conn.execute(insert(self.table).values(id=sid, data=data, expires_at=expires_at))
+
+    def delete(self, sid):
+        with db.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.id == sid))
+
+    def purge_expired(self):
+        with db.engine.begin() as conn:
+            return conn.execute(
+                delete(self.table).where(self.table.c.expires_at <= datetime.utcnow())
+            ).rowcount
+
+
+class FileSessionStore:
+    """One file per session: the expiry timestamp on the first line, then the data"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid):
+        return os.path.join(self.directory, sid)
+
+    def _read(self, path):
+        with open(path, encoding='utf-8') as handle:
+            expires, _, data = handle.read().partition('\n')
+        return data, datetime.utcfromtimestamp(float(expires))
+
+    def load(self, sid):
+        try:
+            data, expires_at = self._read(self._path(sid))
+        except (OSError, ValueError):
+            return None
+        if expires_at <= datetime.utcnow():
+            return None
+        return data, expires_at
+
+    def save(self, sid, data, expires_at):
+        expires = (expires_at - datetime(1970, 1, 1)).total_seconds()
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as output:
+                output.write(f"{expires}\n{data}")
+            os.replace(temp_path, self._path(sid))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def delete(self, sid):
+        try:
+            os.remove(self._path(sid))
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self):
+        purged = 0
+        now = datetime.utcnow()
+        for name in os.listdir(self.directory):
+            if not _SESSION_ID.match(name):
+                continue
+            path = self._path(name)
+            try:
+                if self._read(path)[1] <= now:
+                    os.remove(path)
+                    purged += 1
+            except (OSError, ValueError):
+                continue
+        return purged
+
+
+class ServerSessionInterface(SessionInterface):
+    """Flask session interface keeping session data in a store"""
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, purge_interval=PURGE_INTERVAL):
+        self.store = store
+        self.purge_interval = purge_interval
+        self._last_purge = time.monotonic()
+        self._purge_lock = threading.Lock()
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and _SESSION_ID.match(sid):
+            try:
+                record = self.store.load(sid)
+                if record is not None:
+                    data, expires_at = record
+                    return StoredSession(self.serializer.loads(data), sid=sid, expires_at=expires_at)
+            except Exception as e:
+                logger.warning(f"Could not load session: {e}")
+        return StoredSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # Like Flask's cookie sessions: any response that read the session is per user
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            # Emptied (e.g. logout with nothing else stored): forget it entirely
+            if session.sid is not None and session.modified:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.sid is not None and session.get('_user_id') != session.initial_user_id:
+            # Login or logout: a new id, so an id set before login is worthless afterwards
+            self.store.delete(session.sid)
+            session.sid = None
+
+        now = datetime.utcnow()
+        # Non-permanent sessions end with the browser, but the server copy still expires
+        lifetime = app.permanent_session_lifetime
+        refresh_due = (session.permanent and self.should_set_cookie(app, session) and
+                       (session.expires_at is None or session.expires_at - now < lifetime / 2))
+        if session.sid is not None and not session.modified and not refresh_due:
+            return
+
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(SESSION_ID_BYTES)
+        session.expires_at = now + lifetime
+        self.store.save(session.sid, self.serializer.dumps(dict(session)), session.expires_at)
+
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
+        self._maybe_purge()
+
+    def _maybe_purge(self):
+        if time.monotonic() - self._last_purge < self.purge_interval:
+            return
+        if not self._purge_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_purge = time.monotonic()
+            purged = self.store.purge_expired()
+            if purged:
+                logger.info(f"Purged {purged} expired sessions")
+        except Exception as e:
+            logger.warning(f"Session purge failed: {e}")
+        finally:
+            self._purge_lock.release()
+
+
+def init_session_store(app):
+    """Install the server-side session interface chosen by SESSION_BACKEND"""
+    backend = (app.config.get('SESSION_BACKEND') or 'cookie').lower()
+    if backend not in SESSION_BACKENDS:
+        print(f"⚠️ Unknown SESSION_BACKEND '{backend}', keeping cookie sessions")
+        return None
+    if backend == 'cookie':
+        return None
+
+    if backend == 'sql':
+        store = SqlSessionStore()
+    else:
+        store = FileSessionStore(app.config.get('SESSION_FILE_DIR') or os.path.join(app.instance_path, 'sessions'))
+
+    app.session_interface = ServerSessionInterface(store)
+    print(f"🍪 Server-side sessions: {backend}")
+    return app.session_interface
@@ -0,0 +1,188 @@
+"""Soft deletion of trees with a batched background purge.
+
+User-facing tree deletes only stamp ``Tree.deleted_at`` with one indexed
+UPDATE.  Every ORM SELECT on the registered session gets a
+``deleted_at IS NULL`` criterion (served by the partial indexes on
+``tree``), so tombstoned trees disappear from grids, counts and position
+checks immediately.
+
+The relationship cleanup that used to run inside the request - detaching
+cuttings, dropping plant relationships, drag/regular area memberships and
+lineage rows - is done later by ``purge_deleted_trees`` in id-ordered
+batches from the scheduler.  Two things cannot wait for it: the mothers'
+cached ``cutting_count`` is decremented, and the tombstoned trees' lineage
+closure rows (plus the paths of cuttings that ran through them) are deleted,
+so descendant counts and generations stop including them at once.
+
+Pass ``execution_options(include_deleted=True)`` to a query to see tombstones.
+"""
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import bindparam, event, text, update
+from sqlalchemy.orm import with_loader_criteria
+import logging
+
+from models import db, Tree
+from services.deletion import LINEAGE_CLEANUP_SQL
+from services.dome_versions import bump_dome_versions
+from services.lineage import adjust_cutting_count
+from services.search import prune_search_index, refresh_search_index
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 500
+
+_TOMBSTONED_LINEAGE_SQL = text(
+    LINEAGE_CLEANUP_SQL.format(trees="SELECT id FROM tree WHERE id IN :tree_ids")
+).bindparams(bindparam('tree_ids', expanding=True))
+
+_BATCH_SQL = text("""
+    SELECT id FROM tree
+    WHERE deleted_at IS NOT NULL AND deleted_at <= :cutoff
+    ORDER BY id
+    LIMIT :batch_size
+""")
+
+# The batch is the lowest N tombstone ids, so its id range selects exactly those trees
+_BATCH_TREES = ("SELECT id FROM tree WHERE deleted_at IS NOT NULL AND deleted_at <= :cutoff "
+                "AND id BETWEEN :first_id AND :last_id")
+
+# (stat key, statement) in dependency order; {trees} selects the batch
+_PURGE_STEPS = [
+    ('lineage', LINEAGE_CLEANUP_SQL),
+    (
+        'mother_counts_updated',
+        """UPDATE tree
+           SET cutting_count = (
+               SELECT COUNT(*) FROM tree c
+               WHERE c.mother_plant_id = tree.id AND c.deleted_at IS NULL
+           )
+           WHERE id NOT IN ({trees})
+             AND id IN (SELECT mother_plant_id FROM tree WHERE id IN ({trees}))""",
+    ),
+    (
+        'cutting_trees_updated',
+        """UPDATE tree
+           SET mother_plant_id = NULL,
+               plant_type = 'independent',
+               cutting_notes = COALESCE(cutting_notes, '') || :deleted_note,
+               updated_at = :now
+           WHERE mother_plant_id IN ({trees})
+             AND id NOT IN ({trees})""",
+    ),
+    (
+        'plant_relationships_deleted',
+        """DELETE FROM plant_relationship
+           WHERE mother_tree_id IN ({trees}) OR cutting_tree_id IN ({trees})""",
+    ),
+    ('drag_areas_updated', "DELETE FROM drag_area_tree WHERE tree_id IN ({trees})"),
+    ('regular_areas_updated', "DELETE FROM regular_area_trees WHERE tree_id IN ({trees})"),
+    ('trees_purged', "DELETE FROM tree WHERE id IN ({trees})"),
+]
+
+
+def _filter_tombstones(execute_state):
+    if (execute_state.is_select
+            and not execute_state.is_column_load
+            and not execute_state.execution_options.get('include_deleted', False)):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(Tree, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+
+def register_soft_delete_filter(session=None):
+    """Hide tombstoned trees from every ORM SELECT on the given (scoped) session"""
+    target = session if session is not None else db.session
+    if not event.contains(target, 'do_orm_execute', _filter_tombstones):
+        event.listen(target, 'do_orm_execute', _filter_tombstones)
+
+
+def soft_delete_trees(user_id, *criteria):
+    """Tombstone the user's live trees matching ``criteria`` with one UPDATE.
+
+    Returns the affected rows (id, name, dome_id, internal_row, internal_col,
+    cutting_count, mother_plant_id), after bumping the change version of
+    their domes, decrementing the cutting counts of surviving mothers and
+    dropping the trees from the lineage closure.  The caller commits.
+    """
+    statement = (
+        update(Tree)
+        .where(Tree.user_id == user_id, Tree.deleted_at.is_(None), *criteria)
+        .values(deleted_at=datetime.utcnow())
+        .returning(Tree.id, Tree.name, Tree.dome_id, Tree.internal_row,
+                   Tree.internal_col, Tree.cutting_count, Tree.mother_plant_id)
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.session.execute(statement).all()
+
+    # Cached counts cover live cuttings only, like the lineage hooks keep them
+    deleted_ids = {row.id for row in rows}
+    lost_cuttings = Counter(row.mother_plant_id for row in rows
+                            if row.mother_plant_id is not None and row.mother_plant_id not in deleted_ids)
+    if lost_cuttings:
+        connection = db.session.connection()
+        for mother_id, count in lost_cuttings.items():
+            adjust_cutting_count(connection, mother_id, -count)
+            mother = db.session.identity_map.get(db.session.identity_key(Tree, mother_id))
+            if mother is not None:
+                db.session.expire(mother, ['cutting_count'])
+
+    # Their cuttings lose these ancestors now rather than at the purge
+    tree_ids = sorted(deleted_ids)
+    for start in range(0, len(tree_ids), PURGE_BATCH_SIZE):
+        db.session.execute(_TOMBSTONED_LINEAGE_SQL, {'tree_ids': tree_ids[start:start + PURGE_BATCH_SIZE]})
+
+    bump_dome_versions({row.dome_id for row in rows}, {row.id for row in rows})
+    refresh_search_index(row.id for row in rows)
+    return rows
+
+
+def purge_deleted_trees(batch_size=PURGE_BATCH_SIZE, cutoff=None, max_batches=None):
+    """Hard-delete tombstoned trees and their relationships, one batch per transaction.
+
+    Only trees tombstoned at or before ``cutoff`` (default: now) are purged.
+    Returns accumulated per-step counts plus the number of batches run.
+    """
+    cutoff = cutoff or datetime.utcnow()
+    totals = {key: 0 for key, _ in _PURGE_STEPS}
+    totals['batches'] = 0
+
+    while max_batches is None or totals['batches'] < max_batches:
+        tree_ids = [row[0] for row in db.session.execute(
+            _BATCH_SQL, {'cutoff': cutoff, 'batch_size': batch_size}
+        ).fetchall()]
+        if not tree_ids:
+            break
+
+        params = {
+            'cutoff': cutoff,
+            'first_id': tree_ids[0],
+            'last_id': tree_ids[-1],
+            'now': datetime.utcnow(),
+            'deleted_note': f" [Mother tree was deleted on {datetime.utcnow().strftime('%Y-%m-%d')}]"
+        }
+        try:
+            # Cuttings in other domes lose their mother and get a note
+            bump_dome_versions(tree_ids=tree_ids)
+            cutting_ids = [row[0] for row in db.session.execute(
+                text(f"SELECT id FROM tree WHERE mother_plant_id IN ({_BATCH_TREES})"), params
+            ).fetchall()]
+            for key, sql in _PURGE_STEPS:
+                totals[key] += db.session.execute(
+                    text(sql.format(trees=_BATCH_TREES)), params
+                ).rowcount or 0
+            refresh_search_index(tree_ids + cutting_ids)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        totals['batches'] += 1
+
+    # Trees deleted with their whole dome or farm leave search rows behind
+    totals['search_rows_pruned'] = prune_search_index() or 0
+    db.session.commit()
+
+    if totals['batches']:
+        db.session.expire_all()
+        logger.info(f"Purged tombstoned trees: {totals}")
+    return totals
@@ -0,0 +1,218 @@
+"""Heterogeneous batch mutations of the trees in one dome.
+
+A batch is a list of operations applied in order:
+
+* ``{"op": "move", "tree_id": 1, "row": 2, "col": 3}``
+* ``{"op": "swap", "tree_id": 1, "other_id": 2}``
+* ``{"op": "update", "tree_id": 1, "fields": {"name": "...", "breed": "..."}}``
+* ``{"op": "delete", "tree_id": 1}``
+
+The whole batch is first simulated against a ``DomeOccupancy`` map built
+with one query, so a move may target a cell vacated earlier in the same
+batch.  If any operation is invalid nothing is written.  Otherwise the net
+changes are written with executemany-style bulk UPDATEs (one per column set)
+and a single soft-delete UPDATE, all in one transaction.
+"""
+from datetime import datetime
+from sqlalchemy import update
+
+from models import db, Tree
+from services.breeds import breed_ids_for
+from services.dome_versions import bump_dome_versions
+from services.occupancy import DomeOccupancy
+from services.search import INDEXED_COLUMNS, refresh_search_index
+from services.soft_delete import soft_delete_trees
+
+MAX_BATCH_OPERATIONS = 1000
+
+# Columns a batch "update" operation may change, with the type their values must have
+BATCH_UPDATE_FIELDS = {
+    'name': str,
+    'breed': str,
+    'info': str,
+    'cutting_notes': str,
+    'life_days': int,
+    'life_day_offset': int,
+    'image_url': str,
+}
+
+BATCH_OPERATIONS = ('move', 'swap', 'update', 'delete')
+
+
+class BatchValidationError(Exception):
+    """Raised with per-operation errors when a batch cannot be applied"""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid operation(s)")
+        self.errors = errors
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _field_error(field, value):
+    """Why a value cannot be written to a batch update field, or None"""
+    expected = BATCH_UPDATE_FIELDS[field]
+    if expected is int:
+        # bool is an int subclass, but true/false is never a day count
+        if not isinstance(value, int) or isinstance(value, bool):
+            return f'{field} must be an integer'
+        return None
+    if value is None and Tree.__table__.c[field].nullable:
+        return None
+    if not isinstance(value, str):
+        return f'{field} must be a string'
+    max_length = getattr(Tree.__table__.c[field].type, 'length', None)
+    if max_length and len(value) > max_length:
+        return f'{field} is limited to {max_length} characters'
+    return None
+
+
+def _plan(dome, operations, occupancy):
+    """Simulate the batch; returns (moved, updated, deleted) or raises BatchValidationError"""
+    errors = []
+    original = dict(occupancy.positions)
+    updated = {}
+    deleted = set()
+
+    def fail(index, operation, message):
+        errors.append({'index': index, 'op': operation.get('op'), 'tree_id': operation.get('tree_id'), 'error': message})
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            errors.append({'index': index, 'op': None, 'tree_id': None, 'error': 'Operation must be an object'})
+            continue
+        op = operation.get('op')
+        tree_id = _as_int(operation.get('tree_id'))
+        if op not in BATCH_OPERATIONS:
+            fail(index, operation, f"Unknown operation '{op}'")
+            continue
+        if tree_id is None or tree_id not in occupancy:
+            fail(index, operation, f"Tree {operation.get('tree_id')} not found in dome {dome.id}")
+            continue
+
+        if op == 'move':
+            row, col = _as_int(operation.get('row')), _as_int(operation.get('col'))
+            if row is None or col is None:
+                fail(index, operation, 'row and col must be integers')
+            elif not occupancy.in_bounds(row, col):
+                fail(index, operation, f'Position ({row}, {col}) is outside dome bounds ({dome.internal_rows}x{dome.internal_cols})')
+            elif occupancy.positions[tree_id] != (row, col) and not occupancy.is_free(row, col):
+                fail(index, operation, f'Position ({row}, {col}) is occupied')
+            else:
+                occupancy.move(tree_id, row, col)
+
+        elif op == 'swap':
+            other_id = _as_int(operation.get('other_id'))
+            if other_id is None or other_id not in occupancy:
+                fail(index, operation, f"Tree {operation.get('other_id')} not found in dome {dome.id}")
+            elif other_id == tree_id:
+                fail(index, operation, 'Cannot swap tree with itself')
+            else:
+                first, second = occupancy.positions[tree_id], occupancy.positions[other_id]
+                occupancy.move(tree_id, *second)
+                occupancy.move(other_id, *first)
+
+        elif op == 'update':
+            fields = operation.get('fields')
+            if not isinstance(fields, dict) or not fields:
+                fail(index, operation, 'fields must be a non-empty object')
+                continue
+            invalid = [field for field in fields if field not in BATCH_UPDATE_FIELDS]
+            if invalid:
+                fail(index, operation, f"Fields not allowed: {', '.join(sorted(invalid))}")
+                continue
+            value_errors = [error for error in (_field_error(field, value) for field, value in fields.items())
+                            if error]
+            if value_errors:
+                fail(index, operation, '; '.join(value_errors))
+            elif 'name' in fields and not fields['name'].strip():
+                fail(index, operation, 'Tree name cannot be empty')
+            else:
+                updated.setdefault(tree_id, {}).update(fields)
+
+        elif op == 'delete':
+            occupancy.remove(tree_id)
+            deleted.add(tree_id)
+            updated.pop(tree_id, None)
+
+    if errors:
+        raise BatchValidationError(errors)
+
+    moved = {
+        tree_id: (original[tree_id], position)
+        for tree_id, position in occupancy.positions.items()
+        if position != original[tree_id]
+    }
+    return moved, updated, deleted
+
+
+def apply_tree_batch(dome, user_id, operations):
+    """Validate and apply a batch of operations to a dome's trees.
+
+    Returns a delta ``{'moved': [...], 'updated': [...], 'deleted': [...]}``.
+    Raises ValueError for a malformed batch and BatchValidationError when any
+    operation is invalid; in both cases nothing is written.  Commits on success.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise ValueError('operations must be a non-empty array')
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValueError(f'A batch is limited to {MAX_BATCH_OPERATIONS} operations')
+
+    rows = db.session.query(Tree.id, Tree.internal_row, Tree.internal_col, Tree.name).filter(
+        Tree.dome_id == dome.id,
+        Tree.user_id == user_id
+    ).all()
+    occupancy = DomeOccupancy(dome.internal_rows, dome.internal_cols,
+                              [(row.id, row.internal_row, row.internal_col) for row in rows])
+    names = {row.id: row.name for row in rows}
+
+    moved, updated, deleted = _plan(dome, operations, occupancy)
+    now = datetime.utcnow()
+
+    try:
+        if moved:
+            db.session.execute(update(Tree), [
+                {'id': tree_id, 'internal_row': new[0], 'internal_col': new[1], 'updated_at': now}
+                for tree_id, (old, new) in moved.items()
+            ])
+
+        # One executemany per distinct column set
+        by_columns = {}
+        breed_ids = breed_ids_for(db.session.connection(), user_id, dome.farm_id,
+                                  {fields.get('breed') for fields in updated.values()})
+        for tree_id, fields in updated.items():
+            params = dict(fields, id=tree_id, updated_at=now)
+            if 'breed' in fields:
+                params['breed_id'] = breed_ids.get(fields['breed'])
+            by_columns.setdefault(tuple(sorted(params)), []).append(params)
+        for params in by_columns.values():
+            db.session.execute(update(Tree), params)
+
+        if deleted:
+            soft_delete_trees(user_id, Tree.id.in_(deleted), Tree.dome_id == dome.id)
+
+        # Bulk UPDATEs skip the flush events; renamed trees show up in their cuttings' domes
+        bump_dome_versions([dome.id], updated)
+        refresh_search_index(tree_id for tree_id, fields in updated.items()
+                             if any(column in fields for column in INDEXED_COLUMNS))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        'moved': [
+            {'id': tree_id, 'name': names.get(tree_id), 'old_row': old[0], 'old_col': old[1],
+             'internal_row': new[0], 'internal_col': new[1]}
+            for tree_id, (old, new) in sorted(moved.items())
+        ],
+        'updated': [
+            {'id': tree_id, 'fields': fields} for tree_id, fields in sorted(updated.items())
+        ],
+        'deleted': sorted(deleted)
+    }
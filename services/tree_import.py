@@ -0,0 +1,433 @@
+"""Bulk planting of trees from a CSV file.
+
+Each CSV row plants one tree: ``dome, row, col, name`` and optionally
+``breed, plant_type, mother, info``.  ``dome`` is a dome id or a unique dome
+name; ``mother`` is an existing tree id, the name of another row in the same
+file, or the unique name of an existing tree.
+
+The whole file is validated in memory first:
+* positions run against one ``DomeOccupancy`` map per dome, including
+  rows placed earlier in the file;
+* mother references and lineage are checked (no cycles, bounded depth).
+
+If any row is invalid, nothing is written and every error is reported with
+its line number.  Otherwise trees are inserted one generation at a time with
+multi-row INSERTs, one transaction per dome.  Domes whose rows name mothers
+planted in another dome of the file are ordered after it; domes that depend
+on each other share one transaction.
+
+Bulk INSERTs skip the session events, so lineage closure rows, cutting
+counts, plant relationships, breed links, dome versions and the search
+index are all written explicitly in each transaction.
+"""
+from collections import Counter
+import csv
+from datetime import datetime
+import io
+import logging
+
+import click
+from sqlalchemy import insert, text
+
+from models import db, Dome, PlantRelationship, Tree, User
+from services.breeds import breed_ids_for
+from services.dome_versions import bump_dome_versions
+from services.lineage import MAX_LINEAGE_DEPTH, link_new_trees
+from services.occupancy import DomeOccupancy
+from services.search import refresh_search_index
+
+logger = logging.getLogger(__name__)
+
+MAX_IMPORT_ROWS = 20000
+IMPORT_COLUMNS = ('dome', 'row', 'col', 'name', 'breed', 'plant_type', 'mother', 'info')
+REQUIRED_COLUMNS = ('dome', 'row', 'col', 'name')
+PLANT_TYPES = ('mother', 'cutting', 'independent')
+MAX_NAME_LENGTH = 100
+
+# Accepted spellings of the header names
+_COLUMN_ALIASES = {
+    'dome_id': 'dome', 'dome_name': 'dome',
+    'internal_row': 'row', 'internal_col': 'col', 'column': 'col',
+    'mother_ref': 'mother', 'mother_id': 'mother', 'mother_name': 'mother',
+    'type': 'plant_type',
+}
+
+_ADD_CUTTINGS_SQL = text(
+    "UPDATE tree SET cutting_count = COALESCE(cutting_count, 0) + :delta WHERE id = :mother_id"
+)
+
+
+class ImportValidationError(Exception):
+    """Raised with per-row errors when an import cannot be applied"""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid row(s)")
+        self.errors = errors
+
+
+def parse_import_csv(content):
+    """[(line number, {column: value})] from CSV text; raises ImportValidationError on a bad header"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    reader = csv.reader(io.StringIO(content.lstrip('\ufeff')))
+    header = next(reader, None)
+    if not header:
+        raise ImportValidationError([{'line': 1, 'error': 'The file is empty'}])
+
+    columns = []
+    for name in header:
+        name = name.strip().lower().replace(' ', '_')
+        columns.append(_COLUMN_ALIASES.get(name, name))
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    unknown = [name for name in columns if name and name not in IMPORT_COLUMNS]
+    if missing or unknown:
+        problems = []
+        if missing:
+            problems.append(f"missing columns: {', '.join(missing)}")
+        if unknown:
+            problems.append(f"unknown columns: {', '.join(unknown)}")
+        raise ImportValidationError([{'line': 1, 'error': '; '.join(problems).capitalize()}])
+
+    rows = []
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        rows.append((reader.line_num, {
+            column: value.strip() for column, value in zip(columns, values) if column
+        }))
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise ImportValidationError([{
+                'line': reader.line_num, 'error': f'An import is limited to {MAX_IMPORT_ROWS} rows'
+            }])
+    if not rows:
+        raise ImportValidationError([{'line': 1, 'error': 'The file has no rows'}])
+    return rows
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def plan_import(user_id, rows, farm_id=None):
+    """Validate parsed rows; returns (planned rows, {dome id: Dome}) or raises ImportValidationError.
+
+    A planned row is a dict of Tree column values plus ``line``,
+    ``mother_id`` (an existing tree) or ``mother_index`` (another planned
+    row) and its ``generation`` within the file.
+    """
+    errors = []
+
+    def fail(line, message):
+        errors.append({'line': line, 'error': message})
+
+    domes_query = Dome.query.filter(Dome.user_id == user_id)
+    if farm_id is not None:
+        domes_query = domes_query.filter(Dome.farm_id == farm_id)
+    domes = {dome.id: dome for dome in domes_query}
+    domes_by_name = {}
+    for dome in domes.values():
+        domes_by_name.setdefault(dome.name.strip().lower(), []).append(dome)
+
+    # Rows by name, for mothers planted in the same file
+    names_in_file = {}
+    for index, (_, values) in enumerate(rows):
+        names_in_file.setdefault(values.get('name', '').lower(), []).append(index)
+
+    # Existing mothers, looked up with one query per reference kind
+    references = [values.get('mother', '') for _, values in rows]
+    mother_ids = {_as_int(ref) for ref in references if _as_int(ref) is not None}
+    mother_names = {ref for ref in references
+                    if ref and _as_int(ref) is None and ref.lower() not in names_in_file}
+    existing = {tree_id for (tree_id,) in db.session.query(Tree.id).filter(
+        Tree.user_id == user_id, Tree.id.in_(mother_ids))} if mother_ids else set()
+    existing_by_name = {}
+    if mother_names:
+        for tree_id, name in db.session.query(Tree.id, Tree.name).filter(
+                Tree.user_id == user_id, Tree.name.in_(mother_names)):
+            existing_by_name.setdefault(name, []).append(tree_id)
+
+    occupancy = {}
+    planned = []
+    for index, (line, values) in enumerate(rows):
+        dome_ref = values.get('dome', '')
+        if _as_int(dome_ref) is not None:
+            dome = domes.get(_as_int(dome_ref))
+            candidates = [dome] if dome else []
+        else:
+            candidates = domes_by_name.get(dome_ref.lower(), [])
+        if len(candidates) != 1:
+            fail(line, f"Dome '{dome_ref}' " + ('is ambiguous; use its id' if candidates else 'not found'))
+            planned.append(None)
+            continue
+        dome = candidates[0]
+
+        row, col = _as_int(values.get('row')), _as_int(values.get('col'))
+        name = values.get('name', '')
+        breed = values.get('breed') or None
+        mother_ref = values.get('mother', '')
+        plant_type = (values.get('plant_type') or ('cutting' if mother_ref else 'mother')).lower()
+
+        problems = []
+        if row is None or col is None:
+            problems.append('row and col must be integers')
+        if not name:
+            problems.append('name is required')
+        elif len(name) > MAX_NAME_LENGTH:
+            problems.append(f'name is longer than {MAX_NAME_LENGTH} characters')
+        if breed and len(breed) > MAX_NAME_LENGTH:
+            problems.append(f'breed is longer than {MAX_NAME_LENGTH} characters')
+        if plant_type not in PLANT_TYPES:
+            problems.append(f"plant_type must be one of {', '.join(PLANT_TYPES)}")
+        elif mother_ref and plant_type != 'cutting':
+            problems.append('only cuttings can have a mother')
+
+        mother_id = mother_index = None
+        if mother_ref:
+            same_file = names_in_file.get(mother_ref.lower(), [])
+            if _as_int(mother_ref) is not None:
+                mother_id = _as_int(mother_ref)
+                if mother_id not in existing:
+                    problems.append(f'mother tree {mother_id} not found')
+            elif len(same_file) == 1:
+                mother_index = same_file[0]
+                if mother_index == index:
+                    problems.append('a tree cannot be its own mother')
+            elif len(same_file) > 1:
+                problems.append(f"mother '{mother_ref}' names several rows of the file")
+            elif len(existing_by_name.get(mother_ref, [])) == 1:
+                mother_id = existing_by_name[mother_ref][0]
+            else:
+                problems.append(f"mother '{mother_ref}' " +
+                                ('names several trees; use its id' if existing_by_name.get(mother_ref) else 'not found'))
+
+        if row is not None and col is not None:
+            cells = occupancy.get(dome.id)
+            if cells is None:
+                cells = occupancy[dome.id] = DomeOccupancy.for_dome(dome)
+            if not cells.in_bounds(row, col):
+                problems.append(f'position ({row}, {col}) is outside dome {dome.name} '
+                                f'({dome.internal_rows}x{dome.internal_cols})')
+            elif not cells.is_free(row, col):
+                problems.append(f'position ({row}, {col}) in dome {dome.name} is already occupied')
+            elif not problems:
+                cells.place(('import', index), row, col)
+
+        if problems:
+            fail(line, '; '.join(problems))
+            planned.append(None)
+            continue
+        planned.append({
+            'line': line,
+            'name': name,
+            'breed': breed,
+            'plant_type': plant_type,
+            'info': values.get('info') or None,
+            'internal_row': row,
+            'internal_col': col,
+            'dome_id': dome.id,
+            'mother_id': mother_id,
+            'mother_index': mother_index,
+        })
+
+    # Lineage inside the file: generations, cycles and depth
+    for index, entry in enumerate(planned):
+        if entry is None or 'generation' in entry:
+            continue
+        chain, seen = [], set()
+        current = index
+        while True:
+            node = planned[current]
+            if node is None or 'generation' in node:
+                base = -1 if node is None else node['generation']
+                break
+            if current in seen:
+                base = None
+                break
+            chain.append(current)
+            seen.add(current)
+            if node['mother_index'] is None:
+                base = -1
+                break
+            current = node['mother_index']
+        for depth, member in enumerate(reversed(chain)):
+            if base is None:
+                planned[member]['generation'] = None
+            else:
+                planned[member]['generation'] = base + depth + 1
+
+    for entry in planned:
+        if entry is None:
+            continue
+        mother = planned[entry['mother_index']] if entry['mother_index'] is not None else None
+        if entry['generation'] is None:
+            fail(entry['line'], 'mother references form a cycle')
+        elif entry['mother_index'] is not None and mother is None:
+            fail(entry['line'], 'mother row is invalid')
+        elif entry['generation'] > MAX_LINEAGE_DEPTH:
+            fail(entry['line'], f'lineage is deeper than {MAX_LINEAGE_DEPTH} generations')
+
+    if errors:
+        raise ImportValidationError(sorted(errors, key=lambda error: error['line']))
+    return planned, {dome_id: domes[dome_id] for dome_id in occupancy}
+
+
+def _transaction_groups(planned, domes):
+    """Dome id groups in commit order: a dome after the domes holding its mothers"""
+    depends = {dome_id: set() for dome_id in domes}
+    for entry in planned:
+        if entry['mother_index'] is not None:
+            mother_dome = planned[entry['mother_index']]['dome_id']
+            if mother_dome != entry['dome_id']:
+                depends[entry['dome_id']].add(mother_dome)
+
+    groups = []
+    remaining = dict(depends)
+    while remaining:
+        ready = sorted(dome_id for dome_id, needs in remaining.items() if not needs & remaining.keys())
+        if not ready:
+            # Domes planting each other's mothers are written together
+            groups.append(sorted(remaining))
+            break
+        for dome_id in ready:
+            groups.append([dome_id])
+            del remaining[dome_id]
+    return groups
+
+
+def _write_group(user_id, planned, indexes, domes, tree_ids):
+    """Insert one transaction's rows generation by generation; fills tree_ids"""
+    connection = db.session.connection()
+    now = datetime.utcnow()
+    breed_ids = {}
+    for dome_id in {planned[index]['dome_id'] for index in indexes}:
+        farm_id = domes[dome_id].farm_id
+        if farm_id not in breed_ids:
+            breed_ids[farm_id] = breed_ids_for(connection, user_id, farm_id, {
+                planned[index]['breed'] for index in indexes
+                if domes[planned[index]['dome_id']].farm_id == farm_id
+            })
+
+    cuttings = []
+    for generation in sorted({planned[index]['generation'] for index in indexes}):
+        level = [index for index in indexes if planned[index]['generation'] == generation]
+        params = []
+        for index in level:
+            entry = planned[index]
+            mother_id = entry['mother_id'] if entry['mother_index'] is None else tree_ids[entry['mother_index']]
+            params.append({
+                'name': entry['name'],
+                'breed': entry['breed'],
+                'breed_id': breed_ids[domes[entry['dome_id']].farm_id].get(entry['breed']),
+                'plant_type': entry['plant_type'],
+                'info': entry['info'],
+                'internal_row': entry['internal_row'],
+                'internal_col': entry['internal_col'],
+                'dome_id': entry['dome_id'],
+                'user_id': user_id,
+                'mother_plant_id': mother_id,
+                'life_days': 0,
+                'cutting_count': 0,
+                'created_at': now,
+                'updated_at': now,
+                'planted_date': now,
+            })
+        # Multi-row INSERT ... RETURNING, ids in parameter order
+        new_ids = db.session.execute(
+            insert(Tree).returning(Tree.id, sort_by_parameter_order=True), params
+        ).scalars().all()
+        for index, tree_id, values in zip(level, new_ids, params):
+            tree_ids[index] = tree_id
+            if values['mother_plant_id'] is not None:
+                cuttings.append((tree_id, values['mother_plant_id'], values['dome_id']))
+        link_new_trees(connection, new_ids)
+
+    if cuttings:
+        counts = Counter(mother_id for _, mother_id, _ in cuttings)
+        connection.execute(_ADD_CUTTINGS_SQL, [
+            {'mother_id': mother_id, 'delta': delta} for mother_id, delta in counts.items()
+        ])
+        db.session.execute(insert(PlantRelationship), [
+            {'mother_tree_id': mother_id, 'cutting_tree_id': tree_id, 'user_id': user_id,
+             'dome_id': dome_id, 'cutting_date': now}
+            for tree_id, mother_id, dome_id in cuttings
+        ])
+
+    created = [tree_ids[index] for index in indexes]
+    bump_dome_versions({planned[index]['dome_id'] for index in indexes}, created)
+    refresh_search_index(created)
+
+
+def apply_import(user_id, planned, domes):
+    """Write a validated plan, one transaction per dome (or per group of
+    interdependent domes).  Returns {'created', 'domes', 'transactions'}."""
+    tree_ids = {}
+    summary = Counter()
+    groups = _transaction_groups(planned, domes)
+    for group in groups:
+        indexes = [index for index, entry in enumerate(planned) if entry['dome_id'] in group]
+        try:
+            _write_group(user_id, planned, indexes, domes, tree_ids)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.error(f"Tree import failed in dome(s) {group}; "
+                         f"{sum(summary.values())} trees in earlier domes were committed")
+            raise
+        for index in indexes:
+            summary[planned[index]['dome_id']] += 1
+
+    # Bulk SQL changed cutting counts and lineage under any loaded trees
+    db.session.expire_all()
+    logger.info(f"Imported {len(tree_ids)} trees into {len(summary)} domes")
+    return {
+        'created': len(tree_ids),
+        'domes': [{'id': dome_id, 'name': domes[dome_id].name, 'created': count}
+                  for dome_id, count in summary.items()],
+        'transactions': len(groups),
+    }
+
+
+def import_trees(user_id, content, farm_id=None, dry_run=False):
+    """Parse, validate and (unless dry_run) write a CSV import.
+
+    Raises ImportValidationError with every row error; nothing is written then.
+    """
+    rows = parse_import_csv(content)
+    planned, domes = plan_import(user_id, rows, farm_id=farm_id)
+    if dry_run:
+        counts = Counter(entry['dome_id'] for entry in planned)
+        return {
+            'created': 0,
+            'valid_rows': len(planned),
+            'domes': [{'id': dome_id, 'name': domes[dome_id].name, 'rows': count}
+                      for dome_id, count in counts.items()],
+        }
+    return apply_import(user_id, planned, domes)
+
+
+def register_import_commands(app):
+    """``flask import-trees``"""
+
+    @app.cli.command('import-trees')
+    @click.argument('csv_file', type=click.File('rb'))
+    @click.option('--user', 'username', required=True, help='Owner of the domes being planted.')
+    @click.option('--farm-id', type=int, help='Only match dome names in this farm.')
+    @click.option('--dry-run', is_flag=True, help='Validate the file without writing.')
+    def import_trees_command(csv_file, username, farm_id, dry_run):
+        """Plant trees from a CSV of dome,row,col,name[,breed,plant_type,mother,info]."""
+        user = User.query.filter_by(username=username).first()
+        if not user:
+            raise click.ClickException(f"User '{username}' not found")
+        try:
+            result = import_trees(user.id, csv_file.read(), farm_id=farm_id, dry_run=dry_run)
+        except ImportValidationError as e:
+            for error in e.errors:
+                click.echo(f"line {error['line']}: {error['error']}", err=True)
+            raise click.ClickException(str(e))
+        for dome in result['domes']:
+            click.echo(f"{dome['name']}: {dome.get('created', dome.get('rows'))} trees")
+        click.echo(f"{'Validated' if dry_run else 'Imported'} "
+                   f"{result.get('valid_rows', result['created'])} trees")
@@ -0,0 +1,149 @@
+"""Keyset pages, field selection and NDJSON streaming for tree listings.
+
+Tree listing endpoints accept three optional query parameters on top of
+their usual behaviour:
+
+``fields=id,name,internal_row``
+    Only those keys per tree.  Each field names the Tree columns it reads,
+    and only those columns are loaded (``load_only``), so a listing without
+    ``image_url`` never pulls base64 images out of the database.
+
+``limit=N`` and ``after=<cursor>``
+    Keyset pages ordered by (dome_id, id).  The response carries
+    ``next_cursor``, which is null on the last page.  A page costs the same
+    however deep it is.
+
+``format=ndjson`` (or ``Accept: application/x-ndjson``)
+    One JSON object per line, streamed from the database in batches.  This
+    is for very large domes and for integrations.  With ``limit``/``after``
+    the stream is one page, and its last line is ``{"next_cursor": ...}``.
+
+Without them every endpoint answers exactly as it did before.
+"""
+import base64
+import json
+
+from flask import Response, stream_with_context
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only
+
+from models import Tree
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+# Columns Tree.get_actual_life_days() and the life stage read
+LIFE_DAY_COLUMNS = ('life_days', 'planted_date', 'created_at', 'total_paused_days', 'life_day_offset')
+
+
+class ListingError(ValueError):
+    """A malformed fields, limit or after parameter"""
+
+
+def tree_field(getter, *columns):
+    """A listing field: its getter and the Tree columns the getter reads"""
+    return (columns, getter)
+
+
+def wants_ndjson(request):
+    """Whether a request asked for NDJSON, by format=ndjson or its Accept header"""
+    return (request.args.get('format', '').lower() == 'ndjson' or
+            request.accept_mimetypes.best == NDJSON_MIMETYPE)
+
+
+def encode_cursor(tree):
+    return base64.urlsafe_b64encode(f"{tree.dome_id}:{tree.id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        dome_id, tree_id = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+        return int(dome_id), int(tree_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ListingError('Invalid cursor')
+
+
+class TreeListing:
+    """The fields, page and format one request asked of a tree listing"""
+
+    def __init__(self, available, fields=None, after=None, limit=None, ndjson=False):
+        self.available = available
+        self.fields = list(fields or available)
+        self.after = after
+        self.limit = limit
+        self.ndjson = ndjson
+
+    @classmethod
+    def from_request(cls, available, request):
+        """Read fields/limit/after/format from a request; raises ListingError"""
+        args = request.args
+        fields = None
+        if args.get('fields'):
+            fields = [name.strip() for name in args['fields'].split(',') if name.strip()]
+            unknown = [name for name in fields if name not in available]
+            if unknown:
+                raise ListingError(f"Unknown fields: {', '.join(unknown)}. "
+                                   f"Available: {', '.join(available)}")
+
+        limit = None
+        if args.get('limit'):
+            try:
+                limit = int(args['limit'])
+            except ValueError:
+                raise ListingError('limit must be an integer')
+            if not 1 <= limit <= MAX_PAGE_SIZE:
+                raise ListingError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+        after = decode_cursor(args['after']) if args.get('after') else None
+        return cls(available, fields, after, limit, wants_ndjson(request))
+
+    @property
+    def paginated(self):
+        return self.limit is not None or self.after is not None
+
+    def columns(self, extra=()):
+        names = {'id', 'dome_id', *extra}
+        for name in self.fields:
+            names.update(self.available[name][0])
+        return [getattr(Tree, name) for name in sorted(names)]
+
+    def apply(self, query, extra_columns=()):
+        """Load only the needed columns, in (dome_id, id) order, from the cursor on"""
+        query = query.options(load_only(*self.columns(extra_columns))).order_by(Tree.dome_id, Tree.id)
+        if self.after:
+            query = query.filter(tuple_(Tree.dome_id, Tree.id) > self.after)
+        if self.limit:
+            # One extra row tells whether another page follows
+            query = query.limit(self.limit + 1)
+        return query
+
+    def serialize(self, tree):
+        return {name: self.available[name][1](tree) for name in self.fields}
+
+    def page(self, trees):
+        """(trees of this page, cursor of the next page or None)"""
+        if self.limit and len(trees) > self.limit:
+            trees = trees[:self.limit]
+            return trees, encode_cursor(trees[-1])
+        return trees, None
+
+    def stream(self, query, extra_columns=()):
+        """NDJSON response streaming the trees of the query (one page of them when paginated)"""
+        query = self.apply(query, extra_columns).yield_per(STREAM_BATCH_SIZE)
+
+        def generate():
+            sent, next_cursor = 0, None
+            for tree in query:
+                if self.limit and sent == self.limit:
+                    # The extra row apply() asked for: another page follows
+                    next_cursor = encode_cursor(previous)
+                    break
+                yield json.dumps(self.serialize(tree), default=str) + '\n'
+                previous = tree
+                sent += 1
+            if self.paginated:
+                yield json.dumps({'next_cursor': next_cursor}) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
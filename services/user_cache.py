@@ -0,0 +1,126 @@
+"""Short-lived in-process cache behind Flask-Login's user loader.
+
+``load_user`` used to SELECT the user row on every authenticated request.
+Here the row's column values are kept per user id for ``USER_CACHE_TTL``
+seconds.  A hit is attached to the request's session with
+``merge(load=False)``: no SQL runs, yet the instance is persistent, so lazy
+relationships load and changes made through ``current_user`` are flushed
+as usual.
+
+Any ORM write to a user (profile edits, password changes and resets, login
+bookkeeping, deactivation) drops its entry at flush and again at commit.
+Invalidation is per process, so other workers can serve a changed profile
+for at most the TTL.  ``USER_CACHE_TTL=0`` turns the cache off.
+"""
+from collections import OrderedDict
+import os
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from models import db, User
+
+DEFAULT_TTL = 60
+MAX_ENTRIES = 1024
+
+
+class UserCache:
+    """LRU of detached User snapshots with a time to live"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # user id -> (expires at, snapshot)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user):
+        """Remember a loaded user's column values"""
+        if self.ttl <= 0:
+            return
+        snapshot = User(**{
+            attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+        })
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(ttl=int(os.getenv('USER_CACHE_TTL', DEFAULT_TTL)))
+
+
+def load_cached_user(user_id, cache=None):
+    """The user with this id, attached to the current session; None if missing"""
+    cache = cache or user_cache
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    snapshot = cache.get(user_id)
+    if snapshot is not None:
+        return db.session.merge(snapshot, load=False)
+    user = db.session.get(User, user_id)
+    if user is not None:
+        cache.put(user)
+    return user
+
+
+def _changed_user_ids(session):
+    user_ids = {
+        inspect(obj).dict.get('id') for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+        if isinstance(obj, User)
+    }
+    user_ids.discard(None)
+    return user_ids
+
+
+def _before_flush(session, flush_context, instances):
+    # Deleted and modified users still have their ids here
+    user_ids = _changed_user_ids(session)
+    if user_ids:
+        user_cache.invalidate(*user_ids)
+        session.info.setdefault('changed_user_ids', set()).update(user_ids)
+
+
+def _after_commit(session):
+    # A concurrent request may have cached the old row between flush and commit
+    user_ids = session.info.pop('changed_user_ids', None)
+    if user_ids:
+        user_cache.invalidate(*user_ids)
+
+
+def _after_soft_rollback(session, previous_transaction):
+    session.info.pop('changed_user_ids', None)
+
+
+def register_user_cache_listeners(session=None):
+    """Drop cached users changed by the given (scoped) session"""
+    target = session if session is not None else db.session
+    if not event.contains(target, 'before_flush', _before_flush):
+        event.listen(target, 'before_flush', _before_flush)
+        event.listen(target, 'after_commit', _after_commit)
+        event.listen(target, 'after_soft_rollback', _after_soft_rollback)
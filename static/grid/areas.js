@@ -0,0 +1,141 @@
+// ✅ NEW: Color validation function
+function ensureValidHexColor(color) {
+    if (!color || typeof color !== 'string') return '#007bff';
+    color = color.trim();
+    if (!color.startsWith('#')) color = '#' + color;
+    const hexRegex = /^#([A-Fa-f0-9]{6}|[A-Fa-f0-9]{3})$/;
+    if (hexRegex.test(color)) {
+        if (color.length === 4) {
+            color = '#' + color[1] + color[1] + color[2] + color[2] + color[3] + color[3];
+        }
+        return color;
+    }
+    return '#007bff';
+}
+window.ensureValidHexColor = ensureValidHexColor;
+
+// ✅ NEW: Build mother-cutting pairs for relationship metadata
+function buildMotherCuttingPairs(enhancedTreesData) {
+    console.log('🔗 Building mother-cutting pairs for relationship metadata...');
+    
+    const motherTrees = enhancedTreesData.filter(t => t.plant_type === 'mother');
+    const cuttingTrees = enhancedTreesData.filter(t => t.plant_type === 'cutting');
+    
+    console.log(`🔍 Found ${motherTrees.length} mothers and ${cuttingTrees.length} cuttings`);
+    
+    const pairs = [];
+    
+    // Build pairs for each cutting tree
+    cuttingTrees.forEach(cutting => {
+        if (cutting.mother_plant_id) {
+            const motherTree = motherTrees.find(m => m.id === cutting.mother_plant_id);
+            
+            const pair = {
+                cutting_original_id: cutting.id,
+                cutting_name: cutting.name,
+                cutting_plant_type: cutting.plant_type,
+                cutting_notes: cutting.cutting_notes || '',
+                mother_original_id: cutting.mother_plant_id,
+                mother_name: motherTree ? motherTree.name : `Mother Tree ${cutting.mother_plant_id}`,
+                mother_plant_type: motherTree ? motherTree.plant_type : 'mother',
+                relationship_preserved: !!motherTree, // True if mother is also being copied
+                mother_in_copy: !!motherTree,
+                cutting_position: {
+                    row: cutting.internal_row,
+                    col: cutting.internal_col,
+                    relative_row: cutting.relativeRow || cutting.relative_row || 0,
+                    relative_col: cutting.relativeCol || cutting.relative_col || 0
+                },
+                mother_position: motherTree ? {
+                    row: motherTree.internal_row,
+                    col: motherTree.internal_col,
+                    relative_row: motherTree.relativeRow || motherTree.relative_row || 0,
+                    relative_col: motherTree.relativeCol || motherTree.relative_col || 0
+                } : null
+            };
+            
+            pairs.push(pair);
+            
+            if (motherTree) {
+                console.log(`🔗 Complete relationship: cutting "${cutting.name}" -> mother "${motherTree.name}"`);
+            } else {
+                console.log(`🔗 Partial relationship: cutting "${cutting.name}" -> mother ID ${cutting.mother_plant_id} (not in copy)`);
+            }
+        }
+    });
+    
+    console.log(`✅ Built ${pairs.length} mother-cutting pairs`);
+    return pairs;
+}
+
+// Make function available globally
+window.buildMotherCuttingPairs = buildMotherCuttingPairs;
+
+// Drag Selection Box Implementation
+
+
+// Initialize drag selector when DOM is loaded
+
+
+document.addEventListener('DOMContentLoaded', function() {
+    const gridContainer = document.querySelector('.grid-container');
+    if (gridContainer) {
+        dragSelector = new DragSelector(gridContainer);
+        
+        // Add drag mode toggle button
+        addDragModeToggle();
+    }
+});
+
+function addDragModeToggle() {
+    // Add drag mode toggle button to the page
+    const toggleButton = document.createElement('button');
+    toggleButton.innerHTML = '🎯 Drag Select';
+    toggleButton.className = 'btn btn-outline-primary';
+    toggleButton.style.cssText = `
+        position: fixed;
+        top: 80px;
+        right: 20px;
+        z-index: 1000;
+    `;
+    toggleButton.onclick = function() {
+        if (dragSelector.isDragMode) {
+            dragSelector.disableDragMode();
+            this.innerHTML = '🎯 Drag Select';
+            this.className = 'btn btn-outline-primary';
+        } else {
+            dragSelector.enableDragMode();
+            this.innerHTML = '❌ Exit Drag';
+            this.className = 'btn btn-danger';
+        }
+    };
+    
+    document.body.appendChild(toggleButton);
+}
+
+// Utility function for notifications
+function showNotification(message, type = 'info') {
+    const notification = document.createElement('div');
+    notification.className = `alert alert-${type} alert-dismissible fade show`;
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        left: 50%;
+        transform: translateX(-50%);
+        z-index: 10001;
+        min-width: 300px;
+    `;
+    notification.innerHTML = `
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    
+    document.body.appendChild(notification);
+    
+    // Auto-remove after 5 seconds
+    setTimeout(() => {
+        if (notification.parentNode) {
+            notification.remove();
+        }
+    }, 5000);
+}
@@ -0,0 +1,509 @@
+// Enhanced Copy/Paste Frontend Integration
+// This enhances the existing copy/paste functionality to use backend storage
+
+// Enhanced copy function that saves to backend
+async function copyDragAreaToBackend(areaId) {
+    try {
+        console.log(`🔄 Enhanced copy: Copying drag area ${areaId} to backend`);
+        showStatus('Copying area to backend...', 'info');
+        
+        // Call the backend copy API
+        const response = await fetch(`/api/copy_drag_area_to_backend/${domeId}/${areaId}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            // Also store in localStorage for immediate use
+            localStorage.setItem('globalDragClipboard', JSON.stringify(result.clipboard_data));
+            localStorage.setItem('globalDragClipboardTimestamp', Date.now().toString());
+            
+            // Update frontend clipboard variables
+            window.dragClipboard = result.clipboard_data;
+            window.clipboardArea = result.clipboard_data;
+            
+            // Update paste button
+            if (typeof updatePasteButtonDisplay === 'function') {
+                updatePasteButtonDisplay();
+            }
+            
+            // Show success message with stats
+            const stats = result.stats;
+            const message = `✅ Copied "${result.clipboard_data.name}" to backend clipboard\n` +
+                          `📦 ${stats.trees_copied} trees, ${stats.breeds_found} breeds\n` +
+                          `🔗 ${stats.relationships_preserved} relationships preserved`;
+            
+            showStatus(message, 'success');
+            console.log('✅ Area copied to backend successfully:', result);
+            
+            return result;
+        } else {
+            throw new Error(result.error || 'Copy failed');
+        }
+        
+    } catch (error) {
+        console.error('❌ Error copying to backend:', error);
+        showStatus(`Error copying area: ${error.message}`, 'error');
+        throw error;
+    }
+}
+
+// Enhanced paste function that uses backend storage
+async function pasteDragAreaFromBackend(pasteRow, pasteCol, areaName = null) {
+    try {
+        console.log(`📋 Enhanced paste: Pasting from backend to (${pasteRow}, ${pasteCol})`);
+        showStatus('Pasting area from backend...', 'info');
+        
+        // Prepare paste data
+        const pasteData = {
+            paste_row: pasteRow,
+            paste_col: pasteCol,
+            create_trees: true
+        };
+        
+        // Add custom name if provided
+        if (areaName) {
+            pasteData.name = areaName;
+        }
+        
+        // Call the backend paste API
+        const response = await fetch(`/api/paste_drag_area_from_backend/${domeId}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(pasteData)
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            // Show success message with stats
+            const stats = result.stats;
+            let message = `✅ Pasted "${result.area.name}" successfully\n` +
+                         `🌳 ${stats.trees_created} trees created\n` +
+                         `📍 From: ${stats.source_dome}`;
+            
+            // Add relationship info if applicable
+            if (stats.relationships_created > 0) {
+                message += `\n🔗 ${stats.relationships_created} mother-cutting relationships created`;
+            }
+            if (stats.independent_cuttings_converted > 0) {
+                message += `\n🌱 ${stats.independent_cuttings_converted} cuttings converted to independent mothers`;
+            }
+            
+            showStatus(message, 'success');
+            console.log('✅ Area pasted from backend successfully:', result);
+            
+            // Refresh the grid to show the new area
+            setTimeout(() => {
+                location.reload();
+            }, 1500);
+            
+            return result;
+        } else {
+            throw new Error(result.error || 'Paste failed');
+        }
+        
+    } catch (error) {
+        console.error('❌ Error pasting from backend:', error);
+        showStatus(`Error pasting area: ${error.message}`, 'error');
+        throw error;
+    }
+}
+
+// Check clipboard status from backend
+async function getBackendClipboardStatus() {
+    try {
+        const response = await fetch('/api/get_clipboard_status');
+        const result = await response.json();
+        
+        if (result.success) {
+            return result;
+        } else {
+            console.warn('Failed to get clipboard status:', result.error);
+            return { success: true, has_clipboard: false };
+        }
+        
+    } catch (error) {
+        console.error('Error getting clipboard status:', error);
+        return { success: true, has_clipboard: false };
+    }
+}
+
+// Enhanced copy function that replaces the existing one
+function enhancedCopyDragArea(areaId) {
+    // Use the backend copy function
+    return copyDragAreaToBackend(areaId);
+}
+
+// Enhanced paste function for click-to-paste
+async function enhancedPasteDragArea(row, col) {
+    try {
+        // First check if we have clipboard data in backend
+        const clipboardStatus = await getBackendClipboardStatus();
+        
+        if (clipboardStatus.has_clipboard) {
+            // Use backend paste
+            return await pasteDragAreaFromBackend(row, col);
+        } else {
+            // Fallback to existing frontend paste if available
+            if (window.dragClipboard || window.clipboardArea) {
+                console.log('📋 Using frontend clipboard as fallback');
+                return await pasteDragArea(row, col); // Call existing function
+            } else {
+                throw new Error('No clipboard data available');
+            }
+        }
+        
+    } catch (error) {
+        console.error('❌ Enhanced paste error:', error);
+        showStatus(`Paste failed: ${error.message}`, 'error');
+        throw error;
+    }
+}
+
+// Enable click-to-paste mode for backend clipboard
+function enableClickToPasteBackend() {
+    console.log('🎯 Enabling click-to-paste mode for backend clipboard');
+    
+    // Remove any existing click handlers
+    document.querySelectorAll('.grid-cell').forEach(cell => {
+        cell.classList.remove('paste-target');
+        cell.style.cursor = '';
+    });
+    
+    // Add click-to-paste mode
+    document.body.style.cursor = 'crosshair';
+    
+    // Show instruction
+    showStatus('Click on the grid where you want to paste the area', 'info');
+    
+    // Add click handler to grid cells
+    const gridCells = document.querySelectorAll('.grid-cell');
+    gridCells.forEach(cell => {
+        cell.classList.add('paste-target');
+        cell.style.cursor = 'crosshair';
+        
+        const clickHandler = async function(event) {
+            event.preventDefault();
+            event.stopPropagation();
+            
+            const row = parseInt(cell.dataset.row);
+            const col = parseInt(cell.dataset.col);
+            
+            console.log(`🎯 Backend paste clicked at (${row}, ${col})`);
+            
+            // Remove click handlers
+            gridCells.forEach(c => {
+                c.classList.remove('paste-target');
+                c.style.cursor = '';
+                c.removeEventListener('click', clickHandler);
+            });
+            document.body.style.cursor = '';
+            
+            // Execute backend paste
+            try {
+                await pasteDragAreaFromBackend(row, col);
+            } catch (error) {
+                console.error('❌ Backend paste failed:', error);
+                showStatus(`Paste failed: ${error.message}`, 'error');
+            }
+        };
+        
+        cell.addEventListener('click', clickHandler);
+    });
+}
+
+// Enable click-to-paste mode for backend clipboard (area only - no trees)
+function enableClickToPasteBackendAreaOnly() {
+    console.log('🎯 Enabling click-to-paste mode for backend clipboard (area only)');
+    
+    // Remove any existing click handlers
+    document.querySelectorAll('.grid-cell').forEach(cell => {
+        cell.classList.remove('paste-target');
+        cell.style.cursor = '';
+    });
+    
+    // Add click-to-paste mode
+    document.body.style.cursor = 'crosshair';
+    
+    // Show instruction
+    showStatus('Click on the grid where you want to paste the area boundary (no trees)', 'info');
+    
+    // Add click handler to grid cells
+    const gridCells = document.querySelectorAll('.grid-cell');
+    gridCells.forEach(cell => {
+        cell.classList.add('paste-target');
+        cell.style.cursor = 'crosshair';
+        
+        const clickHandler = async function(event) {
+            event.preventDefault();
+            event.stopPropagation();
+            
+            const row = parseInt(cell.dataset.row);
+            const col = parseInt(cell.dataset.col);
+            
+            console.log(`🎯 Backend area-only paste clicked at (${row}, ${col})`);
+            
+            // Remove click handlers
+            gridCells.forEach(c => {
+                c.classList.remove('paste-target');
+                c.style.cursor = '';
+                c.removeEventListener('click', clickHandler);
+            });
+            document.body.style.cursor = '';
+            
+            // Execute backend paste with create_trees = false
+            try {
+                const response = await fetch(`/api/paste_drag_area_from_backend/${domeId}`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({
+                        paste_row: row,
+                        paste_col: col,
+                        create_trees: false // Area only, no trees
+                    })
+                });
+                
+                const result = await response.json();
+                
+                if (result.success) {
+                    showStatus(`✅ Area boundary pasted successfully: "${result.area.name}"`, 'success');
+                    console.log('✅ Area-only paste successful:', result);
+                    
+                    // ✅ FIX: Refresh grid without reloading page to preserve clipboard
+                    setTimeout(() => {
+                        if (typeof refreshGridDisplay === 'function') {
+                            refreshGridDisplay();
+                        } else if (typeof renderGrid === 'function') {
+                            renderGrid();
+                        } else {
+                            console.log('🔄 Grid refresh functions not available, keeping clipboard active');
+                        }
+                    }, 1000);
+                } else {
+                    throw new Error(result.error || 'Area-only paste failed');
+                }
+            } catch (error) {
+                console.error('❌ Backend area-only paste failed:', error);
+                showStatus(`Area-only paste failed: ${error.message}`, 'error');
+            }
+        };
+        
+        cell.addEventListener('click', clickHandler);
+    });
+}
+
+// Initialize enhanced clipboard on page load
+async function initializeEnhancedClipboard() {
+    try {
+        console.log('🔄 Initializing enhanced clipboard...');
+        
+        // Check backend clipboard status
+        const clipboardStatus = await getBackendClipboardStatus();
+        
+        if (clipboardStatus.has_clipboard) {
+            const info = clipboardStatus.clipboard_info;
+            console.log(`📋 Found backend clipboard: "${info.name}" (${info.tree_count} trees)`);
+            
+            // Update paste button to show backend clipboard
+            const pasteBtn = document.getElementById('pasteAreaBtn');
+            if (pasteBtn) {
+                pasteBtn.style.display = 'block';
+                pasteBtn.textContent = `📋 Paste "${info.name}" (${info.tree_count} trees) [Backend]`;
+                pasteBtn.classList.add('paste-btn-backend');
+                
+                // Override the click handler to use backend paste
+                pasteBtn.onclick = function() {
+                    showPasteOptionsDialog();
+                };
+            }
+            
+            // Show notification about available clipboard
+            showStatus(`Backend clipboard available: "${info.name}" (${info.tree_count} trees)`, 'info');
+        } else {
+            console.log('📭 No backend clipboard data found');
+        }
+        
+    } catch (error) {
+        console.error('⚠️ Error initializing enhanced clipboard:', error);
+    }
+}
+
+// Override the copy function for drag areas
+function copyArea(areaId) {
+    console.log(`📋 ENHANCED: Copy area ${areaId} - using backend copy`);
+    console.log(`🔧 DEBUG: copyArea function called with areaId: ${areaId}`);
+    return copyDragAreaToBackend(areaId);
+}
+
+// Also override any existing copyArea functions
+window.copyArea = function(areaId) {
+    console.log(`📋 ENHANCED WINDOW: Copy area ${areaId} - using backend copy`);
+    console.log(`🔧 DEBUG: window.copyArea function called with areaId: ${areaId}`);
+    return copyDragAreaToBackend(areaId);
+};
+
+// Force override any existing copyArea functions
+if (typeof window.originalCopyArea === 'undefined' && typeof copyArea !== 'undefined') {
+    window.originalCopyArea = copyArea;
+}
+
+// Override with a more aggressive approach
+const enhancedCopyArea = function(areaId) {
+    console.log(`📋 FORCE ENHANCED: Copy area ${areaId} - using backend copy`);
+    console.log(`🔧 DEBUG: Force enhanced copyArea called`);
+    return copyDragAreaToBackend(areaId);
+};
+
+// Replace all possible copy functions
+window.copyArea = enhancedCopyArea;
+copyArea = enhancedCopyArea;
+
+// Also check if there are other copy functions
+console.log('🔍 DEBUG: Available copy functions:', {
+    'window.copyArea': typeof window.copyArea,
+    'copyArea': typeof copyArea,
+    'window.copyDragAreaToBackend': typeof window.copyDragAreaToBackend,
+    'dragSelector': typeof dragSelector,
+    'dragSelector.copyDragArea': typeof (dragSelector && dragSelector.copyDragArea)
+});
+
+// Override dragSelector.copyDragArea if it exists
+if (typeof dragSelector !== 'undefined' && dragSelector && typeof dragSelector.copyDragArea === 'function') {
+    console.log('🔧 DEBUG: Overriding dragSelector.copyDragArea');
+    dragSelector.originalCopyDragArea = dragSelector.copyDragArea;
+    dragSelector.copyDragArea = function(areaId) {
+        console.log(`📋 DRAGSEL ENHANCED: Copy area ${areaId} - using backend copy`);
+        console.log(`🔧 DEBUG: dragSelector.copyDragArea called with areaId: ${areaId}`);
+        return copyDragAreaToBackend(areaId);
+    };
+} else {
+    console.log('⚠️ DEBUG: dragSelector.copyDragArea not found, will override when available');
+}
+
+// Set up a periodic check to override dragSelector when it becomes available
+let dragSelectorOverrideAttempts = 0;
+const maxOverrideAttempts = 10;
+
+function attemptDragSelectorOverride() {
+    dragSelectorOverrideAttempts++;
+    
+    if (typeof dragSelector !== 'undefined' && dragSelector && typeof dragSelector.copyDragArea === 'function') {
+        console.log(`🔧 DEBUG: Found dragSelector on attempt ${dragSelectorOverrideAttempts}, overriding now`);
+        dragSelector.originalCopyDragArea = dragSelector.copyDragArea;
+        dragSelector.copyDragArea = function(areaId) {
+            console.log(`📋 DRAGSEL ENHANCED: Copy area ${areaId} - using backend copy`);
+            console.log(`🔧 DEBUG: dragSelector.copyDragArea called with areaId: ${areaId}`);
+            return copyDragAreaToBackend(areaId);
+        };
+        return true;
+    } else if (dragSelectorOverrideAttempts < maxOverrideAttempts) {
+        console.log(`⏳ DEBUG: dragSelector not ready yet, attempt ${dragSelectorOverrideAttempts}/${maxOverrideAttempts}`);
+        setTimeout(attemptDragSelectorOverride, 500);
+    } else {
+        console.log('❌ DEBUG: Failed to override dragSelector.copyDragArea after maximum attempts');
+    }
+}
+
+// Start the override attempts
+setTimeout(attemptDragSelectorOverride, 100);
+
+// Enhanced paste button handler
+async function enhancedHandlePasteButtonClick() {
+    console.log('🎯 Enhanced paste button clicked');
+
+    // First check for backend clipboard
+    try {
+        const backendStatus = await getBackendClipboardStatus();
+        if (backendStatus.has_clipboard) {
+            console.log('📋 Found backend clipboard, showing paste options');
+            await showPasteOptionsDialog();
+            return;
+        }
+    } catch (error) {
+        console.warn('⚠️ Could not check backend clipboard:', error);
+    }
+
+    // Fallback to original handler
+    if (typeof handlePasteButtonClick === 'function') {
+        handlePasteButtonClick();
+    } else {
+        console.warn('⚠️ No clipboard data available');
+    }
+}
+
+// Override the paste button handler
+window.handlePasteButtonClick = enhancedHandlePasteButtonClick;
+
+// Add enhanced functions to global scope
+window.copyDragAreaToBackend = copyDragAreaToBackend;
+window.pasteDragAreaFromBackend = pasteDragAreaFromBackend;
+window.enhancedCopyDragArea = enhancedCopyDragArea;
+window.enhancedPasteDragArea = enhancedPasteDragArea;
+window.getBackendClipboardStatus = getBackendClipboardStatus;
+window.initializeEnhancedClipboard = initializeEnhancedClipboard;
+
+// Initialize when DOM is ready
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('✅ Enhanced copy/paste frontend loaded');
+    
+    // Initialize enhanced clipboard after a short delay
+    setTimeout(initializeEnhancedClipboard, 2000);
+    
+    // Final override attempt after everything is loaded
+    setTimeout(function() {
+        console.log('🔧 FINAL: Attempting final override of all copy functions');
+        
+        // Override copyArea again
+        if (typeof copyArea === 'function') {
+            window.copyArea = enhancedCopyArea;
+            copyArea = enhancedCopyArea;
+            console.log('✅ FINAL: copyArea overridden');
+        }
+        
+        // Override dragSelector.copyDragArea again
+        if (typeof dragSelector !== 'undefined' && dragSelector && typeof dragSelector.copyDragArea === 'function') {
+            dragSelector.copyDragArea = function(areaId) {
+                console.log(`📋 FINAL DRAGSEL: Copy area ${areaId} - using backend copy`);
+                return copyDragAreaToBackend(areaId);
+            };
+            console.log('✅ FINAL: dragSelector.copyDragArea overridden');
+        }
+        
+        // Check what functions are available
+        console.log('🔍 FINAL: Function check:', {
+            'copyArea': typeof copyArea,
+            'window.copyArea': typeof window.copyArea,
+            'dragSelector': typeof dragSelector,
+            'dragSelector.copyDragArea': typeof (dragSelector && dragSelector.copyDragArea),
+            'copyDragAreaToBackend': typeof copyDragAreaToBackend
+        });
+    }, 5000);
+});
+
+// Add CSS for backend clipboard indicator
+const style = document.createElement('style');
+style.textContent = `
+    .paste-btn-backend {
+        background: linear-gradient(45deg, #28a745, #20c997) !important;
+        border-color: #28a745 !important;
+        box-shadow: 0 2px 4px rgba(40, 167, 69, 0.3) !important;
+    }
+    
+    .paste-btn-backend:hover {
+        background: linear-gradient(45deg, #218838, #1ea080) !important;
+        transform: translateY(-1px);
+        box-shadow: 0 4px 8px rgba(40, 167, 69, 0.4) !important;
+    }
+`;
+document.head.appendChild(style);
+
+console.log('🚀 Enhanced copy/paste system initialized');
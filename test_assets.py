@@ -0,0 +1,45 @@
+import os
+import re
+
+from blueprints import register_blueprints
+from services.assets import AssetManifest, asset_url
+
+
+def test_fingerprint_follows_file_content(tmp_path):
+    bundle = tmp_path / 'grid' / 'grid.js'
+    bundle.parent.mkdir()
+    bundle.write_text('let a = 1;\n')
+    manifest = AssetManifest(str(tmp_path))
+    first = manifest.fingerprinted('grid/grid.js')
+
+    assert re.fullmatch(r'grid/grid\.[0-9a-f]{12}\.js', first)
+    assert manifest.resolve(first) == ('grid/grid.js', first.split('.')[1])
+    bundle.write_text('let a = 2;\n')
+    os.utime(bundle, ns=(0, 1))  # a different mtime, whatever the clock resolution
+    assert manifest.fingerprinted('grid/grid.js') != first
+
+
+def test_assets_are_served_immutable_and_stale_links_redirect(app):
+    register_blueprints(app, only='assets')
+    client = app.test_client()
+    with app.test_request_context():
+        url = asset_url('grid/grid.css')
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.cache_control.immutable and response.cache_control.max_age == 365 * 24 * 3600
+
+    stale = client.get('/assets/grid/grid.000000000000.css')
+    assert (stale.status_code, stale.headers['Location']) == (302, url)
+    assert client.get('/assets/grid/grid.css').status_code == 404
+    assert client.get('/assets/%2E%2E/config.000000000000.py').status_code == 404
+
+
+def test_grid_template_only_inlines_the_page_bootstrap():
+    with open(os.path.join(os.path.dirname(__file__), 'templates', 'grid.html'), encoding='utf-8') as handle:
+        template = handle.read()
+
+    inline_scripts = re.findall(r'<script>(.*?)</script>', template, re.S)
+    assert len(inline_scripts) == 1 and 'GRID_BOOTSTRAP' in inline_scripts[0]
+    assert '<style>' not in template
+    assert len(template) < 20000
@@ -0,0 +1,28 @@
+import sys
+from collections import Counter
+
+from blueprints import register_blueprints
+
+
+def rule_keys(app):
+    return [(str(rule.rule), method) for rule in app.url_map.iter_rules()
+            for method in rule.methods - {'HEAD', 'OPTIONS'}]
+
+
+def test_debug_routes_are_only_registered_when_enabled(app):
+    sys.modules.pop('blueprints.admin', None)
+    registered = register_blueprints(app, enable_debug_routes=False, only='')
+
+    assert 'admin' not in registered
+    assert 'blueprints.admin' not in sys.modules
+    rules = {rule for rule, _ in rule_keys(app)}
+    assert '/farms' in rules
+    assert '/debug/routes' not in rules
+
+
+def test_no_duplicate_routes(app):
+    register_blueprints(app, enable_debug_routes=True, only='')
+
+    duplicates = [key for key, count in Counter(rule_keys(app)).items() if count > 1]
+    assert duplicates == []
+    assert '/debug/routes' in {rule for rule, _ in rule_keys(app)}
@@ -0,0 +1,106 @@
+from sqlalchemy import event, text
+
+from models import db, Tree, TreeBreed
+from services.breeds import BreedDictionary, sync_breed_ids
+from services.soft_delete import soft_delete_trees
+from services.tree_batch import apply_tree_batch
+
+from conftest import make_tree
+
+
+def add_breed(user, name, farm=None):
+    breed = TreeBreed(name=name, user_id=user.id, farm_id=farm.id if farm else None)
+    db.session.add(breed)
+    db.session.flush()
+    return breed
+
+
+def test_trees_link_to_the_farm_breed_before_the_user_wide_one(farm_setup):
+    user, farm, dome = farm_setup
+    user_wide = add_breed(user, 'Gelato')
+    farm_breed = add_breed(user, 'Gelato', farm)
+    other = add_breed(user, 'Zkittlez')
+
+    gelato = make_tree(dome, 0, 0, breed='Gelato')
+    free_text = make_tree(dome, 0, 1, breed='Unlisted')
+    db.session.commit()
+    assert (gelato.breed_id, free_text.breed_id) == (farm_breed.id, None)
+    assert user_wide.get_tree_count() == 0
+
+    gelato.breed = 'Zkittlez'
+    db.session.commit()
+    assert gelato.breed_id == other.id
+
+    # A breed created later claims the trees already using its name
+    unlisted = add_breed(user, 'Unlisted', farm)
+    db.session.commit()
+    assert db.session.get(Tree, free_text.id).breed_id == unlisted.id
+
+
+def test_usage_counts_come_from_one_group_by(farm_setup):
+    user, farm, dome = farm_setup
+    gelato = add_breed(user, 'Gelato', farm)
+    kush = add_breed(user, 'OG Kush', farm)
+    mother = make_tree(dome, 0, 0, breed='Gelato')
+    make_tree(dome, 0, 1, breed='Gelato', mother=mother)
+    gone = make_tree(dome, 0, 2, breed='Gelato', mother=mother)
+    db.session.commit()
+    soft_delete_trees(user.id, Tree.id == gone.id)
+    db.session.commit()
+
+    usage = TreeBreed.usage_counts([gelato.id, kush.id])
+
+    assert usage == {gelato.id: {'tree_count': 2, 'mother_count': 1, 'cutting_count': 1}}
+    assert gelato.to_dict(usage.get(gelato.id))['can_be_deleted'] is False
+    assert kush.to_dict(usage.get(kush.id, TreeBreed.EMPTY_USAGE))['can_be_deleted'] is True
+
+
+def test_farm_usage_report_is_one_query_for_any_number_of_breeds(farm_setup):
+    user, farm, dome = farm_setup
+    for n in range(60):
+        add_breed(user, f'Strain {n}', farm)
+    mother = make_tree(dome, 0, 0, breed='Strain 3')
+    make_tree(dome, 0, 1, breed='Strain 3', mother=mother)
+    make_tree(dome, 0, 2, breed='Strain 59')
+    db.session.commit()
+    farm_id, user_id = farm.id, user.id
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        breeds = TreeBreed.query.filter_by(farm_id=farm_id, user_id=user_id).all()
+        usage = TreeBreed.farm_usage_counts(farm_id, user_id)
+        report = [breed.to_dict(usage.get(breed.id, TreeBreed.EMPTY_USAGE)) for breed in breeds]
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert len(statements) == 2  # the breed list and one aggregate
+    assert {row['name']: (row['tree_count'], row['mother_count'], row['cutting_count'])
+            for row in report if row['tree_count']} == {'Strain 3': (2, 1, 1), 'Strain 59': (1, 1, 0)}
+    assert 'tree_count' not in breeds[0].to_dict(include_usage=False)
+
+
+def test_sync_and_batch_updates_keep_breed_ids_linked(farm_setup):
+    user, farm, dome = farm_setup
+    gelato = add_breed(user, 'Gelato', farm)
+    kush = add_breed(user, 'OG Kush', farm)
+    a = make_tree(dome, 0, 0, breed='Gelato')
+    b = make_tree(dome, 0, 1, breed='Gelato')
+    db.session.commit()
+
+    # Backfill of rows written without the ORM
+    db.session.execute(text("UPDATE tree SET breed_id = NULL"))
+    assert sync_breed_ids() == 2
+    assert sync_breed_ids() == 0
+
+    apply_tree_batch(dome, user.id, [{'op': 'update', 'tree_id': b.id, 'fields': {'breed': 'OG Kush'}}])
+    db.session.expire_all()
+    assert (db.session.get(Tree, a.id).breed_id, db.session.get(Tree, b.id).breed_id) == (gelato.id, kush.id)
+
+
+def test_breed_dictionary_codes():
+    breeds = BreedDictionary()
+    codes = [breeds.code(name) for name in ('Gelato', None, 'Kush', 'Gelato', '')]
+    assert codes == [0, None, 1, 0, None]
+    assert breeds.names == ['Gelato', 'Kush']
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+from models import db, DeletionJob, Dome, Farm, Tree, DragArea, DragAreaTree, PlantRelationship, TreeLineage
+from services.deletion import (
+    STALE_JOB_AFTER, delete_scope, deletion_steps, get_deletion_job, resume_deletion_jobs, start_deletion_job
+)
+
+from conftest import make_tree
+
+
+def _second_dome(user, farm):
+    dome = Dome(name='Other', grid_row=0, grid_col=1, internal_rows=10, internal_cols=10,
+                user_id=user.id, farm_id=farm.id)
+    db.session.add(dome)
+    db.session.flush()
+    return dome
+
+
+def test_delete_dome_removes_dependents_and_detaches_outside_cuttings(farm_setup):
+    user, farm, dome = farm_setup
+    other = _second_dome(user, farm)
+
+    grandmother = make_tree(other, 0, 0, name='Grandmother')
+    mother = make_tree(dome, 0, 0, name='Mother', mother=grandmother)
+    inside_cutting = make_tree(dome, 0, 1, name='Inside', mother=mother)
+    outside_cutting = make_tree(other, 1, 0, name='Outside', mother=mother)
+    area = DragArea(name='Area', dome_id=dome.id, min_row=0, max_row=0, min_col=0, max_col=1,
+                    width=2, height=1)
+    db.session.add(area)
+    db.session.flush()
+    db.session.add(DragAreaTree(drag_area_id=area.id, tree_id=mother.id, relative_row=0, relative_col=0))
+    db.session.add(PlantRelationship(mother_tree_id=mother.id, cutting_tree_id=outside_cutting.id,
+                                     user_id=user.id, dome_id=other.id))
+    db.session.commit()
+    grandmother_id, inside_id, outside_id, dome_id = grandmother.id, inside_cutting.id, outside_cutting.id, dome.id
+
+    result = delete_scope('dome', dome_id)
+
+    assert result['deleted'] == {'trees': 2, 'drag_areas': 1, 'regular_areas': 0,
+                                 'relationships': 1, 'domes': 1}
+    assert result['details']['plant_relationship'] == 1
+    assert db.session.get(Dome, dome_id) is None
+    assert DragAreaTree.query.count() == 0
+    # The cutting inside the dome goes with it, tombstone and all
+    assert Tree.query.execution_options(include_deleted=True).filter_by(id=inside_id).count() == 0
+
+    survivor = db.session.get(Tree, outside_id)
+    assert survivor.mother_plant_id is None
+    assert survivor.plant_type == 'independent'
+    assert db.session.get(Tree, grandmother_id).cutting_count == 0
+    # The grandmother -> outside cutting path ran through the deleted mother
+    assert TreeLineage.query.count() == 0
+
+
+class InlineScheduler:
+    """Runs jobs as they are added, so the test's single SQLite connection is never shared"""
+    running = True
+
+    def add_job(self, func, args, id):
+        func(*args)
+
+
+def test_delete_farm_in_background_reports_progress(app, farm_setup):
+    user, farm, dome = farm_setup
+    _second_dome(user, farm)
+    make_tree(dome, 0, 0)
+    db.session.commit()
+    farm_id = farm.id
+
+    job_id = start_deletion_job(app, 'farm', farm_id, user_id=user.id, scheduler=InlineScheduler())
+
+    # Read back from the deletion_job table, as any other worker would
+    job = get_deletion_job(job_id, user_id=user.id)
+    assert job['status'] == 'completed', job['error']
+    assert job['percent'] == 100
+    assert job['result']['deleted']['domes'] == 2
+    assert job['result']['deleted']['trees'] == 1
+    assert get_deletion_job(job_id, user_id=user.id + 1) is None
+    db.session.expire_all()
+    assert db.session.get(Farm, farm_id) is None
+
+
+def test_abandoned_deletion_jobs_are_resumed_once(app, farm_setup):
+    user, farm, dome = farm_setup
+    make_tree(dome, 0, 0)
+    abandoned = DeletionJob(id='a' * 32, scope='dome', target_id=dome.id, user_id=user.id,
+                            status='running', attempts=1, total_steps=len(deletion_steps('dome')),
+                            started_at=datetime.utcnow() - STALE_JOB_AFTER - timedelta(minutes=1))
+    busy = DeletionJob(id='b' * 32, scope='dome', target_id=dome.id, user_id=user.id,
+                       status='running', attempts=1, started_at=datetime.utcnow())
+    db.session.add_all([abandoned, busy])
+    db.session.commit()
+    dome_id = dome.id
+
+    assert resume_deletion_jobs(app) == 1
+    job = get_deletion_job('a' * 32)
+    assert (job['status'], job['attempts']) == ('completed', 2)
+    assert job['result']['deleted']['trees'] == 1
+    assert get_deletion_job('b' * 32)['status'] == 'running'
+    db.session.expire_all()
+    assert db.session.get(Dome, dome_id) is None
+    # Nothing left to claim
+    assert resume_deletion_jobs(app) == 0
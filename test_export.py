@@ -0,0 +1,67 @@
+import csv
+from datetime import datetime, timedelta
+import io
+
+import pytest
+
+from models import db, Dome
+from services.export import iter_farm_inventory, iter_inventory_csv
+
+from conftest import login_client, make_tree
+
+
+def _farm_trees(farm, dome):
+    mother = make_tree(dome, 0, 0, name='Mother', breed='Gelato')
+    mother.planted_date = datetime.utcnow() - timedelta(days=40)
+    make_tree(dome, 0, 1, name='=HYPERLINK("x")', mother=mother)
+    other = Dome(name='Other', grid_row=0, grid_col=1, internal_rows=5, internal_cols=5,
+                 user_id=dome.user_id, farm_id=farm.id)
+    db.session.add(other)
+    db.session.flush()
+    make_tree(other, 2, 3, name='Far Cutting', mother=mother)
+    db.session.commit()
+    return mother
+
+
+def test_inventory_rows_carry_life_days_stage_and_mother(app, farm_setup):
+    user, farm, dome = farm_setup
+    _farm_trees(farm, dome)
+
+    rows = list(iter_farm_inventory(farm.id, user.id, batch_size=2))
+    assert [row['name'] for row in rows] == ['Mother', '=HYPERLINK("x")', 'Far Cutting']
+    assert (rows[0]['life_days'], rows[0]['life_stage'], rows[0]['cutting_count']) == (40, 'Mature', 2)
+    assert [row['mother_name'] for row in rows] == ['', 'Mother', 'Mother']
+    assert rows[2]['dome_name'] == 'Other'
+    assert list(iter_farm_inventory(farm.id, user.id + 1)) == []
+
+
+def test_csv_export_streams_escaped_rows(app, farm_setup, monkeypatch):
+    user, farm, dome = farm_setup
+    _farm_trees(farm, dome)
+    monkeypatch.setattr('services.export.CSV_CHUNK_ROWS', 1)
+    assert len(list(iter_inventory_csv(iter_farm_inventory(farm.id, user.id)))) == 4
+
+    client = login_client(app, user, 'farms')
+    response = client.get(f'/api/farm/{farm.id}/export.csv')
+    assert response.status_code == 200 and response.is_streamed
+    assert 'Farm_inventory_' in response.headers['Content-Disposition']
+
+    table = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+    assert table[0][:3] == ['Tree ID', 'Name', 'Breed']
+    assert table[2][1] == '\'=HYPERLINK("x")' and table[2][8] == 'Mother'
+    assert len(table) == 4
+
+    assert client.get(f'/api/farm/{farm.id + 1}/export.csv').status_code == 404
+
+
+def test_xlsx_export(app, farm_setup):
+    openpyxl = pytest.importorskip('openpyxl')
+    user, farm, dome = farm_setup
+    _farm_trees(farm, dome)
+    client = login_client(app, user, 'farms')
+
+    response = client.get(f'/api/farm/{farm.id}/export.xlsx')
+    sheet = openpyxl.load_workbook(io.BytesIO(response.data)).active
+    rows = list(sheet.values)
+    assert rows[0][0] == 'Tree ID' and len(rows) == 4
+    assert rows[1][12] == 'Mature'
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from models import db, GridSettings
+from services import grid_settings
+from services.grid_settings import get_grid_settings, update_grid_settings, invalidate_grid_settings
+
+
+@pytest.fixture(autouse=True)
+def clear_grid_settings_cache():
+    invalidate_grid_settings()
+    yield
+    invalidate_grid_settings()
+
+
+def test_grid_settings_are_cached_until_updated(farm_setup):
+    user, farm, dome = farm_setup
+
+    first = get_grid_settings('dome', user.id, farm.id)
+    assert (first.rows, first.cols, first.grid_type) == (5, 5, f'farm_{farm.id}_dome')
+    assert GridSettings.query.filter_by(user_id=user.id).count() == 1
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        again = get_grid_settings('dome', user.id, farm.id)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    assert (again.rows, again.cols) == (5, 5)
+    assert statements == []
+
+    assert update_grid_settings('dome', 7, 9, user.id, farm.id)
+    updated = get_grid_settings('dome', user.id, farm.id)
+    assert (updated.rows, updated.cols) == (7, 9)
+    assert get_grid_settings('farm', user.id).rows == 10
+
+
+def test_grid_settings_unique_per_user_and_type(farm_setup, monkeypatch):
+    user, farm, dome = farm_setup
+    db.session.add(GridSettings(rows=3, cols=3, grid_type='farm', user_id=user.id))
+    db.session.commit()
+
+    db.session.add(GridSettings(rows=4, cols=4, grid_type='farm', user_id=user.id))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    monkeypatch.setattr(grid_settings, 'GRID_SETTINGS_TTL', -1)
+    assert get_grid_settings('farm', user.id).rows == 3
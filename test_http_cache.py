@@ -0,0 +1,96 @@
+from datetime import datetime
+import gzip
+
+import blueprints.common
+from models import db, Dome, DragArea, Tree
+from services.compression import init_compression
+from services.soft_delete import soft_delete_trees
+
+from conftest import login_client, make_tree
+
+
+def version(dome):
+    return db.session.get(Dome, dome.id).change_version
+
+
+def test_dome_versions_follow_trees_areas_and_lineage(farm_setup):
+    user, farm, dome = farm_setup
+    other = Dome(name='Other', grid_row=0, grid_col=1, internal_rows=5, internal_cols=5,
+                 user_id=user.id, farm_id=farm.id)
+    db.session.add(other)
+    db.session.commit()
+    before = version(dome), version(other)
+
+    mother = make_tree(dome, 0, 0)
+    db.session.commit()
+    assert (version(dome), version(other)) == (before[0] + 1, before[1])
+
+    # A cutting in another dome changes the mother's lineage too
+    make_tree(other, 0, 0, mother=mother)
+    db.session.commit()
+    assert (version(dome), version(other)) == (before[0] + 2, before[1] + 1)
+
+    db.session.add(DragArea(name='A', dome_id=other.id, min_row=0, max_row=0, min_col=0, max_col=0,
+                            width=1, height=1))
+    db.session.commit()
+    assert version(other) == before[1] + 2
+
+    soft_delete_trees(user.id, Tree.id == mother.id)
+    db.session.commit()
+    assert (version(dome), version(other)) == (before[0] + 3, before[1] + 3)
+
+
+def test_unchanged_polls_get_304_and_large_bodies_are_compressed(app, farm_setup):
+    user, farm, dome = farm_setup
+    for col in range(5):
+        make_tree(dome, 0, col)
+    db.session.commit()
+
+    app.config['COMPRESS_MIN_SIZE'] = 200
+    init_compression(app)
+    client = login_client(app, user, 'trees')
+
+    url = f'/api/dome/{dome.id}/trees'
+    first = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in first.headers['Vary']
+    assert len(gzip.decompress(first.data)) > len(first.data)
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+
+    again = client.get(url, headers={'If-None-Match': etag})
+    assert (again.status_code, again.data) == (304, b'')
+    assert client.get(url + '?breed_codes=1', headers={'If-None-Match': etag}).status_code == 200
+    assert 'Accept' in first.headers['Vary']
+    ndjson = client.get(url, headers={'If-None-Match': etag, 'Accept': 'application/x-ndjson'})
+    assert ndjson.status_code == 200 and ndjson.headers['ETag'] != etag
+
+    make_tree(dome, 1, 0)
+    db.session.commit()
+    changed = client.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert 'Content-Encoding' not in changed.headers  # client did not ask for it
+
+
+def test_lineage_report_etag_changes_with_the_utc_date(app, farm_setup, monkeypatch):
+    user, farm, dome = farm_setup
+    make_tree(dome, 0, 0)
+    db.session.commit()
+    client = login_client(app, user, 'lineage')
+    url = f'/api/dome/{dome.id}/lineage_report'
+
+    class Clock(datetime):
+        now = datetime(2026, 1, 1, 23, 59)
+
+        @classmethod
+        def utcnow(cls):
+            return cls.now
+
+    monkeypatch.setattr(blueprints.common, 'datetime', Clock)
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    # Life days moved on at midnight even though no midnight job bumped the dome
+    Clock.now = datetime(2026, 1, 2, 0, 1)
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
@@ -0,0 +1,95 @@
+"""
+Tests for the relationship integrity checker
+"""
+from flask import g
+from sqlalchemy import text
+
+from conftest import login_client, make_tree
+from models import db, DragArea, DragAreaTree, PlantRelationship, Tree, TreeLineage, User
+from services.integrity import run_integrity_check
+
+
+def _break_references(dome, user):
+    mother = make_tree(dome, 0, 0, 'Mother')
+    cutting = make_tree(dome, 0, 1, 'Cutting', mother=mother)
+    area = DragArea(name='Area', dome_id=dome.id, min_row=0, max_row=1, min_col=0, max_col=1,
+                    width=2, height=2)
+    db.session.add(area)
+    db.session.flush()
+    db.session.add(DragAreaTree(drag_area_id=area.id, tree_id=cutting.id, relative_row=0, relative_col=1))
+    db.session.add(PlantRelationship(mother_tree_id=mother.id, cutting_tree_id=cutting.id,
+                                     user_id=user.id, dome_id=dome.id))
+    db.session.commit()
+    mother_id, cutting_id = mother.id, cutting.id
+
+    # Simulate a partial delete that bypassed the ORM
+    db.session.execute(text("DELETE FROM tree WHERE id = :id"), {'id': mother_id})
+    db.session.commit()
+    return mother_id, cutting_id
+
+
+def test_dry_run_reports_without_writing(farm_setup):
+    user, farm, dome = farm_setup
+    mother_id, cutting_id = _break_references(dome, user)
+
+    report = run_integrity_check(apply=False)
+
+    assert report['mode'] == 'dry_run'
+    assert report['checks']['dangling_mother_plant_id']['found'] == 1
+    assert report['checks']['dangling_mother_plant_id']['sample'] == [cutting_id]
+    assert report['checks']['orphaned_plant_relationships']['found'] == 1
+    assert report['checks']['orphaned_lineage_rows']['found'] == 1
+    assert report['total_fixed'] == 0
+    assert db.session.get(Tree, cutting_id).mother_plant_id == mother_id
+
+
+def test_apply_repairs_everything_in_one_pass(farm_setup):
+    user, farm, dome = farm_setup
+    mother_id, cutting_id = _break_references(dome, user)
+    db.session.execute(text("DELETE FROM drag_area"))
+    db.session.commit()
+
+    report = run_integrity_check(apply=True)
+
+    assert report['total_fixed'] == report['total_found'] == 4
+    assert report['lineage_rebuilt'] is True
+    cutting = db.session.get(Tree, cutting_id)
+    assert cutting.mother_plant_id is None
+    assert cutting.plant_type == 'independent'
+    assert PlantRelationship.query.count() == 0
+    assert DragAreaTree.query.count() == 0
+    assert run_integrity_check(apply=False)['total_found'] == 0
+
+
+def test_route_only_sees_and_repairs_the_current_users_rows(app, farm_setup):
+    user, farm, dome = farm_setup
+    grandmother = make_tree(dome, 1, 0, 'Grandmother')
+    db.session.commit()
+    mother_id, cutting_id = _break_references(dome, user)
+    # The cutting's path from the grandmother ran through the deleted mother
+    db.session.add(TreeLineage(ancestor_id=grandmother.id, descendant_id=cutting_id, depth=2))
+    db.session.commit()
+
+    other = User(username='other', email='other@example.com')
+    other.set_password('secret123')
+    db.session.add(other)
+    db.session.commit()
+    other_client = login_client(app, other, 'lineage')
+
+    report = other_client.get('/api/cleanup_orphaned_relationships').get_json()['report']
+    assert report['total_found'] == 0
+    assert all(check['sample'] == [] for check in report['checks'].values())
+    assert other_client.post('/api/cleanup_orphaned_relationships', json={}).get_json()['deleted_count'] == 0
+    db.session.expire_all()
+    assert db.session.get(Tree, cutting_id).mother_plant_id == mother_id
+
+    # Requests share the fixture's app context, and with it Flask-Login's cached user
+    g.pop('_login_user', None)
+    owner_client = app.test_client()
+    with owner_client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+    report = owner_client.post('/api/cleanup_orphaned_relationships', json={}).get_json()['report']
+    assert report['checks']['dangling_mother_plant_id']['fixed'] == 1
+    db.session.expire_all()
+    assert db.session.get(Tree, cutting_id).mother_plant_id is None
+    assert TreeLineage.query.count() == 0
@@ -0,0 +1,161 @@
+"""
+Tests for the tree lineage closure table
+"""
+import pytest
+from sqlalchemy import text
+
+from conftest import make_tree
+from models import db, Dome, TreeLineage
+from services.lineage import rebuild_lineage, iter_farm_lineage, reconcile_cutting_counts
+
+
+def _closure_rows():
+    return sorted(
+        (row.ancestor_id, row.descendant_id, row.depth)
+        for row in TreeLineage.query.all()
+    )
+
+
+def test_generation_and_descendants_follow_links(farm_setup):
+    user, farm, dome = farm_setup
+    root = make_tree(dome, 0, 0, 'Root')
+    child = make_tree(dome, 0, 1, 'Child', mother=root)
+    grandchild = make_tree(dome, 0, 2, 'Grandchild', mother=child)
+    db.session.commit()
+
+    assert root.get_generation() == 0
+    assert child.get_generation() == 1
+    assert grandchild.get_generation() == 2
+    assert root.get_descendant_count() == 2
+    assert sorted(root.get_descendant_ids()) == sorted([child.id, grandchild.id])
+    assert root.get_descendant_ids(max_depth=1) == [child.id]
+    assert grandchild.get_ancestor_ids() == [child.id, root.id]
+    assert grandchild.get_plant_lineage()['generation'] == 2
+
+
+def test_unlink_and_relink_moves_whole_subtree(farm_setup):
+    user, farm, dome = farm_setup
+    root = make_tree(dome, 0, 0, 'Root')
+    other = make_tree(dome, 1, 0, 'Other')
+    child = make_tree(dome, 0, 1, 'Child', mother=root)
+    grandchild = make_tree(dome, 0, 2, 'Grandchild', mother=child)
+    db.session.commit()
+
+    child.mother_plant_id = None
+    db.session.commit()
+    assert root.get_descendant_count() == 0
+    assert grandchild.get_generation() == 1
+
+    child.mother_plant_id = other.id
+    db.session.commit()
+    assert other.get_descendant_count() == 2
+    assert grandchild.get_ancestor_ids() == [child.id, other.id]
+
+
+def test_delete_tree_detaches_cuttings(farm_setup):
+    user, farm, dome = farm_setup
+    root = make_tree(dome, 0, 0, 'Root')
+    child = make_tree(dome, 0, 1, 'Child', mother=root)
+    grandchild = make_tree(dome, 0, 2, 'Grandchild', mother=child)
+    db.session.commit()
+
+    grandchild.mother_plant_id = None
+    db.session.delete(child)
+    db.session.commit()
+
+    assert root.get_descendant_count() == 0
+    assert _closure_rows() == []
+
+
+def test_rebuild_matches_incremental_maintenance(farm_setup):
+    user, farm, dome = farm_setup
+    root = make_tree(dome, 0, 0, 'Root')
+    a = make_tree(dome, 0, 1, 'A', mother=root)
+    make_tree(dome, 0, 2, 'B', mother=root)
+    make_tree(dome, 0, 3, 'A1', mother=a)
+    db.session.commit()
+
+    incremental = _closure_rows()
+    assert rebuild_lineage() == len(incremental)
+    db.session.commit()
+    assert _closure_rows() == incremental
+
+
+def test_cycles_are_rejected(farm_setup):
+    user, farm, dome = farm_setup
+    root = make_tree(dome, 0, 0, 'Root')
+    child = make_tree(dome, 0, 1, 'Child', mother=root)
+    db.session.commit()
+
+    root.mother_plant_id = child.id
+    with pytest.raises(ValueError, match='lineage cycle'):
+        db.session.commit()
+    db.session.rollback()
+    assert root.get_generation() == 0
+
+
+def test_farm_forest_crosses_dome_boundaries(farm_setup):
+    user, farm, dome = farm_setup
+    other_dome = Dome(name='Dome 2', grid_row=0, grid_col=1, internal_rows=5, internal_cols=5,
+                      user_id=user.id, farm_id=farm.id)
+    db.session.add(other_dome)
+    db.session.flush()
+    root = make_tree(dome, 0, 0, 'Root')
+    child = make_tree(other_dome, 0, 0, 'Child', mother=root)
+    grandchild = make_tree(dome, 0, 1, 'Grandchild', mother=child)
+    loner = make_tree(other_dome, 1, 1, 'Loner')
+    db.session.commit()
+
+    rows = {row['id']: row for row in iter_farm_lineage(farm.id, user.id, batch_size=2)}
+
+    assert set(rows) == {root.id, child.id, grandchild.id, loner.id}
+    assert rows[grandchild.id]['generation'] == 2
+    assert rows[grandchild.id]['root_id'] == root.id
+    assert rows[child.id]['dome_name'] == 'Dome 2'
+    assert rows[loner.id]['generation'] == 0
+
+
+def test_cutting_count_follows_relationship_mutations(farm_setup):
+    user, farm, dome = farm_setup
+    mother = make_tree(dome, 0, 0, 'Mother')
+    other = make_tree(dome, 1, 0, 'Other')
+    first = make_tree(dome, 0, 1, 'First', mother=mother)
+    second = make_tree(dome, 0, 2, 'Second', mother=mother)
+    db.session.commit()
+    assert mother.get_cutting_count() == 2
+
+    second.mother_plant_id = other.id
+    db.session.commit()
+    assert (mother.cutting_count, other.cutting_count) == (1, 1)
+
+    db.session.delete(first)
+    db.session.commit()
+    assert mother.cutting_count == 0
+
+
+def test_reconcile_cutting_counts_repairs_drift(farm_setup):
+    user, farm, dome = farm_setup
+    mother = make_tree(dome, 0, 0, 'Mother')
+    make_tree(dome, 0, 1, 'First', mother=mother)
+    db.session.commit()
+
+    db.session.execute(text("UPDATE tree SET cutting_count = 7 WHERE id = :id"), {'id': mother.id})
+    assert reconcile_cutting_counts() == 1
+    db.session.commit()
+    assert mother.cutting_count == 1
+    assert reconcile_cutting_counts() == 0
+
+
+def test_mother_info_lists_the_users_cuttings_by_name(farm_setup):
+    from blueprints.trees import update_mother_cutting_count
+
+    user, farm, dome = farm_setup
+    mother = make_tree(dome, 0, 0, name='Mother')
+    mother.info = 'Indoor\nCuttings: 9 cutting trees (stale)'
+    make_tree(dome, 0, 1, name='First', mother=mother)
+    make_tree(dome, 0, 2, name='Second', mother=mother)
+    independent = make_tree(dome, 0, 3, name='Independent', mother=mother)
+    independent.plant_type = 'independent'
+
+    assert update_mother_cutting_count(mother) == 2
+    assert mother.info == 'Indoor\nCuttings: 2 cutting trees (First, Second)'
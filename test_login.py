@@ -0,0 +1,20 @@
+from models import db
+
+from conftest import make_tree
+
+
+def test_update_last_login_touches_only_the_user_row(farm_setup):
+    user, farm, dome = farm_setup
+    trees = [make_tree(dome, 0, col) for col in range(3)]
+    db.session.commit()
+    stamps = {tree.id: tree.updated_at for tree in trees}
+
+    user.update_last_login()
+    assert not any(tree in db.session.dirty for tree in trees)
+    db.session.commit()
+
+    assert user.login_count == 1
+    assert user.life_reference_at == user.last_login
+    for tree in trees:
+        assert tree.updated_at == stamps[tree.id]
+        assert tree.to_dict()['life_reference_at'] == user.life_reference_at.isoformat()
@@ -0,0 +1,43 @@
+"""
+Tests for the indexed mother-candidate matcher
+"""
+from conftest import make_tree
+from models import db
+from services.mother_matcher import MotherCandidate, MotherCandidateIndex
+
+
+def _index():
+    return MotherCandidateIndex([
+        MotherCandidate(3, 'Big Gelato Mother', 'Gelato'),
+        MotherCandidate(1, 'Blue Dream', 'Blue Dream'),
+        MotherCandidate(2, 'Kush Queen', 'og kush'),
+    ])
+
+
+def test_strategy_precedence():
+    index = _index()
+    assert index.match({'name': 'anything', 'breed': 'Gelato'}, original_mother_id=2).id == 2
+    assert index.match({'name': 'Kush clone', 'breed': 'Blue Dream'}).id == 1
+    assert index.match({'name': 'Clone of Blue Dream #4', 'breed': ''}).id == 1
+    assert index.match({'name': 'gelato', 'breed': ''}).id == 3
+    assert index.match({'name': 'Queen cutting', 'breed': ''}).id == 2
+    assert index.match({'name': 'x', 'breed': 'OG Kush'}).id == 2
+    assert index.match({'name': 'x', 'breed': 'Unknown'}).id == 1
+
+
+def test_empty_index_matches_nothing():
+    index = MotherCandidateIndex([])
+    assert not index
+    assert index.match({'name': 'Clone', 'breed': 'Gelato'}) is None
+
+
+def test_for_dome_loads_only_mothers(farm_setup):
+    user, farm, dome = farm_setup
+    mother = make_tree(dome, 0, 0, 'Gelato Mother', breed='Gelato')
+    make_tree(dome, 0, 1, 'Gelato Clone', mother=mother, breed='Gelato')
+    db.session.commit()
+
+    index = MotherCandidateIndex.for_dome(dome.id, user.id)
+
+    assert len(index) == 1
+    assert index.match_all([{'id': 99, 'name': 'Clone', 'breed': 'Gelato'}]) == {99: mother.id}
@@ -0,0 +1,82 @@
+from models import db, Tree, DragArea, validate_tree_position
+from services.occupancy import DomeOccupancy
+from services.soft_delete import soft_delete_trees
+
+from conftest import make_tree
+
+
+def test_occupancy_search_and_rectangles():
+    occupancy = DomeOccupancy(3, 4, [(1, 0, 0), (2, 0, 1), (3, 1, 3), (4, 2, 0)])
+
+    assert occupancy.free_count() == 8
+    assert occupancy.first_free() == (0, 2)
+    assert occupancy.first_free(1, 3) == (2, 1)
+    assert occupancy.first_fit(3) == [(0, 2), (0, 3), (1, 0)]
+    assert occupancy.first_fit(9) is None
+    assert occupancy.rect_is_empty(0, 2, 1, 2)
+    assert not occupancy.rect_is_empty(0, 2, 1, 3)
+    assert not occupancy.rect_is_empty(2, 3, 3, 3)
+    assert occupancy.can_resize_to(3, 4) == (True, 0)
+    assert occupancy.can_resize_to(2, 3) == (False, 2)
+
+    occupancy.move(3, 0, 3)
+    assert occupancy.can_resize_to(3, 3) == (False, 1)
+    occupancy.remove(1)
+    assert occupancy.first_free() == (0, 0)
+
+
+def test_dome_occupancy_ignores_soft_deleted_trees(farm_setup):
+    user, farm, dome = farm_setup
+    tree = make_tree(dome, 0, 0)
+    make_tree(dome, 0, 1)
+    db.session.commit()
+
+    occupancy = dome.get_occupancy()
+    assert occupancy.first_free() == (0, 2)
+    assert not validate_tree_position(dome.id, 0, 0, occupancy=occupancy)[0]
+    assert validate_tree_position(dome.id, 0, 0, exclude_tree_id=tree.id, occupancy=occupancy)[0]
+
+    soft_delete_trees(user.id, Tree.id == tree.id)
+    db.session.commit()
+
+    assert dome.get_empty_positions()[0] == {'row': 0, 'col': 0}
+    assert len(dome.get_empty_positions()) == 99
+
+
+def test_resize_conflicts_use_aggregate_bounds(farm_setup):
+    user, farm, dome = farm_setup
+    tree = make_tree(dome, 6, 2)
+    make_tree(dome, 1, 1)
+    db.session.add(DragArea(name='Corner', dome_id=dome.id, min_row=2, max_row=3,
+                            min_col=7, max_col=8, width=2, height=2))
+    db.session.commit()
+
+    assert dome.get_content_bounds()['trees'] == (6, 2)
+    assert dome.can_resize_to(7, 9) == (True, "Resize is safe")
+    assert not dome.can_resize_to(6, 9)[0]
+
+    conflicts = dome.find_resize_conflicts(5, 8)
+    assert [t['id'] for t in conflicts['trees']] == [tree.id]
+    assert [a['name'] for a in conflicts['drag_areas']] == ['Corner']
+    assert conflicts['regular_areas'] == []
+
+    soft_delete_trees(user.id, Tree.id == tree.id)
+    db.session.commit()
+    assert dome.find_resize_conflicts(5, 9) == {'trees': [], 'drag_areas': [], 'regular_areas': []}
+
+
+def test_excluded_tree_does_not_hide_a_co_located_tree(farm_setup):
+    user, farm, dome = farm_setup
+    moving = make_tree(dome, 2, 2)
+    make_tree(dome, 2, 2)  # legacy duplicate on the same cell
+    db.session.commit()
+
+    occupancy = dome.get_occupancy()
+    assert occupancy.occupants(2, 2) == 2
+    assert not validate_tree_position(dome.id, 2, 2, exclude_tree_id=moving.id, occupancy=occupancy)[0]
+    assert not validate_tree_position(dome.id, 2, 2, exclude_tree_id=moving.id)[0]
+
+    data = dome.to_dict()
+    assert data['tree_count'] == 2
+    assert data['occupancy_rate'] == 2.0
+    assert data['empty_positions'] == 99
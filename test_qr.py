@@ -0,0 +1,76 @@
+from PIL import Image
+import io
+import os
+import zipfile
+
+from models import db
+from services import labels, qr
+from services.qr import QRCache, cached_qr_png, qr_cache_key, qr_png
+
+from conftest import login_client, make_tree
+
+
+def test_qr_png_renders_and_resizes():
+    png = qr_png('https://example.com/tree_info/1', box_size=8, border=2, size=(200, 200))
+    assert png.startswith(b'\x89PNG')
+    assert Image.open(io.BytesIO(png)).size == (200, 200)
+
+
+def test_cached_qr_png_is_content_keyed_and_persisted(tmp_path):
+    cache = QRCache(str(tmp_path))
+    png, key = cached_qr_png('https://example.com/tree_info/1', box_size=8, border=2, cache=cache)
+
+    assert key == qr_cache_key('https://example.com/tree_info/1', box_size=8, border=2)
+    assert key != qr_cache_key('https://example.com/tree_info/1', box_size=10, border=2)
+    # A fresh process finds the PNG on disk
+    assert QRCache(str(tmp_path)).get(key) == png
+
+
+def test_qr_cache_directory_keeps_the_most_recently_used_files(tmp_path):
+    cache = QRCache(str(tmp_path), max_files=2)
+    for n in range(3):
+        cache.put(f'{n:064x}', b'png')
+        os.utime(cache._path(f'{n:064x}'), (n, n))
+    cache.clear_memory()
+    assert cache.get(f'{0:064x}') == b'png'  # a read makes it recent again
+
+    assert cache.prune() == 1
+    assert cache.get(f'{1:064x}') is None
+    assert cache.get(f'{0:064x}') == b'png' and cache.get(f'{2:064x}') == b'png'
+
+
+def test_label_sheets_render_as_pdf_pages_or_png_tiles(monkeypatch):
+    monkeypatch.setattr(labels, 'POOL_THRESHOLD', 0)  # exercise the worker pool
+    sheet = [{'url': f'https://example.com/tree_info/{n}', 'title': f'Tree {n}',
+              'subtitle': 'R1 C1', 'filename': f'tree_{n}'} for n in range(17)]
+
+    pdf, mimetype = labels.render_labels(sheet, 'pdf', cache=QRCache())
+    assert (mimetype, pdf[:5]) == ('application/pdf', b'%PDF-')
+    assert pdf.count(b'/Type /Page\n') == 2
+
+    archive, mimetype = labels.render_labels(sheet[:3], 'png', cache=QRCache())
+    names = zipfile.ZipFile(io.BytesIO(archive)).namelist()
+    assert mimetype == 'application/zip'
+    assert names == ['0001_tree_0.png', '0002_tree_1.png', '0003_tree_2.png']
+
+
+def test_qr_json_revalidates_while_the_png_is_cached(app, farm_setup, monkeypatch):
+    monkeypatch.setattr(qr, '_cache', QRCache())
+    user, farm, dome = farm_setup
+    tree = make_tree(dome, 0, 0, name='Before')
+    db.session.commit()
+    client = login_client(app, user, 'images,trees')
+
+    image = client.get(f'/qr_image/{tree.id}')
+    assert image.cache_control.max_age == 86400
+
+    first = client.get(f'/generate_qr/{tree.id}')
+    assert first.cache_control.no_cache and first.cache_control.max_age is None
+    etag = first.headers['ETag']
+    assert client.get(f'/generate_qr/{tree.id}', headers={'If-None-Match': etag}).status_code == 304
+
+    tree.name = 'After'
+    db.session.commit()
+    renamed = client.get(f'/generate_qr/{tree.id}', headers={'If-None-Match': etag})
+    assert renamed.status_code == 200 and renamed.get_json()['tree_name'] == 'After'
+    assert client.get(f'/simple_qr/{tree.id}').cache_control.no_cache
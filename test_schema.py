@@ -0,0 +1,29 @@
+from sqlalchemy import inspect, text
+
+from models import db
+from services.schema import (
+    SCHEMA_VERSION, _migrate_columns, get_schema_version, migrate_schema, schema_is_current
+)
+
+
+def test_migrate_schema_stamps_version_and_short_circuits(app):
+    assert get_schema_version() is None
+    assert not schema_is_current()
+
+    assert migrate_schema() is True
+    assert get_schema_version() == SCHEMA_VERSION
+    assert schema_is_current()
+
+    # A current schema is detected with one query and left alone
+    assert migrate_schema() is False
+    with db.engine.connect() as conn:
+        indexes = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert {'ux_grid_settings_user_type', 'ix_tree_live_position', 'ix_tree_tombstone'} <= indexes
+
+
+def test_migration_creates_server_session_table(app):
+    with db.engine.connect() as conn:
+        conn.execute(text("DROP TABLE server_session"))
+        _migrate_columns(conn)
+        conn.commit()
+        assert inspect(conn).has_table('server_session')
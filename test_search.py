@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from models import db, Dome, Tree
+from services.search import LikeBackend, ensure_search_index, get_search_backend, search_trees
+from services.soft_delete import soft_delete_trees
+from services.tree_batch import apply_tree_batch
+
+from conftest import login_client, make_tree
+
+
+def _names(results):
+    return sorted(tree['name'] for tree in results['trees'])
+
+
+def test_index_follows_tree_writes(app, farm_setup):
+    user, farm, dome = farm_setup
+    gelato = make_tree(dome, 0, 0, name='Gelato Mother', breed='Gelato')
+    make_tree(dome, 0, 1, name='Kush One')
+    db.session.commit()
+    assert ensure_search_index(db.session.connection()) == 2
+    db.session.commit()
+
+    assert _names(search_trees(user.id, 'gel')) == ['Gelato Mother']
+    assert _names(search_trees(user.id, 'kush')) == ['Kush One']
+
+    cutting = make_tree(dome, 1, 0, name='Clone A', mother=gelato)
+    cutting.cutting_notes = 'Rooted in rockwool'
+    db.session.commit()
+    assert _names(search_trees(user.id, 'rockwool')) == ['Clone A']
+
+    # Bulk batch updates and soft deletes re-index too
+    apply_tree_batch(dome, user.id, [{'op': 'update', 'tree_id': gelato.id, 'fields': {'name': 'Sherbet'}}])
+    assert _names(search_trees(user.id, 'sherbet')) == ['Sherbet']
+    soft_delete_trees(user.id, Tree.id == cutting.id)
+    db.session.commit()
+    assert search_trees(user.id, 'rockwool')['total'] == 0
+    assert search_trees(user.id + 1, 'kush')['total'] == 0
+
+
+def test_facets_ignore_their_own_filter(app, farm_setup):
+    user, farm, dome = farm_setup
+    other = Dome(name='Veg', grid_row=0, grid_col=1, internal_rows=5, internal_cols=5,
+                 user_id=user.id, farm_id=farm.id)
+    db.session.add(other)
+    db.session.flush()
+    old = make_tree(dome, 0, 0, name='Old Kush')
+    old.planted_date = datetime.utcnow() - timedelta(days=120)
+    make_tree(dome, 0, 1, name='Kush Clone', mother=old)
+    make_tree(other, 0, 0, name='Veg Kush')
+    db.session.commit()
+    ensure_search_index(db.session.connection())
+
+    results = search_trees(user.id, 'kush', dome_id=dome.id)
+    assert results['total'] == 2
+    assert {entry['name']: entry['count'] for entry in results['facets']['dome']} == {'Dome': 2, 'Veg': 1}
+    assert {entry['value']: entry['count'] for entry in results['facets']['plant_type']} == {'mother': 1, 'cutting': 1}
+    assert {entry['value']: entry['count'] for entry in results['facets']['age']} == {'seedling': 1, 'old': 1}
+    assert results['facets']['farm'] == [{'id': farm.id, 'name': 'Farm', 'count': 2}]
+
+    aged = search_trees(user.id, '', age='old')
+    assert _names(aged) == ['Old Kush'] and aged['trees'][0]['life_days'] == 120
+
+
+def test_search_route_and_like_fallback(app, farm_setup):
+    user, farm, dome = farm_setup
+    make_tree(dome, 0, 0, name='Blue Dream', breed='Haze')
+    db.session.commit()
+    client = login_client(app, user, 'search')
+
+    body = client.get('/api/search?q=haze').get_json()
+    assert isinstance(get_search_backend(), LikeBackend)
+    assert body['backend'] == 'like' and _names(body) == ['Blue Dream']
+
+    ensure_search_index(db.session.connection())
+    db.session.commit()
+    body = client.get('/api/search?q=blue+dr').get_json()
+    assert body['backend'] == 'fts5' and body['total'] == 1
+    assert client.get('/api/search?age=teen').status_code == 400
+    assert client.get('/api/search?limit=0').status_code == 400
+    assert 'offset' in client.get('/api/search?offset=-1').get_json()['error']
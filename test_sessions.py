@@ -0,0 +1,106 @@
+import pytest
+from flask import session
+from sqlalchemy import event
+
+from models import db, ServerSession
+from services.sessions import init_session_store
+from services.user_cache import load_cached_user, user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+def count_selects():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return statements, lambda: event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_cached_user_loads_without_sql_and_drops_on_change(farm_setup):
+    user, farm, dome = farm_setup
+    user_id = user.id
+    load_cached_user(str(user_id))
+    db.session.remove()
+
+    selects, stop = count_selects()
+    try:
+        cached = load_cached_user(str(user_id))
+    finally:
+        stop()
+    assert selects == []
+    assert cached.username == 'grower' and cached in db.session
+
+    # Writes through the attached instance are flushed and invalidate the entry
+    cached.set_password('changed456')
+    db.session.commit()
+    assert user_cache.get(user_id) is None
+    db.session.remove()
+    assert load_cached_user(user_id).check_password('changed456')
+
+    assert load_cached_user('999') is None
+    assert load_cached_user('not-a-number') is None
+
+
+def session_app(app, backend, tmp_path):
+    app.config['SESSION_BACKEND'] = backend
+    app.config['SESSION_FILE_DIR'] = str(tmp_path)
+    init_session_store(app)
+
+    @app.route('/login/<user_id>')
+    def login(user_id):
+        session['_user_id'] = user_id
+        session['farm'] = 'A'
+        return 'ok'
+
+    @app.route('/read')
+    def read():
+        return session.get('farm', '-')
+
+    @app.route('/logout')
+    def logout():
+        session.clear()
+        return 'ok'
+
+    return app.test_client()
+
+
+def session_cookie(client):
+    cookie = client.get_cookie('session')
+    return cookie.value if cookie else None
+
+
+@pytest.mark.parametrize('backend', ['filesystem', 'sql'])
+def test_server_side_sessions(app, tmp_path, backend):
+    client = session_app(app, backend, tmp_path)
+
+    client.get('/login/1')
+    first = session_cookie(client)
+    assert len(first) == 43 and 'farm' not in first
+
+    # Unchanged requests read the stored data and do not rewrite the cookie
+    response = client.get('/read')
+    assert response.get_data(as_text=True) == 'A'
+    assert 'Set-Cookie' not in response.headers
+    assert 'Cookie' in response.headers['Vary']
+
+    # A different user gets a new id; the old one no longer works
+    client.get('/login/2')
+    second = session_cookie(client)
+    assert second != first
+    assert app.session_interface.store.load(first) is None
+    assert client.get('/read').get_data(as_text=True) == 'A'
+
+    client.get('/logout')
+    assert session_cookie(client) is None
+    assert app.session_interface.store.load(second) is None
+    if backend == 'sql':
+        assert db.session.query(ServerSession).count() == 0
@@ -0,0 +1,92 @@
+from models import db, Dome, Tree, DragArea, DragAreaTree, TreeLineage
+from services.lineage import reconcile_cutting_counts
+from services.soft_delete import soft_delete_trees, purge_deleted_trees
+
+from conftest import login_client, make_tree
+
+
+def test_soft_deleted_trees_are_hidden_from_orm_reads(farm_setup):
+    user, farm, dome = farm_setup
+    mother = make_tree(dome, 0, 0, name='Mother')
+    make_tree(dome, 0, 1, name='Cutting', mother=mother)
+    db.session.commit()
+
+    deleted = soft_delete_trees(user.id, Tree.id == mother.id)
+    db.session.commit()
+
+    assert [row.name for row in deleted] == ['Mother']
+    db.session.expire_all()
+    assert Tree.query.filter_by(dome_id=dome.id).count() == 1
+    assert db.session.get(Dome, dome.id).trees[0].name == 'Cutting'
+    assert Tree.query.execution_options(include_deleted=True).count() == 2
+    # Deleting again is a no-op
+    assert soft_delete_trees(user.id, Tree.id == mother.id) == []
+
+
+def test_purge_cleans_up_relationships_in_batches(farm_setup):
+    user, farm, dome = farm_setup
+    mother = make_tree(dome, 0, 0, name='Mother')
+    cutting = make_tree(dome, 0, 1, name='Cutting', mother=mother)
+    others = [make_tree(dome, 1, col) for col in range(3)]
+    area = DragArea(name='Area', dome_id=dome.id, min_row=0, max_row=0, min_col=0, max_col=1,
+                    width=2, height=1)
+    db.session.add(area)
+    db.session.flush()
+    db.session.add(DragAreaTree(drag_area_id=area.id, tree_id=mother.id, relative_row=0, relative_col=0))
+    db.session.commit()
+    mother_id, cutting_id = mother.id, cutting.id
+
+    soft_delete_trees(user.id, Tree.id.in_([mother_id] + [tree.id for tree in others]))
+    db.session.commit()
+
+    totals = purge_deleted_trees(batch_size=2)
+
+    assert totals['batches'] == 2
+    assert totals['trees_purged'] == 4
+    assert totals['cutting_trees_updated'] == 1
+    assert totals['drag_areas_updated'] == 1
+    assert Tree.query.execution_options(include_deleted=True).count() == 1
+
+    survivor = db.session.get(Tree, cutting_id)
+    assert survivor.mother_plant_id is None
+    assert survivor.plant_type == 'independent'
+    assert TreeLineage.query.count() == 0
+    assert purge_deleted_trees()['batches'] == 0
+
+
+def test_deleting_a_cutting_updates_the_mother_count_at_once(app, farm_setup):
+    user, farm, dome = farm_setup
+    mother = make_tree(dome, 0, 0, name='Mother')
+    first = make_tree(dome, 0, 1, mother=mother)
+    make_tree(dome, 0, 2, mother=mother)
+    db.session.commit()
+    assert mother.cutting_count == 2
+
+    response = login_client(app, user, 'trees').delete(f'/delete_tree/{first.id}').get_json()
+    assert response['success'] and 'cutting_trees_updated' not in response
+    assert mother.cutting_count == 1
+
+    # Tombstoned cuttings no longer count as drift, and the purge keeps the count
+    assert reconcile_cutting_counts() == 0
+    purge_deleted_trees()
+    db.session.expire_all()
+    assert db.session.get(Tree, mother.id).cutting_count == 1
+
+
+def test_tombstones_leave_the_lineage_closure_at_once(farm_setup):
+    user, farm, dome = farm_setup
+    root = make_tree(dome, 0, 0, name='Root')
+    middle = make_tree(dome, 0, 1, name='Middle', mother=root)
+    leaf = make_tree(dome, 0, 2, name='Leaf', mother=middle)
+    db.session.commit()
+    assert root.get_descendant_count() == 2
+    assert leaf.get_generation() == 2
+
+    soft_delete_trees(user.id, Tree.id == middle.id)
+    db.session.commit()
+
+    assert root.get_descendant_count() == 0
+    assert leaf.get_generation() == 0
+    assert leaf.get_ancestor_ids() == []
+    assert purge_deleted_trees()['trees_purged'] == 1
+    assert TreeLineage.query.count() == 0
@@ -0,0 +1,68 @@
+import pytest
+
+from models import db, Tree
+from services.tree_batch import apply_tree_batch, BatchValidationError
+
+from conftest import login_client, make_tree
+
+
+def test_batch_applies_chained_moves_swaps_updates_and_deletes(farm_setup):
+    user, farm, dome = farm_setup
+    a, b, c, d = (make_tree(dome, 0, col, name=f'T{col}') for col in range(4))
+    db.session.commit()
+
+    delta = apply_tree_batch(dome, user.id, [
+        {'op': 'delete', 'tree_id': d.id},
+        {'op': 'move', 'tree_id': c.id, 'row': 0, 'col': 3},   # into the cell just freed
+        {'op': 'swap', 'tree_id': a.id, 'other_id': b.id},
+        {'op': 'update', 'tree_id': a.id, 'fields': {'name': 'Renamed', 'breed': 'Gelato'}},
+    ])
+
+    assert delta['deleted'] == [d.id]
+    assert {(m['id'], m['internal_row'], m['internal_col']) for m in delta['moved']} == {
+        (a.id, 0, 1), (b.id, 0, 0), (c.id, 0, 3)
+    }
+    assert delta['updated'] == [{'id': a.id, 'fields': {'name': 'Renamed', 'breed': 'Gelato'}}]
+
+    db.session.expire_all()
+    renamed = db.session.get(Tree, a.id)
+    assert (renamed.name, renamed.breed, renamed.internal_col) == ('Renamed', 'Gelato', 1)
+    assert Tree.query.filter_by(dome_id=dome.id).count() == 3
+
+
+def test_invalid_batch_writes_nothing(farm_setup):
+    user, farm, dome = farm_setup
+    a, b = make_tree(dome, 0, 0), make_tree(dome, 0, 1)
+    db.session.commit()
+
+    with pytest.raises(BatchValidationError) as excinfo:
+        apply_tree_batch(dome, user.id, [
+            {'op': 'move', 'tree_id': a.id, 'row': 5, 'col': 5},
+            {'op': 'move', 'tree_id': b.id, 'row': 5, 'col': 5},
+            {'op': 'update', 'tree_id': a.id, 'fields': {'dome_id': 99}},
+        ])
+
+    assert [error['index'] for error in excinfo.value.errors] == [1, 2]
+    db.session.expire_all()
+    assert (db.session.get(Tree, a.id).internal_row, db.session.get(Tree, a.id).internal_col) == (0, 0)
+
+
+def test_update_values_are_type_checked(app, farm_setup):
+    user, farm, dome = farm_setup
+    tree = make_tree(dome, 0, 0)
+    db.session.commit()
+
+    with pytest.raises(BatchValidationError) as excinfo:
+        apply_tree_batch(dome, user.id, [
+            {'op': 'update', 'tree_id': tree.id, 'fields': {'life_days': 'abc'}},
+            {'op': 'update', 'tree_id': tree.id, 'fields': {'life_day_offset': []}},
+            {'op': 'update', 'tree_id': tree.id, 'fields': {'name': 42}},
+            {'op': 'update', 'tree_id': tree.id, 'fields': {'breed': 'x' * 101}},
+            {'op': 'update', 'tree_id': tree.id, 'fields': {'life_days': 12, 'info': None}},
+        ])
+    assert [error['index'] for error in excinfo.value.errors] == [0, 1, 2, 3]
+    assert 'limited to 100' in excinfo.value.errors[3]['error']
+
+    client = login_client(app, user, 'trees')
+    response = client.post(f'/api/dome/{dome.id}/batch', data='not json', content_type='text/plain')
+    assert response.status_code == 400
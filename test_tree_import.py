@@ -0,0 +1,72 @@
+from models import db, Dome, PlantRelationship, Tree, TreeLineage
+from services.search import ensure_search_index, search_trees
+from services.tree_import import ImportValidationError, import_trees
+
+from conftest import login_client, make_tree
+
+import pytest
+
+
+def test_import_plants_lineage_across_domes(app, farm_setup):
+    user, farm, dome = farm_setup
+    nursery = Dome(name='Nursery', grid_row=0, grid_col=1, internal_rows=3, internal_cols=3,
+                   user_id=user.id, farm_id=farm.id)
+    db.session.add(nursery)
+    existing = make_tree(dome, 9, 9, name='Old Mother')
+    db.session.commit()
+    ensure_search_index(db.session.connection())
+
+    result = import_trees(user.id, (
+        "Dome,Row,Col,Name,Breed,Mother\n"
+        "Nursery,0,1,Clone 2,Gelato,Clone 1\n"
+        f"{dome.id},0,0,Big Mother,Gelato,\n"
+        "nursery,0,0,Clone 1,Gelato,Big Mother\n"
+        f"Nursery,1,0,Clone 3,,{existing.id}\n"
+    ))
+    assert result['created'] == 4 and result['transactions'] == 2
+
+    trees = {tree.name: tree for tree in Tree.query.all()}
+    assert trees['Clone 2'].mother_plant_id == trees['Clone 1'].id
+    assert trees['Clone 1'].plant_type == 'cutting' and trees['Big Mother'].plant_type == 'mother'
+    assert trees['Big Mother'].cutting_count == 1 and trees['Old Mother'].cutting_count == 1
+    assert TreeLineage.query.filter_by(ancestor_id=trees['Big Mother'].id, descendant_id=trees['Clone 2'].id,
+                                       depth=2).count() == 1
+    assert PlantRelationship.query.count() == 3
+    assert search_trees(user.id, 'clone')['total'] == 3
+
+
+def test_invalid_rows_reject_the_whole_file(app, farm_setup):
+    user, farm, dome = farm_setup
+    make_tree(dome, 0, 0)
+    db.session.commit()
+
+    with pytest.raises(ImportValidationError) as error:
+        import_trees(user.id, (
+            "dome,row,col,name,mother\n"
+            f"{dome.id},1,1,Fine,\n"
+            f"{dome.id},0,0,Taken,\n"
+            f"{dome.id},1,1,Twice,\n"
+            f"{dome.id},20,0,Outside,\n"
+            "Nowhere,2,2,Lost,\n"
+            f"{dome.id},3,3,Loop A,Loop B\n"
+            f"{dome.id},3,4,Loop B,Loop A\n"
+        ))
+    lines = {entry['line']: entry['error'] for entry in error.value.errors}
+    assert sorted(lines) == [3, 4, 5, 6, 7, 8]
+    assert 'occupied' in lines[3] and 'occupied' in lines[4] and 'outside' in lines[5]
+    assert 'not found' in lines[6] and 'cycle' in lines[7]
+    assert Tree.query.count() == 1
+
+
+def test_import_route_dry_run_and_errors(app, farm_setup):
+    user, farm, dome = farm_setup
+    client = login_client(app, user, 'trees')
+    body = "dome,row,col,name\nDome,0,0,First\n"
+
+    response = client.post('/api/trees/import?dry_run=1', data=body, content_type='text/csv')
+    assert response.get_json()['valid_rows'] == 1 and Tree.query.count() == 0
+    assert client.post('/api/trees/import', data=body, content_type='text/csv').get_json()['created'] == 1
+
+    response = client.post('/api/trees/import', data=body, content_type='text/csv')
+    assert response.status_code == 400 and response.get_json()['errors'][0]['line'] == 2
+    assert client.post('/api/trees/import', data='id,name\n1,x\n', content_type='text/csv').status_code == 400
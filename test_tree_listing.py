@@ -0,0 +1,102 @@
+import json
+
+from sqlalchemy import event
+
+from models import db, DragArea, DragAreaTree
+
+from conftest import login_client, make_tree
+
+
+def test_keyset_pages_walk_the_dome_once(app, farm_setup):
+    user, farm, dome = farm_setup
+    for col in range(7):
+        make_tree(dome, col // 5, col % 5)
+    db.session.commit()
+    client = login_client(app, user, 'trees')
+
+    seen, cursor = [], None
+    while True:
+        url = f'/api/trees/{dome.id}?limit=3&fields=id,name' + (f'&after={cursor}' if cursor else '')
+        page = client.get(url).get_json()
+        assert all(set(tree) == {'id', 'name'} for tree in page['trees'])
+        seen += [tree['id'] for tree in page['trees']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    assert len(page['trees']) == 1
+    assert seen == sorted(seen) and len(set(seen)) == 7
+    assert 'next_cursor' not in client.get(f'/api/trees/{dome.id}').get_json()
+
+
+def test_fields_limit_the_columns_loaded(app, farm_setup):
+    user, farm, dome = farm_setup
+    make_tree(dome, 0, 0)
+    db.session.commit()
+    client = login_client(app, user, 'trees')
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        body = client.get(f'/api/dome/{dome.id}/trees?fields=id,internal_row,internal_col').get_json()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert body['trees'] == [{'id': 1, 'internal_row': 0, 'internal_col': 0}]
+    tree_select = next(sql for sql in statements if 'FROM tree' in sql and 'tree.internal_row' in sql)
+    assert 'image_url' not in tree_select and 'info' not in tree_select
+
+    assert client.get(f'/api/dome/{dome.id}/trees?fields=id,password').status_code == 400
+    assert client.get(f'/api/dome/{dome.id}/trees?after=garbage').status_code == 400
+
+
+def test_ndjson_streams_one_tree_per_line(app, farm_setup):
+    user, farm, dome = farm_setup
+    for col in range(3):
+        make_tree(dome, 0, col)
+    db.session.commit()
+    client = login_client(app, user, 'trees')
+
+    response = client.get(f'/api/dome/{dome.id}/trees?format=ndjson&fields=id,breed')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [set(line) for line in lines] == [{'id', 'breed'}] * 3
+
+    paged = client.get(f'/api/dome/{dome.id}/trees?format=ndjson&fields=id&limit=2')
+    page = [json.loads(line) for line in paged.get_data(as_text=True).splitlines()]
+    assert page[:2] == [{'id': line['id']} for line in lines[:2]]
+    assert len(page) == 3 and page[2]['next_cursor']
+    last = client.get(f"/api/dome/{dome.id}/trees?format=ndjson&fields=id&limit=2&after={page[2]['next_cursor']}")
+    assert [json.loads(line) for line in last.get_data(as_text=True).splitlines()] == [
+        {'id': lines[2]['id']}, {'next_cursor': None}]
+
+    selected = client.post('/get_selected_trees_info?fields=id,has_image',
+                           json={'tree_ids': [line['id'] for line in lines]}).get_json()
+    assert selected['summary']['total_trees'] == 3
+    assert selected['trees'][0] == {'id': lines[0]['id'], 'has_image': False}
+
+
+def test_area_trees_are_paged_from_drag_area_members(app, farm_setup):
+    user, farm, dome = farm_setup
+    members = [make_tree(dome, 0, col) for col in range(3)]
+    make_tree(dome, 5, 5)
+    area = DragArea(name='A', dome_id=dome.id, min_row=0, max_row=0, min_col=0, max_col=2,
+                    width=3, height=1)
+    db.session.add(area)
+    db.session.flush()
+    db.session.add_all([DragAreaTree(drag_area_id=area.id, tree_id=tree.id, relative_row=0,
+                                     relative_col=tree.internal_col) for tree in members])
+    db.session.commit()
+    client = login_client(app, user, 'areas')
+
+    first = client.get(f'/get_area_trees/{dome.id}/{area.id}?limit=2&fields=id').get_json()
+    assert first['area']['name'] == 'A'
+    assert first['trees'] == [{'id': members[0].id}, {'id': members[1].id}]
+    rest = client.get(f"/get_area_trees/{dome.id}/{area.id}?limit=2&fields=id&after={first['next_cursor']}")
+    assert rest.get_json()['trees'] == [{'id': members[2].id}]
+    assert rest.get_json()['next_cursor'] is None
+
+    lines = client.get(f'/get_area_trees/{dome.id}/{area.id}?format=ndjson').get_data(as_text=True).splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [tree.id for tree in members]
+    assert client.get(f'/get_area_trees/{dome.id}/{area.id + 1}').status_code == 404